@@ -5,14 +5,28 @@
 from __future__ import annotations
 
 # 導入（import）dataclass 工具，方便建立只有資料的類別（不需要寫 __init__）。
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+# 導入（import）執行緒池工具：多後端時每個後端各有一條佇列，同時讀取、逾時不等。
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 # 導入（import）路徑處理（pathlib）中的 Path 工具。
 from pathlib import Path
 # 導入（import）類型提示（typing）中的 Literal（字面量）、List（列表）、Dict（字典）和 Optional（可選的）。
-from typing import Literal, List, Dict, Optional, Any
+from typing import Literal, List, Dict, Optional, Any, Tuple, Callable
 # 導入（import）json 模組，用於讀取和寫入 JSON 格式的設定檔。
 import json
+import os
 import subprocess
+import configparser
+import threading
+import time
+
+from src.backend import metrics
+from src.backend.session import WslDaemonSession, SessionError, CREATE_NO_WINDOW
+from src.backend.fake_daemon import FAKE_BACKEND_ENV, FakeDaemon
+from src.backend.path_index import ProjectPathIndex
+from src.backend.paths import default_distro, set_default_distro, split_wsl, to_wsl, to_wsl_many
+from src.backend.protocol import ChunkCallback, FrameDecoder, Reply, ReplyCollector
+from src.backend.wsl_bridge import DISTRO_COMMAND, PING_COMMAND, TAIL_LOG_COMMAND
 
 # ============================
 #  型別定義（給 tray_app 使用）
@@ -36,11 +50,16 @@ class BackendError(Exception):
     UI 專用的後端錯誤封裝。
 
     - 目前 stub 版本只用來在 adapter / tray_app 之間傳遞錯誤訊息。
-    - 未來若接上真正的 Laplace Sentry daemon，可以在這裡加上
-    error_code / kind 等欄位，統一映射 daemon 傳回的錯誤。
+    - kind：錯誤類別（延遲量測依此分類失敗，見 src/backend/metrics.py）
+        - "spawn"：行程 / 常駐連線起不來
+        - "transport"：連線在執行中斷掉、沒收到回覆
+        - "timeout"：等待回覆逾時
+        - "backend"：daemon 回報失敗（結束碼非 0）或參數檢查失敗
+        - "protocol"：回覆格式不對
     """
-    # 這裡用 pass 意思是不需要為這個錯誤類型添加額外的程式碼。
-    pass
+    def __init__(self, message: str = "", kind: str = "backend") -> None:
+        super().__init__(message)
+        self.kind = kind
 
 # ============================
 #  WSL 設定 (Hardcoded for v1)
@@ -54,6 +73,116 @@ WSL_PYTHON = f"{WSL_PROJECT_ROOT}/.venv/bin/python"
 # 3. 最後定義主腳本路徑
 WSL_MAIN_SCRIPT = "src.core.daemon"
 
+# ============================
+#  UI 設定檔 (sentry_config.ini)
+# ============================
+# 和 tray_app 的 QSettings 共用同一個檔案（相對於啟動目錄，run_ui.bat 會先 cd 到專案根）。
+SENTRY_CONFIG_PATH = "sentry_config.ini"
+
+# 通訊模式：
+# - "session"：常駐 wsl_bridge 行程（預設），啟動一次、之後逐行傳送請求
+# - "direct" ：每個指令都跑一次 wsl ... wsl_bridge.py --once（回覆框架與 session 相同）
+# - "fake"   ：行程內的假後端（src/backend/fake_daemon.py），不需要 WSL；設定 SENTRY_FAKE_BACKEND 環境變數也會啟用
+TRANSPORT_SESSION = "session"
+TRANSPORT_DIRECT = "direct"
+TRANSPORT_FAKE = "fake"
+# 多後端（[backend:<name>] 區段）時 MultiBackendAdapter 的 transport；不是設定值
+TRANSPORT_MULTI = "multi"
+
+# 常駐連線啟動失敗後，多久之內先改走 direct（秒），避免每次點擊都重試啟動
+SESSION_RETRY_COOLDOWN = 30.0
+
+# 專案列表快取的預設存活時間（秒）；可用 [backend] projects_cache_ttl 覆寫，0 = 不快取
+DEFAULT_PROJECTS_CACHE_TTL = 15.0
+
+# 直接讀取 projects.json 時，後端回報的執行狀態可以沿用多久（秒）；可用 [backend] projects_status_ttl 覆寫
+# 事件串流連線中時狀態由事件即時更新，不受這個期限限制
+DEFAULT_PROJECTS_STATUS_TTL = 60.0
+
+# 托盤啟動後是否在背景先暖機（啟動 WSL / bridge、載入 daemon）；可用 [backend] warmup 覆寫
+DEFAULT_BACKEND_WARMUP = True
+
+# 保活：閒置超過這麼多秒就送一個 __ping__（0 = 關閉）；可用 [backend] keepalive_interval 覆寫
+DEFAULT_KEEPALIVE_INTERVAL = 0.0
+
+# 多後端：[backend:<name>] 區段的前綴，以及讀取列表時最多等每個後端幾秒（[backend] backend_timeout）
+BACKEND_SECTION_PREFIX = "backend:"
+DEFAULT_BACKEND_TIMEOUT = 3.0
+
+# 日誌增量讀取：第一次讀取 / 重置時最多帶回幾行（更早的歷史不送到 UI）
+LOG_TAIL_INITIAL_LINES = 2000
+
+# 啟停切換後等待狀態收斂：總逾時、第一次輪詢間隔、間隔上限（秒）
+TOGGLE_CONVERGE_TIMEOUT = 10.0
+TOGGLE_POLL_INITIAL = 0.1
+TOGGLE_POLL_MAX = 0.8
+
+# 會改變專案列表內容的後端指令：執行後（不論成敗）一律讓列表快取失效
+_MUTATING_COMMANDS = frozenset({
+    "add_project",
+    "delete_project",
+    "edit_project",
+    "add_target",
+    "remove_target",
+    "start_sentry",
+    "stop_sentry",
+    "update_ignore_patterns",
+    "add_ignore_patterns",
+})
+
+# 常駐連線等待回覆的上限（秒）；可用 [backend] request_timeout 覆寫，0 = 不限
+DEFAULT_REQUEST_TIMEOUT = 60.0
+
+# 不套用 request_timeout 的指令：寫入指令（逾時會砍掉 bridge，projects.json 可能寫到一半）
+# 以及本來就可能跑很久的讀取（手動更新、整份日誌、忽略候選名單）
+_UNBOUNDED_COMMANDS = _MUTATING_COMMANDS | frozenset({
+    "manual_update",
+    "get_log",
+    "list_ignore_candidates",
+})
+
+
+def _read_config(path: str | Path) -> Optional[configparser.ConfigParser]:
+    """讀取 sentry_config.ini；格式錯誤時印出警告並回傳 None（檔案不存在時是空的 parser）。"""
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(str(path), encoding="utf-8")
+    except (configparser.Error, UnicodeDecodeError) as e:
+        print(f"[Warning] 無法讀取 {path}: {e}")
+        return None
+    return parser
+
+
+def _load_backend_config(path: str | Path = SENTRY_CONFIG_PATH) -> Dict[str, str]:
+    """
+    讀取 sentry_config.ini 的 [backend] 區段，回傳 {key: value}。
+    檔案不存在或格式錯誤時回傳空字典（一律使用預設值）。
+    """
+    parser = _read_config(path)
+    if parser is None or not parser.has_section("backend"):
+        return {}
+    return dict(parser.items("backend"))
+
+
+def _load_backend_sections(path: str | Path = SENTRY_CONFIG_PATH) -> Dict[str, Dict[str, str]]:
+    """
+    讀取 sentry_config.ini 的 [backend:<name>] 區段（多後端），回傳 {name: {key: value}}，順序同檔案。
+    沒有這種區段時回傳空字典（單一後端，沿用 WSL_* 常數）。
+    """
+    parser = _read_config(path)
+    if parser is None:
+        return {}
+    sections: Dict[str, Dict[str, str]] = {}
+    for section in parser.sections():
+        if not section.startswith(BACKEND_SECTION_PREFIX):
+            continue
+        name = section[len(BACKEND_SECTION_PREFIX):].strip()
+        if not name or name in sections:
+            print(f"[Warning] 略過無效或重複的後端區段 [{section}]")
+            continue
+        sections[name] = dict(parser.items(section))
+    return sections
+
 # 這裡，我們用「@dataclass」標記（mark）這是一個資料類別（只有數據）。
 @dataclass
 class ProjectInfo:
@@ -77,6 +206,8 @@ class ProjectInfo:
     output_file: List[str] = field(default_factory=list)
     # 目標監控檔案的路徑列表（target_files），預設是空的列表（用 default_factory=list）。
     target_files: List[str] = field(default_factory=list)
+    # 來自哪個後端（[backend:<name>] 的 name）；單一後端時是空字串。
+    backend: str = ""
 
 
 # 這裡，我們用「@dataclass」標記（mark）這是忽略設定的資料類別。
@@ -87,6 +218,173 @@ class IgnoreSettings:
     # 目錄樹的深度限制（int），型別是整數。
     tree_depth_limit: int
 
+# 這裡，我們用「@dataclass」標記（mark）這是暖機 / 保活設定的資料類別。
+@dataclass
+class WarmupSettings:
+    """[backend] warmup / keepalive_interval 的設定值（tray_app 依此排程）。"""
+    # 托盤出現後是否在背景暖機。
+    warmup: bool
+    # 閒置多少秒後送保活 ping（0 = 不保活）。
+    keepalive_interval: float
+
+# 這裡，我們用「@dataclass」標記（mark）這是後端位置（哪個 distro 的哪份 checkout）的資料類別。
+@dataclass(frozen=True)
+class BackendEndpoint:
+    """
+    一個後端 daemon 在哪裡（[backend:<name>] 區段；單一後端時就是上面的 WSL_* 常數）。
+
+    - name：後端名稱，也是 ProjectInfo.backend 的標籤（單一後端為空字串）
+    - distro：wsl -d 的 distro 名稱；空字串 = WSL 的預設 distro
+    - project_root / python / main_script：對應 WSL_PROJECT_ROOT / WSL_PYTHON / WSL_MAIN_SCRIPT
+    """
+    name: str = ""
+    distro: str = ""
+    project_root: str = WSL_PROJECT_ROOT
+    python: str = WSL_PYTHON
+    main_script: str = WSL_MAIN_SCRIPT
+
+    def bridge_command(self, *bridge_args: str) -> List[str]:
+        """在這個後端執行 wsl_bridge.py 的完整指令（bridge_args 接在 bridge 路徑之後）。"""
+        distro = ["-d", self.distro] if self.distro else []
+        return [
+            "wsl", *distro,
+            "--cd", self.project_root,
+            self.python,
+            "-u", BackendAdapter._bridge_path(),
+            *bridge_args,
+        ]
+
+# 這裡，我們用「@dataclass」標記（mark）這是日誌增量讀取的結果。
+@dataclass
+class LogTail:
+    """
+    日誌增量讀取的結果（get_log_tail）。
+
+    - lines：這次新增的行（reset=True 時是要整個替換的內容）
+    - cursor：下次要帶回來的游標（不透明字串，格式 "<行數>:<最後一行指紋>"）
+    - reset：日誌是第一次讀、被輪替或被截斷 → 顯示端要清空重畫，而不是接在後面
+    """
+    lines: List[str]
+    cursor: str
+    reset: bool
+
+
+# 這裡，我們用「@dataclass」標記（mark）這是批次指令中「單一子指令」的結果。
+@dataclass
+class BatchResult:
+    """
+    批次執行（BackendAdapter.batch）中每個子指令的結果：
+    - ok=True 時 value 是解析後的回傳值
+    - ok=False 時 error 是錯誤訊息（參數檢查失敗或後端報錯）
+    """
+    cmd: str
+    args: List[str]
+    ok: bool
+    value: Any = None
+    error: Optional[str] = None
+
+
+class CommandBatch:
+    """
+    收集多個後端指令，離開 with 區塊時一次送出（一次往返）。
+
+    用法：
+        with adapter.batch() as b:
+            for uuid in uuids:
+                b.delete_project(uuid)
+        for r in b.results: ...
+
+    - 參數檢查失敗的子指令不會送出，直接記為失敗結果（順序不變）。
+    - 某個子指令失敗不影響其他子指令。
+    """
+
+    def __init__(self, adapter: "BackendAdapter | MultiBackendAdapter") -> None:
+        self._adapter = adapter
+        # 依加入順序存放：(指令, 參數, 參數檢查失敗時的錯誤訊息；None 代表待送出)
+        self._items: List[Tuple[str, List[str], Optional[str]]] = []
+        self.results: List[BatchResult] = []
+
+    def __enter__(self) -> "CommandBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # with 區塊內出錯時不送出任何指令
+        if exc_type is None:
+            self.execute()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # --- 收集指令 ---
+
+    def add(self, cmd: str, *args: str) -> None:
+        """加入任意後端指令。"""
+        self._items.append((cmd, [str(a) for a in args], None))
+
+    def _reject(self, cmd: str, args: List[str], error: str) -> None:
+        self._items.append((cmd, [str(a) for a in args], error))
+
+    def add_project(self, name: str, path: str, output_file: str) -> None:
+        try:
+            name, path, output_file = BackendAdapter._validate_new_project(name, path, output_file)
+        except BackendError as e:
+            self._reject("add_project", [name, path, output_file], str(e))
+            return
+        self.add("add_project", name, path, output_file)
+
+    def delete_project(self, uuid: str) -> None:
+        if not uuid:
+            self._reject("delete_project", [uuid], "刪除失敗：UUID 為空。")
+            return
+        self.add("delete_project", uuid)
+
+    def start_project(self, uuid: str) -> None:
+        if not uuid:
+            self._reject("start_sentry", [uuid], "啟動失敗：UUID 為空。")
+            return
+        self.add("start_sentry", uuid)
+
+    def stop_project(self, uuid: str) -> None:
+        if not uuid:
+            self._reject("stop_sentry", [uuid], "停止失敗：UUID 為空。")
+            return
+        self.add("stop_sentry", uuid)
+
+    def edit_project(self, uuid: str, field: str, new_value: str) -> None:
+        if not uuid or not field or not new_value:
+            self._reject("edit_project", [uuid, field, new_value], "編輯失敗：UUID、欄位名稱或新值不得為空。")
+            return
+        self.add("edit_project", uuid, field, new_value)
+
+    def add_target(self, uuid: str, new_target: str) -> None:
+        if not uuid or not new_target:
+            self._reject("add_target", [uuid, new_target], "追加失敗：參數不得為空。")
+            return
+        self.add("add_target", uuid, new_target)
+
+    def remove_target(self, uuid: str, target_to_remove: str) -> None:
+        if not uuid or not target_to_remove:
+            self._reject("remove_target", [uuid, target_to_remove], "移除失敗：參數不得為空。")
+            return
+        self.add("remove_target", uuid, target_to_remove)
+
+    # --- 執行 ---
+
+    def execute(self) -> List[BatchResult]:
+        """送出所有有效的子指令，並把結果依原順序填入 self.results。"""
+        pending = [(cmd, args) for cmd, args, error in self._items if error is None]
+        sent = iter(self._adapter.run_batch(pending))
+
+        self.results = []
+        for cmd, args, error in self._items:
+            if error is not None:
+                self.results.append(BatchResult(cmd=cmd, args=args, ok=False, error=error))
+            else:
+                self.results.append(next(sent))
+        self._items = []
+        return self.results
+
+
 # ============================
 #  內部用模型（真實 projects.json）
 # ============================
@@ -133,9 +431,56 @@ class BackendAdapter:
     """
 
     # 這裡，我們用「def」來定義（define）Adapter 物件被建立時會自動執行的函式（__init__）。
-    def __init__(self, json_path: str | Path) -> None:
+    def __init__(
+        self,
+        json_path: str | Path | None = None,
+        transport: str = TRANSPORT_SESSION,
+        projects_cache_ttl: float = DEFAULT_PROJECTS_CACHE_TTL,
+        projects_status_ttl: float = DEFAULT_PROJECTS_STATUS_TTL,
+        warmup: bool = DEFAULT_BACKEND_WARMUP,
+        keepalive_interval: float = DEFAULT_KEEPALIVE_INTERVAL,
+        endpoint: Optional[BackendEndpoint] = None,
+        request_timeout: float = DEFAULT_REQUEST_TIMEOUT,
+    ) -> None:
+        # 後端位置（distro / checkout）；None = WSL_* 常數。name 會標在回傳的每個 ProjectInfo 上
+        self.endpoint = endpoint or BackendEndpoint()
+        self.name = self.endpoint.name
+
         # 將設定檔的路徑（json_path）存入實例變數。
-        self.json_path = Path(json_path)
+        # 有設定時（例如 \\wsl$\Ubuntu\...\projects.json）專案列表直接讀檔，None = 一律問 WSL
+        self.json_path = Path(json_path) if json_path else None
+        # projects.json 上次解析時的 (mtime_ns, size)；沒變就不重新解析
+        self._projects_json_signature: Optional[Tuple[int, int]] = None
+
+        # 專案列表快取（所有呼叫端共用；寫入指令會自動讓它失效）
+        self.projects_cache_ttl = projects_cache_ttl
+        self._projects_cache: Optional[List[ProjectInfo]] = None
+        self._projects_cache_at = 0.0
+        # 每次失效就 +1；背景讀取回來時若世代已變，代表期間有寫入，結果不可存入快取
+        self._projects_cache_generation = 0
+        self._projects_cache_lock = threading.Lock()
+        # 專案路徑索引（拖曳比對用）；每次從後端讀到新列表時增量更新，與快取共用同一把鎖
+        self._path_index = ProjectPathIndex()
+
+        # 通訊模式（session / direct / fake）與常駐連線物件（第一次呼叫時才啟動）
+        self.transport = transport
+        self._session: Optional[WslDaemonSession | FakeDaemon] = None
+        # 常駐連線啟動失敗時記錄的時間點，冷卻期間改走 direct
+        self._session_retry_at = 0.0
+        # 暖機 / 保活設定，以及上一次送出指令的時間點（保活只在閒置時才 ping）
+        self.warmup_settings = WarmupSettings(warmup=warmup, keepalive_interval=keepalive_interval)
+        self._last_request_at = 0.0
+        if transport == TRANSPORT_SESSION:
+            # 讀取指令逾時才砍掉 bridge；寫入 / 長時間指令一律等它回覆（見 _UNBOUNDED_COMMANDS）
+            self._session = WslDaemonSession(
+                self._build_session_command(),
+                request_timeout=request_timeout or None,
+                unbounded_commands=_UNBOUNDED_COMMANDS,
+            )
+        elif transport == TRANSPORT_FAKE:
+            # 假後端的介面和常駐連線相同，之後的請求 / 批次路徑完全一樣
+            # 多後端時 uuid 加上後端名稱前綴，各個假後端的專案不會撞號
+            self._session = FakeDaemon.from_env(uuid_prefix=f"{self.name}-") if self.name else FakeDaemon.from_env()
 
         # 真實的 projects.json → _RawProject
         # 建立一個叫 _projects 的「空籃子」（List[_RawProject]），用來存放所有原始專案資料。
@@ -145,6 +490,12 @@ class BackendAdapter:
         # 建立一個叫 _runtime 的「有標籤的盒子」（Dict），用來存放專案的執行狀態。
         # 標籤（key）是 uuid，盒子裡面的內容（value）是 _RuntimeState 物件。
         self._runtime: Dict[str, _RuntimeState] = {}
+        # 執行狀態的來源一律是後端：記錄上次向 WSL 讀取的時間點，寫入指令後標記為過時
+        self.projects_status_ttl = projects_status_ttl
+        self._runtime_at = 0.0
+        self._runtime_stale = True
+        # 事件串流連線中（狀態變化會即時推來）時，狀態不會因為時間而過期
+        self._status_push = False
 
         # 暫時寫死（之後可改成可編輯）
         # # TODO: 這裡之後要改成可編輯的設定。
@@ -155,98 +506,360 @@ class BackendAdapter:
         )
 
         # 【核心修改】停止在初始化時讀取實體檔案！
-        # 我們現在依賴 list_projects() 動態去 WSL 撈資料。
-        # self._load_projects_json()
+        # 我們現在依賴 list_projects() 動態去 WSL 撈資料；
+        # 有設定 json_path 時，第一次 list_projects 才讀檔（見 _list_projects_from_json）。
+
+
+    @staticmethod
+    def _bridge_path() -> str:
+        """bridge 檔案在 WSL 裡的路徑（透過 /mnt/<drive> 存取 Windows 端的檔案）。"""
+        return to_wsl(str(Path(__file__).resolve().with_name("wsl_bridge.py")))
+
+    def _build_session_command(self) -> List[str]:
+        """組裝常駐 bridge 的啟動指令。"""
+        return self.endpoint.bridge_command(self.endpoint.main_script)
 
+    def _metrics_transport(self, transport: str) -> str:
+        """延遲統計用的通訊模式標籤：多後端時加上後端名稱（例如 session@ubuntu），各後端分開統計。"""
+        return f"{transport}@{self.name}" if self.name else transport
 
-    def _run_wsl_command(self, cmd: str, *args: str) -> list | dict | str:
+    def fake_daemon(self) -> Optional[FakeDaemon]:
+        """transport=fake 時回傳這個後端的 FakeDaemon，否則回傳 None。"""
+        return self._session if self.transport == TRANSPORT_FAKE else None
+
+    def close(self) -> None:
+        """關閉常駐連線（程式結束時呼叫）。"""
+        if self._session is not None:
+            self._session.close()
+
+    def _run_wsl_command(
+        self, cmd: str, *args: str, on_chunk: Optional[ChunkCallback] = None
+    ) -> list | dict | str:
         """
-        核心通訊橋樑 (v3.1 安全路徑版)：
-        1. 【新增】強制將所有 args 中的反斜線 (\\) 替換為正斜線 (/)，防止被 WSL Shell 吃掉。
-        2. 組裝 wsl ... 指令
-        3. 強制使用 utf-8 解碼
-        4. 智能解析回傳值
+        核心通訊橋樑 (v5 框架協定版)：
+        1. 強制將所有 args 中的反斜線 (\\) 替換為正斜線 (/)，防止被 WSL Shell 吃掉。
+        2. 優先走常駐連線（session）；連線無法啟動時自動退回 direct 模式。
+        3. 兩種模式都由 bridge 回傳長度前綴的框架（protocol.py），回傳值在 WSL 端就已解讀好。
+        4. on_chunk：大型清單會分段到達，每段解碼完成就先回呼一次（回傳值仍是完整資料）。
+        5. 每次呼叫都記錄延遲（總時間 / 啟動 / 後端執行 / 解碼）與失敗類別（見 metrics.py）。
         """
         # --- 安全清洗：防止反斜線災難 ---
         # WSL/Linux 接收參數時，反斜線 \ 會被視為跳脫字元。
         # 我們必須在 Windows 這端就先把它轉成 /，這對 Linux 來說是合法的路徑分隔符。
         clean_args = [str(a).replace("\\", "/") for a in args]
 
-        full_cmd = [
-            "wsl",
-            "--cd", WSL_PROJECT_ROOT,
-            WSL_PYTHON,
-            "-m", WSL_MAIN_SCRIPT,
-            cmd,
-            *clean_args
-        ]
+        # 寫入指令：送出前就讓快取失效（失敗也可能已部分生效，寧可多撈一次）
+        if cmd in _MUTATING_COMMANDS:
+            self.invalidate_projects_cache()
+
+        started = time.perf_counter()
+        self._last_request_at = time.monotonic()
+        transport = self.transport if self._session is not None else TRANSPORT_DIRECT
+        try:
+            reply = self._request_via_session(cmd, clean_args, on_chunk)
+            if reply is None:
+                transport = TRANSPORT_DIRECT
+                reply = self._request_direct(cmd, clean_args, on_chunk)
+            result = self._reply_result(reply)
+        except BackendError as e:
+            metrics.record_failure(cmd, self._metrics_transport(transport), e.kind, time.perf_counter() - started, str(e))
+            raise
+
+        metrics.record(
+            cmd, self._metrics_transport(transport), time.perf_counter() - started, reply.backend_seconds, reply.parse_seconds, reply.cold
+        )
+        return result
+
+    def _request_via_session(
+        self, cmd: str, clean_args: List[str], on_chunk: Optional[ChunkCallback] = None
+    ) -> Optional[Reply]:
+        """
+        透過常駐連線送出一個指令，回傳結構化的 Reply。
+        回傳 None 代表這次不能走常駐連線（direct 模式、冷卻中、或連線起不來），呼叫端應改走 direct。
+        """
+        if self._session is None or time.monotonic() < self._session_retry_at:
+            return None
+        try:
+            return self._session.request(cmd, clean_args, on_chunk)
+        except SessionError as e:
+            if e.delivered:
+                # 指令已送達（可能已執行），不能再用 direct 重送；下次呼叫會自動重啟連線
+                raise BackendError(f"WSL 執行失敗: {e}", kind=e.kind)
+            # 連線起不來：冷卻一段時間，這次先用 direct 完成
+            print(f"[Warning] 常駐連線無法啟動，改用 direct 模式: {e}")
+            self._session_retry_at = time.monotonic() + SESSION_RETRY_COOLDOWN
+            return None
+
+    def _build_direct_command(self, cmd: str, clean_args: List[str]) -> List[str]:
+        """組裝 direct 模式（一次一個行程）的完整 wsl 指令：bridge 的單次模式。"""
+        return self.endpoint.bridge_command("--once", self.endpoint.main_script, cmd, *clean_args)
+
+    def _build_watch_command(self, interval: float, log_path: str = "") -> List[str]:
+        """
+        組裝事件訂閱用的 bridge 監看模式指令（見 src/backend/events.py）。
+        log_path：日誌路徑樣板（見 wsl_bridge.WATCH_LOG_PATH）；空字串 = 用 bridge 的預設值。
+        """
+        bridge_args = ["--watch", self.endpoint.main_script, f"{interval:g}"]
+        if log_path:
+            bridge_args.append(log_path)
+        return self.endpoint.bridge_command(*bridge_args)
+
+    def _request_direct(
+        self, cmd: str, clean_args: List[str], on_chunk: Optional[ChunkCallback] = None
+    ) -> Reply:
+        """
+        direct 模式（每次一個行程）：
+        1. 啟動 wsl ... wsl_bridge.py --once 指令
+        2. stdout 有多少讀多少，交給 FrameDecoder 邊收邊解（大型回覆可即時回呼 on_chunk）
+        3. 行程結束後取出結果框架；沒有結果框架代表 bridge 本身失敗，改用 stderr 回報
+        回傳結構化的 Reply（結束碼由呼叫端交給 _reply_result 判斷）。
+        """
+        full_cmd = self._build_direct_command(cmd, clean_args)
 
         try:
-            # 執行指令
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 full_cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                creationflags=0x08000000,
-                check=True 
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                creationflags=CREATE_NO_WINDOW,
             )
-            
-            output = result.stdout.strip()
+        except OSError as e:
+            raise BackendError(f"系統錯誤: {e}", kind="spawn")
+
+        decoder = FrameDecoder()
+        collector = ReplyCollector(None, on_chunk)
+        with proc:
+            assert proc.stdout is not None and proc.stderr is not None
+            while True:
+                data = proc.stdout.read1(65536)
+                if not data:
+                    break
+                for frame in decoder.feed(data):
+                    collector.add(frame)
+            stderr = proc.stderr.read()
+
+        reply = self._direct_reply(collector, stderr)
+        reply.parse_seconds = decoder.busy_seconds
+        return reply
+
+    def _build_direct_batch_command(self) -> List[str]:
+        """組裝 direct 模式批次的 wsl 指令：bridge 的單次批次模式（批次內容由 stdin 送入）。"""
+        return self.endpoint.bridge_command("--once-batch", self.endpoint.main_script)
+
+    def _request_direct_batch(self, cleaned: List[Tuple[str, List[str]]]) -> List[Reply]:
+        """
+        direct 模式的批次：啟動一個 bridge --once-batch 行程，把 {"batch": [...]} 寫進 stdin 後關閉，
+        再讀回唯一的 results 框架，拆成與 cleaned 等長的 [Reply, ...]（一律標為冷啟動）。
+        """
+        body = json.dumps(
+            {"batch": [{"cmd": c, "args": list(a)} for c, a in cleaned]}, ensure_ascii=False
+        ).encode("utf-8")
+        try:
+            proc = subprocess.Popen(
+                self._build_direct_batch_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                creationflags=CREATE_NO_WINDOW,
+            )
+        except OSError as e:
+            raise BackendError(f"系統錯誤: {e}", kind="spawn")
+
+        # bridge 讀完整份 stdin 才開始執行，先寫完再讀不會卡住
+        decoder = FrameDecoder()
+        collector = ReplyCollector(None)
+        with proc:
+            assert proc.stdin is not None and proc.stdout is not None and proc.stderr is not None
+            try:
+                proc.stdin.write(body)
+                proc.stdin.close()
+            except OSError:
+                pass  # bridge 提早結束；錯誤由下面的 stderr 回報
+            for frame in decoder.feed(proc.stdout.read()):
+                collector.add(frame)
+            stderr = proc.stderr.read()
+
+        frame = collector.frame
+        if frame is None or not isinstance(frame.get("results"), list):
+            detail = (frame or {}).get("stderr") or stderr.decode("utf-8", errors="replace").strip()
+            raise BackendError(f"WSL 執行失敗: {detail or '未收到 bridge 回覆'}", kind="transport")
+        results = frame["results"]
+        if len(results) != len(cleaned):
+            raise BackendError("WSL 執行失敗: 批次回覆格式錯誤（結果數量不符）", kind="protocol")
+        replies = [Reply.from_frame(r) for r in results]
+        for reply in replies:
+            reply.parse_seconds = decoder.busy_seconds / len(replies)
+            reply.cold = True
+        return replies
+
+    @staticmethod
+    def _direct_reply(collector: ReplyCollector, stderr: bytes) -> Reply:
+        """
+        取出 direct 模式的回覆；bridge 沒送出結果框架（例如起不來）時用 stderr 組成錯誤。
+        direct 模式每個指令都是新行程，回覆一律標為冷啟動。
+        """
+        reply = collector.reply
+        if reply is None:
+            error_msg = stderr.decode("utf-8", errors="replace").strip() or "未收到 bridge 回覆"
+            raise BackendError(f"WSL 執行失敗: {error_msg}", kind="transport")
+        reply.cold = True
+        return reply
+
+    @staticmethod
+    def _reply_result(reply: Reply) -> list | dict | str:
+        """結束碼非 0 → BackendError；否則回傳解讀好的值（規則見 Reply.result）。"""
+        if reply.code != 0:
+            raise BackendError(f"WSL 執行失敗: {reply.stderr.strip() or '未知錯誤'}")
+        return reply.result()
+
+    # ---------------------------------------------------------
+    # 暖機與保活
+    # ---------------------------------------------------------
+
+    def ping(self) -> float:
+        """送一個 __ping__（不碰 daemon），回傳往返秒數；連線不在時會順便啟動它。"""
+        started = time.perf_counter()
+        self._run_wsl_command(PING_COMMAND)
+        return time.perf_counter() - started
+
+    def warm_up(self) -> float:
+        """
+        先付掉冷啟動（回傳花的秒數）：
+        1. ping：啟動 WSL VM、venv Python 與常駐 bridge（direct 模式至少把 VM 叫醒）
+        2. 還不知道預設 distro 時，向 bridge 問一次（見 _learn_default_distro）
+        3. list_projects：第一次執行 daemon，載入它的 import，順便填好專案列表快取
+        """
+        started = time.perf_counter()
+        self.ping()
+        self._learn_default_distro()
+        self.list_projects()
+        return time.perf_counter() - started
+
+    def _learn_default_distro(self) -> None:
+        """
+        沒有設定 [backend] wsl_distro 時，向 bridge 問它所在的 distro（$WSL_DISTRO_NAME），
+        之後 WSL 內的路徑才能轉成 \\wsl$\<distro> 顯示。
+        只有沒指定 distro 的後端（跑在 WSL 的預設 distro 裡）能回答「預設 distro」是哪一個；
+        問不到就維持未知（路徑照原樣顯示 WSL 形式）。
+        """
+        if self.endpoint.distro or default_distro() is not None:
+            return
+        try:
+            distro = self._run_wsl_command(DISTRO_COMMAND)
+        except BackendError as e:
+            print(f"[Warning] 無法取得後端的 distro 名稱: {e}")
+            return
+        if isinstance(distro, str) and distro.strip():
+            set_default_distro(distro)
+
+    def keep_alive(self) -> bool:
+        """閒置超過 keepalive_interval 才送 ping（有其他指令在跑就不必）；回傳這次是否有送。"""
+        interval = self.warmup_settings.keepalive_interval
+        if interval <= 0 or time.monotonic() - self._last_request_at < interval:
+            return False
+        self.ping()
+        return True
+
+    # ---------------------------------------------------------
+    # 批次指令（一次往返執行多個指令）
+    # ---------------------------------------------------------
+
+    def batch(self) -> CommandBatch:
+        """建立一個批次收集器，搭配 with 使用（見 CommandBatch）。"""
+        return CommandBatch(self)
+
+    def run_batch(self, commands: List[Tuple[str, List[str]]]) -> List[BatchResult]:
+        """
+        執行一組 (指令, 參數) 並回傳每個子指令的結果。
+
+        - session 模式：整批只走一次往返（bridge 端依序執行）。
+        - direct 模式 / 連線起不來：整批交給一個 `wsl_bridge.py --once-batch` 行程（批次從 stdin 送入），
+          一樣只付一次 WSL 與直譯器啟動。
+        """
+        cleaned = [(cmd, [str(a).replace("\\", "/") for a in args]) for cmd, args in commands]
+        if not cleaned:
+            return []
 
-            if not output:
-                return []
+        if any(cmd in _MUTATING_COMMANDS for cmd, _ in cleaned):
+            self.invalidate_projects_cache()
+        self._last_request_at = time.monotonic()
 
-            # --- 策略 1: 直接解析 JSON ---
+        if self._session is not None and time.monotonic() >= self._session_retry_at:
+            started = time.perf_counter()
             try:
-                return json.loads(output)
-            except json.JSONDecodeError:
-                pass 
+                replies = self._session.request_batch(cleaned)
+            except SessionError as e:
+                if e.delivered:
+                    metrics.record_failure(
+                        "batch", self._metrics_transport(self.transport), e.kind,
+                        time.perf_counter() - started, str(e),
+                    )
+                    # 整批可能已部分執行，不能重送；每個子指令都回報同一個錯誤
+                    return [
+                        BatchResult(cmd=cmd, args=args, ok=False, error=f"WSL 執行失敗: {e}")
+                        for cmd, args in cleaned
+                    ]
+                print(f"[Warning] 常駐連線無法啟動，批次改用 direct 模式: {e}")
+                self._session_retry_at = time.monotonic() + SESSION_RETRY_COOLDOWN
+            else:
+                self._record_batch(self.transport, started, replies)
+                return self._batch_results(cleaned, replies)
+
+        # direct 模式 / 冷卻中：整批交給一個 bridge --once-batch 行程
+        started = time.perf_counter()
+        try:
+            replies = self._request_direct_batch(cleaned)
+        except BackendError as e:
+            metrics.record_failure(
+                "batch", self._metrics_transport(TRANSPORT_DIRECT), e.kind, time.perf_counter() - started, str(e)
+            )
+            return [BatchResult(cmd=cmd, args=args, ok=False, error=str(e)) for cmd, args in cleaned]
+        self._record_batch(TRANSPORT_DIRECT, started, replies)
+        return self._batch_results(cleaned, replies)
+
+    def _record_batch(self, transport: str, started: float, replies: List[Reply]) -> None:
+        """整批算一筆 "batch" 量測（後端時間 = 各子指令的 elapsed 總和）。"""
+        metrics.record(
+            "batch", self._metrics_transport(transport), time.perf_counter() - started,
+            sum(r.backend_seconds for r in replies), sum(r.parse_seconds for r in replies),
+            replies[0].cold,
+        )
 
-            # --- 策略 2: 嘗試從雜訊中提取 JSON ---
+    def _batch_results(self, cleaned: List[Tuple[str, List[str]]], replies: List[Reply]) -> List[BatchResult]:
+        """每個子指令的 Reply → BatchResult（結束碼非 0 的記成失敗，不影響其他子指令）。"""
+        results = []
+        for (cmd, args), reply in zip(cleaned, replies):
             try:
-                l_idx = output.find('[')
-                r_idx = output.rfind(']')
-                if l_idx != -1 and r_idx != -1 and r_idx > l_idx:
-                    return json.loads(output[l_idx : r_idx + 1])
-                
-                l_idx = output.find('{')
-                r_idx = output.rfind('}')
-                if l_idx != -1 and r_idx != -1 and r_idx > l_idx:
-                    return json.loads(output[l_idx : r_idx + 1])
-            except json.JSONDecodeError:
-                pass 
-
-            # --- 策略 3: 寬容放行 ---
-            if result.returncode == 0:
-                return "OK"
-
-            raise BackendError(f"資料解析失敗 (非 JSON 且無法識別為 OK): {output}")
-
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr.strip() or "未知錯誤"
-            raise BackendError(f"WSL 執行失敗: {error_msg}")
-        except Exception as e:
-            raise BackendError(f"系統錯誤: {e}")   
+                value = self._reply_result(reply)
+                results.append(BatchResult(cmd=cmd, args=args, ok=True, value=value))
+            except BackendError as err:
+                results.append(BatchResult(cmd=cmd, args=args, ok=False, error=str(err)))
+        return results
     # ---------------------------------------------------------
     # 讀取 projects.json
     # ---------------------------------------------------------
 
     # 這裡，我們用「def」來定義（define）載入 JSON 專案列表的函式。
     def _load_projects_json(self) -> None:
-        """從 json 檔載入專案列表，填入 _projects 與 _runtime。"""
+        """
+        從 json 檔載入專案列表，換掉 _projects。
+
+        只讀取專案的設定欄位；執行狀態（_runtime）一律來自後端，這裡不碰。
+        讀檔或解析失敗時拋出 OSError / ValueError，_projects 保持原樣。
+        """
         # 讀取（read_text）JSON 檔案的全部內容，並指定編碼（encoding="utf-8"）。
         text = self.json_path.read_text(encoding="utf-8")
         # 呼叫（call）json.loads 函式，把 JSON 格式的文字轉換成 Python 的列表或字典（raw_items）。
         raw_items = json.loads(text)
 
-        # 清空（clear）舊有的專案列表「空籃子」（_projects）。
-        self._projects.clear()
+        # 建立新的「空籃子」，全部讀完後才一次換掉 _projects（其他執行緒不會看到讀到一半的列表）。
+        projects: List[_RawProject] = []
 
         # # DEFENSE: 這裡用 DEFENSE 標籤標註，這是防呆檢查。
         # 用「if」來判斷：如果（if）讀進來的不是一個列表（list）...
         if not isinstance(raw_items, list):
-            # 就用「return」結束這個載入函式。
+            # 就當作沒有任何專案，用「return」結束這個載入函式。
+            self._projects = projects
             return
 
         # 我們用「for...in...」這個結構，來一個一個地（for）處理 JSON 列表中的每一個項目（item）。
@@ -291,14 +904,11 @@ class BackendAdapter:
                 output_file=list(map(str, output_file)),
                 target_files=list(map(str, target_files)),
             )
-            # 把新的 _RawProject 物件加入（append）到 _projects 列表（空籃子）中。
-            self._projects.append(proj)
+            # 把新的 _RawProject 物件加入（append）到新的列表（空籃子）中。
+            projects.append(proj)
 
-            # 給新專案預設 runtime 狀態
-            # 用「if」來判斷：如果（if）這個專案的 uuid 不在 runtime 盒子（_runtime）裡面...
-            if uuid not in self._runtime:
-                # 就建立一個預設的 _RuntimeState() 物件，並用 uuid 作為標籤（key）放進盒子。
-                self._runtime[uuid] = _RuntimeState()
+        # 一次換掉舊列表
+        self._projects = projects
 
 # ---------------------------------------------------------
     # 內部：把 _RawProject + _RuntimeState → ProjectInfo
@@ -321,6 +931,7 @@ class BackendAdapter:
             path=raw.path,
             output_file=list(raw.output_file),
             target_files=list(raw.target_files),
+            backend=self.name,
         )
 
     # ---------------------------------------------------------
@@ -329,19 +940,187 @@ class BackendAdapter:
 
 # ... (在 BackendAdapter 類別內)
 
-    def list_projects(self) -> List[ProjectInfo]:
+    def list_projects(self, force_refresh: bool = False) -> List[ProjectInfo]:
         """
         【真實化】呼叫 WSL 獲取專案列表，並轉換為 UI 格式。
+
+        - 結果會快取 projects_cache_ttl 秒，期間內的呼叫不再碰 WSL。
+        - force_refresh=True：略過快取，一定向後端重新讀取（並更新快取）。
+        - 回傳的是快取的淺拷貝，呼叫端增刪列表不會影響快取（ProjectInfo 本身請當唯讀）。
         """
+        if not force_refresh:
+            cached = self._cached_projects()
+            if cached is not None:
+                return cached
+            # 有設定 projects.json 路徑：檔案沒變、狀態也還新鮮時，只花一次 stat
+            direct = self._list_projects_from_json()
+            if direct is not None:
+                return direct
+
+        with self._projects_cache_lock:
+            generation = self._projects_cache_generation
+
         # 1. 呼叫 WSL 指令：list_projects
         # 這會執行：wsl python3 main.py list_projects
         raw_data = self._run_wsl_command("list_projects")
 
-        # 2. 清空舊快取
-        self._projects.clear()
-        self._runtime.clear() # 真實模式下，我們依賴後端狀態，這裡先清空
+        # 2. 轉換資料
+        projects = self._to_project_infos(raw_data, self.name)
+
+        # 3. 存入快取（讀取期間若有寫入指令讓快取失效，這份資料可能已過時，就不存）
+        with self._projects_cache_lock:
+            # 後端回報的執行狀態：直接讀檔時沿用（真實模式下狀態只相信後端）
+            fresh = generation == self._projects_cache_generation
+            if fresh:
+                self._remember_runtime(projects)
+            self._store_projects(projects, cacheable=fresh)
+
+        return list(projects)
+
+    def _store_projects(self, projects: List[ProjectInfo], cacheable: bool) -> None:
+        """更新路徑索引，可以的話存入快取（呼叫端需持有 _projects_cache_lock）。"""
+        # 路徑索引一律跟上最新讀到的列表（只套用差異）
+        self._path_index.update(projects)
+        if cacheable and self.projects_cache_ttl > 0:
+            self._projects_cache = projects
+            self._projects_cache_at = time.monotonic()
+
+    def _remember_runtime(self, projects: List[ProjectInfo]) -> None:
+        """記下後端回報的執行狀態（呼叫端需持有 _projects_cache_lock）。"""
+        self._runtime = {p.uuid: _RuntimeState(status=p.status, mode=p.mode) for p in projects}
+        self._runtime_at = time.monotonic()
+        self._runtime_stale = False
+
+    def _runtime_fresh(self) -> bool:
+        """後端回報的執行狀態是否還能沿用（呼叫端需持有 _projects_cache_lock）。"""
+        if self._runtime_stale:
+            return False
+        return self._status_push or time.monotonic() - self._runtime_at <= self.projects_status_ttl
+
+    def _list_projects_from_json(self) -> Optional[List[ProjectInfo]]:
+        """
+        直接讀 projects.json 的快速路徑（唯讀）。
+
+        - 檔案的 (mtime, size) 沒變就不重新解析，只有一次 stat
+        - 專案設定來自檔案，執行狀態沿用上次後端回報的（見 _runtime_fresh）
+        - 沒設定路徑、讀不到檔案、狀態過時、或檔案裡有後端沒回報過的專案 → 回傳 None（改問 WSL）
+        """
+        if self.json_path is None:
+            return None
+        try:
+            st = self.json_path.stat()
+        except OSError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+
+        with self._projects_cache_lock:
+            if not self._runtime_fresh():
+                return None
+            if signature != self._projects_json_signature:
+                try:
+                    self._load_projects_json()
+                except (OSError, ValueError) as e:
+                    print(f"[Adapter] 無法直接讀取 {self.json_path}，改問 WSL: {e}")
+                    self._projects_json_signature = None
+                    return None
+                self._projects_json_signature = signature
+
+            if any(raw.uuid not in self._runtime for raw in self._projects):
+                # 新專案的狀態只有後端知道
+                return None
+            projects = [self._to_project_info(raw) for raw in self._projects]
+            self._store_projects(projects, cacheable=True)
+
+        return list(projects)
+
+    def apply_project_status(self, proj: ProjectInfo) -> None:
+        """
+        套用後端推來的單一專案狀態（events 的 status 事件）：
+        更新直接讀檔用的執行狀態，並就地換掉快取列表與路徑索引中的這個專案
+        （快取仍然有效，不必因此再問一次 WSL；快取裡沒有的專案直接補上）。
+        """
+        with self._projects_cache_lock:
+            self._runtime[proj.uuid] = _RuntimeState(status=proj.status, mode=proj.mode)
+            cache = self._projects_cache
+            if cache is not None:
+                # 換成新的列表物件：先前回傳給呼叫端的拷貝不受影響
+                updated = [proj if p.uuid == proj.uuid else p for p in cache]
+                if not any(p.uuid == proj.uuid for p in cache):
+                    updated.append(proj)
+                self._projects_cache = updated
+            self._path_index.add(proj)
+            # 事件之前就送出的 list_projects 回來時可能已過時，不讓它蓋掉快取
+            self._projects_cache_generation += 1
+
+    def set_status_push(self, active: bool) -> None:
+        """事件串流連線 / 中斷時呼叫：連線中的狀態由事件維持，不會因時間過期。"""
+        with self._projects_cache_lock:
+            self._status_push = active
+
+    def _projects_cache_fresh(self) -> bool:
+        """快取是否仍有效（呼叫端需持有 _projects_cache_lock）。"""
+        return (
+            self._projects_cache is not None
+            and time.monotonic() - self._projects_cache_at <= self.projects_cache_ttl
+        )
+
+    def _cached_projects(self) -> Optional[List[ProjectInfo]]:
+        """快取仍有效時回傳其拷貝，否則回傳 None。"""
+        with self._projects_cache_lock:
+            if not self._projects_cache_fresh():
+                return None
+            return list(self._projects_cache)
 
-        # 3. 轉換資料
+    # ---------------------------------------------------------
+    # 路徑查詢（走 ProjectPathIndex，參數為 WSL 路徑）
+    # ---------------------------------------------------------
+
+    def _query_path_index(self, query: Callable[[ProjectPathIndex], Any]) -> Any:
+        """快取有效就直接查索引；過期或失效才先向後端讀一次列表（順便更新索引）。"""
+        with self._projects_cache_lock:
+            if self._projects_cache_fresh():
+                return query(self._path_index)
+        self.list_projects(force_refresh=True)
+        with self._projects_cache_lock:
+            return query(self._path_index)
+
+    def find_project_by_path(self, wsl_path: str) -> Optional[ProjectInfo]:
+        """路徑完全相同的已註冊專案（O(1)）。"""
+        return self._query_path_index(lambda index: index.lookup(wsl_path))
+
+    def find_project_containing(self, wsl_path: str) -> Optional[ProjectInfo]:
+        """此路徑位於哪個已註冊專案底下（最深的那個；不含路徑本身）。"""
+        return self._query_path_index(lambda index: index.find_containing(wsl_path))
+
+    def find_projects_within(self, wsl_path: str) -> List[ProjectInfo]:
+        """此路徑底下已經註冊了哪些專案（不含路徑本身）。"""
+        return self._query_path_index(lambda index: index.find_within(wsl_path))
+
+    def match_paths(
+        self, wsl_paths: List[str]
+    ) -> List[Tuple[Optional[ProjectInfo], Optional[ProjectInfo], List[ProjectInfo]]]:
+        """
+        一次比對多個路徑（多資料夾拖曳用）：列表最多只讀一次，索引只鎖一次。
+        每個路徑回傳（路徑完全相同的專案, 包含它的專案, 它底下的專案）。
+        """
+        return self._query_path_index(
+            lambda index: [(index.lookup(p), index.find_containing(p), index.find_within(p)) for p in wsl_paths]
+        )
+
+    def invalidate_projects_cache(self) -> None:
+        """讓專案列表快取失效（寫入指令會自動呼叫；外部改動後端資料時也可手動呼叫）。"""
+        with self._projects_cache_lock:
+            self._projects_cache = None
+            self._projects_cache_generation += 1
+            # 寫入指令可能改變執行狀態：下一次列表一定要問 WSL
+            self._runtime_stale = True
+
+    @staticmethod
+    def _to_project_infos(raw_data: Any, backend: str = "") -> List[ProjectInfo]:
+        """
+        把後端 list_projects 的回傳值轉成 UI 用的 ProjectInfo 列表（同步 / 非同步版共用）。
+        backend：標在每個專案上的後端名稱（項目本身帶 "backend" 欄位時以它為準）。
+        """
         if not isinstance(raw_data, list):
             return []
 
@@ -358,7 +1137,8 @@ class BackendAdapter:
             # 前端 ProjectStatus: "monitoring", "stopped"
             # 前端 ProjectMode: "silent", "interactive" (暫時依賴 muting 判斷)
             
-            ui_status: ProjectStatus = "monitoring" if status == "running" else "stopped"
+            # muting 是「監控中但暫時靜默」，仍算監控中（Tooltip 才數得到靜默中的專案）
+            ui_status: ProjectStatus = "monitoring" if status in ("running", "muting") else "stopped"
             ui_mode: ProjectMode = "silent" if status == "muting" else "interactive"
 
             # 建立 ProjectInfo 物件
@@ -369,7 +1149,8 @@ class BackendAdapter:
                 mode=ui_mode,
                 path=str(item.get("path", "")),
                 output_file=item.get("output_file", []),
-                target_files=item.get("target_files", [])
+                target_files=item.get("target_files", []),
+                backend=str(item.get("backend") or backend),
             )
             result_list.append(info)
             
@@ -386,11 +1167,12 @@ class BackendAdapter:
         1. 獲取當前真實狀態 (list_projects)
         2. 判斷要 Start 還是 Stop
         3. 發送指令
-        4. 回傳更新後的狀態
+        4. 等狀態真的翻轉（後端有回報新狀態就直接用；否則短間隔輪詢，逾時為止）
+        5. 回傳更新後的狀態（逾時則回傳最後觀察到的狀態）
         """
         # 1. 獲取最新狀態 (這是 Source of Truth)
-        # 我們直接呼叫自己的 list_projects，它會去問 WSL
-        current_list = self.list_projects()
+        # 要依目前狀態決定 start / stop，所以略過快取、一定去問 WSL
+        current_list = self.list_projects(force_refresh=True)
         
         # 2. 尋找目標專案 (優先匹配 UUID，兼容 Name)
         target = next((p for p in current_list if p.uuid == key), None)
@@ -404,29 +1186,112 @@ class BackendAdapter:
 
         # 3. 判斷意圖 & 發送指令
         # 根據我們在 list_projects 的定義：ui_status 為 "monitoring" 代表後端是 "running"
+        expected = self._toggled_status(target)
         try:
             if target.status == "monitoring":
                 # 當前是監控中 -> 執行停止
                 print(f"--- Adapter: Stopping sentry for {target.name} ({target.uuid}) ---")
-                self._run_wsl_command("stop_sentry", target.uuid)
+                reply = self._run_wsl_command("stop_sentry", target.uuid)
             else:
                 # 當前是停止/失效 -> 執行啟動
                 print(f"--- Adapter: Starting sentry for {target.name} ({target.uuid}) ---")
-                self._run_wsl_command("start_sentry", target.uuid)
+                reply = self._run_wsl_command("start_sentry", target.uuid)
         except BackendError as e:
             # 如果後端報錯 (例如路徑不存在)，我們印出錯誤但不崩潰，讓 UI 顯示舊狀態或錯誤
             print(f"Adapter Error: {e}")
             return None
 
-        # 4. 確認結果 (再撈一次，確保狀態已更新)
-        # 給後端一點點時間處理 PID 檔案 (0.5秒通常足夠)
-        import time
-        time.sleep(1.5)
-        
-        new_list = self.list_projects()
-        updated_target = next((p for p in new_list if p.uuid == target.uuid), None)
-        
-        return updated_target
+        # 4. 後端若直接回報了新狀態（ack），就不必再輪詢
+        acked = self._project_from_ack(reply, target)
+        if acked is not None and acked.status == expected:
+            return acked
+
+        # 5. 否則等狀態收斂（取代舊版固定 sleep 1.5 秒）
+        return self.wait_for_project_status(target.uuid, expected)
+
+    @staticmethod
+    def _toggled_status(target: ProjectInfo) -> ProjectStatus:
+        """切換後應該變成的狀態。"""
+        return "stopped" if target.status == "monitoring" else "monitoring"
+
+    @classmethod
+    def _project_from_ack(cls, reply: Any, target: ProjectInfo) -> Optional[ProjectInfo]:
+        """
+        解讀 start/stop_sentry 的回覆：
+        若後端回傳了帶 status 的專案物件（dict），就把它當成新狀態的確認；
+        目前的 daemon 只印訊息（解析成 "OK"），此時回傳 None，改走輪詢。
+        """
+        if not isinstance(reply, dict) or "status" not in reply:
+            return None
+        if str(reply.get("uuid", target.uuid)) != target.uuid:
+            return None
+        merged = {
+            "uuid": target.uuid,
+            "name": target.name,
+            "path": target.path,
+            "output_file": target.output_file,
+            "target_files": target.target_files,
+            **reply,
+        }
+        infos = cls._to_project_infos([merged], target.backend)
+        return infos[0] if infos else None
+
+    def wait_for_project_status(
+        self,
+        uuid: str,
+        expected: ProjectStatus,
+        timeout: float = TOGGLE_CONVERGE_TIMEOUT,
+    ) -> Optional[ProjectInfo]:
+        """
+        輪詢單一專案，直到狀態變成 expected 或逾時。
+
+        - 間隔從 TOGGLE_POLL_INITIAL 開始倍增，上限 TOGGLE_POLL_MAX（狀態通常很快翻轉，不必固定等 1.5 秒）。
+        - 成功：立刻回傳新狀態。
+        - 逾時 / 專案消失：回傳最後一次觀察到的結果（可能仍是舊狀態，或 None）。
+        """
+        latest, _projects = self.wait_for_project_statuses({uuid: expected}, timeout)
+        return latest.get(uuid)
+
+    def wait_for_project_statuses(
+        self,
+        expected: Dict[str, ProjectStatus],
+        timeout: float = TOGGLE_CONVERGE_TIMEOUT,
+        cancel: Optional[threading.Event] = None,
+    ) -> Tuple[Dict[str, Optional[ProjectInfo]], Optional[List[ProjectInfo]]]:
+        """
+        一次輪詢多個專案（每輪只讀一次列表），直到每個都變成 expected[uuid]、消失，或逾時 / 取消。
+
+        回傳（uuid → 最後觀察到的專案（消失為 None；從未讀到也是 None）, 最後一次讀到的完整列表）。
+        """
+        deadline = time.monotonic() + timeout
+        delay = TOGGLE_POLL_INITIAL
+        latest: Dict[str, Optional[ProjectInfo]] = {uuid: None for uuid in expected}
+        pending = set(expected)
+        projects: Optional[List[ProjectInfo]] = None
+
+        while pending and not (cancel is not None and cancel.is_set()):
+            # 先等一小段再問：指令剛回來時，PID 檔案多半還沒寫完
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, TOGGLE_POLL_MAX)
+
+            try:
+                projects = self.list_projects(force_refresh=True)
+            except BackendError as e:
+                print(f"Adapter: 輪詢 {len(pending)} 個專案狀態失敗（將重試）: {e}")
+                continue
+
+            by_uuid = {p.uuid: p for p in projects}
+            for uuid in list(pending):
+                latest[uuid] = by_uuid.get(uuid)
+                if latest[uuid] is None or latest[uuid].status == expected[uuid]:
+                    pending.discard(uuid)
+
+        for uuid in pending:
+            print(f"Adapter: 等待 {uuid} 切換為 {expected[uuid]} 逾時（>{timeout:g}s）")
+        return latest, projects
 
     # 這裡，我們用「def」來定義（define）獲取忽略設定的函式。
     def get_ignore_settings(self) -> IgnoreSettings:
@@ -434,11 +1299,9 @@ class BackendAdapter:
         return self._ignore_settings
     
 
-    def add_project(self, name: str, path: str, output_file: str) -> None:
-        """
-        【真實化】呼叫 WSL daemon 新增專案。
-        - 對應後端指令: add_project <name> <path> <output_file>
-        """
+    @staticmethod
+    def _validate_new_project(name: str, path: str, output_file: str) -> Tuple[str, str, str]:
+        """新增專案前的參數檢查（單筆與批次共用），回傳清理過的 (name, path, output_file)。"""
         name = (name or "").strip()
         path = (path or "").strip()
         output_file = (output_file or "").strip()
@@ -470,6 +1333,15 @@ class BackendAdapter:
                 raise e
             print(f"[Warning] Path safety check failed: {e}")   
 
+        return name, path, output_file
+
+    def add_project(self, name: str, path: str, output_file: str) -> None:
+        """
+        【真實化】呼叫 WSL daemon 新增專案。
+        - 對應後端指令: add_project <name> <path> <output_file>
+        """
+        name, path, output_file = self._validate_new_project(name, path, output_file)
+
         # 呼叫通用通訊函式
         # 如果後端驗證失敗 (如路徑不存在、重名)，會拋出例外，被 UI 捕獲顯示紅字
         self._run_wsl_command("add_project", name, path, output_file)
@@ -493,7 +1365,7 @@ class BackendAdapter:
             raise BackendError("編輯失敗：UUID、欄位名稱或新值不得為空。")
         
         # 呼叫通用通訊函式
-        code, output = self._run_wsl_command("edit_project", uuid, field, new_value)
+        self._run_wsl_command("edit_project", uuid, field, new_value)
 
         # 這裡，我們用「def」來定義（define）追加目標的函式。
     def add_target(self, uuid: str, new_target: str) -> None:
@@ -516,15 +1388,30 @@ class BackendAdapter:
             raise BackendError("更新失敗：UUID 為空。")
         self._run_wsl_command("manual_update", uuid)
 
+    def start_project(self, uuid: str) -> None:
+        """只送出 start_sentry（不等狀態翻轉；批次操作最後再用 wait_for_project_statuses 一起等）。"""
+        if not uuid:
+            raise BackendError("啟動失敗：UUID 為空。")
+        self._run_wsl_command("start_sentry", uuid)
+
+    def stop_project(self, uuid: str) -> None:
+        """只送出 stop_sentry（不等狀態翻轉）。"""
+        if not uuid:
+            raise BackendError("停止失敗：UUID 為空。")
+        self._run_wsl_command("stop_sentry", uuid)
+
 
     # 這裡，我們用「def」來定義（define）獲取忽略候選名單的函式。
-    def get_ignore_candidates(self, uuid: str) -> List[str]:
-        """呼叫 WSL 獲取忽略規則候選名單（含現有規則 + 目錄）。"""
+    def get_ignore_candidates(self, uuid: str, on_chunk: Optional[ChunkCallback] = None) -> List[str]:
+        """
+        呼叫 WSL 獲取忽略規則候選名單（含現有規則 + 目錄）。
+        on_chunk：名單很長時會分段到達，每段先回呼一次（回傳值仍是完整名單）。
+        """
         if not uuid:
             return []
         
         # 呼叫後端指令：list_ignore_candidates <uuid>
-        result = self._run_wsl_command("list_ignore_candidates", uuid)
+        result = self._run_wsl_command("list_ignore_candidates", uuid, on_chunk=on_chunk)
         
         if isinstance(result, list):
             return [str(x) for x in result]
@@ -553,18 +1440,66 @@ class BackendAdapter:
         self._run_wsl_command("update_ignore_patterns", uuid, *patterns)
 
         # 這裡，我們用「def」來定義（define）獲取日誌內容的函式。
-    def get_log_content(self, uuid: str) -> List[str]:
-        """呼叫 WSL 獲取指定專案的日誌內容。"""
+    def get_log_content(self, uuid: str, on_chunk: Optional[ChunkCallback] = None) -> List[str]:
+        """
+        呼叫 WSL 獲取指定專案的日誌內容。
+        on_chunk：大型日誌會分段到達，每段先回呼一次（回傳值仍是完整內容）。
+        """
         if not uuid:
             return []
         
         # 呼叫後端指令：get_log <uuid>
-        result = self._run_wsl_command("get_log", uuid)
+        result = self._run_wsl_command("get_log", uuid, on_chunk=on_chunk)
         
         if isinstance(result, list):
             return [str(x) for x in result]
         return []
     
+    def get_log_tail(
+        self,
+        uuid: str,
+        cursor: Optional[str] = None,
+        limit: int = LOG_TAIL_INITIAL_LINES,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> LogTail:
+        """
+        增量讀取日誌：只回傳 cursor 之後新增的行，並附上新的 cursor。
+
+        - cursor=None：第一次讀，回傳最後 limit 行（reset=True）
+        - 日誌被輪替 / 截斷時自動偵測，回傳 reset=True 與最新的最後 limit 行
+        - 切行在 WSL 端（bridge）完成，session / direct 兩種模式都只有新行經過管線
+        - on_chunk：新行很多時會分段到達，每段先回呼一次（LogTail.lines 仍是全部）
+        """
+        if not uuid:
+            return LogTail(lines=[], cursor="", reset=True)
+
+        after, anchor = self._parse_log_cursor(cursor)
+        payload = self._run_wsl_command(TAIL_LOG_COMMAND, uuid, str(after), anchor, str(limit), on_chunk=on_chunk)
+        return self._to_log_tail(payload)
+
+    @staticmethod
+    def _to_log_tail(payload: list | dict | str) -> LogTail:
+        """bridge 的 __tail_log__ 回傳值 → LogTail。"""
+        if not isinstance(payload, dict):
+            raise BackendError(f"日誌增量讀取回傳格式錯誤: {payload!r}")
+
+        return LogTail(
+            lines=[str(x) for x in payload.get("lines") or []],
+            cursor=f"{int(payload.get('total') or 0)}:{payload.get('anchor') or ''}",
+            reset=bool(payload.get("reset")),
+        )
+
+    @staticmethod
+    def _parse_log_cursor(cursor: Optional[str]) -> Tuple[int, str]:
+        """"120:ab12cd..." → (120, "ab12cd...")；空值或格式錯誤一律視為從頭讀。"""
+        if not cursor:
+            return 0, ""
+        count, _, anchor = cursor.partition(":")
+        try:
+            return max(0, int(count)), anchor
+        except ValueError:
+            return 0, ""
+
     # [Task 9.4] 審計功能：獲取靜默路徑
     def get_muted_paths(self, uuid: str) -> List[str]:
         """呼叫 WSL 獲取該專案目前被靜默的路徑列表。"""
@@ -588,18 +1523,518 @@ class BackendAdapter:
         # (注意：後端指令叫 add_ignore_patterns，但我們 UI 語意叫 solidify)
         self._run_wsl_command("add_ignore_patterns", uuid)
 
+# ============================
+#  多後端（多個 distro / checkout）
+# ============================
+
+# 這裡，我們用「@dataclass」標記（mark）這是單一後端健康狀況的資料類別。
+@dataclass
+class BackendHealth:
+    """
+    多後端模式下，一個後端最近一次讀取專案列表的結果（backend_health() 回傳）。
+
+    - ok=False：讀取失敗（error 是原因），它的專案暫時不在合併列表裡
+    - pending=True：超過 backend_timeout 還沒回來，合併列表先沿用它上次的結果
+    - latency：最近一次成功讀取花的秒數；projects：當時的專案數
+    """
+    name: str
+    distro: str = ""
+    ok: bool = True
+    pending: bool = False
+    error: str = ""
+    latency: float = 0.0
+    projects: int = 0
+
+
+# 這裡，我們用「class」來定義（define）同時管理多個後端的 Adapter。
+class MultiBackendAdapter:
+    """
+    同時管理多個後端（sentry_config.ini 的 [backend:<name>] 區段），對 UI 提供和 BackendAdapter 相同的介面。
+
+    - list_projects：同時向每個後端讀取，合併成一份列表（ProjectInfo.backend 標明來源，順序同設定檔）。
+      每個後端有自己的單執行緒佇列，慢的後端只會卡住自己；超過 list_timeout 還沒回來的，
+      先沿用它上次的列表（讀取仍在背景進行，下一次刷新就拿得到）。
+    - 失敗互不影響：某個後端讀不到時只略過它的專案（原因記在 backend_health()）；全部失敗才拋出 BackendError。
+    - 以 uuid 為參數的指令送到擁有該專案的後端（uuid → 後端 的對照表在每次讀到列表時更新）。
+    - add_project 依路徑決定後端：\\\\wsl$\\<distro>\\... 送到該 distro 的後端，其他路徑送到第一個後端。
+    - 延遲統計依後端分開記錄（通訊模式標成 session@<name>，見 BackendAdapter._metrics_transport）。
+    """
+
+    def __init__(self, backends: List[BackendAdapter], list_timeout: float = DEFAULT_BACKEND_TIMEOUT) -> None:
+        if not backends:
+            raise ValueError("MultiBackendAdapter 至少需要一個後端")
+        self.backends: Dict[str, BackendAdapter] = {backend.name: backend for backend in backends}
+        # 第一個後端：新專案的預設去處，也負責不屬於任何專案的指令
+        self.default = backends[0]
+        self.list_timeout = list_timeout
+        self.transport = TRANSPORT_MULTI
+        self.warmup_settings = self.default.warmup_settings
+
+        self._lock = threading.Lock()
+        # 每個後端各一條單執行緒佇列（慢的後端只會卡住自己的佇列）
+        self._queues: Dict[str, ThreadPoolExecutor] = {
+            name: ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"backend-{name}") for name in self.backends
+        }
+        # 進行中的列表讀取，以 (後端名稱, force_refresh) 區分（逾時的後端下次刷新時不重複排隊）
+        self._inflight: Dict[Tuple[str, bool], Future] = {}
+        # 每個後端最後一次讀到的列表（逾時時沿用；讀取失敗時清掉）
+        self._last: Dict[str, List[ProjectInfo]] = {}
+        # uuid → 後端名稱
+        self._owner: Dict[str, str] = {}
+        self._health: Dict[str, BackendHealth] = {
+            name: BackendHealth(name=name, distro=backend.endpoint.distro) for name, backend in self.backends.items()
+        }
+
+    def close(self) -> None:
+        """關閉每個後端的常駐連線與佇列。"""
+        for backend in self.backends.values():
+            backend.close()
+        for queue in self._queues.values():
+            queue.shutdown(wait=False)
+
+    # ---------------------------------------------------------
+    # 專案列表（同時讀取、逾時沿用、失敗隔離）
+    # ---------------------------------------------------------
+
+    def list_projects(self, force_refresh: bool = False) -> List[ProjectInfo]:
+        """
+        合併所有後端的專案列表（順序同設定檔）。
+
+        - 每個後端最多等 list_timeout 秒；來不及的沿用上次的列表（health.pending=True）。
+          還沒有任何一個後端讀到過列表時（例如剛啟動），至少等到第一個後端回來。
+        - 讀取失敗的後端不列出（health.ok=False）；所有後端都失敗時拋出 BackendError。
+        - 進行中的讀取可以共用：一般讀取可以搭上強制刷新（資料只會更新），
+          強制刷新只搭強制刷新（一般讀取可能只回快取）。
+        """
+        futures: Dict[str, Future] = {}
+        with self._lock:
+            for name, backend in self.backends.items():
+                future = self._inflight.get((name, True))
+                if not force_refresh and (future is None or future.done()):
+                    future = self._inflight.get((name, False))
+                if future is None or future.done():
+                    future = self._queues[name].submit(self._list_one, name, backend, force_refresh)
+                    self._inflight[(name, force_refresh)] = future
+                futures[name] = future
+
+        _done, pending = wait(futures.values(), timeout=self.list_timeout)
+        if pending:
+            with self._lock:
+                have_any = any(name in self._last for name in futures)
+            if not have_any:
+                wait(pending, return_when=FIRST_COMPLETED)
+
+        merged: List[ProjectInfo] = []
+        errors: List[str] = []
+        with self._lock:
+            for name, future in futures.items():
+                health = self._health[name]
+                health.pending = not future.done()
+                if health.pending:
+                    print(f"[Adapter] 後端 {name} 超過 {self.list_timeout:g}s 未回應，先沿用上次的列表")
+                if not health.ok:
+                    errors.append(f"{name}: {health.error}")
+                    continue
+                merged.extend(self._last.get(name, []))
+        if len(errors) == len(futures):
+            raise BackendError("所有後端都無法讀取專案列表：" + "；".join(errors))
+        return merged
+
+    def _list_one(self, name: str, backend: BackendAdapter, force_refresh: bool) -> None:
+        """[後端佇列] 讀取一個後端的列表，記下結果與健康狀況（錯誤不往外拋）。"""
+        started = time.perf_counter()
+        try:
+            projects = backend.list_projects(force_refresh=force_refresh)
+        except BackendError as e:
+            print(f"[Adapter] 後端 {name} 讀取專案列表失敗: {e}")
+            with self._lock:
+                health = self._health[name]
+                health.ok = False
+                health.error = str(e)
+                self._last.pop(name, None)
+            return
+        with self._lock:
+            self._remember(name, projects)
+            health = self._health[name]
+            health.latency = time.perf_counter() - started
+
+    def _remember(self, name: str, projects: List[ProjectInfo]) -> None:
+        """記下某個後端最新的列表與 uuid 對照（呼叫端需持有 _lock）。"""
+        self._last[name] = projects
+        for proj in projects:
+            self._owner[proj.uuid] = name
+        health = self._health[name]
+        health.ok = True
+        health.error = ""
+        health.projects = len(projects)
+
+    def backend_health(self) -> List[BackendHealth]:
+        """每個後端的健康狀況（拷貝，順序同設定檔）。"""
+        with self._lock:
+            return [replace(health) for health in self._health.values()]
+
+    def invalidate_projects_cache(self) -> None:
+        for backend in self.backends.values():
+            backend.invalidate_projects_cache()
+
+    def set_status_push(self, active: bool) -> None:
+        for backend in self.backends.values():
+            backend.set_status_push(active)
+
+    def apply_project_status(self, proj: ProjectInfo) -> None:
+        """事件帶有後端名稱時直接交給它；沒有時依 uuid 找。"""
+        backend = self.backends.get(proj.backend) or self._backend_of(proj.uuid)
+        backend.apply_project_status(proj)
+
+    # ---------------------------------------------------------
+    # 指令路由
+    # ---------------------------------------------------------
+
+    def _owner_of(self, key: str) -> Optional[str]:
+        """uuid（或名稱，舊 UI 的相容行為）→ 後端名稱（呼叫端需持有 _lock）。"""
+        name = self._owner.get(key)
+        if name is None:
+            name = next((n for n, projects in self._last.items() for p in projects if p.name == key), None)
+        return name
+
+    def _backend_of(self, key: str) -> BackendAdapter:
+        """擁有這個專案的後端；對照表沒有時先重讀一次列表，仍找不到就交給第一個後端（由它回報錯誤）。"""
+        with self._lock:
+            name = self._owner_of(key)
+        if name is None and key:
+            try:
+                self.list_projects(force_refresh=True)
+            except BackendError:
+                pass
+            with self._lock:
+                name = self._owner_of(key)
+        return self.backends.get(name, self.default) if name else self.default
+
+    def _backends_for_path(self, path: str) -> List[BackendAdapter]:
+        """
+        可能擁有這個路徑的後端：\\\\wsl$\\<distro> 路徑只看該 distro 的後端
+        （沒有對應的就看沒指定 distro 的後端）；磁碟機 / WSL 路徑每個後端都可能有。
+        """
+        distro = split_wsl(path)[1]
+        if distro is None:
+            return list(self.backends.values())
+        matched = [b for b in self.backends.values() if b.endpoint.distro.lower() == distro.lower()]
+        return matched or [b for b in self.backends.values() if not b.endpoint.distro]
+
+    def _backend_for_path(self, path: str) -> BackendAdapter:
+        """新專案要送到哪個後端：UNC 路徑看 distro，其他路徑送到第一個後端。"""
+        if split_wsl(path)[1] is None:
+            return self.default
+        return next(iter(self._backends_for_path(path)), self.default)
+
+    def backend_for_command(self, cmd: str, args: List[str]) -> BackendAdapter:
+        """一個後端指令該送到哪個後端（批次與 async 版共用）。"""
+        if cmd == "add_project" and len(args) >= 2:
+            return self._backend_for_path(args[1])
+        if cmd == "list_projects" or not args:
+            return self.default
+        return self._backend_of(args[0])
+
+    # ---------------------------------------------------------
+    # 暖機與保活（每個後端各自進行，失敗互不影響）
+    # ---------------------------------------------------------
+
+    def _fan_out(self, label: str, call: Callable[[BackendAdapter], Any]) -> Dict[str, Any]:
+        """在每個後端的佇列上同時執行 call，回傳成功的 {name: 結果}；全部失敗才拋出 BackendError。"""
+        futures = {name: self._queues[name].submit(call, backend) for name, backend in self.backends.items()}
+        results: Dict[str, Any] = {}
+        errors: List[str] = []
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except BackendError as e:
+                print(f"[Adapter] 後端 {name} {label}失敗: {e}")
+                errors.append(f"{name}: {e}")
+        if errors and not results:
+            raise BackendError(f"所有後端{label}失敗：" + "；".join(errors))
+        return results
+
+    def warm_up(self) -> float:
+        started = time.perf_counter()
+        self._fan_out("暖機", lambda backend: backend.warm_up())
+        return time.perf_counter() - started
+
+    def keep_alive(self) -> bool:
+        return any(self._fan_out("保活", lambda backend: backend.keep_alive()).values())
+
+    # ---------------------------------------------------------
+    # 批次與狀態等待
+    # ---------------------------------------------------------
+
+    def batch(self) -> CommandBatch:
+        return CommandBatch(self)
+
+    def run_batch(self, commands: List[Tuple[str, List[str]]]) -> List[BatchResult]:
+        """依後端分組，各組同時送出（每組仍是一次往返），結果按原本的順序回傳。"""
+        groups: Dict[str, List[int]] = {}
+        for index, (cmd, args) in enumerate(commands):
+            groups.setdefault(self.backend_for_command(cmd, list(args)).name, []).append(index)
+
+        futures = {
+            name: self._queues[name].submit(self.backends[name].run_batch, [commands[i] for i in indexes])
+            for name, indexes in groups.items()
+        }
+        results: List[Optional[BatchResult]] = [None] * len(commands)
+        for name, future in futures.items():
+            for index, result in zip(groups[name], future.result()):
+                results[index] = result
+        return results
+
+    def wait_for_project_statuses(
+        self,
+        expected: Dict[str, ProjectStatus],
+        timeout: float = TOGGLE_CONVERGE_TIMEOUT,
+        cancel: Optional[threading.Event] = None,
+    ) -> Tuple[Dict[str, Optional[ProjectInfo]], Optional[List[ProjectInfo]]]:
+        """
+        依後端分組同時輪詢（規則同 BackendAdapter.wait_for_project_statuses）。
+        只有每個後端都輪詢到列表時才回傳合併列表，否則回傳 None（呼叫端會自己重讀）。
+        """
+        groups: Dict[str, Dict[str, ProjectStatus]] = {}
+        for uuid, status in expected.items():
+            groups.setdefault(self._backend_of(uuid).name, {})[uuid] = status
+
+        latest: Dict[str, Optional[ProjectInfo]] = {}
+        lists: Dict[str, Optional[List[ProjectInfo]]] = {}
+        # 不用後端佇列：等待最多 timeout 秒，不能卡住同一個後端的列表刷新
+        with ThreadPoolExecutor(max_workers=max(1, len(groups)), thread_name_prefix="backend-wait") as pool:
+            futures = {
+                name: pool.submit(self.backends[name].wait_for_project_statuses, group, timeout, cancel)
+                for name, group in groups.items()
+            }
+            for name, future in futures.items():
+                group_latest, lists[name] = future.result()
+                latest.update(group_latest)
+
+        with self._lock:
+            for name, projects in lists.items():
+                if projects is not None:
+                    self._remember(name, projects)
+        if any(lists.get(name) is None for name in self.backends):
+            return latest, None
+        return latest, [p for name in self.backends for p in lists[name]]
+
+    def wait_for_project_status(
+        self, uuid: str, expected: ProjectStatus, timeout: float = TOGGLE_CONVERGE_TIMEOUT
+    ) -> Optional[ProjectInfo]:
+        return self._backend_of(uuid).wait_for_project_status(uuid, expected, timeout)
+
+    # ---------------------------------------------------------
+    # 路徑查詢（參數為 WSL 路徑；各後端同時查、結果合併）
+    # ---------------------------------------------------------
+
+    def match_paths(
+        self, wsl_paths: List[str]
+    ) -> List[Tuple[Optional[ProjectInfo], Optional[ProjectInfo], List[ProjectInfo]]]:
+        """
+        每個路徑只問可能擁有它的後端，各後端同時查；超過 list_timeout 或失敗的後端略過。
+        合併規則：完全相同的專案取第一個、包含它的專案取最深的、底下的專案全部列出。
+        """
+        wanted: Dict[str, List[int]] = {}
+        for index, path in enumerate(wsl_paths):
+            for backend in self._backends_for_path(path):
+                wanted.setdefault(backend.name, []).append(index)
+
+        futures = {
+            name: self._queues[name].submit(self.backends[name].match_paths, [wsl_paths[i] for i in indexes])
+            for name, indexes in wanted.items()
+        }
+        done, _pending = wait(futures.values(), timeout=self.list_timeout)
+
+        found: List[List[Tuple[Optional[ProjectInfo], Optional[ProjectInfo], List[ProjectInfo]]]] = [
+            [] for _ in wsl_paths
+        ]
+        errors: List[str] = []
+        for name, future in futures.items():
+            if future not in done:
+                print(f"[Adapter] 後端 {name} 超過 {self.list_timeout:g}s 未回應，路徑比對略過它")
+                errors.append(f"{name}: 逾時")
+                continue
+            try:
+                results = future.result()
+            except BackendError as e:
+                print(f"[Adapter] 後端 {name} 路徑比對失敗: {e}")
+                errors.append(f"{name}: {e}")
+                continue
+            for index, result in zip(wanted[name], results):
+                found[index].append(result)
+        if futures and len(errors) == len(futures):
+            raise BackendError("所有後端都無法比對路徑：" + "；".join(errors))
+        return [self._merge_matches(results) for results in found]
+
+    @staticmethod
+    def _merge_matches(
+        results: List[Tuple[Optional[ProjectInfo], Optional[ProjectInfo], List[ProjectInfo]]]
+    ) -> Tuple[Optional[ProjectInfo], Optional[ProjectInfo], List[ProjectInfo]]:
+        exact = next((e for e, _c, _w in results if e is not None), None)
+        containing = max(
+            (c for _e, c, _w in results if c is not None), key=lambda p: len(to_wsl(p.path)), default=None
+        )
+        within = sorted((p for _e, _c, w in results for p in w), key=lambda p: to_wsl(p.path))
+        return exact, containing, within
+
+    def find_project_by_path(self, wsl_path: str) -> Optional[ProjectInfo]:
+        return self.match_paths([wsl_path])[0][0]
+
+    def find_project_containing(self, wsl_path: str) -> Optional[ProjectInfo]:
+        return self.match_paths([wsl_path])[0][1]
+
+    def find_projects_within(self, wsl_path: str) -> List[ProjectInfo]:
+        return self.match_paths([wsl_path])[0][2]
+
+    # ---------------------------------------------------------
+    # 轉送到擁有專案的後端
+    # ---------------------------------------------------------
+
+    def get_ignore_settings(self) -> IgnoreSettings:
+        return self.default.get_ignore_settings()
+
+    def toggle_project_status(self, key: str) -> Optional[ProjectInfo]:
+        return self._backend_of(key).toggle_project_status(key)
+
+    def add_project(self, name: str, path: str, output_file: str) -> None:
+        self._backend_for_path(path).add_project(name, path, output_file)
+
+    def delete_project(self, uuid: str) -> None:
+        self._backend_of(uuid).delete_project(uuid)
+
+    def edit_project(self, uuid: str, field: str, new_value: str) -> None:
+        self._backend_of(uuid).edit_project(uuid, field, new_value)
+
+    def add_target(self, uuid: str, new_target: str) -> None:
+        self._backend_of(uuid).add_target(uuid, new_target)
+
+    def remove_target(self, uuid: str, target_to_remove: str) -> None:
+        self._backend_of(uuid).remove_target(uuid, target_to_remove)
+
+    def trigger_manual_update(self, uuid: str) -> None:
+        self._backend_of(uuid).trigger_manual_update(uuid)
+
+    def start_project(self, uuid: str) -> None:
+        self._backend_of(uuid).start_project(uuid)
+
+    def stop_project(self, uuid: str) -> None:
+        self._backend_of(uuid).stop_project(uuid)
+
+    def get_ignore_candidates(self, uuid: str, on_chunk: Optional[ChunkCallback] = None) -> List[str]:
+        return self._backend_of(uuid).get_ignore_candidates(uuid, on_chunk=on_chunk)
+
+    def get_current_ignore_patterns(self, uuid: str) -> List[str]:
+        return self._backend_of(uuid).get_current_ignore_patterns(uuid)
+
+    def update_ignore_patterns(self, uuid: str, patterns: List[str]) -> None:
+        self._backend_of(uuid).update_ignore_patterns(uuid, patterns)
+
+    def get_log_content(self, uuid: str, on_chunk: Optional[ChunkCallback] = None) -> List[str]:
+        return self._backend_of(uuid).get_log_content(uuid, on_chunk=on_chunk)
+
+    def get_log_tail(
+        self,
+        uuid: str,
+        cursor: Optional[str] = None,
+        limit: int = LOG_TAIL_INITIAL_LINES,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> LogTail:
+        return self._backend_of(uuid).get_log_tail(uuid, cursor, limit, on_chunk=on_chunk)
+
+    def get_muted_paths(self, uuid: str) -> List[str]:
+        return self._backend_of(uuid).get_muted_paths(uuid)
+
+    def solidify_ignore_patterns(self, uuid: str) -> None:
+        self._backend_of(uuid).solidify_ignore_patterns(uuid)
+
 # ============================
 #  模組層：給 tray_app 使用的單例介面
 # ============================
 
 # 單例 adapter（懶載入）
 # 建立一個叫 _adapter_singleton 的變數，預設是空的（Optional[BackendAdapter] = None）。
-# 之後整個應用程式只會建立這一個 Adapter 物件。
-_adapter_singleton: Optional[BackendAdapter] = None
+# 之後整個應用程式只會建立這一個 Adapter 物件（多後端時是 MultiBackendAdapter）。
+_adapter_singleton: Optional[BackendAdapter | MultiBackendAdapter] = None
+
+
+# 這裡，我們用「def」來定義（define）把 [backend] 設定轉成 BackendAdapter 參數的函式。
+def _adapter_options(config: Dict[str, str]) -> Dict[str, Any]:
+    """[backend]（或 [backend:<name>]）的設定值 → BackendAdapter 的參數；格式錯誤時印出警告並用預設值。"""
+    # BackendAdapter 預設是「指令發送器」，不是「檔案讀取器」。
+    # 只有明確設定 projects_json（例如 \\wsl$ 路徑或本機掛載點）時，專案列表才直接讀檔（唯讀）；
+    # 執行狀態與所有寫入仍然走 WSL 指令。
+    json_path = config.get("projects_json", "").strip() or None
+    transport = config.get("transport", TRANSPORT_SESSION).strip().lower()
+    # 有設定 SENTRY_FAKE_BACKEND 時一律用假後端（測試 / 效能量測不必改設定檔）
+    if os.environ.get(FAKE_BACKEND_ENV):
+        transport = TRANSPORT_FAKE
+    if transport not in (TRANSPORT_SESSION, TRANSPORT_DIRECT, TRANSPORT_FAKE):
+        print(f"[Warning] 未知的 transport 設定 '{transport}'，改用 {TRANSPORT_SESSION}")
+        transport = TRANSPORT_SESSION
+
+    try:
+        cache_ttl = max(0.0, float(config.get("projects_cache_ttl", DEFAULT_PROJECTS_CACHE_TTL)))
+    except ValueError:
+        print(f"[Warning] projects_cache_ttl 必須是秒數，改用預設 {DEFAULT_PROJECTS_CACHE_TTL}")
+        cache_ttl = DEFAULT_PROJECTS_CACHE_TTL
+
+    try:
+        status_ttl = max(0.0, float(config.get("projects_status_ttl", DEFAULT_PROJECTS_STATUS_TTL)))
+    except ValueError:
+        print(f"[Warning] projects_status_ttl 必須是秒數，改用預設 {DEFAULT_PROJECTS_STATUS_TTL}")
+        status_ttl = DEFAULT_PROJECTS_STATUS_TTL
+
+    warmup = config.get("warmup", "").strip().lower()
+    if not warmup:
+        warmup_enabled = DEFAULT_BACKEND_WARMUP
+    elif warmup in ("1", "on", "true", "yes"):
+        warmup_enabled = True
+    elif warmup in ("0", "off", "false", "no"):
+        warmup_enabled = False
+    else:
+        print(f"[Warning] warmup 必須是 on / off，改用預設 {'on' if DEFAULT_BACKEND_WARMUP else 'off'}")
+        warmup_enabled = DEFAULT_BACKEND_WARMUP
+
+    try:
+        keepalive = max(0.0, float(config.get("keepalive_interval", DEFAULT_KEEPALIVE_INTERVAL)))
+    except ValueError:
+        print(f"[Warning] keepalive_interval 必須是秒數，改用預設 {DEFAULT_KEEPALIVE_INTERVAL:g}")
+        keepalive = DEFAULT_KEEPALIVE_INTERVAL
+
+    try:
+        request_timeout = max(0.0, float(config.get("request_timeout", DEFAULT_REQUEST_TIMEOUT)))
+    except ValueError:
+        print(f"[Warning] request_timeout 必須是秒數，改用預設 {DEFAULT_REQUEST_TIMEOUT:g}")
+        request_timeout = DEFAULT_REQUEST_TIMEOUT
+
+    return dict(
+        json_path=json_path,
+        transport=transport,
+        projects_cache_ttl=cache_ttl,
+        projects_status_ttl=status_ttl,
+        warmup=warmup_enabled,
+        keepalive_interval=keepalive,
+        request_timeout=request_timeout,
+    )
+
+
+# 這裡，我們用「def」來定義（define）把 [backend:<name>] 區段轉成後端位置的函式。
+def _endpoint_from_section(name: str, section: Dict[str, str]) -> BackendEndpoint:
+    """[backend:<name>] 的 distro / project_root / python / main_script；沒寫的沿用 WSL_* 常數。"""
+    root = section.get("project_root", "").strip() or WSL_PROJECT_ROOT
+    return BackendEndpoint(
+        name=name,
+        distro=section.get("distro", "").strip(),
+        project_root=root,
+        # 換了 project_root 時，預設的 Python 跟著換成那份 checkout 的 .venv
+        python=section.get("python", "").strip() or f"{root}/.venv/bin/python",
+        main_script=section.get("main_script", "").strip() or WSL_MAIN_SCRIPT,
+    )
 
 
 # 這裡，我們用「def」來定義（define）確保 Adapter 物件已經被建立的函式。
-def _ensure_adapter() -> BackendAdapter:
+def _ensure_adapter() -> BackendAdapter | MultiBackendAdapter:
     # 宣告（global）我們要修改這個全域變數 _adapter_singleton。
     global _adapter_singleton
     # 用「if」來判斷：如果（if）它已經被建立了（不是 None）...
@@ -607,50 +2042,179 @@ def _ensure_adapter() -> BackendAdapter:
         # 就直接回傳（return）現有的物件。
         return _adapter_singleton
 
-    # 【核心修改】我們不再需要這個高風險的 UNC 路徑了！
-    # 傳入一個標示字串即可，BackendAdapter 現在是「指令發送器」，不是「檔案讀取器」。
-    json_path = "WSL_MODE_NO_DIRECT_FILE_ACCESS"
+    # 從 sentry_config.ini 的 [backend] 區段決定通訊模式（預設常駐連線）
+    config = _load_backend_config()
+    # [backend:<name>] 區段：有的話就是多後端（每個區段覆寫 [backend] 的共用設定）
+    sections = _load_backend_sections()
+
+    # 顯示 WSL 內路徑（\\wsl$\<distro>\...）用的 distro；
+    # 沒設定時多後端採用第一個後端的 distro，都沒有時由暖機向 bridge 問一次（見 _learn_default_distro）
+    first_distro = next((s.get("distro", "").strip() for s in sections.values()), "")
+    set_default_distro(config.get("wsl_distro", "") or first_distro)
 
-    # 建立（instantiate）BackendAdapter 物件，把路徑傳入。
-    _adapter_singleton = BackendAdapter(json_path)
-    # 回傳（return）這個新建立的物件。
+    if not sections:
+        # 建立（instantiate）BackendAdapter 物件，把設定傳入。
+        _adapter_singleton = BackendAdapter(**_adapter_options(config))
+        # 回傳（return）這個新建立的物件。
+        return _adapter_singleton
+
+    try:
+        timeout = max(0.1, float(config.get("backend_timeout", DEFAULT_BACKEND_TIMEOUT)))
+    except ValueError:
+        print(f"[Warning] backend_timeout 必須是秒數，改用預設 {DEFAULT_BACKEND_TIMEOUT:g}")
+        timeout = DEFAULT_BACKEND_TIMEOUT
+
+    backends = [
+        BackendAdapter(
+            endpoint=_endpoint_from_section(name, section),
+            # projects.json 屬於各自的 checkout：只看區段自己的設定，不繼承 [backend] 的
+            **_adapter_options({**config, "projects_json": "", **section}),
+        )
+        for name, section in sections.items()
+    ]
+    _adapter_singleton = MultiBackendAdapter(backends, list_timeout=timeout)
     return _adapter_singleton
 
 
+# 這裡，我們用「def」來定義（define）取得假後端的函式。
+def get_fake_backend() -> Optional[FakeDaemon]:
+    """
+    transport=fake 時回傳單例 adapter 使用的 FakeDaemon（async 版與測試共用同一份狀態），否則回傳 None。
+    多後端時回傳 None（各後端的假後端用 backend_adapters() 逐一取得）。
+    """
+    adapter = _ensure_adapter()
+    if isinstance(adapter, MultiBackendAdapter):
+        return None
+    return adapter.fake_daemon()
+
+
+# 這裡，我們用「def」來定義（define）取得實際後端 adapter 的函式。
+def backend_adapters(name: str = "") -> List[BackendAdapter]:
+    """實際的後端 adapter：單一後端時就是那一個；多後端時是全部（順序同設定檔），或只有名稱為 name 的那個。"""
+    adapter = _ensure_adapter()
+    if not isinstance(adapter, MultiBackendAdapter):
+        return [adapter]
+    if name:
+        return [adapter.backends[name]] if name in adapter.backends else []
+    return list(adapter.backends.values())
+
+
+# 這裡，我們用「def」來定義（define）決定指令要送到哪個後端的函式。
+def backend_for_command(cmd: str, args: List[str]) -> BackendAdapter:
+    """這個後端指令該由哪個後端執行（async 版用；單一後端時一律是它）。"""
+    adapter = _ensure_adapter()
+    if isinstance(adapter, MultiBackendAdapter):
+        return adapter.backend_for_command(cmd, args)
+    return adapter
+
+
+# 這裡，我們用「def」來定義（define）讀取各後端健康狀況的函式。
+def backend_health() -> List[BackendHealth]:
+    """多後端時每個後端最近一次讀取的結果（見 BackendHealth）；單一後端回傳空列表。"""
+    adapter = _ensure_adapter()
+    if isinstance(adapter, MultiBackendAdapter):
+        return adapter.backend_health()
+    return []
+
+
+# 這裡，我們用「def」來定義（define）查詢後端 distro 的函式。
+def backend_distro(name: str) -> Optional[str]:
+    """後端名稱 → 它的 distro（把 WSL 路徑轉成 \\\\wsl$ 路徑顯示用）；未指定時回傳 None（用預設 distro）。"""
+    if not name:
+        return None
+    backends = backend_adapters(name)
+    return (backends[0].endpoint.distro or None) if backends else None
+
+
+# 這裡，我們用「def」來定義（define）程式結束時關閉常駐連線的函式。
+def shutdown() -> None:
+    """關閉單例 adapter 的常駐 WSL 連線（tray_app 結束前呼叫）。"""
+    if _adapter_singleton is not None:
+        _adapter_singleton.close()
+
+
+# 這裡，我們用「def」來定義（define）讀取暖機 / 保活設定的函式。
+def get_warmup_settings() -> WarmupSettings:
+    """[backend] warmup / keepalive_interval（tray_app 啟動時讀一次來排程）。"""
+    return _ensure_adapter().warmup_settings
+
+
+# 這裡，我們用「def」來定義（define）在背景暖機的函式。
+def warm_up() -> float:
+    """先啟動 WSL / bridge 並載入 daemon（請在背景執行緒呼叫），回傳花的秒數。"""
+    return _ensure_adapter().warm_up()
+
+
+# 這裡，我們用「def」來定義（define）保活的函式。
+def keep_alive() -> bool:
+    """閒置夠久時送一個 __ping__ 讓 WSL 不被閒置關閉（請在背景執行緒呼叫）；回傳是否有送。"""
+    return _ensure_adapter().keep_alive()
+
+
 # 這裡，我們用「def」來定義（define）對外提供的獲取專案列表函式。
-def list_projects() -> List[ProjectInfo]:
+def list_projects(force_refresh: bool = False) -> List[ProjectInfo]:
     """
     tray_app 期待的介面：
     - 回傳 List[ProjectInfo]
     - ProjectInfo 內含 name/status/mode/path/output_file/target_files
+    - 預設走 adapter 的專案列表快取；force_refresh=True 時一定向 WSL 重新讀取
     """
     # 呼叫（call）_ensure_adapter 函式，獲取 Adapter 物件。
     adapter = _ensure_adapter()
     # 呼叫（call）Adapter 內部的 list_projects 函式並回傳結果。
-    return adapter.list_projects()
+    return adapter.list_projects(force_refresh=force_refresh)
+
+
+# 這裡，我們用「def」來定義（define）讓專案列表快取失效的函式。
+def invalidate_projects_cache(backend: str = "") -> None:
+    """讓專案列表快取失效（下一次 list_projects 一定會去問 WSL）；backend：只針對這個後端。"""
+    for adapter in backend_adapters(backend) if backend else [_ensure_adapter()]:
+        adapter.invalidate_projects_cache()
+
+
+# 這裡，我們用「def」來定義（define）套用後端推來的專案狀態的函式。
+def apply_project_status(proj: ProjectInfo) -> None:
+    """後端事件回報了某個專案的新狀態（events 模組呼叫）。"""
+    adapter = _ensure_adapter()
+    adapter.apply_project_status(proj)
+
+
+# 這裡，我們用「def」來定義（define）記錄事件串流連線狀態的函式。
+def set_status_push(active: bool, backend: str = "") -> None:
+    """事件串流連線 / 中斷（events 模組呼叫）；backend：只針對這個後端的串流。"""
+    for adapter in backend_adapters(backend) if backend else [_ensure_adapter()]:
+        adapter.set_status_push(active)
 
 
 # 這裡，我們用「def」來定義（define）對外提供的切換專案狀態函式。
 def toggle_project_status(key: str) -> Optional[ProjectInfo]:
     """
     tray_app 期待的介面：
-    - key 可以是 uuid 或 name（過渡期）
+    - key 可以是 uuid 或 name（過渡期；adapter 會先比對 uuid，找不到才比對名稱）
     """
-    # 呼叫（call）_ensure_adapter 函式，獲取 Adapter 物件。
-    adp = _ensure_adapter()
+    # 呼叫（call）_ensure_adapter 函式，獲取 Adapter 物件，直接交給它切換。
+    return _ensure_adapter().toggle_project_status(key)
+
 
-    # 先試 uuid
-    # 我們用「for...in...」這個結構，來一個一個地（for）檢查 Adapter 內部（_projects）。
-    for raw in adp._projects:
-        # 用「if」來判斷：如果（if）原始專案的 uuid 等於（==）傳入的 key...
-        if raw.uuid == key:
-            # 就呼叫（call）Adapter 內部的 toggle_project_status，並回傳（return）結果。
-            # 這裡傳入的是 name，因為 Adapter 內部是以 name 來判斷的（過渡期邏輯）。
-            return adp.toggle_project_status(raw.name)
+# 這裡，我們用「def」來定義（define）只送出啟動 / 停止指令的函式（批次操作用）。
+def start_project(uuid: str) -> None:
+    """送出 start_sentry，不等狀態翻轉。"""
+    _ensure_adapter().start_project(uuid)
 
-    # 否則 fallback 成舊行為（靠 name）
-    # 如果上面 for 循環沒有找到 uuid，就回到原本的行為：直接用 key（name）去切換狀態。
-    return adp.toggle_project_status(key)
+
+def stop_project(uuid: str) -> None:
+    """送出 stop_sentry，不等狀態翻轉。"""
+    _ensure_adapter().stop_project(uuid)
+
+
+# 這裡，我們用「def」來定義（define）一次等待多個專案狀態收斂的函式。
+def wait_for_project_statuses(
+    expected: Dict[str, ProjectStatus],
+    timeout: float = TOGGLE_CONVERGE_TIMEOUT,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[Dict[str, Optional[ProjectInfo]], Optional[List[ProjectInfo]]]:
+    """見 BackendAdapter.wait_for_project_statuses。"""
+    return _ensure_adapter().wait_for_project_statuses(expected, timeout, cancel)
 
 
 # 這裡，我們用「def」來定義（define）對外提供的獲取忽略設定函式。
@@ -707,14 +2271,26 @@ def trigger_manual_update(uuid: str) -> None:
 
 
 # 這裡，我們用「def」來定義（define）對外提供的獲取忽略候選函式。
-def get_ignore_candidates(uuid: str) -> List[str]:
+def get_ignore_candidates(uuid: str, on_chunk: Optional[ChunkCallback] = None) -> List[str]:
     adapter = _ensure_adapter()
-    return adapter.get_ignore_candidates(uuid)
+    return adapter.get_ignore_candidates(uuid, on_chunk=on_chunk)
 
 def get_current_ignore_patterns(uuid: str) -> List[str]:
     adapter = _ensure_adapter()
     return adapter.get_current_ignore_patterns(uuid)
 
+# 這裡，我們用「def」來定義（define）對外提供的批次指令函式。
+def batch() -> CommandBatch:
+    """
+    tray_app 的批次介面：把迴圈中的多個寫入操作合併成一次後端往返。
+
+        with adapter.batch() as b:
+            b.delete_project(uuid)
+        b.results  # List[BatchResult]
+    """
+    adapter = _ensure_adapter()
+    return adapter.batch()
+
 # 這裡，我們用「def」來定義（define）對外提供的更新忽略規則函式。
 def update_ignore_patterns(uuid: str, patterns: List[str]) -> None:
     adapter = _ensure_adapter()
@@ -722,60 +2298,63 @@ def update_ignore_patterns(uuid: str, patterns: List[str]) -> None:
 
 # ============================
 #  [v9.2.3 新增] 路徑比對邏輯 (把髒活藏在 Adapter)
+#  Windows → WSL 的轉換在 src/backend/paths.py（有快取）
 # ============================
 
-def _local_to_wsl_path(local_path: str) -> str:
-    """
-    [內部工具] 將 Windows 本地路徑轉換為 WSL 格式。
-    """
-    import re
-    # 1. 統一轉為正斜線，去除頭尾空白
-    p = local_path.strip().replace("\\", "/")
-    
-    # 2. 處理 WSL UNC 路徑 (例如 //wsl.localhost/Ubuntu/home/user/...)
-    if p.startswith("//wsl") or p.startswith("//WSL"):
-        parts = p.split("/")
-        # 取第 4 個元素之後的部分
-        if len(parts) >= 5:
-            return "/" + "/".join(parts[4:])
-    
-    # 3. 處理 Windows 磁碟機 (例如 D:/Project) -> /mnt/d/Project
-    match_drive = re.match(r"^([A-Za-z]):/(.*)", p)
-    if match_drive:
-        drive = match_drive.group(1).lower()
-        rest = match_drive.group(2)
-        return f"/mnt/{drive}/{rest}"
-        
-    return p.rstrip("/")
-
 def match_project_by_path(local_path: str) -> Optional[ProjectInfo]:
     """
     [UI 專用] 給定一個 Windows 路徑，檢查是否為已註冊專案。
     如果是，回傳 ProjectInfo；如果不是，回傳 None。
     """
-    # 1. 轉換路徑
-    target_wsl_path = _local_to_wsl_path(local_path)
-    
-    # 2. 獲取專案列表 (這會觸發一次 WSL 呼叫，確保資料最新)
-    # 如果怕太慢，也可以改用 _ensure_adapter()._projects (快取)，但這裡求穩先讀新的
-    all_projects = list_projects()
-    
-    # 3. 比對 (忽略結尾斜線差異)
-    target_clean = target_wsl_path.rstrip("/")
-    
-    for proj in all_projects:
-        # 專案路徑也可能帶有斜線，統一清理
-        proj_path_clean = proj.path.strip().replace("\\", "/").rstrip("/")
-        
-        if proj_path_clean == target_clean:
-            return proj
-            
-    return 
+    # 1. 轉換路徑，再查 adapter 的路徑索引
+    #    （索引跟著列表快取走：快取有效時完全不碰 WSL，新增/編輯/刪除都會讓它失效重讀）
+    adapter = _ensure_adapter()
+    return adapter.find_project_by_path(to_wsl(local_path))
+
+def find_project_containing(local_path: str) -> Optional[ProjectInfo]:
+    """
+    [UI 專用] 給定一個 Windows 路徑，找出「包含」它的已註冊專案
+    （也就是拖進來的是某個專案底下的子資料夾）。找不到回傳 None。
+    """
+    adapter = _ensure_adapter()
+    return adapter.find_project_containing(to_wsl(local_path))
+
+def find_projects_within(local_path: str) -> List[ProjectInfo]:
+    """[UI 專用] 給定一個 Windows 路徑，列出它底下已經註冊的專案。"""
+    adapter = _ensure_adapter()
+    return adapter.find_projects_within(to_wsl(local_path))
+
+def match_projects_by_paths(
+    local_paths: List[str],
+) -> List[Tuple[Optional[ProjectInfo], Optional[ProjectInfo], List[ProjectInfo]]]:
+    """
+    [UI 專用] 多個 Windows 路徑一次比對（多資料夾拖曳）：
+    每個路徑回傳（已註冊的專案本身, 包含它的專案, 它底下的專案），與上面三個函式的結果相同。
+    """
+    adapter = _ensure_adapter()
+    return adapter.match_paths(to_wsl_many(local_paths))
 
 # 這裡，我們用「def」來定義（define）對外提供的獲取日誌函式。
-def get_log_content(uuid: str) -> List[str]:
+def get_log_content(uuid: str, on_chunk: Optional[ChunkCallback] = None) -> List[str]:
+    adapter = _ensure_adapter()
+    return adapter.get_log_content(uuid, on_chunk=on_chunk)
+
+# 這裡，我們用「def」來定義（define）對外提供的增量讀取日誌函式。
+def get_log_tail(
+    uuid: str,
+    cursor: Optional[str] = None,
+    limit: int = LOG_TAIL_INITIAL_LINES,
+    on_chunk: Optional[ChunkCallback] = None,
+) -> LogTail:
+    """
+    只讀取 cursor 之後新增的日誌行（見 BackendAdapter.get_log_tail）。
+
+        tail = adapter.get_log_tail(uuid, cursor)
+        viewer.set_logs(tail.lines) if tail.reset else viewer.append_logs(tail.lines)
+        cursor = tail.cursor
+    """
     adapter = _ensure_adapter()
-    return adapter.get_log_content(uuid)
+    return adapter.get_log_tail(uuid, cursor, limit, on_chunk=on_chunk)
 
 # [Task 9.4] 對外公開接口
 def get_muted_paths(uuid: str) -> List[str]:
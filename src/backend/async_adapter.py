@@ -0,0 +1,425 @@
+# src/backend/async_adapter.py
+"""
+asyncio 版 Adapter（AsyncBackendAdapter）
+
+和同步的 BackendAdapter 提供相同的介面，但每個方法都是 awaitable：
+
+    projects = await aadp.list_projects()
+    candidates, current = await aadp.get_ignore_lists(uuid)  # 內部用 run_batch 合成一批
+
+- transport=session 時指令在執行緒中經由後端的常駐連線送出（asyncio.to_thread），
+  和同步版共用同一個 bridge 行程：不會有兩個 daemon 行程同時改寫 projects.json，
+  代價是同一後端的請求在連線上依序處理；要同時讀幾份資料時用 run_batch，整批只走一次往返。
+- direct 模式（或常駐連線起不來、冷卻中）才用 asyncio.create_subprocess_exec 各自啟動一個
+  bridge 單次模式行程（wsl_bridge.py --once），stdout 邊讀邊用 FrameDecoder 解碼；
+  run_batch 在這個模式下讓每個子指令各開一個行程並行。
+- 參數檢查、回傳值解析與 ProjectInfo 轉換都沿用 BackendAdapter 的實作，兩邊行為一致。
+- 本類別不另外持有專案列表快取：list_projects 在執行緒中呼叫各後端的 BackendAdapter.list_projects，
+  和同步版共用快取與路徑索引；寫入指令會讓這份共用快取失效。
+- transport=fake 時改在執行緒中呼叫同一個 FakeDaemon（和同步版共用狀態），不啟動行程。
+- 延遲記錄在同一個 metrics registry，通訊模式標為 "async-session" / "async"（單次行程）/ "async-fake"
+  （多後端時加上 @<後端名稱>）；list_projects 走同步版，記在同步版的通訊模式下。
+- 多後端（[backend:<name>] 區段）時每個指令送到擁有該專案的後端；list_projects 同時問所有後端再合併，
+  某個後端失敗只略過它的專案。
+- 在 Qt 介面中請透過 src.tray.workers.run_coroutine 執行（背景 asyncio 迴圈 + Qt 訊號）。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple
+
+from src.backend.adapter import (
+    _MUTATING_COMMANDS,
+    _UNBOUNDED_COMMANDS,
+    TOGGLE_CONVERGE_TIMEOUT,
+    TOGGLE_POLL_INITIAL,
+    TOGGLE_POLL_MAX,
+    LOG_TAIL_INITIAL_LINES,
+    BackendAdapter,
+    BackendError,
+    BatchResult,
+    LogTail,
+    ProjectInfo,
+    ProjectStatus,
+    backend_adapters,
+    backend_for_command,
+)
+from src.backend import metrics
+from src.backend.protocol import ChunkCallback, FrameDecoder, Reply, ReplyCollector
+from src.backend.session import CREATE_NO_WINDOW, SessionError
+from src.backend.wsl_bridge import TAIL_LOG_COMMAND
+
+
+class AsyncBackendAdapter:
+    """
+    非同步版後端介面。
+
+    - request_timeout：單次行程模式下單一指令的秒數上限，逾時會砍掉該行程並拋出 BackendError
+      （寫入與長時間指令不限時，規則同常駐連線，見 adapter._UNBOUNDED_COMMANDS；
+      走常駐連線時沿用後端自己的 request_timeout）
+    """
+
+    def __init__(self, request_timeout: float = 60.0) -> None:
+        self.request_timeout = request_timeout
+
+    # ---------------------------------------------------------
+    # 核心通訊
+    # ---------------------------------------------------------
+
+    async def _run_wsl_command(
+        self,
+        cmd: str,
+        *args: str,
+        on_chunk: Optional[ChunkCallback] = None,
+        backend: Optional[BackendAdapter] = None,
+    ) -> list | dict | str:
+        """
+        非同步版 _run_wsl_command：有常駐連線就在執行緒中經由它送出，
+        否則啟動一個 WSL 行程，邊讀邊解碼回覆框架，直到它結束。
+        backend：指定要送到哪個後端；None = 依指令與參數決定（見 adapter.backend_for_command）。
+        """
+        # 與同步版相同的安全清洗：反斜線一律轉成正斜線
+        clean_args = [str(a).replace("\\", "/") for a in args]
+
+        if backend is None:
+            backend = await self._resolve_backend(cmd, clean_args)
+
+        # 寫入指令也要讓同步 adapter 的共用列表快取失效
+        if cmd in _MUTATING_COMMANDS:
+            backend.invalidate_projects_cache()
+
+        fake = backend.fake_daemon()
+        label = "async-fake" if fake is not None else "async-session" if backend._session is not None else "async"
+        transport = backend._metrics_transport(label)
+        started = time.perf_counter()
+        backend._last_request_at = time.monotonic()
+        try:
+            reply: Optional[Reply] = None
+            if fake is not None:
+                try:
+                    reply = await asyncio.to_thread(fake.request, cmd, clean_args, on_chunk)
+                except SessionError as e:
+                    raise BackendError(f"WSL 執行失敗: {e}", kind=e.kind)
+            elif backend._session is not None:
+                # 常駐連線：與同步版共用同一個 bridge；None = 連線起不來（冷卻中），改用單次行程
+                reply = await asyncio.to_thread(backend._request_via_session, cmd, clean_args, on_chunk)
+            if reply is None:
+                transport = backend._metrics_transport("async")
+                reply = await self._request_process(backend, cmd, clean_args, on_chunk)
+            result = BackendAdapter._reply_result(reply)
+        except BackendError as e:
+            metrics.record_failure(cmd, transport, e.kind, time.perf_counter() - started, str(e))
+            raise
+
+        metrics.record(
+            cmd, transport, time.perf_counter() - started, reply.backend_seconds, reply.parse_seconds, reply.cold
+        )
+        return result
+
+    @staticmethod
+    async def _resolve_backend(cmd: str, clean_args: List[str]) -> BackendAdapter:
+        """決定指令要送到哪個後端（見 adapter.backend_for_command）。"""
+        backends = backend_adapters()
+        if len(backends) == 1:
+            return backends[0]
+        # 不認得的 uuid 會先重讀列表（阻塞），不能在事件迴圈上做
+        return await asyncio.to_thread(backend_for_command, cmd, clean_args)
+
+    async def run_batch(self, commands: List[Tuple[str, List[str]]]) -> List[BatchResult]:
+        """
+        非同步版 BackendAdapter.run_batch：執行一組 (指令, 參數)，結果按原本的順序回傳。
+
+        - 依後端分組；有常駐連線（或 fake）的後端在執行緒中交給它的 run_batch，整批一次往返。
+        - direct 模式的後端每個子指令各開一個單次行程並行（和 asyncio.gather 個別呼叫相同）。
+        - 某個子指令失敗只記在它的 BatchResult，不影響其他子指令。
+        """
+        cleaned = [(cmd, [str(a).replace("\\", "/") for a in args]) for cmd, args in commands]
+        groups: Dict[str, Tuple[BackendAdapter, List[int]]] = {}
+        for index, (cmd, args) in enumerate(cleaned):
+            backend = await self._resolve_backend(cmd, args)
+            groups.setdefault(backend.name, (backend, []))[1].append(index)
+
+        async def _run_group(backend: BackendAdapter, indexes: List[int]) -> List[BatchResult]:
+            group = [cleaned[i] for i in indexes]
+            if backend.fake_daemon() is not None or backend._session is not None:
+                return await asyncio.to_thread(backend.run_batch, group)
+            values = await asyncio.gather(
+                *(self._run_wsl_command(cmd, *args, backend=backend) for cmd, args in group),
+                return_exceptions=True,
+            )
+            results = []
+            for (cmd, args), value in zip(group, values):
+                if isinstance(value, BackendError):
+                    results.append(BatchResult(cmd=cmd, args=args, ok=False, error=str(value)))
+                elif isinstance(value, BaseException):
+                    raise value
+                else:
+                    results.append(BatchResult(cmd=cmd, args=args, ok=True, value=value))
+            return results
+
+        grouped = list(groups.values())
+        group_results = await asyncio.gather(*(_run_group(backend, indexes) for backend, indexes in grouped))
+        results: List[Optional[BatchResult]] = [None] * len(cleaned)
+        for (_backend, indexes), batch_results in zip(grouped, group_results):
+            for index, result in zip(indexes, batch_results):
+                results[index] = result
+        return results
+
+    async def _request_process(
+        self,
+        backend: BackendAdapter,
+        cmd: str,
+        clean_args: List[str],
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> Reply:
+        """在 backend 的位置啟動一個 bridge 單次模式行程並收集回覆框架（direct 模式用）。"""
+        full_cmd = backend._build_direct_command(cmd, clean_args)
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *full_cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                creationflags=CREATE_NO_WINDOW,
+            )
+        except OSError as e:
+            raise BackendError(f"系統錯誤: {e}", kind="spawn")
+
+        decoder = FrameDecoder()
+        collector = ReplyCollector(None, on_chunk)
+        try:
+            stderr = await asyncio.wait_for(
+                self._collect(proc, decoder, collector),
+                timeout=None if cmd in _UNBOUNDED_COMMANDS else self.request_timeout,
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise BackendError(f"WSL 執行逾時（>{self.request_timeout:.0f}s）: {cmd}", kind="timeout")
+
+        reply = BackendAdapter._direct_reply(collector, stderr)
+        reply.parse_seconds = decoder.busy_seconds
+        return reply
+
+    @staticmethod
+    async def _collect(
+        proc: asyncio.subprocess.Process, decoder: FrameDecoder, collector: ReplyCollector
+    ) -> bytes:
+        """讀完 stdout（框架邊到邊解）與 stderr，等行程結束；回傳 stderr。"""
+        assert proc.stdout is not None and proc.stderr is not None
+        stderr_task = asyncio.ensure_future(proc.stderr.read())
+        try:
+            while True:
+                data = await proc.stdout.read(65536)
+                if not data:
+                    break
+                for frame in decoder.feed(data):
+                    collector.add(frame)
+            stderr = await stderr_task
+        finally:
+            stderr_task.cancel()
+        await proc.wait()
+        return stderr
+
+    @staticmethod
+    def _as_str_list(result: list | dict | str) -> List[str]:
+        if isinstance(result, list):
+            return [str(x) for x in result]
+        return []
+
+    # ---------------------------------------------------------
+    # 給 UI 用的介面（與 BackendAdapter 同名）
+    # ---------------------------------------------------------
+
+    async def list_projects(self, force_refresh: bool = False) -> List[ProjectInfo]:
+        """
+        獲取專案列表（UI 格式），規則同 BackendAdapter.list_projects：
+        快取還新鮮就直接回傳，不碰 WSL；force_refresh=True 一定向後端重新讀取（並更新快取）。
+        多後端時同時問每個後端並依設定檔順序合併；失敗的後端略過，全部失敗才拋出 BackendError。
+        """
+        backends = backend_adapters()
+        # 同步版的讀取會阻塞（WSL 往返、讀檔），放到執行緒中做
+        replies = await asyncio.gather(
+            *(asyncio.to_thread(backend.list_projects, force_refresh) for backend in backends),
+            return_exceptions=True,
+        )
+        projects: List[ProjectInfo] = []
+        errors: List[BackendError] = []
+        for backend, reply in zip(backends, replies):
+            if isinstance(reply, BackendError):
+                print(f"AsyncAdapter: 後端 {backend.name or '(預設)'} 讀取專案列表失敗: {reply}")
+                errors.append(reply)
+                continue
+            if isinstance(reply, BaseException):
+                raise reply
+            projects.extend(reply)
+        if errors and len(errors) == len(backends):
+            raise errors[0]
+        return projects
+
+    async def toggle_project_status(self, key: str) -> Optional[ProjectInfo]:
+        """發送 start/stop_sentry 指令，並等待狀態收斂（流程與同步版相同）。"""
+        current_list = await self.list_projects(force_refresh=True)
+
+        target = next((p for p in current_list if p.uuid == key), None)
+        if not target:
+            target = next((p for p in current_list if p.name == key), None)
+        if not target:
+            print(f"AsyncAdapter: 找不到專案 {key}")
+            return None
+
+        expected = BackendAdapter._toggled_status(target)
+        # 列表已經標明專案屬於哪個後端，直接送過去（不必再查 uuid 對照）
+        owner = next(iter(backend_adapters(target.backend)), None) if target.backend else None
+        try:
+            if target.status == "monitoring":
+                reply = await self._run_wsl_command("stop_sentry", target.uuid, backend=owner)
+            else:
+                reply = await self._run_wsl_command("start_sentry", target.uuid, backend=owner)
+        except BackendError as e:
+            print(f"AsyncAdapter Error: {e}")
+            return None
+
+        acked = BackendAdapter._project_from_ack(reply, target)
+        if acked is not None and acked.status == expected:
+            return acked
+
+        return await self.wait_for_project_status(target.uuid, expected)
+
+    async def wait_for_project_status(
+        self,
+        uuid: str,
+        expected: ProjectStatus,
+        timeout: float = TOGGLE_CONVERGE_TIMEOUT,
+    ) -> Optional[ProjectInfo]:
+        """輪詢單一專案直到狀態變成 expected 或逾時（規則同 BackendAdapter.wait_for_project_status）。"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = TOGGLE_POLL_INITIAL
+        latest: Optional[ProjectInfo] = None
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            # 不會卡住事件迴圈
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, TOGGLE_POLL_MAX)
+
+            try:
+                projects = await self.list_projects(force_refresh=True)
+            except BackendError as e:
+                print(f"AsyncAdapter: 輪詢 {uuid} 狀態失敗（將重試）: {e}")
+                continue
+
+            latest = next((p for p in projects if p.uuid == uuid), None)
+            if latest is None or latest.status == expected:
+                return latest
+
+        print(f"AsyncAdapter: 等待 {uuid} 切換為 {expected} 逾時（>{timeout:g}s）")
+        return latest
+
+    async def add_project(self, name: str, path: str, output_file: str) -> None:
+        name, path, output_file = BackendAdapter._validate_new_project(name, path, output_file)
+        await self._run_wsl_command("add_project", name, path, output_file)
+
+    async def delete_project(self, uuid: str) -> None:
+        if not uuid:
+            raise BackendError("刪除失敗：UUID 為空。")
+        await self._run_wsl_command("delete_project", uuid)
+
+    async def edit_project(self, uuid: str, field: str, new_value: str) -> None:
+        if not uuid or not field or not new_value:
+            raise BackendError("編輯失敗：UUID、欄位名稱或新值不得為空。")
+        await self._run_wsl_command("edit_project", uuid, field, new_value)
+
+    async def add_target(self, uuid: str, new_target: str) -> None:
+        if not uuid or not new_target:
+            raise BackendError("追加失敗：參數不得為空。")
+        await self._run_wsl_command("add_target", uuid, new_target)
+
+    async def remove_target(self, uuid: str, target_to_remove: str) -> None:
+        if not uuid or not target_to_remove:
+            raise BackendError("移除失敗：參數不得為空。")
+        await self._run_wsl_command("remove_target", uuid, target_to_remove)
+
+    async def trigger_manual_update(self, uuid: str) -> None:
+        if not uuid:
+            raise BackendError("更新失敗：UUID 為空。")
+        await self._run_wsl_command("manual_update", uuid)
+
+    async def get_ignore_candidates(self, uuid: str, on_chunk: Optional[ChunkCallback] = None) -> List[str]:
+        if not uuid:
+            return []
+        return self._as_str_list(await self._run_wsl_command("list_ignore_candidates", uuid, on_chunk=on_chunk))
+
+    async def get_current_ignore_patterns(self, uuid: str) -> List[str]:
+        if not uuid:
+            return []
+        return self._as_str_list(await self._run_wsl_command("list_ignore_patterns", uuid))
+
+    async def get_ignore_lists(self, uuid: str) -> Tuple[List[str], List[str]]:
+        """
+        一次讀取 (候選名單, 當前忽略規則)：session 模式兩個指令合成一批只走一次往返。
+        任一份讀取失敗就拋出 BackendError。
+        """
+        if not uuid:
+            return [], []
+        candidates, current = await self.run_batch(
+            [("list_ignore_candidates", [uuid]), ("list_ignore_patterns", [uuid])]
+        )
+        for result in (candidates, current):
+            if not result.ok:
+                raise BackendError(result.error or f"{result.cmd} 失敗")
+        return self._as_str_list(candidates.value), self._as_str_list(current.value)
+
+    async def update_ignore_patterns(self, uuid: str, patterns: List[str]) -> None:
+        if not uuid:
+            raise BackendError("更新失敗：UUID 為空。")
+        await self._run_wsl_command("update_ignore_patterns", uuid, *patterns)
+
+    async def get_log_content(self, uuid: str, on_chunk: Optional[ChunkCallback] = None) -> List[str]:
+        if not uuid:
+            return []
+        return self._as_str_list(await self._run_wsl_command("get_log", uuid, on_chunk=on_chunk))
+
+    async def get_log_tail(
+        self,
+        uuid: str,
+        cursor: Optional[str] = None,
+        limit: int = LOG_TAIL_INITIAL_LINES,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> LogTail:
+        """增量讀取日誌（切行在 bridge 端完成，結果與同步版相同）。"""
+        if not uuid:
+            return LogTail(lines=[], cursor="", reset=True)
+        after, anchor = BackendAdapter._parse_log_cursor(cursor)
+        payload = await self._run_wsl_command(
+            TAIL_LOG_COMMAND, uuid, str(after), anchor, str(limit), on_chunk=on_chunk
+        )
+        return BackendAdapter._to_log_tail(payload)
+
+    async def get_muted_paths(self, uuid: str) -> List[str]:
+        if not uuid:
+            return []
+        return self._as_str_list(await self._run_wsl_command("get_muted_paths", uuid))
+
+    async def solidify_ignore_patterns(self, uuid: str) -> None:
+        if not uuid:
+            raise BackendError("固化失敗：UUID 為空。")
+        await self._run_wsl_command("add_ignore_patterns", uuid)
+
+
+# ============================
+#  模組層：單例（懶載入）
+# ============================
+
+_async_adapter_singleton: Optional[AsyncBackendAdapter] = None
+
+
+def get_async_adapter() -> AsyncBackendAdapter:
+    """取得共用的 AsyncBackendAdapter。"""
+    global _async_adapter_singleton
+    if _async_adapter_singleton is None:
+        _async_adapter_singleton = AsyncBackendAdapter()
+    return _async_adapter_singleton
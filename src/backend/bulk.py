@@ -0,0 +1,273 @@
+# src/backend/bulk.py
+"""
+多個專案的批次操作（BulkOperation）：刪除 / 啟動 / 停止 / 手動更新。
+
+控制台多選專案後從右鍵選單發動，由 src/tray/bulk_dialog.py 的 BulkOperationDialog 顯示進度：
+
+    op = BulkOperation(BULK_STOP, [(uuid, name), ...])
+    outcome = op.run(on_chunk=...)     # 阻塞；請在背景執行緒呼叫（run_in_background）
+    op.cancel()                        # 從任何執行緒呼叫：還沒開始的項目不再送出
+
+- 會改寫 projects.json 的動作（刪除 / 啟動 / 停止）一律經由 adapter.batch() 送出：
+  每 BULK_BATCH_SIZE 個項目一批、一次往返，由後端依序執行，批與批之間回報進度、檢查取消。
+  不會有兩個 daemon 行程同時改寫 projects.json（direct 模式下並行的 delete_project 會互相蓋掉）。
+- 手動更新不改寫 projects.json，才各自送一個指令，最多同時 concurrency 個
+  （[backend] bulk_concurrency，預設 4；direct 模式下就是最多同時幾個 WSL 行程）。
+- 啟動 / 停止只送指令、不逐一等狀態翻轉；全部送完後用 wait_for_project_statuses
+  一起輪詢（每輪只讀一次列表），不會像逐一切換那樣每個專案各等幾秒。
+- 已經是目標狀態的專案直接略過（啟動前先讀一次最新列表）。
+- 取消：還沒開始的項目標為「已取消」；已送出的指令無法收回，照常回報結果。
+- 最後讀一次完整列表（BulkOutcome.projects）讓 UI 一次對齊，不必逐列重載。
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.backend.adapter import (
+    BackendError,
+    ProjectInfo,
+    ProjectStatus,
+    CommandBatch,
+    _load_backend_config,
+    batch,
+    list_projects,
+    trigger_manual_update,
+    wait_for_project_statuses,
+)
+
+BULK_DELETE = "delete"
+BULK_START = "start"
+BULK_STOP = "stop"
+BULK_UPDATE = "update"
+
+# 動作 → 顯示名稱
+BULK_ACTION_LABELS = {
+    BULK_DELETE: "刪除",
+    BULK_START: "啟動",
+    BULK_STOP: "停止",
+    BULK_UPDATE: "手動更新",
+}
+
+# 啟動 / 停止後應該收斂到的狀態
+_EXPECTED_STATUS: Dict[str, ProjectStatus] = {
+    BULK_START: "monitoring",
+    BULK_STOP: "stopped",
+}
+
+# 會改寫 projects.json 的動作：經由 adapter.batch() 分批依序送出
+_BATCH_ACTIONS = frozenset({BULK_DELETE, BULK_START, BULK_STOP})
+
+# 上述動作每批的項目數（每批一次往返；批與批之間回報進度、檢查取消）
+BULK_BATCH_SIZE = 10
+
+# 其他動作（手動更新）同時送出的指令數上限；可用 [backend] bulk_concurrency 覆寫
+DEFAULT_BULK_CONCURRENCY = 4
+
+# 每個項目完成（成功 / 失敗 / 取消 / 略過）時的回呼；在工作執行緒上被呼叫
+BulkCallback = Callable[["BulkResult"], None]
+
+
+@dataclass
+class BulkResult:
+    """一個項目的結果（message 是給使用者看的一句話）。"""
+    uuid: str
+    name: str
+    ok: bool = False
+    message: str = ""
+    cancelled: bool = False
+    skipped: bool = False
+
+
+@dataclass
+class BulkOutcome:
+    """整批的結果。projects 是最後讀到的完整列表（讀取失敗時為 None，UI 應自行重載）。"""
+    action: str
+    results: List[BulkResult] = field(default_factory=list)
+    projects: Optional[List[ProjectInfo]] = None
+    cancelled: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> List[BulkResult]:
+        return [r for r in self.results if not r.ok and not r.cancelled]
+
+
+def _configured_concurrency() -> int:
+    raw = _load_backend_config().get("bulk_concurrency", "")
+    if not raw.strip():
+        return DEFAULT_BULK_CONCURRENCY
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        print(f"[Warning] bulk_concurrency 必須是整數，改用預設 {DEFAULT_BULK_CONCURRENCY}")
+        return DEFAULT_BULK_CONCURRENCY
+
+
+class BulkOperation:
+    """
+    對一組專案執行同一個動作。
+
+    - action：BULK_DELETE / BULK_START / BULK_STOP / BULK_UPDATE
+    - targets：[(uuid, 顯示名稱), ...]（與控制台右鍵選單收集的格式相同）
+    - concurrency：手動更新同時送出的指令數（None = 讀設定檔；刪除 / 啟動 / 停止一律分批依序送出）
+    """
+
+    def __init__(
+        self,
+        action: str,
+        targets: List[Tuple[str, str]],
+        concurrency: Optional[int] = None,
+    ) -> None:
+        if action not in BULK_ACTION_LABELS:
+            raise ValueError(f"未知的批次動作: {action}")
+        self.action = action
+        self.targets = list(targets)
+        self.concurrency = concurrency if concurrency is not None else _configured_concurrency()
+        self._cancel = threading.Event()
+
+    @property
+    def label(self) -> str:
+        return BULK_ACTION_LABELS[self.action]
+
+    def cancel(self) -> None:
+        """要求取消（執行緒安全）：還沒開始的項目不再送出，等待狀態收斂也會提早結束。"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    # ---------------------------------------------------------
+    # 執行
+    # ---------------------------------------------------------
+
+    def run(self, on_chunk: Optional[BulkCallback] = None) -> BulkOutcome:
+        """
+        執行整批（阻塞），回傳 BulkOutcome。
+        on_chunk：每個項目完成時回呼一次（名稱沿用 run_in_background 的串流參數，可直接轉回 GUI 執行緒）。
+        """
+        started = time.perf_counter()
+        outcome = BulkOutcome(action=self.action)
+        expected = _EXPECTED_STATUS.get(self.action)
+
+        # 啟動 / 停止：先讀一次最新狀態，已經是目標狀態的直接略過
+        current: Dict[str, ProjectInfo] = {}
+        if expected is not None and self.targets:
+            try:
+                current = {p.uuid: p for p in list_projects(force_refresh=True)}
+            except BackendError as e:
+                print(f"[Warning] 批次{self.label}前讀取狀態失敗，全部照送: {e}")
+
+        def _emit(result: BulkResult) -> None:
+            if on_chunk is not None:
+                on_chunk(result)
+
+        outcome.results = [BulkResult(uuid=uuid, name=name) for uuid, name in self.targets]
+        todo: List[BulkResult] = []
+        for result in outcome.results:
+            proj = current.get(result.uuid)
+            if expected is not None and proj is not None and proj.status == expected:
+                result.ok = result.skipped = True
+                result.message = f"已是{self._status_label(expected)}，略過"
+                _emit(result)
+            else:
+                todo.append(result)
+
+        if self.action in _BATCH_ACTIONS:
+            self._send_batches(todo, _emit)
+        else:
+            def _one(result: BulkResult) -> None:
+                if self._cancel.is_set():
+                    self._mark_cancelled(result)
+                else:
+                    try:
+                        trigger_manual_update(result.uuid)
+                    except BackendError as e:
+                        result.message = str(e)
+                    else:
+                        result.ok = True
+                        result.message = "完成"
+                _emit(result)
+
+            with ThreadPoolExecutor(max_workers=max(1, self.concurrency), thread_name_prefix="bulk") as pool:
+                list(pool.map(_one, todo))
+
+        # 啟動 / 停止：送出成功的專案一起等狀態收斂（每輪只讀一次列表）
+        if expected is not None:
+            waiting = {r.uuid: expected for r in outcome.results if r.ok and not r.skipped}
+            if waiting:
+                latest, outcome.projects = wait_for_project_statuses(waiting, cancel=self._cancel)
+                for result in outcome.results:
+                    if result.uuid not in waiting:
+                        continue
+                    proj = latest.get(result.uuid)
+                    if proj is not None and proj.status == expected:
+                        result.message = f"已{self.label}"
+                    elif proj is not None:
+                        result.message = f"已送出，但目前仍為{self._status_label(proj.status)}"
+
+        # 最後對齊一次完整列表（收斂輪詢剛讀過、而且期間沒有取消的話就直接沿用）
+        if outcome.projects is None or self._cancel.is_set():
+            try:
+                outcome.projects = list_projects(force_refresh=True)
+            except BackendError as e:
+                print(f"[Warning] 批次{self.label}後重新讀取列表失敗: {e}")
+                outcome.projects = None
+
+        outcome.cancelled = self._cancel.is_set()
+        outcome.elapsed = time.perf_counter() - started
+        return outcome
+
+    def _send_batches(self, todo: List[BulkResult], emit: BulkCallback) -> None:
+        """刪除 / 啟動 / 停止：每 BULK_BATCH_SIZE 個一批經由 adapter.batch() 送出，每批送完就回報。"""
+        sent_message = "已送出" if self.action in _EXPECTED_STATUS else "完成"
+        for start in range(0, len(todo), BULK_BATCH_SIZE):
+            if self._cancel.is_set():
+                for result in todo[start:]:
+                    self._mark_cancelled(result)
+                    emit(result)
+                return
+            chunk = todo[start:start + BULK_BATCH_SIZE]
+            try:
+                with batch() as b:
+                    for result in chunk:
+                        self._queue(b, result.uuid)
+                replies = b.results
+            except BackendError as e:
+                # 找不到負責的後端之類的錯誤：整批都算失敗
+                for result in chunk:
+                    result.message = str(e)
+                    emit(result)
+                continue
+            for result, reply in zip(chunk, replies):
+                if reply.ok:
+                    result.ok = True
+                    result.message = sent_message
+                else:
+                    result.message = reply.error
+                emit(result)
+
+    def _queue(self, b: CommandBatch, uuid: str) -> None:
+        if self.action == BULK_DELETE:
+            b.delete_project(uuid)
+        elif self.action == BULK_START:
+            b.start_project(uuid)
+        else:
+            b.stop_project(uuid)
+
+    @staticmethod
+    def _mark_cancelled(result: BulkResult) -> None:
+        result.cancelled = True
+        result.message = "已取消"
+
+    @staticmethod
+    def _status_label(status: str) -> str:
+        return {"monitoring": "監控中", "stopped": "已停止"}.get(status, status)
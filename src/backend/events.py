@@ -0,0 +1,413 @@
+# src/backend/events.py
+"""
+後端事件訂閱（push）
+
+控制台原本每 5 秒輪詢一次日誌，托盤 Tooltip 也只在控制台重載時才更新。
+這裡提供一條長駐的事件串流，後端一有變化就推過來：
+
+    sub = events.subscribe(on_event)      # on_event(BackendEvent) 在讀取執行緒上被呼叫
+    ...
+    sub.close()
+
+事件種類（BackendEvent.kind）：
+- "connected" / "disconnected"：串流就緒 / 中斷（中斷後會自動重連）
+- "status"：專案出現或欄位改變（event.project 是新的 ProjectInfo）
+- "removed"：專案消失
+- "log"：新日誌行（event.lines；event.cursor 可直接當 get_log_tail 的游標，空字串代表不適用）
+- "file"：日誌中的檔案事件（event.action = created / modified / deleted，event.path）
+- "muting"：觸發過熱保護（智能靜默）
+
+事件來源（sentry_config.ini 的 [backend] events）：
+- "wsl"（預設）：EventSubscription，啟動 wsl_bridge.py --watch，讀它推來的框架
+- "local"：LocalEventPublisher，在本機產生模擬事件，不需要真正的 daemon（測試 UI 用）
+  （adapter 使用假後端 transport=fake 時，"wsl" 也會改用這個來源，專案取自假後端）
+- "off"：不訂閱（控制台照舊輪詢）
+
+多後端（[backend:<name>] 區段）時每個後端各有一條串流，事件的 backend 欄位標明來源；
+某個後端的串流中斷只影響它自己（各自重連）。
+"""
+from __future__ import annotations
+
+import random
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from src.backend.adapter import (
+    TRANSPORT_FAKE,
+    BackendAdapter,
+    BackendError,
+    ProjectInfo,
+    _load_backend_config,
+    apply_project_status,
+    backend_adapters,
+    invalidate_projects_cache,
+    list_projects,
+    set_status_push,
+)
+from src.backend.protocol import FrameDecoder
+from src.backend.session import CREATE_NO_WINDOW
+
+EVENT_SOURCE_WSL = "wsl"
+EVENT_SOURCE_LOCAL = "local"
+EVENT_SOURCE_OFF = "off"
+
+# 監看模式的預設輪詢間隔（秒）；可用 [backend] events_interval 覆寫
+DEFAULT_EVENTS_INTERVAL = 2.0
+
+# 串流中斷後的重連等待（秒）：從 RECONNECT_INITIAL 開始加倍，最多 RECONNECT_MAX
+RECONNECT_INITIAL = 2.0
+RECONNECT_MAX = 60.0
+
+# 日誌行 → 衍生事件（規則與 tray/log_model.py 的顯示分類一致）
+_FILE_EVENT_RE = re.compile(r"\[偵測\] (created|modified|deleted): (.+)")
+_MUTING_MARKERS = ("智能靜默", "Muting triggered")
+
+
+@dataclass(frozen=True)
+class BackendEvent:
+    """一個後端事件（欄位依 kind 使用，其餘保持預設值）。"""
+    kind: str
+    uuid: str = ""
+    project: Optional[ProjectInfo] = None
+    lines: Tuple[str, ...] = ()
+    cursor: str = ""
+    reset: bool = False
+    action: str = ""
+    path: str = ""
+    # 來自哪個後端（多後端時；單一後端為空字串）
+    backend: str = ""
+
+
+EventCallback = Callable[[BackendEvent], None]
+
+
+def events_from_frame(frame: dict, backend: str = "") -> List[BackendEvent]:
+    """
+    bridge 監看模式的一個事件框架 → BackendEvent 列表（log 框架會再衍生 file / muting 事件）。
+    backend：串流所屬的後端名稱，標在每個事件（與 status 事件的專案）上。
+    """
+    kind = frame.get("event")
+
+    if kind == "hello":
+        return [BackendEvent("connected", backend=backend)]
+
+    if kind == "status":
+        raw = frame.get("project")
+        if not isinstance(raw, dict):
+            return []
+        infos = BackendAdapter._to_project_infos([raw], backend)
+        if not infos or not infos[0].uuid:
+            return []
+        return [BackendEvent("status", uuid=infos[0].uuid, project=infos[0], backend=infos[0].backend)]
+
+    if kind == "removed":
+        return [BackendEvent("removed", uuid=str(frame.get("uuid") or ""), backend=backend)]
+
+    if kind == "log":
+        uuid = str(frame.get("uuid") or "")
+        lines = tuple(str(x) for x in frame.get("lines") or [])
+        found = [BackendEvent(
+            "log",
+            uuid=uuid,
+            lines=lines,
+            cursor=str(frame.get("cursor") or ""),
+            reset=bool(frame.get("reset")),
+            backend=backend,
+        )]
+        for line in lines:
+            match = _FILE_EVENT_RE.search(line)
+            if match:
+                found.append(BackendEvent(
+                    "file", uuid=uuid, action=match.group(1), path=match.group(2).strip(), backend=backend
+                ))
+            elif any(marker in line for marker in _MUTING_MARKERS):
+                found.append(BackendEvent("muting", uuid=uuid, lines=(line,), backend=backend))
+        return found
+
+    return []
+
+
+class _EventSource:
+    """事件來源的共同骨架：背景執行緒 + 關閉旗標 + 派送（含列表快取失效）。"""
+
+    def __init__(self, on_event: EventCallback, backend: str = "") -> None:
+        self.on_event = on_event
+        # 這條串流所屬的後端（多後端時；空字串 = 單一後端 / 不分後端）
+        self.backend = backend
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.connected = False
+
+    def start(self) -> "_EventSource":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        self._closed.set()
+
+    def _run(self) -> None:
+        raise NotImplementedError
+
+    def _dispatch_frame(self, frame: dict) -> None:
+        for event in events_from_frame(frame, self.backend):
+            self._emit(event)
+
+    def _emit(self, event: BackendEvent) -> None:
+        if event.kind == "connected":
+            self.connected = True
+            set_status_push(True, backend=self.backend)
+        elif event.kind == "disconnected":
+            self.connected = False
+            set_status_push(False, backend=self.backend)
+        elif event.kind == "status" and event.project is not None:
+            # 專案狀態變了：adapter 記下新狀態（直接讀檔時沿用），快取不能再用
+            apply_project_status(event.project)
+        elif event.kind == "removed":
+            invalidate_projects_cache(backend=self.backend)
+        try:
+            self.on_event(event)
+        except Exception as e:
+            print(f"[Events] 事件處理失敗: {e}")
+
+
+class EventSubscription(_EventSource):
+    """
+    WSL 事件串流：啟動 wsl_bridge.py --watch，邊讀邊解碼事件框架。
+
+    - 行程結束（WSL 關閉、bridge 當掉）→ 送出 disconnected，等一下再自動重連
+    - close()：關閉 stdin（bridge 收到 EOF 會自己結束）並停止重連
+    - adapter：要監看的後端（多後端時每個後端一條）；None = 單例 adapter
+    - log_path：日誌路徑樣板，bridge 用它 stat 日誌、沒變就不讀（空字串 = bridge 預設值，"off" = 每次都讀）
+    """
+
+    def __init__(
+        self,
+        on_event: EventCallback,
+        interval: float = DEFAULT_EVENTS_INTERVAL,
+        adapter: Optional[BackendAdapter] = None,
+        log_path: str = "",
+    ) -> None:
+        super().__init__(on_event, backend=adapter.name if adapter is not None else "")
+        self.interval = interval
+        self.adapter = adapter
+        self.log_path = log_path
+        self._proc: Optional[subprocess.Popen] = None
+        self._proc_lock = threading.Lock()
+
+    def close(self) -> None:
+        super().close()
+        with self._proc_lock:
+            proc = self._proc
+            self._proc = None
+        if proc is None:
+            return
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    def _run(self) -> None:
+        delay = RECONNECT_INITIAL
+        while not self._closed.is_set():
+            started = time.monotonic()
+            self._stream_once()
+            if self._closed.is_set():
+                break
+            if self.connected:
+                self._emit(BackendEvent("disconnected", backend=self.backend))
+            # 跑了一陣子才斷線 → 重連等待從頭算；一啟動就斷 → 逐次加倍
+            if time.monotonic() - started > RECONNECT_MAX:
+                delay = RECONNECT_INITIAL
+            print(f"[Events] 事件串流中斷，{delay:g}s 後重連")
+            self._closed.wait(delay)
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    def _stream_once(self) -> None:
+        """啟動一次監看行程並讀到它結束。"""
+        try:
+            proc = subprocess.Popen(
+                (self.adapter or backend_adapters()[0])._build_watch_command(self.interval, self.log_path),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                creationflags=CREATE_NO_WINDOW,
+            )
+        except OSError as e:
+            print(f"[Events] 無法啟動事件串流: {e}")
+            return
+
+        with self._proc_lock:
+            if self._closed.is_set():
+                proc.kill()
+                return
+            self._proc = proc
+
+        assert proc.stdout is not None
+        decoder = FrameDecoder()
+        while True:
+            data = proc.stdout.read1(65536)
+            if not data:
+                break
+            for frame in decoder.feed(data):
+                self._dispatch_frame(frame)
+        proc.wait()
+
+
+class LocalEventPublisher(_EventSource):
+    """
+    本機的模擬事件來源（不需要 WSL / daemon），用來測試事件驅動的 UI。
+
+    產生的是和 bridge 監看模式相同格式的框架，經過同一個 events_from_frame 轉換：
+    - 開始時為每個專案送一次 status（讀不到後端時改用兩個示範專案）
+    - 每隔 interval 秒，隨機挑一個專案送一行檔案事件日誌
+    - 偶爾觸發過熱保護：送出智能靜默日誌並把狀態切到 muting，下一輪再切回 running
+    """
+
+    def __init__(
+        self,
+        on_event: EventCallback,
+        interval: float = DEFAULT_EVENTS_INTERVAL,
+        projects: Optional[Callable[[], List[ProjectInfo]]] = None,
+        muting_chance: float = 0.1,
+    ) -> None:
+        super().__init__(on_event)
+        self.interval = interval
+        self.projects = projects or list_projects
+        self.muting_chance = muting_chance
+        self._counter = 0
+
+    def _snapshot(self) -> List[dict]:
+        """起始專案（原始 list_projects 格式）。"""
+        try:
+            infos = self.projects()
+        except BackendError as e:
+            print(f"[Events] 模擬事件改用示範專案（讀不到後端: {e}）")
+            infos = []
+        raws = [
+            {
+                "uuid": p.uuid, "name": p.name, "path": p.path,
+                "status": "running" if p.status == "monitoring" else "stopped",
+                "output_file": list(p.output_file), "target_files": list(p.target_files),
+                "backend": p.backend,
+            }
+            for p in infos
+        ]
+        if not raws:
+            raws = [
+                {"uuid": f"demo-{i}", "name": f"示範專案 {i}", "path": f"/demo/project_{i}", "status": "running"}
+                for i in (1, 2)
+            ]
+        return raws
+
+    def _log_line(self, text: str) -> str:
+        return f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {text}"
+
+    def _run(self) -> None:
+        raws = self._snapshot()
+        self._dispatch_frame({"event": "hello"})
+        for raw in raws:
+            self._dispatch_frame({"event": "status", "project": raw})
+
+        while not self._closed.wait(self.interval):
+            # 上一輪進入靜默的專案先恢復
+            for raw in raws:
+                if raw.get("status") == "muting":
+                    raw["status"] = "running"
+                    self._dispatch_frame({"event": "status", "project": dict(raw)})
+
+            active = [r for r in raws if r.get("status") == "running"] or raws
+            raw = random.choice(active)
+            self._counter += 1
+            base = str(raw.get("path") or "/demo").rstrip("/")
+            action = random.choice(("created", "modified", "modified", "deleted"))
+            lines = [self._log_line(f"[偵測] {action}: {base}/src/file_{self._counter}.py")]
+
+            if random.random() < self.muting_chance:
+                lines.append(self._log_line(f"智能靜默 Muting triggered: {base}/src"))
+                raw["status"] = "muting"
+                self._dispatch_frame({"event": "status", "project": dict(raw)})
+
+            # 模擬日誌沒有真正的檔案，所以不給游標
+            self._dispatch_frame({"event": "log", "uuid": raw["uuid"], "lines": lines, "cursor": "", "reset": False})
+
+        self.connected = False
+
+
+# ============================
+#  模組層：依設定建立事件來源
+# ============================
+
+_sources: List[_EventSource] = []
+
+
+def subscribe(
+    on_event: EventCallback,
+    source: Optional[str] = None,
+    interval: Optional[float] = None,
+) -> Optional[_EventSource]:
+    """
+    依 [backend] events / events_interval / events_log_path（或參數）開始訂閱後端事件。
+
+    - on_event 會在背景執行緒上被呼叫；Qt 介面請透過 workers.EventRelay 轉回 GUI 執行緒
+    - events=off 時回傳 None
+    """
+    config = _load_backend_config()
+    if source is None:
+        source = config.get("events", EVENT_SOURCE_WSL).strip().lower()
+    if interval is None:
+        try:
+            interval = float(config.get("events_interval", DEFAULT_EVENTS_INTERVAL))
+        except ValueError:
+            print(f"[Warning] events_interval 不是數字，改用預設 {DEFAULT_EVENTS_INTERVAL:g}s")
+            interval = DEFAULT_EVENTS_INTERVAL
+
+    if source == EVENT_SOURCE_OFF:
+        return None
+    if source == EVENT_SOURCE_LOCAL:
+        started: List[_EventSource] = [LocalEventPublisher(on_event, interval=interval)]
+    else:
+        if source != EVENT_SOURCE_WSL:
+            print(f"[Warning] 未知的 events 設定 '{source}'，改用 {EVENT_SOURCE_WSL}")
+        # 每個後端一條串流（多後端時慢的 / 斷線的後端不影響其他後端的事件）
+        started = []
+        fake_backends = set()
+        for backend in backend_adapters():
+            if backend.transport == TRANSPORT_FAKE:
+                # 假後端沒有 WSL 可以監看
+                fake_backends.add(backend.name)
+            else:
+                started.append(EventSubscription(
+                    on_event, interval=interval, adapter=backend,
+                    log_path=config.get("events_log_path", "").strip(),
+                ))
+        if fake_backends:
+            # 假後端的專案由一個本機模擬來源負責
+            started.append(LocalEventPublisher(
+                on_event,
+                interval=interval,
+                projects=lambda: [p for p in list_projects() if p.backend in fake_backends],
+            ))
+
+    _sources.extend(started)
+    for src in started:
+        src.start()
+    # 回傳第一個來源（單一後端時就是唯一的那個）；全部的來源由 shutdown() 關閉
+    return started[0] if started else None
+
+
+def shutdown() -> None:
+    """關閉所有訂閱（程式結束時呼叫）。"""
+    while _sources:
+        _sources.pop().close()
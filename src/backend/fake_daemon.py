@@ -0,0 +1,518 @@
+# src/backend/fake_daemon.py
+"""
+行程內的假後端（FakeDaemon）：不需要 WSL、也不需要 laplace_sentry_control_v2 daemon。
+
+它實作 adapter 會送出的每一個指令（list_projects / start_sentry / stop_sentry / get_log /
+get_muted_paths / list_ignore_candidates ... 以及 bridge 的 __tail_log__ / __ping__），
+狀態全部放在記憶體裡，並且提供和 WslDaemonSession 相同的介面：
+
+    request(cmd, args, on_chunk=None) -> Reply
+    request_batch([(cmd, args), ...]) -> [Reply, ...]
+    close()
+
+所以 adapter 把它當成「常駐連線」使用即可，批次、快取、串流片段的路徑完全不用改。
+回覆一樣先用 bridge 的框架編碼、再用 FrameDecoder 解回來，解碼成本與真實情況相同。
+
+啟用方式（擇一）：
+- sentry_config.ini：[backend] transport=fake
+- 環境變數 SENTRY_FAKE_BACKEND，內容是以逗號分隔的設定（"1" 代表全用預設值），例如
+
+      SENTRY_FAKE_BACKEND="projects=500,log_lines=100000,latency=0.03,jitter=0.01,error_rate=0.05,fail=get_log|start_sentry,seed=7"
+
+可調整的項目見 FakeDaemon.__init__。
+
+命令列模式 `python -m src.backend.fake_daemon <cmd> [args...]` 的輸出格式和真正的 daemon 相同，
+可以讓 wsl_bridge 把它當成 daemon 模組執行（效能量測用來比較 session / direct 模式）；
+每次執行都是全新的狀態，寫入不會保留。
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid as uuid_lib
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.backend.protocol import ChunkCallback, FrameDecoder, Reply, ReplyCollector
+from src.backend.session import SessionError
+from src.backend.wsl_bridge import DISTRO_COMMAND, PING_COMMAND, TAIL_LOG_COMMAND, _send_reply, tail_lines
+
+# 啟用假後端的環境變數（內容是設定字串，見 parse_spec）
+FAKE_BACKEND_ENV = "SENTRY_FAKE_BACKEND"
+
+# 預設的資料量
+DEFAULT_FAKE_PROJECTS = 20
+DEFAULT_FAKE_LOG_LINES = 1000
+DEFAULT_FAKE_CANDIDATES = 40
+
+# 解碼時每次餵給 FrameDecoder 的位元組數（和 session 的讀取大小一致）
+_READ_SIZE = 65536
+
+# 假日誌的第一行時間
+_LOG_EPOCH = datetime(2025, 1, 1, 9, 0, 0)
+
+
+class FakeDaemon:
+    """
+    記憶體裡的假後端。
+
+    - projects / log_lines / candidates：資料量（N 個專案、每個專案 M 行日誌、K 個忽略候選）
+    - latency / jitter：每個指令的延遲秒數（latency ± jitter，模擬 WSL 往返）
+    - cold_start：建立後（或 close 之後）第一個請求額外等待的秒數，模擬 WSL 冷啟動；該回覆標為 cold
+    - error_rate：每個指令以這個機率失敗（結束碼 1，adapter 會拋出 BackendError）
+    - crash_rate：每個指令以這個機率「連線中途死亡」（SessionError(delivered=True)）
+    - fail：一律失敗的指令名稱
+    - seed：亂數種子（資料與錯誤注入都可重現）
+    - uuid_prefix：產生的專案 uuid 前綴（多後端模式下每個假後端各用自己的名稱，uuid 才不會重複）
+    """
+
+    def __init__(
+        self,
+        projects: int = DEFAULT_FAKE_PROJECTS,
+        log_lines: int = DEFAULT_FAKE_LOG_LINES,
+        candidates: int = DEFAULT_FAKE_CANDIDATES,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        cold_start: float = 0.0,
+        error_rate: float = 0.0,
+        crash_rate: float = 0.0,
+        fail: Iterable[str] = (),
+        seed: Optional[int] = None,
+        uuid_prefix: str = "",
+    ) -> None:
+        self.uuid_prefix = uuid_prefix
+        self.log_lines = max(0, log_lines)
+        self.candidates = max(0, candidates)
+        self.latency = max(0.0, latency)
+        self.jitter = max(0.0, jitter)
+        self.cold_start = max(0.0, cold_start)
+        # 下一個請求是否要付冷啟動（模擬「行程還沒啟動」）
+        self._cold = True
+        self.error_rate = error_rate
+        self.crash_rate = crash_rate
+        self.fail = frozenset(fail)
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._projects: List[dict] = [self._make_project(i) for i in range(1, max(0, projects) + 1)]
+        # 日誌與忽略規則第一次用到時才產生（一萬個專案 × 一百萬行不必全部先放進記憶體）
+        self._logs: Dict[str, List[str]] = {}
+        self._ignore_patterns: Dict[str, List[str]] = {}
+        self._muted: Dict[str, List[str]] = {}
+
+        self._handlers: Dict[str, Callable[[List[str]], dict]] = {
+            "list_projects": self._list_projects,
+            "add_project": self._add_project,
+            "delete_project": self._delete_project,
+            "edit_project": self._edit_project,
+            "add_target": self._add_target,
+            "remove_target": self._remove_target,
+            "start_sentry": self._start_sentry,
+            "stop_sentry": self._stop_sentry,
+            "manual_update": self._manual_update,
+            "list_ignore_candidates": self._list_ignore_candidates,
+            "list_ignore_patterns": self._list_ignore_patterns,
+            "update_ignore_patterns": self._update_ignore_patterns,
+            "add_ignore_patterns": self._add_ignore_patterns,
+            "get_log": self._get_log,
+            "get_muted_paths": self._get_muted_paths,
+            PING_COMMAND: lambda args: _text(""),
+            TAIL_LOG_COMMAND: self._tail_log,
+            # 假後端不在任何 distro 裡
+            DISTRO_COMMAND: lambda args: _value(""),
+        }
+
+    # ---------------------------------------------------------
+    # 建立
+    # ---------------------------------------------------------
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "FakeDaemon":
+        """用設定字串建立（格式見 parse_spec）。"""
+        return cls(**parse_spec(spec))
+
+    @classmethod
+    def from_env(cls, **overrides) -> "FakeDaemon":
+        """用環境變數 SENTRY_FAKE_BACKEND 的設定建立（沒設定時全用預設值）；overrides 優先於環境變數。"""
+        return cls(**{**parse_spec(os.environ.get(FAKE_BACKEND_ENV, "")), **overrides})
+
+    def _make_project(self, index: int) -> dict:
+        base = f"/home/fake/projects/project_{index:05d}"
+        # 大約一半在監控中，少數正在靜默
+        roll = self._random.random()
+        status = "muting" if roll < 0.05 else "running" if roll < 0.5 else "stopped"
+        return {
+            "uuid": f"{self.uuid_prefix}fake-{index:05d}",
+            "name": f"示範專案 {index:05d}",
+            "path": base,
+            "status": status,
+            "output_file": [f"{base}/README.md"],
+            "target_files": [f"{base}/README.md"],
+        }
+
+    # ---------------------------------------------------------
+    # WslDaemonSession 相容介面
+    # ---------------------------------------------------------
+
+    def is_alive(self) -> bool:
+        return True
+
+    def start(self) -> None:
+        pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._cold = True
+
+    def request(self, cmd: str, args: List[str], on_chunk: Optional[ChunkCallback] = None) -> Reply:
+        """
+        執行一個指令（含延遲與錯誤注入），回覆經過框架編碼 / 解碼後回傳。
+        模擬延遲算在往返（spawn），只有 invoke 本身算後端執行時間，和 bridge 的 elapsed 一致。
+        """
+        cold = self._delay()
+        self._maybe_crash(cmd)
+        started = time.perf_counter()
+        body = self.invoke(cmd, args)
+        body["elapsed"] = time.perf_counter() - started
+
+        channel = io.BytesIO()
+        _send_reply(channel, 1, body)
+        decoder = FrameDecoder()
+        collector = ReplyCollector(1, on_chunk)
+        data = channel.getvalue()
+        for start in range(0, len(data), _READ_SIZE):
+            for frame in decoder.feed(data[start:start + _READ_SIZE]):
+                collector.add(frame)
+        reply = collector.reply
+        assert reply is not None
+        reply.parse_seconds = decoder.busy_seconds
+        reply.cold = cold
+        return reply
+
+    def request_batch(self, commands: List[Tuple[str, List[str]]]) -> List[Reply]:
+        """一次「往返」執行多個指令：延遲只算一次，和 bridge 的批次一樣不串流。"""
+        if not commands:
+            return []
+        cold = self._delay()
+        self._maybe_crash(commands[0][0])
+        replies = []
+        for cmd, args in commands:
+            started = time.perf_counter()
+            body = self.invoke(cmd, args)
+            body["elapsed"] = time.perf_counter() - started
+            reply = Reply.from_frame(body)
+            reply.cold = cold
+            replies.append(reply)
+        return replies
+
+    def _delay(self) -> bool:
+        """模擬往返延遲；回傳這次是否付了冷啟動。"""
+        with self._lock:
+            cold, self._cold = self._cold, False
+            offset = self._random.uniform(-self.jitter, self.jitter) if self.latency or self.jitter else 0.0
+        wait = self.latency + offset + (self.cold_start if cold else 0.0)
+        if wait > 0:
+            time.sleep(wait)
+        return cold
+
+    def _maybe_crash(self, cmd: str) -> None:
+        if self.crash_rate <= 0:
+            return
+        with self._lock:
+            crashed = self._random.random() < self.crash_rate
+        if crashed:
+            raise SessionError(f"[fake] 連線在執行 {cmd} 時中斷", delivered=True)
+
+    # ---------------------------------------------------------
+    # 指令執行（回傳和 bridge 相同的回覆內容：code / stderr / value 或 text）
+    # ---------------------------------------------------------
+
+    def invoke(self, cmd: str, args: List[str]) -> dict:
+        """執行一個指令並回傳回覆內容（不含延遲；錯誤注入仍然生效）。"""
+        handler = self._handlers.get(cmd)
+        if handler is None:
+            return _error(f"未知的指令: {cmd}", code=2)
+        with self._lock:
+            injected = cmd in self.fail or (self.error_rate > 0 and self._random.random() < self.error_rate)
+            if injected:
+                return _error(f"[fake] 注入的錯誤: {cmd}")
+            return handler([str(a) for a in args])
+
+    def append_log(self, uuid: str, lines: Iterable[str]) -> None:
+        """在某個專案的日誌後面接上幾行（測試增量讀取 / 事件用）。"""
+        with self._lock:
+            self._log_of(uuid).extend(str(x) for x in lines)
+
+    def _find(self, uuid: str) -> Optional[dict]:
+        return next((p for p in self._projects if p["uuid"] == uuid), None)
+
+    def _require(self, args: List[str], count: int) -> Optional[dict]:
+        """檢查參數數量並找出 args[0] 指定的專案；失敗時回傳 None（由呼叫端回報錯誤）。"""
+        if len(args) < count:
+            return None
+        return self._find(args[0])
+
+    # --- 專案 ---
+
+    def _list_projects(self, args: List[str]) -> dict:
+        return _value([dict(p, output_file=list(p["output_file"]), target_files=list(p["target_files"])) for p in self._projects])
+
+    def _add_project(self, args: List[str]) -> dict:
+        if len(args) < 3:
+            return _error("用法: add_project <name> <path> <output_file>")
+        name, path, output_file = args[:3]
+        for p in self._projects:
+            if p["name"] == name:
+                return _error(f"錯誤：專案名稱 '{name}' 已存在。")
+            if p["path"] == path:
+                return _error(f"錯誤：路徑 '{path}' 已被專案 '{p['name']}' 監控。")
+        self._projects.append({
+            "uuid": str(uuid_lib.uuid4()),
+            "name": name,
+            "path": path,
+            "status": "stopped",
+            "output_file": [output_file],
+            "target_files": [output_file],
+        })
+        return _text(f"✅ 專案 '{name}' 已新增。")
+
+    def _delete_project(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        self._projects.remove(proj)
+        for store in (self._logs, self._ignore_patterns, self._muted):
+            store.pop(proj["uuid"], None)
+        return _text(f"✅ 專案 '{proj['name']}' 已刪除。")
+
+    def _edit_project(self, args: List[str]) -> dict:
+        proj = self._require(args, 3)
+        if proj is None:
+            return _error("錯誤：找不到專案或參數不足。")
+        field, value = args[1], args[2]
+        if field == "output_file":
+            proj["output_file"] = [value]
+        elif field in ("name", "path"):
+            proj[field] = value
+        else:
+            return _error(f"錯誤：不支援的欄位 '{field}'。")
+        return _text(f"✅ 已更新 {field}。")
+
+    def _add_target(self, args: List[str]) -> dict:
+        proj = self._require(args, 2)
+        if proj is None:
+            return _error("錯誤：找不到專案或參數不足。")
+        if args[1] in proj["target_files"]:
+            return _error(f"錯誤：目標 '{args[1]}' 已存在。")
+        proj["target_files"].append(args[1])
+        return _text("✅ 已追加寫入目標。")
+
+    def _remove_target(self, args: List[str]) -> dict:
+        proj = self._require(args, 2)
+        if proj is None:
+            return _error("錯誤：找不到專案或參數不足。")
+        if args[1] not in proj["target_files"]:
+            return _error(f"錯誤：目標 '{args[1]}' 不存在。")
+        proj["target_files"].remove(args[1])
+        return _text("✅ 已移除寫入目標。")
+
+    # --- 哨兵 ---
+
+    def _start_sentry(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        if proj["status"] not in ("running", "muting"):
+            proj["status"] = "running"
+            self._log_of(proj["uuid"]).append(self._log_line(f"哨兵啟動，監控 {proj['path']}"))
+        return _text("✅ 哨兵已啟動。")
+
+    def _stop_sentry(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        if proj["status"] != "stopped":
+            proj["status"] = "stopped"
+            self._log_of(proj["uuid"]).append(self._log_line("Stopping sentry... 已成功發送終止信號"))
+        return _text("✅ 哨兵已停止。")
+
+    def _manual_update(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        self._log_of(proj["uuid"]).append(self._log_line("成功觸發更新指令"))
+        return _text("✅ 已觸發更新。")
+
+    # --- 忽略規則 / 靜默 ---
+
+    def _patterns_of(self, uuid: str) -> List[str]:
+        return self._ignore_patterns.setdefault(uuid, ["*.tmp", "*.log", "__pycache__/"])
+
+    def _list_ignore_candidates(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        dirs = ["node_modules/", ".git/", "build/", "dist/"] + [f"dir_{k:04d}/" for k in range(self.candidates)]
+        patterns = self._patterns_of(proj["uuid"])
+        return _value(patterns + [d for d in dirs[:self.candidates] if d not in patterns])
+
+    def _list_ignore_patterns(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        return _value(list(self._patterns_of(proj["uuid"])))
+
+    def _update_ignore_patterns(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        self._ignore_patterns[proj["uuid"]] = list(args[1:])
+        return _text("✅ 忽略規則已更新。")
+
+    def _muted_of(self, proj: dict) -> List[str]:
+        if proj["uuid"] not in self._muted:
+            count = 3 if proj["status"] == "muting" else 0
+            self._muted[proj["uuid"]] = [f"{proj['path']}/hot_dir_{k}" for k in range(count)]
+        return self._muted[proj["uuid"]]
+
+    def _get_muted_paths(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        return _value(list(self._muted_of(proj)))
+
+    def _add_ignore_patterns(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        patterns = self._patterns_of(proj["uuid"])
+        root = proj["path"].rstrip("/") + "/"
+        for path in self._muted_of(proj):
+            rel = path[len(root):] if path.startswith(root) else path
+            if rel + "/" not in patterns:
+                patterns.append(rel + "/")
+        self._muted[proj["uuid"]] = []
+        if proj["status"] == "muting":
+            proj["status"] = "running"
+        return _text("✅ 靜默路徑已固化。")
+
+    # --- 日誌 ---
+
+    def _log_line(self, text: str, at: Optional[datetime] = None) -> str:
+        return f"[{(at or datetime.now()):%Y-%m-%d %H:%M:%S}] {text}"
+
+    def _log_of(self, uuid: str) -> List[str]:
+        """專案的日誌（第一次用到時產生 log_lines 行）。"""
+        lines = self._logs.get(uuid)
+        if lines is None:
+            proj = self._find(uuid)
+            base = proj["path"] if proj else "/home/fake"
+            # 每個專案用自己的種子，同一個 uuid 每次產生的內容都一樣
+            rng = random.Random(uuid)
+            actions = ("created", "modified", "modified", "modified", "deleted")
+            lines = [self._log_line(f"哨兵啟動，監控 {base}", _LOG_EPOCH)]
+            for i in range(1, self.log_lines):
+                at = _LOG_EPOCH + timedelta(seconds=i)
+                if i % 997 == 0:
+                    lines.append(self._log_line(f"智能靜默 Muting triggered: {base}/hot_dir_{i % 3}", at))
+                else:
+                    lines.append(self._log_line(f"[偵測] {rng.choice(actions)}: {base}/src/file_{rng.randrange(500)}.py", at))
+            self._logs[uuid] = lines
+        return lines
+
+    def _get_log(self, args: List[str]) -> dict:
+        proj = self._require(args, 1)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {args[:1]}")
+        return _value(list(self._log_of(proj["uuid"])))
+
+    def _tail_log(self, args: List[str]) -> dict:
+        """bridge 的 __tail_log__：切法與 wsl_bridge 相同（tail_lines）。"""
+        uuid, after, anchor, limit = (list(args) + ["", "0", "", "0"])[:4]
+        proj = self._find(uuid)
+        if proj is None:
+            return _error(f"錯誤：找不到專案 {uuid}")
+        try:
+            return _value(tail_lines(self._log_of(uuid), int(after), anchor, int(limit)))
+        except ValueError as e:
+            return _error(f"bad tail arguments: {e}", code=2)
+
+
+# ---------------------------------------------------------
+# 回覆內容與設定字串
+# ---------------------------------------------------------
+
+def _value(value) -> dict:
+    return {"code": 0, "stderr": "", "value": value}
+
+
+def _text(text: str) -> dict:
+    return {"code": 0, "stderr": "", "text": text}
+
+
+def _error(message: str, code: int = 1) -> dict:
+    return {"code": code, "stderr": message, "text": ""}
+
+
+# 設定字串的鍵 → 型別
+_SPEC_TYPES: Dict[str, Callable[[str], object]] = {
+    "projects": int,
+    "log_lines": int,
+    "candidates": int,
+    "latency": float,
+    "jitter": float,
+    "cold_start": float,
+    "error_rate": float,
+    "crash_rate": float,
+    "seed": int,
+    "uuid_prefix": str,
+    "fail": lambda v: [c for c in v.split("|") if c],
+}
+
+
+def parse_spec(spec: str) -> dict:
+    """
+    "projects=500,latency=0.03,fail=get_log|start_sentry" → FakeDaemon 的參數字典。
+
+    空字串或 "1" / "on" / "true" 代表全用預設值；看不懂的項目印出警告後略過。
+    """
+    options: dict = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item or item.lower() in ("1", "on", "true", "yes"):
+            continue
+        key, sep, raw = item.partition("=")
+        key = key.strip().lower()
+        convert = _SPEC_TYPES.get(key)
+        if not sep or convert is None:
+            print(f"[Warning] {FAKE_BACKEND_ENV}: 看不懂的設定 '{item}'，略過")
+            continue
+        try:
+            options[key] = convert(raw.strip())
+        except ValueError:
+            print(f"[Warning] {FAKE_BACKEND_ENV}: '{item}' 的值格式錯誤，略過")
+    return options
+
+
+def main(argv: List[str]) -> int:
+    """命令列模式：執行一個指令，照 daemon 的格式印出結果（JSON 或文字），回傳結束碼。"""
+    if not argv:
+        print("usage: python -m src.backend.fake_daemon <cmd> [args...]", file=sys.stderr)
+        return 2
+    body = FakeDaemon.from_env().invoke(argv[0], argv[1:])
+    if "value" in body:
+        print(json.dumps(body["value"], ensure_ascii=False))
+    elif body.get("text"):
+        print(body["text"])
+    if body.get("stderr"):
+        print(body["stderr"], file=sys.stderr)
+    return int(body["code"])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,217 @@
+# src/backend/metrics.py
+"""
+adapter 指令的延遲量測（記憶體內直方圖）
+
+每個送往後端的指令都會以「指令名稱 + 通訊模式」為單位記錄：
+
+- total：從 adapter 發出到拿到結果的總時間
+- backend：bridge 在 WSL 端執行 daemon 的時間（bridge 回報在回覆框架的 elapsed）
+- parse：Windows 端解碼框架的時間（FrameDecoder 忙碌的時間）
+- spawn：剩下的部分 = 行程啟動、WSL 冷啟動、管線往返（total - backend - parse）
+- cold / warm：總時間再依「這次是否啟動了新的 bridge 行程」分開統計（direct 模式每次都是冷啟動）
+- 失敗依類別計數（BackendError.kind）：spawn / transport / timeout / backend / protocol
+
+用法：
+    metrics.record("list_projects", "session", total, backend, parse, cold=False)
+    metrics.record_failure("get_log", "direct", "timeout", total)
+    metrics.record_startup("tray_icon", seconds)   # 啟動各階段花的時間（只記最後一次）
+    metrics.snapshot()        # 給診斷面板用的 dict
+    metrics.dump("x.json")    # 寫成 JSON 檔
+
+控制台按 Ctrl+Shift+D 可以打開診斷分頁（src/tray/diagnostics.py）。
+"""
+from __future__ import annotations
+
+import json
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# 直方圖的桶子上界（毫秒）；最後還有一個「超過上界」的桶子
+BUCKETS_MS: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# 每個直方圖保留最近幾筆原始樣本（算百分位數用）
+RECENT_SAMPLES = 512
+
+# 失敗類別（與 BackendError.kind 對應）
+FAILURE_KINDS = ("spawn", "transport", "timeout", "backend", "protocol")
+
+
+class Histogram:
+    """固定桶子的延遲直方圖 + 最近樣本（百分位數）。不執行緒安全，由 MetricsRegistry 的鎖保護。"""
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._recent: Deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, ms: float) -> None:
+        index = next((i for i, bound in enumerate(BUCKETS_MS) if ms <= bound), len(BUCKETS_MS))
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self._recent.append(ms)
+
+    def percentile(self, q: float) -> float:
+        """最近樣本的第 q 百分位（最近鄰）；沒有樣本時為 0。"""
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * q / 100.0)))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50": round(self.percentile(50), 3),
+            "p95": round(self.percentile(95), 3),
+            "p99": round(self.percentile(99), 3),
+            "max": round(self.max_ms, 3),
+            "buckets": [
+                {"le": bound, "count": n}
+                for bound, n in zip([*BUCKETS_MS, None], self.counts)
+            ],
+        }
+
+
+class CommandStats:
+    """一個（指令, 通訊模式）的統計。"""
+
+    def __init__(self) -> None:
+        self.total = Histogram()
+        self.spawn = Histogram()
+        self.backend = Histogram()
+        self.parse = Histogram()
+        # 成功請求的總時間，依冷 / 熱分開
+        self.cold = Histogram()
+        self.warm = Histogram()
+        self.failures: Counter = Counter()
+        self.last_error = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total.to_dict(),
+            "spawn": self.spawn.to_dict(),
+            "backend": self.backend.to_dict(),
+            "parse": self.parse.to_dict(),
+            "cold": self.cold.to_dict(),
+            "warm": self.warm.to_dict(),
+            "failures": dict(self.failures),
+            "last_error": self.last_error,
+        }
+
+
+class MetricsRegistry:
+    """所有指令的統計（執行緒安全）。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], CommandStats] = {}
+        self._since = datetime.now()
+        # 啟動階段 → 毫秒（依記錄順序；reset 不清除，因為無法重新量測）
+        self._startup: Dict[str, float] = {}
+
+    def _get(self, cmd: str, transport: str) -> CommandStats:
+        key = (cmd, transport)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = CommandStats()
+        return stats
+
+    def record(
+        self, cmd: str, transport: str, total: float, backend: float = 0.0, parse: float = 0.0, cold: bool = False
+    ) -> None:
+        """記錄一次成功的指令（秒）；backend / parse 不可能超過總時間，超過時截斷。cold = 這次啟動了新的行程。"""
+        total_ms = total * 1000.0
+        backend_ms = min(max(0.0, backend * 1000.0), total_ms)
+        parse_ms = min(max(0.0, parse * 1000.0), total_ms - backend_ms)
+        with self._lock:
+            stats = self._get(cmd, transport)
+            stats.total.add(total_ms)
+            stats.backend.add(backend_ms)
+            stats.parse.add(parse_ms)
+            stats.spawn.add(total_ms - backend_ms - parse_ms)
+            (stats.cold if cold else stats.warm).add(total_ms)
+
+    def record_failure(self, cmd: str, transport: str, kind: str, total: float, error: str = "") -> None:
+        """記錄一次失敗的指令（秒）：只計入總時間與失敗類別。"""
+        with self._lock:
+            stats = self._get(cmd, transport)
+            stats.total.add(total * 1000.0)
+            stats.failures[kind] += 1
+            if error:
+                stats.last_error = error
+
+    def record_startup(self, stage: str, seconds: float) -> None:
+        """記錄啟動到某個階段花的時間（秒）；同一階段再記一次會蓋掉。"""
+        with self._lock:
+            self._startup[stage] = round(seconds * 1000.0, 3)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """目前的統計（可直接 json.dumps）。"""
+        with self._lock:
+            commands = [
+                {"command": cmd, "transport": transport, **stats.to_dict()}
+                for (cmd, transport), stats in sorted(self._stats.items())
+            ]
+            since = self._since
+            startup = dict(self._startup)
+        return {
+            "since": since.isoformat(timespec="seconds"),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "buckets_ms": list(BUCKETS_MS),
+            "startup": startup,
+            "commands": commands,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._since = datetime.now()
+
+    def dump(self, path: str | Path) -> Path:
+        """把目前的統計寫成 JSON 檔，回傳寫入的路徑。"""
+        target = Path(path)
+        target.write_text(json.dumps(self.snapshot(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return target
+
+
+# ============================
+#  模組層：共用的單一 registry
+# ============================
+
+registry = MetricsRegistry()
+
+
+def record(
+    cmd: str, transport: str, total: float, backend: float = 0.0, parse: float = 0.0, cold: bool = False
+) -> None:
+    registry.record(cmd, transport, total, backend, parse, cold)
+
+
+def record_failure(cmd: str, transport: str, kind: str, total: float, error: str = "") -> None:
+    registry.record_failure(cmd, transport, kind, total, error)
+
+
+def record_startup(stage: str, seconds: float) -> None:
+    registry.record_startup(stage, seconds)
+
+
+def snapshot() -> Dict[str, Any]:
+    return registry.snapshot()
+
+
+def reset() -> None:
+    registry.reset()
+
+
+def dump(path: Optional[str | Path] = None) -> Path:
+    """寫出 JSON；沒給路徑時用 sentry_metrics_<時間>.json（目前目錄）。"""
+    if path is None:
+        path = f"sentry_metrics_{datetime.now():%Y%m%d_%H%M%S}.json"
+    return registry.dump(path)
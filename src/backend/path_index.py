@@ -0,0 +1,179 @@
+# src/backend/path_index.py
+"""
+專案路徑索引（ProjectPathIndex）
+
+拖曳資料夾到 The Eye 時，要回答三個問題：
+1. 這個資料夾本身是不是已註冊專案？          → lookup()            （dict，O(1)）
+2. 它是不是某個已註冊專案底下的子資料夾？    → find_containing()   （trie，O(路徑深度)）
+3. 它底下是不是已經有其他已註冊專案？        → find_within()       （trie 子樹）
+
+索引以「正規化後的 WSL 路徑」為 key（src/backend/paths.py 的 to_wsl，結果有快取）：
+- 反斜線一律轉成正斜線、合併連續斜線、去掉結尾斜線（根目錄 "/" 除外）
+- 專案路徑若存成 Windows 形式（C:/... 或 //wsl$/...）也先轉成 WSL 路徑，查詢時兩種形式都能比對
+- 大小寫保持原樣（WSL 端是 Linux 檔案系統）
+
+專案列表變動時呼叫 update(projects)：只依 uuid 比對新增 / 移除 / 路徑變更，
+不會整個重建。
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from src.backend.paths import to_wsl
+
+if TYPE_CHECKING:
+    # 只用於型別提示；adapter 會 import 本模組，執行期不能反過來 import
+    from src.backend.adapter import ProjectInfo
+
+
+def _components(normalized: str) -> Tuple[str, ...]:
+    """"/home/user/proj" → ("home", "user", "proj")"""
+    return tuple(part for part in normalized.split("/") if part)
+
+
+class _TrieNode:
+    """路徑 trie 的一個節點（一個路徑元件）。"""
+    __slots__ = ("children", "uuids")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_TrieNode"] = {}
+        # 註冊在這個路徑上的專案（理論上一個，但後端不保證路徑唯一，所以用 dict 保序）
+        self.uuids: Dict[str, None] = {}
+
+
+class ProjectPathIndex:
+    """
+    專案路徑索引：正規化路徑 → 專案（dict）＋ 路徑元件 trie。
+
+    - 不執行緒安全；adapter 會在自己的鎖內更新與查詢。
+    """
+
+    def __init__(self, projects: Iterable[ProjectInfo] = ()) -> None:
+        # uuid -> (正規化路徑, ProjectInfo)
+        self._by_uuid: Dict[str, Tuple[str, ProjectInfo]] = {}
+        # 正規化路徑 -> {uuid: None}（保序）
+        self._by_path: Dict[str, Dict[str, None]] = {}
+        self._root = _TrieNode()
+        self.update(projects)
+
+    def __len__(self) -> int:
+        return len(self._by_uuid)
+
+    # ---------------------------------------------------------
+    # 更新
+    # ---------------------------------------------------------
+
+    def update(self, projects: Iterable[ProjectInfo]) -> None:
+        """
+        以新的專案列表為準，增量更新索引：
+        - 消失的 uuid → 移除
+        - 路徑改變的 uuid → 先移除舊路徑再加入新路徑
+        - 其餘只更新 ProjectInfo 內容（狀態等），trie 不動
+        """
+        incoming: Dict[str, ProjectInfo] = {p.uuid: p for p in projects if p.uuid}
+
+        for uuid in [u for u in self._by_uuid if u not in incoming]:
+            self.remove(uuid)
+
+        for proj in incoming.values():
+            self.add(proj)
+
+    def add(self, proj: ProjectInfo) -> None:
+        """加入（或更新）一個專案。"""
+        path = to_wsl(proj.path)
+        existing = self._by_uuid.get(proj.uuid)
+        if existing is not None:
+            if existing[0] == path:
+                self._by_uuid[proj.uuid] = (path, proj)
+                return
+            self.remove(proj.uuid)
+
+        if not path:
+            # 沒有路徑的專案不進索引（無法比對）
+            return
+
+        self._by_uuid[proj.uuid] = (path, proj)
+        self._by_path.setdefault(path, {})[proj.uuid] = None
+
+        node = self._root
+        for part in _components(path):
+            node = node.children.setdefault(part, _TrieNode())
+        node.uuids[proj.uuid] = None
+
+    def remove(self, uuid: str) -> None:
+        """移除一個專案（並修剪變空的 trie 分支）。"""
+        entry = self._by_uuid.pop(uuid, None)
+        if entry is None:
+            return
+        path = entry[0]
+
+        holders = self._by_path.get(path)
+        if holders is not None:
+            holders.pop(uuid, None)
+            if not holders:
+                del self._by_path[path]
+
+        # 沿路記下節點，移除後由下往上修剪空節點
+        trail: List[Tuple[_TrieNode, str]] = []
+        node = self._root
+        for part in _components(path):
+            child = node.children.get(part)
+            if child is None:
+                return
+            trail.append((node, part))
+            node = child
+        node.uuids.pop(uuid, None)
+
+        for parent, part in reversed(trail):
+            child = parent.children[part]
+            if child.uuids or child.children:
+                break
+            del parent.children[part]
+
+    # ---------------------------------------------------------
+    # 查詢（參數通常是 WSL 路徑；Windows 路徑也會經 to_wsl 轉換）
+    # ---------------------------------------------------------
+
+    def lookup(self, wsl_path: str) -> Optional[ProjectInfo]:
+        """完全相同路徑的專案（O(1)）。"""
+        holders = self._by_path.get(to_wsl(wsl_path))
+        if not holders:
+            return None
+        return self._by_uuid[next(iter(holders))][1]
+
+    def find_containing(self, wsl_path: str, include_self: bool = False) -> Optional[ProjectInfo]:
+        """
+        包含此路徑的「最深」專案（路徑是某專案的子資料夾）。
+        include_self=True 時，路徑本身就是專案也算。
+        """
+        parts = _components(to_wsl(wsl_path))
+        found: Optional[str] = None
+        node = self._root
+        # depth 0 是根目錄 "/"；depth == len(parts) 是路徑本身
+        for depth in range(len(parts) + 1):
+            if depth > 0:
+                child = node.children.get(parts[depth - 1])
+                if child is None:
+                    break
+                node = child
+            if node.uuids and (include_self or depth < len(parts)):
+                found = next(iter(node.uuids))
+        return self._by_uuid[found][1] if found is not None else None
+
+    def find_within(self, wsl_path: str) -> List[ProjectInfo]:
+        """此路徑底下（不含本身）的所有已註冊專案，依路徑排序。"""
+        node = self._root
+        for part in _components(to_wsl(wsl_path)):
+            node = node.children.get(part)
+            if node is None:
+                return []
+
+        found: List[Tuple[str, ProjectInfo]] = []
+        stack = list(node.children.values())
+        while stack:
+            current = stack.pop()
+            found.extend(self._by_uuid[u] for u in current.uuids)
+            stack.extend(current.children.values())
+        # 用索引裡已經正規化好的路徑排序，不必再轉一次
+        found.sort(key=lambda entry: entry[0])
+        return [proj for _path, proj in found]
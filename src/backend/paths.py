@@ -0,0 +1,141 @@
+# src/backend/paths.py
+"""
+Windows ⇄ WSL 路徑轉換（有快取）
+
+UI 拿到的是 Windows 路徑（拖曳、檔案對話框），後端與路徑索引用的是 WSL 路徑；
+顯示給使用者時再轉回 Windows 形式。所有轉換都集中在這裡：
+
+    to_wsl(r"C:\\Work\\proj")                   → "/mnt/c/Work/proj"
+    to_wsl(r"\\\\wsl$\\Ubuntu\\home\\me")           → "/home/me"
+    split_wsl(r"\\\\wsl.localhost\\Debian\\srv")   → ("/srv", "Debian")
+    to_windows("/mnt/c/Work/proj")              → r"C:\\Work\\proj"
+    to_windows("/home/me", distro="Ubuntu")     → r"\\\\wsl$\\Ubuntu\\home\\me"
+    to_wsl_many([...]) / to_windows_many([...]) # 整份列表一次轉換（重複的路徑只轉一次）
+
+- 兩個方向都用 lru_cache 記住結果：同一個路徑在每次刷新時只是一次 dict 查詢，不會重跑正規表示式。
+- 輸入可以是任何一種形式（反斜線 / 正斜線、磁碟機、\\\\wsl$ 或 \\\\wsl.localhost UNC、WSL 路徑），
+  兩個函式都會先統一再轉換。
+- 多個 distro：UNC 路徑裡的 distro 名稱由 split_wsl 一併回傳；
+  to_windows 要把 /mnt 以外的 WSL 路徑轉成 UNC 時需要知道 distro，依序用
+  參數 → 路徑本身帶的 → 預設 distro（[backend] wsl_distro，或 adapter 暖機時向 bridge 問到的）；
+  都沒有時維持 WSL 路徑原樣（不從看過的 UNC 路徑猜測：那可能是別的 distro）。
+"""
+from __future__ import annotations
+
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 每個方向最多記住幾個路徑（專案數 × 寫入檔數，遠小於這個值）
+PATH_CACHE_SIZE = 4096
+
+# 轉成 UNC 時使用的前綴（\\wsl$ 在舊版 Windows 10 也能用）
+WSL_UNC_PREFIX = "\\\\wsl$\\"
+
+# 連續的斜線（// 或 ///）
+_MULTI_SLASH = re.compile(r"/{2,}")
+# //wsl$/<distro>/... 或 //wsl.localhost/<distro>/...（已經把反斜線換成正斜線）
+_WSL_UNC = re.compile(r"^//(?:wsl\$|wsl\.localhost)/([^/]+)(/.*)?$", re.IGNORECASE)
+# C: 或 C:/...
+_DRIVE = re.compile(r"^([A-Za-z]):(?:/(.*))?$")
+# /mnt/c 或 /mnt/c/...
+_MNT_DRIVE = re.compile(r"^/mnt/([A-Za-z])(?:/(.*))?$")
+
+_distro_lock = threading.Lock()
+# 預設 distro（None = 還不知道）
+_default_distro: Optional[str] = None
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def normalize_wsl_path(path: str) -> str:
+    """把 WSL 路徑整理成標準形式：反斜線轉正斜線、合併連續斜線、去掉結尾斜線（根目錄 "/" 除外）。"""
+    p = _MULTI_SLASH.sub("/", path.strip().replace("\\", "/"))
+    if len(p) > 1:
+        p = p.rstrip("/")
+    return p
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def split_wsl(path: str) -> Tuple[str, Optional[str]]:
+    """任何形式的路徑 → (正規化的 WSL 路徑, UNC 路徑帶的 distro 或 None)。"""
+    p = path.strip().replace("\\", "/")
+
+    # 1. WSL UNC 路徑：\\wsl$\Ubuntu\home\user → /home/user（distro 另外回傳）
+    unc = _WSL_UNC.match(p)
+    if unc:
+        return normalize_wsl_path(unc.group(2) or "/"), unc.group(1)
+
+    # 2. Windows 磁碟機：D:\Project → /mnt/d/Project
+    drive = _DRIVE.match(p)
+    if drive:
+        return normalize_wsl_path(f"/mnt/{drive.group(1).lower()}/{drive.group(2) or ''}"), None
+
+    # 3. 已經是 WSL 路徑（或相對路徑）：只做正規化
+    return normalize_wsl_path(p), None
+
+
+def to_wsl(path: str) -> str:
+    """任何形式的路徑 → 正規化的 WSL 路徑。"""
+    return split_wsl(path)[0]
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def _to_windows(path: str, distro: Optional[str], fallback: Optional[str]) -> str:
+    wsl_path, path_distro = split_wsl(path)
+    if not wsl_path.startswith("/"):
+        # 相對路徑（或空字串）：只換成反斜線
+        return wsl_path.replace("/", "\\")
+
+    mnt = _MNT_DRIVE.match(wsl_path)
+    if mnt:
+        return f"{mnt.group(1).upper()}:\\" + (mnt.group(2) or "").replace("/", "\\")
+
+    distro = distro or path_distro or fallback
+    if not distro:
+        # 不知道是哪個 distro，無法組成 UNC：維持 WSL 路徑
+        return wsl_path
+    return WSL_UNC_PREFIX + distro + wsl_path.replace("/", "\\").rstrip("\\")
+
+
+def to_windows(path: str, distro: Optional[str] = None) -> str:
+    """任何形式的路徑 → Windows 路徑（/mnt/<d> 轉磁碟機，其他 WSL 路徑轉 \\\\wsl$\\<distro> UNC）。"""
+    return _to_windows(path, distro, _default_distro)
+
+
+def to_wsl_many(paths: Iterable[str]) -> List[str]:
+    """整份列表轉成 WSL 路徑（順序不變；重複的路徑只轉一次）。"""
+    seen: Dict[str, str] = {}
+    return [seen[p] if p in seen else seen.setdefault(p, to_wsl(p)) for p in paths]
+
+
+def to_windows_many(paths: Iterable[str], distro: Optional[str] = None) -> List[str]:
+    """整份列表轉成 Windows 路徑（順序不變；重複的路徑只轉一次）。"""
+    fallback = _default_distro
+    seen: Dict[str, str] = {}
+    return [seen[p] if p in seen else seen.setdefault(p, _to_windows(p, distro, fallback)) for p in paths]
+
+
+# ============================
+#  預設 distro
+# ============================
+
+def default_distro() -> Optional[str]:
+    return _default_distro
+
+
+def set_default_distro(distro: Optional[str]) -> None:
+    """指定預設 distro（[backend] wsl_distro 或向 bridge 問到的）；None / 空字串 = 不知道（WSL 路徑照原樣顯示）。"""
+    global _default_distro
+    distro = (distro or "").strip() or None
+    with _distro_lock:
+        _default_distro = distro
+    # 快取以 (路徑, distro, 預設 distro) 為 key，舊的項目不會再命中，清掉釋放空間
+    _to_windows.cache_clear()
+
+
+def clear_cache() -> None:
+    """清掉所有轉換快取（測試 / 改設定用）。"""
+    normalize_wsl_path.cache_clear()
+    split_wsl.cache_clear()
+    _to_windows.cache_clear()
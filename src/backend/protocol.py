@@ -0,0 +1,189 @@
+# src/backend/protocol.py
+"""
+bridge 回覆協定（Windows 端解碼）
+
+wsl_bridge 的輸出是一連串長度前綴的框架（格式見 wsl_bridge.encode_frame）：
+
+    RS + <JSON 位元組長度> + "\n" + <JSON> + "\n"
+
+- FrameDecoder：邊收邊解。餵進任意切法的位元組片段，吐出已完整的框架（dict）；
+  不是以 RS 開頭的位元組都當雜訊跳過，壞掉的標頭會自動重新對齊到下一個 RS。
+- ReplyCollector：把同一個請求的串流片段（chunk）與最後的結果框架組回完整回覆，
+  片段到達時可以即時回呼 on_chunk（例如讓日誌邊收邊顯示）。
+- Reply：一個指令的結構化回覆（結束碼、daemon 印出的 JSON 或原文、stderr，
+  以及延遲量測用的 backend_seconds / parse_seconds）。
+
+daemon 輸出的「解讀」（從雜訊中找 JSON）只在 bridge 端做一次，
+這裡不再對整份 stdout 做 find('[') / rfind(']') 之類的猜測。
+"""
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from src.backend.wsl_bridge import RECORD_SEPARATOR as _RS_TEXT
+
+# 和 wsl_bridge.RECORD_SEPARATOR 保持一致（位元組版）
+RECORD_SEPARATOR = _RS_TEXT.encode("ascii")
+
+# 標頭（長度數字）最多幾個位元組；超過就當作壞掉的標頭重新對齊
+_MAX_HEADER_BYTES = 20
+
+# 串流片段的回呼：收到一段清單項目就呼叫一次（依序）
+ChunkCallback = Callable[[List[Any]], None]
+
+
+class FrameDecoder:
+    """長度前綴框架的增量解碼器（不執行緒安全，一條讀取執行緒一個）。"""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        # 目前框架還需要的 JSON 位元組數；None 代表正在找下一個標頭
+        self._need: Optional[int] = None
+        # feed 累計花掉的秒數（延遲量測的 parse 時間）
+        self.busy_seconds = 0.0
+
+    def feed(self, data: bytes) -> List[dict]:
+        """餵入一段位元組，回傳這段之後「已完整」的框架（可能為空）。"""
+        started = time.perf_counter()
+        try:
+            return self._feed(data)
+        finally:
+            self.busy_seconds += time.perf_counter() - started
+
+    def _feed(self, data: bytes) -> List[dict]:
+        self._buf += data
+        frames: List[dict] = []
+
+        while True:
+            if self._need is None:
+                start = self._buf.find(RECORD_SEPARATOR)
+                if start < 0:
+                    # 全部都是雜訊
+                    self._buf.clear()
+                    break
+                if start:
+                    del self._buf[:start]
+
+                newline = self._buf.find(b"\n", 1, _MAX_HEADER_BYTES + 2)
+                if newline < 0:
+                    if len(self._buf) > _MAX_HEADER_BYTES + 1:
+                        # 標頭太長 → 不是真的框架，丟掉這個 RS 往後找
+                        del self._buf[:1]
+                        continue
+                    break
+
+                header = bytes(self._buf[1:newline])
+                if not header.isdigit():
+                    del self._buf[:1]
+                    continue
+                self._need = int(header)
+                del self._buf[:newline + 1]
+
+            if len(self._buf) < self._need:
+                break
+
+            payload = bytes(self._buf[:self._need])
+            del self._buf[:self._need]
+            self._need = None
+            try:
+                frame = json.loads(payload.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+            if isinstance(frame, dict):
+                frames.append(frame)
+
+        return frames
+
+
+@dataclass
+class Reply:
+    """
+    一個指令的結構化回覆：
+
+    - code：daemon 的結束碼
+    - value：daemon 印出的 JSON（has_value=False 時沒有 JSON，value 為 None）
+    - text：沒有 JSON 時的原始輸出（例如「完成」之類的訊息）
+    - stderr：daemon 的錯誤輸出
+    - backend_seconds：bridge 回報的指令執行時間（框架的 elapsed）
+    - parse_seconds：Windows 端解碼這個回覆花的時間（由各通訊模式填入）
+    - cold：這次請求是否付了冷啟動（啟動新的 bridge 行程；由各通訊模式填入）
+    """
+    code: int
+    value: Any = None
+    has_value: bool = False
+    text: str = ""
+    stderr: str = ""
+    backend_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    cold: bool = False
+
+    @classmethod
+    def from_frame(cls, frame: dict) -> "Reply":
+        return cls(
+            code=int(frame.get("code") or 0),
+            value=frame.get("value"),
+            has_value="value" in frame,
+            text=str(frame.get("text") or ""),
+            stderr=str(frame.get("stderr") or ""),
+            backend_seconds=float(frame.get("elapsed") or 0.0),
+        )
+
+    def result(self) -> list | dict | str:
+        """
+        給 adapter 用的回傳值（與舊版解析規則相同）：
+        有 JSON → JSON；沒有任何輸出 → []；只有非 JSON 的文字 → "OK"。
+        """
+        if self.has_value:
+            return self.value
+        if not self.text:
+            return []
+        return "OK"
+
+
+class ReplyCollector:
+    """
+    收集一個請求的框架：chunk 片段累積起來，遇到結果框架時組回完整回覆。
+
+    - req_id：只收這個 id 的框架（其他 id 是逾時請求的遲到回覆，直接忽略）
+    - on_chunk：每收到一段片段就呼叫一次（在讀取的那條執行緒上）
+    """
+
+    def __init__(self, req_id: Any = None, on_chunk: Optional[ChunkCallback] = None) -> None:
+        self.req_id = req_id
+        self.on_chunk = on_chunk
+        self._chunks: List[Any] = []
+        self.frame: Optional[dict] = None
+
+    def add(self, frame: dict) -> bool:
+        """處理一個框架；收到結果框架（回覆完整）時回傳 True。"""
+        if frame.get("id") != self.req_id:
+            return False
+
+        if "chunk" in frame:
+            items = frame.get("chunk")
+            if isinstance(items, list):
+                self._chunks.extend(items)
+                if self.on_chunk is not None:
+                    self.on_chunk(items)
+            return False
+
+        streamed = frame.get("streamed")
+        if streamed is not None:
+            frame = dict(frame)
+            frame.pop("streamed")
+            if streamed:
+                value = dict(frame.get("value") or {})
+                value[str(streamed)] = self._chunks
+                frame["value"] = value
+            else:
+                frame["value"] = self._chunks
+        self.frame = frame
+        return True
+
+    @property
+    def reply(self) -> Optional[Reply]:
+        """完整的回覆（結果框架還沒到時為 None）。"""
+        return Reply.from_frame(self.frame) if self.frame is not None else None
@@ -0,0 +1,257 @@
+# src/backend/session.py
+"""
+常駐 WSL daemon 連線（Windows 端）。
+
+對應 WSL 端的 wsl_bridge.py：我們只啟動一次 `wsl ... wsl_bridge.py`，
+之後每個指令都是「寫一行 JSON 請求 → 讀框架回覆」（框架格式見 protocol.py），
+不再為每次點擊付出 WSL 啟動 + Python 啟動 + daemon import 的成本。
+
+- 行程死掉時，下一個請求會自動重啟。
+- 一個 session 同一時間只處理一個請求（內部有鎖），可安全地跨執行緒共用。
+- 大型回覆會分段到達；request(..., on_chunk=...) 可以在每段解碼完成時就拿到資料。
+"""
+from __future__ import annotations
+
+import json
+import queue
+import subprocess
+import sys
+import threading
+from typing import Iterable, List, Optional, Tuple
+
+from src.backend.protocol import ChunkCallback, FrameDecoder, Reply, ReplyCollector
+
+# 讀取執行緒每次最多從管線讀多少位元組（有多少讀多少，不等滿）
+_READ_SIZE = 65536
+
+# Windows: CREATE_NO_WINDOW，避免每次啟動都閃出黑色主控台（其他平台不支援此參數）
+CREATE_NO_WINDOW = 0x08000000 if sys.platform == "win32" else 0
+
+
+class SessionError(Exception):
+    """
+    常駐連線本身的錯誤（啟動失敗、逾時、行程中途死亡）。
+
+    - delivered=False：請求根本沒送到 bridge，呼叫端可以安全地改用其他方式重送。
+    - delivered=True ：請求已送出，指令可能已經執行過，不應再重送。
+    - kind：錯誤類別（"spawn" / "transport" / "timeout"，對應 BackendError.kind）
+    """
+    def __init__(self, message: str, delivered: bool = False, kind: str = "transport") -> None:
+        super().__init__(message)
+        self.delivered = delivered
+        self.kind = kind
+
+
+class WslDaemonSession:
+    """
+    管理一個長駐的 wsl_bridge 行程。
+
+    - command：完整的啟動指令（由 adapter 組好，例如 ["wsl", "--cd", ..., "wsl_bridge.py", "src.core.daemon"]）
+    - request_timeout：單一請求等待回覆的秒數上限，超過就砍掉行程（None = 不限）
+    - unbounded_commands：不套用 request_timeout 的指令（寫入指令、可能跑很久的讀取）；
+      中途砍掉 bridge 可能讓 projects.json 寫到一半，這些指令一律等到 bridge 回覆或行程結束
+    """
+
+    def __init__(
+        self,
+        command: List[str],
+        request_timeout: Optional[float] = 60.0,
+        unbounded_commands: Iterable[str] = (),
+    ) -> None:
+        self.command = list(command)
+        self.request_timeout = request_timeout
+        self.unbounded_commands = frozenset(unbounded_commands)
+
+        self._proc: Optional[subprocess.Popen] = None
+        # 讀取執行緒把解碼好的框架丟進這個佇列；None 代表 stdout 已關閉（行程死了）
+        self._replies: "queue.Queue[Optional[dict]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # 目前這個行程是否已經成功回覆過至少一次（用來分辨「bridge 起不來」和「指令執行中死掉」）
+        self._answered = False
+        # 目前行程的讀取執行緒所用的解碼器（延遲量測：請求前後的 busy_seconds 差就是這次的解碼時間）
+        self._decoder = FrameDecoder()
+        # 啟動過幾次 bridge 行程（請求前後不同 = 這次請求付了冷啟動）
+        self._spawn_count = 0
+
+    # ---------------------------------------------------------
+    # 行程生命週期
+    # ---------------------------------------------------------
+
+    def is_alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self) -> None:
+        """啟動 bridge 行程（若已在執行則不做事）。"""
+        if self.is_alive():
+            return
+        self._discard_process()
+
+        try:
+            self._proc = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                creationflags=CREATE_NO_WINDOW,
+            )
+        except OSError as e:
+            self._proc = None
+            raise SessionError(f"無法啟動常駐連線: {e}", kind="spawn")
+
+        # 每個行程配一個新的佇列、解碼器與讀取執行緒，避免舊行程的殘留回覆混進來
+        self._replies = queue.Queue()
+        self._decoder = FrameDecoder()
+        self._answered = False
+        self._spawn_count += 1
+        reader = threading.Thread(
+            target=self._read_replies,
+            args=(self._proc, self._replies, self._decoder),
+            name="wsl-session-reader",
+            daemon=True,
+        )
+        reader.start()
+
+    def close(self) -> None:
+        """關閉 stdin 讓 bridge 自然結束；必要時強制終止。"""
+        with self._lock:
+            self._discard_process()
+
+    def _discard_process(self) -> None:
+        proc = self._proc
+        self._proc = None
+        if proc is None:
+            return
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    @staticmethod
+    def _read_replies(
+        proc: subprocess.Popen, replies: "queue.Queue[Optional[dict]]", decoder: FrameDecoder
+    ) -> None:
+        """[背景執行緒] 有多少讀多少，交給 FrameDecoder 邊收邊解，完整的框架立刻送進佇列。"""
+        assert proc.stdout is not None
+        while True:
+            data = proc.stdout.read1(_READ_SIZE)
+            if not data:
+                break
+            for frame in decoder.feed(data):
+                replies.put(frame)
+        replies.put(None)
+
+    # ---------------------------------------------------------
+    # 請求
+    # ---------------------------------------------------------
+
+    def request(self, cmd: str, args: List[str], on_chunk: Optional[ChunkCallback] = None) -> Reply:
+        """
+        送出一個指令並等待回覆。
+
+        on_chunk：大型回覆分段到達時，每段都會先回呼一次（在呼叫端的執行緒上），
+        最後回傳的 Reply 仍然包含完整的資料。
+        """
+        frame, parse_seconds, cold = self._roundtrip(
+            {"cmd": cmd, "args": list(args)}, self._timeout_for([cmd]), on_chunk
+        )
+        reply = Reply.from_frame(frame)
+        reply.parse_seconds = parse_seconds
+        reply.cold = cold
+        return reply
+
+    def request_batch(self, commands: List[Tuple[str, List[str]]]) -> List[Reply]:
+        """
+        一次往返送出多個指令（bridge 端依序執行），
+        回傳與 commands 等長的 [Reply, ...]。
+        """
+        if not commands:
+            return []
+        frame, parse_seconds, cold = self._roundtrip(
+            {"batch": [{"cmd": c, "args": list(a)} for c, a in commands]},
+            self._timeout_for([c for c, _ in commands]),
+        )
+        results = frame.get("results")
+        if not isinstance(results, list) or len(results) != len(commands):
+            raise SessionError("批次回覆格式錯誤（結果數量不符）", delivered=True, kind="protocol")
+        replies = [Reply.from_frame(r) for r in results]
+        # 整批只解碼一次，解碼時間平均分攤給各子指令
+        for reply in replies:
+            reply.parse_seconds = parse_seconds / len(replies)
+            reply.cold = cold
+        return replies
+
+    def _timeout_for(self, cmds: List[str]) -> Optional[float]:
+        """這次請求的逾時秒數：只要有一個指令在 unbounded_commands 裡就不限（None）。"""
+        if any(cmd in self.unbounded_commands for cmd in cmds):
+            return None
+        return self.request_timeout
+
+    def _roundtrip(
+        self, body: dict, timeout: Optional[float], on_chunk: Optional[ChunkCallback] = None
+    ) -> Tuple[dict, float, bool]:
+        """
+        幫請求加上 id、寫入 bridge，並等待對應的回覆（timeout=None 代表不限時）；
+        回傳（結果框架, 解碼花的秒數, 這次是否啟動了新的行程）。
+
+        - 行程不在 → 自動重啟。
+        - 寫入失敗（請求根本沒送達）→ 重啟後重送一次；
+          送達之後才死掉的請求不重送，避免重複執行非冪等指令。
+        """
+        with self._lock:
+            self._next_id += 1
+            req_id = self._next_id
+            payload = (json.dumps({"id": req_id, **body}, ensure_ascii=False) + "\n").encode("utf-8")
+            spawns_before = self._spawn_count
+
+            for attempt in range(2):
+                self.start()
+                try:
+                    assert self._proc is not None and self._proc.stdin is not None
+                    self._proc.stdin.write(payload)
+                    self._proc.stdin.flush()
+                    break
+                except (OSError, ValueError):
+                    self._discard_process()
+                    if attempt == 1:
+                        raise SessionError("常駐連線寫入失敗（bridge 已結束）")
+
+            decoder = self._decoder
+            parsed_before = decoder.busy_seconds
+            frame = self._wait_reply(ReplyCollector(req_id, on_chunk), timeout)
+            return frame, decoder.busy_seconds - parsed_before, self._spawn_count != spawns_before
+
+    def _wait_reply(self, collector: ReplyCollector, timeout: Optional[float]) -> dict:
+        """等到 collector 收齊回覆；串流中每收到一段就重新計算逾時（timeout=None：等到回覆或行程結束）。"""
+        while True:
+            try:
+                frame = self._replies.get(timeout=timeout)
+            except queue.Empty:
+                self._kill()
+                raise SessionError(
+                    f"常駐連線逾時（>{timeout:g}s），已重置連線", delivered=True, kind="timeout"
+                )
+
+            if frame is None:
+                # 新行程連一次都沒回覆就結束 → 多半是 bridge 本身起不來，視為未送達
+                delivered = self._answered
+                self._discard_process()
+                raise SessionError("常駐連線在執行指令時中斷，下次呼叫會自動重啟", delivered=delivered)
+
+            self._answered = True
+
+            # 上一個逾時請求的遲到回覆（id 不同）由 collector 直接丟掉
+            if collector.add(frame):
+                assert collector.frame is not None
+                return collector.frame
+
+    def _kill(self) -> None:
+        proc = self._proc
+        self._proc = None
+        if proc is not None and proc.poll() is None:
+            proc.kill()
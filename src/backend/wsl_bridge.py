@@ -0,0 +1,502 @@
+# src/backend/wsl_bridge.py
+"""
+WSL 端常駐橋接器（Persistent Daemon Session）
+
+這個檔案**不在 Windows 端執行**，而是由 adapter 透過
+`wsl --cd <WSL_PROJECT_ROOT> <WSL_PYTHON> -u <本檔的 /mnt/... 路徑> <daemon 模組>`
+啟動，並長駐在 WSL 裡：
+
+- stdin：每行一個 JSON 請求 {"id": 1, "cmd": "list_projects", "args": [...]}
+- stdout：一連串「框架」（frame），格式為
+      RECORD_SEPARATOR + <UTF-8 位元組長度（十進位）> + "\\n" + <JSON> + "\\n"
+  長度前綴讓 Windows 端（src/backend/protocol.py 的 FrameDecoder）可以邊收邊解，
+  不必等整份輸出、也不必在內容裡找括號；不是以 RECORD_SEPARATOR 開頭的位元組一律視為雜訊。
+- 回覆 {"id": 1, "code": 0, "value": <daemon 印出的 JSON>, "stderr": "...", "elapsed": <執行秒數>}
+  daemon 的 stdout 由這裡「解讀一次」（見 interpret_output）：找得到 JSON 就放在 value，
+  否則原文放在 text。
+- 大型回覆（清單超過 STREAM_CHUNK_ITEMS 項）改成串流：先送數個
+  {"id": 1, "chunk": [...]}，最後才送 {"id": 1, "code": 0, "value": ..., "streamed": <key>}，
+  streamed 是 "" 時整個 value 就是 chunk 依序相接；是 "lines" 時 value["lines"] 才是。
+- 批次請求 {"id": 2, "batch": [{"cmd": ..., "args": [...]}, ...]}
+  依序執行，回覆 {"id": 2, "results": [{"code", "value" | "text", "stderr"}, ...]}（不串流）
+- 日誌增量讀取 {"cmd": "__tail_log__", "args": [uuid, after, anchor, limit]}
+  在 WSL 端執行 get_log 後只切出新增的行（見 tail_lines），只有新行會經過管線
+- 查詢 distro {"cmd": "__distro__"}：回覆 value 是 bridge 所在的 distro 名稱（$WSL_DISTRO_NAME，不碰 daemon）
+
+單次模式 `wsl_bridge.py --once <daemon 模組> <cmd> <args...>`（adapter 的 direct 模式）：
+執行一個指令、用同樣的框架寫出回覆後結束，兩種模式的回覆格式完全相同。
+
+單次批次模式 `wsl_bridge.py --once-batch <daemon 模組>`（direct 模式的 run_batch）：
+從 stdin 讀入一份 {"batch": [...]}（讀到 EOF 為止），依序執行後寫出一個
+{"id": null, "results": [...]} 框架再結束——整批只啟動一個行程，回覆格式與常駐模式的批次相同。
+
+監看模式 `wsl_bridge.py --watch <daemon 模組> [間隔秒數] [日誌路徑樣板]`（src/backend/events.py 的事件訂閱）：
+不收請求，每隔一段時間比對 list_projects 與執行中專案的日誌，只把「變化」推成事件框架。
+日誌路徑樣板（預設 WATCH_LOG_PATH，相對於 daemon 專案根目錄，{uuid} 會被替換）只用來 stat：
+檔案大小與修改時間都沒變就不執行 get_log；stat 不到（路徑不對、樣板是 "off"）時照舊每次讀取。
+- {"event": "hello"}：連線就緒（只送一次）
+- {"event": "status", "project": {...}}：專案第一次出現或任何欄位改變（原始 list_projects 項目）
+- {"event": "removed", "uuid": ...}：專案消失
+- {"event": "log", "uuid": ..., "lines": [...], "cursor": "total:anchor", "reset": bool}：新日誌行
+stdin 關閉（Windows 端結束或關閉訂閱）時立刻結束。
+
+每個請求都在同一個 Python 行程內用 runpy 執行 daemon 模組，
+等同於 `python -m src.core.daemon <cmd> <args...>`，
+但 WSL 啟動、直譯器啟動與 daemon 的 import 只需要付一次。
+
+注意：本檔必須保持「獨立」（只用標準函式庫），
+因為它在 daemon 專案的 cwd 下執行，而兩邊的頂層套件都叫 `src`。
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import runpy
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+# 框架行的開頭標記（ASCII RS）。adapter 只接受以它開頭的行，其餘一律視為雜訊。
+RECORD_SEPARATOR = "\x1e"
+
+# 日誌增量讀取的內部指令名稱（daemon 沒有這個指令，由 bridge 自己處理）
+TAIL_LOG_COMMAND = "__tail_log__"
+
+# 保活用的空指令（不碰 daemon）
+PING_COMMAND = "__ping__"
+
+# 查詢 bridge 所在 distro 的內部指令（不碰 daemon；Windows 端顯示 \\wsl$ 路徑用）
+DISTRO_COMMAND = "__distro__"
+
+# 清單超過這個項數就分段串流，每段最多這麼多項
+STREAM_CHUNK_ITEMS = 500
+
+# 監看模式：預設輪詢間隔（秒）、一次事件最多帶幾行新日誌、視為「執行中」的後端狀態
+WATCH_INTERVAL = 2.0
+WATCH_LOG_LIMIT = 500
+# 監看模式：專案日誌的路徑樣板（相對於 cwd）；"off" = 不 stat，每次都讀
+WATCH_LOG_PATH = "logs/{uuid}.log"
+_ACTIVE_STATUSES = ("running", "muting")
+
+
+def _open_private_channels():
+    """
+    把真正的 stdin/stdout 搬到私有 fd，並把 fd 0/1 指向 /dev/null。
+
+    daemon 的 start_sentry 會 fork 背景哨兵，它們會繼承 fd 0/1；
+    如果不先搬走，子行程可能偷讀我們的請求或把雜訊寫進回覆通道。
+    （os.dup 產生的 fd 預設不可繼承，子行程拿不到。）
+    """
+    req_fd = os.dup(0)
+    rep_fd = os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    return os.fdopen(req_fd, "rb"), os.fdopen(rep_fd, "wb")
+
+
+def _silence_stderr() -> None:
+    """
+    單次模式用：把 fd 2 也指向 /dev/null。
+
+    start_sentry fork 出的背景哨兵會繼承 fd 2；adapter 要讀到 stderr 的 EOF 才算結束，
+    不搬走的話會一直等到哨兵結束。daemon 的 stderr 已經由 _invoke 捕捉並放進回覆。
+    """
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 2)
+    os.close(devnull)
+
+
+def _invoke(module: str, cmd: str, args: list) -> dict:
+    """在本行程內執行一次 daemon 指令，捕捉它的輸出與結束碼。"""
+    out = io.StringIO()
+    err = io.StringIO()
+    code = 0
+    saved_argv = sys.argv
+    sys.argv = [module, cmd, *[str(a) for a in args]]
+    try:
+        with redirect_stdout(out), redirect_stderr(err):
+            try:
+                runpy.run_module(module, run_name="__main__", alter_sys=True)
+            except SystemExit as e:
+                if e.code is None:
+                    code = 0
+                elif isinstance(e.code, int):
+                    code = e.code
+                else:
+                    # sys.exit("訊息") 的語意：訊息寫到 stderr，結束碼 1
+                    print(e.code, file=sys.stderr)
+                    code = 1
+            except Exception:
+                traceback.print_exc()
+                code = 1
+    finally:
+        sys.argv = saved_argv
+    return {"code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+# ---------------------------------------------------------
+# 日誌增量讀取（adapter 的 direct 模式也 import 這兩個函式，兩邊切法一致）
+# ---------------------------------------------------------
+
+def line_fingerprint(line: str) -> str:
+    """一行日誌的指紋，用來確認游標所指的那一行還是同一行（偵測輪替 / 截斷）。"""
+    return hashlib.sha1(line.encode("utf-8", errors="replace")).hexdigest()[:16]
+
+
+def tail_lines(lines: list, after: int, anchor: str, limit: int) -> dict:
+    """
+    從完整日誌中切出游標之後的新行。
+
+    - after / anchor：上次讀到第幾行、以及那一行（第 after 行）的指紋；after <= 0 代表第一次讀
+    - limit：一次最多回傳幾行（第一次讀、重置或新行太多時只給最後 limit 行；<= 0 不限制）
+
+    回傳 {"lines": [...], "total": 行數, "anchor": 最後一行指紋, "reset": bool}
+    reset=True 代表呼叫端要「整個換掉」顯示內容，而不是接在後面：
+    第一次讀、日誌被輪替或截斷（游標那一行不見或內容不同）、或新行超過 limit。
+    """
+    total = len(lines)
+    reset = after <= 0
+    if not reset and (after > total or line_fingerprint(str(lines[after - 1])) != anchor):
+        reset = True
+
+    start = 0 if reset else after
+    if limit > 0 and total - start > limit:
+        start = total - limit
+        reset = True
+
+    return {
+        "lines": [str(x) for x in lines[start:]],
+        "total": total,
+        "anchor": line_fingerprint(str(lines[-1])) if total else "",
+        "reset": reset,
+    }
+
+
+# ---------------------------------------------------------
+# daemon 輸出的解讀（只在這裡做一次；Windows 端直接拿到結構化的 value）
+# ---------------------------------------------------------
+
+def interpret_output(text: str) -> dict:
+    """
+    解讀 daemon 的 stdout：回傳 {"value": <JSON>} 或 {"text": <原文>}。
+
+    daemon 會在 JSON 前面印出進度訊息之類的雜訊，但 JSON 一定從某一行的行首開始，
+    所以只在「以 [ 或 { 開頭的行」嘗試解碼（raw_decode，允許後面還有雜訊），
+    從最後一行往前找，第一個成功的就是回傳值。
+    """
+    stripped = text.strip()
+    if not stripped:
+        return {"text": ""}
+
+    decoder = json.JSONDecoder()
+    try:
+        # 整份就是 JSON（最常見的情況）
+        return {"value": decoder.decode(stripped)}
+    except ValueError:
+        pass
+
+    # 每一行的行首位置（跳過行首空白）
+    starts = []
+    offset = 0
+    for line in stripped.split("\n"):
+        body = line.lstrip()
+        if body[:1] in ("[", "{"):
+            starts.append(offset + len(line) - len(body))
+        offset += len(line) + 1
+
+    for start in reversed(starts):
+        try:
+            value, _end = decoder.raw_decode(stripped, start)
+        except ValueError:
+            continue
+        return {"value": value}
+
+    return {"text": stripped}
+
+
+def _reply_body(result: dict) -> dict:
+    """_invoke 的原始結果 → 回覆內容（code / stderr / value 或 text）。"""
+    body = {"code": result["code"], "stderr": result["stderr"]}
+    body.update(interpret_output(result["stdout"]))
+    return body
+
+
+def _tail_log(module: str, args: list) -> dict:
+    """執行 get_log <uuid>，再用 tail_lines 只回傳新增的行。"""
+    uuid, after, anchor, limit = (list(args) + ["", "0", "", "0"])[:4]
+    body = _reply_body(_invoke(module, "get_log", [uuid]))
+    if body["code"] != 0:
+        return body
+    lines = body.get("value")
+    if not isinstance(lines, list):
+        lines = []
+    try:
+        tail = tail_lines(lines, int(after), str(anchor), int(limit))
+    except ValueError as e:
+        return {"code": 2, "stderr": f"bad tail arguments: {e}", "text": ""}
+    return {"code": 0, "stderr": body["stderr"], "value": tail}
+
+
+def _dispatch(module: str, cmd: str, args: list) -> dict:
+    """執行一個指令（含 bridge 自己的內部指令），回傳回覆內容；elapsed 是在 WSL 端花的秒數。"""
+    started = time.perf_counter()
+    # 保活用的空指令，不碰 daemon
+    if cmd == PING_COMMAND:
+        body = {"code": 0, "stderr": "", "text": ""}
+    elif cmd == TAIL_LOG_COMMAND:
+        body = _tail_log(module, args)
+    elif cmd == DISTRO_COMMAND:
+        body = {"code": 0, "stderr": "", "value": os.environ.get("WSL_DISTRO_NAME", "")}
+    else:
+        body = _reply_body(_invoke(module, cmd, args))
+    body["elapsed"] = round(time.perf_counter() - started, 6)
+    return body
+
+
+# ---------------------------------------------------------
+# 框架輸出
+# ---------------------------------------------------------
+
+def encode_frame(payload: dict) -> bytes:
+    """一個框架：RS + 長度 + "\\n" + JSON + "\\n"（長度只算 JSON 本身的位元組數）。"""
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return RECORD_SEPARATOR.encode("ascii") + str(len(data)).encode("ascii") + b"\n" + data + b"\n"
+
+
+def _write_frame(channel, payload: dict) -> None:
+    channel.write(encode_frame(payload))
+    channel.flush()
+
+
+def _streamable(body: dict):
+    """要串流的清單與它在 value 中的位置（"" = value 本身、"lines" = value["lines"]）；不需串流時回傳 None。"""
+    value = body.get("value")
+    if isinstance(value, list) and len(value) > STREAM_CHUNK_ITEMS:
+        return "", value
+    if isinstance(value, dict):
+        lines = value.get("lines")
+        if isinstance(lines, list) and len(lines) > STREAM_CHUNK_ITEMS:
+            return "lines", lines
+    return None
+
+
+def _send_reply(channel, req_id, body: dict) -> None:
+    """送出一個指令的回覆；大型清單先分段送出，最後一個框架才帶結束碼。"""
+    stream = _streamable(body)
+    if stream is not None:
+        key, items = stream
+        for i in range(0, len(items), STREAM_CHUNK_ITEMS):
+            _write_frame(channel, {"id": req_id, "chunk": items[i:i + STREAM_CHUNK_ITEMS]})
+        body = dict(body, streamed=key)
+        if key:
+            body["value"] = {k: v for k, v in body["value"].items() if k != key}
+        else:
+            del body["value"]
+    _write_frame(channel, dict(body, id=req_id))
+
+
+# ---------------------------------------------------------
+# 主迴圈
+# ---------------------------------------------------------
+
+def _prepare_import_path() -> None:
+    # daemon 以專案根目錄（cwd）為 import 根，和 `python -m` 的行為一致。
+    cwd = os.getcwd()
+    if cwd not in sys.path:
+        sys.path.insert(0, cwd)
+
+
+def serve(module: str) -> int:
+    """主迴圈：一行請求 → 一個（或串流的數個）框架回覆，直到 stdin 關閉。"""
+    _prepare_import_path()
+    requests, replies = _open_private_channels()
+
+    for raw in requests:
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            req = json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            _write_frame(replies, {"id": None, "code": 2, "text": "", "stderr": f"bad request: {e}"})
+            continue
+
+        req_id = req.get("id")
+
+        # 批次：一次往返執行多個指令，每個子指令各自回報結果
+        if "batch" in req:
+            _write_frame(replies, {"id": req_id, "results": _dispatch_batch(module, req.get("batch"))})
+            continue
+
+        _send_reply(replies, req_id, _dispatch(module, str(req.get("cmd") or ""), list(req.get("args") or [])))
+
+    return 0
+
+
+def _dispatch_batch(module: str, items) -> list:
+    """依序執行批次裡的每個子指令，回傳各自的回覆內容（不串流）。"""
+    return [
+        _dispatch(module, str(item.get("cmd") or ""), list(item.get("args") or []))
+        for item in (items or [])
+    ]
+
+
+def serve_once(module: str, cmd: str, args: list) -> int:
+    """單次模式：執行一個指令、寫出回覆框架後結束（結束碼同 daemon）。"""
+    _prepare_import_path()
+    _requests, replies = _open_private_channels()
+    _silence_stderr()
+    body = _dispatch(module, cmd, args)
+    _send_reply(replies, None, body)
+    replies.close()
+    return int(body.get("code") or 0)
+
+
+def serve_batch_once(module: str) -> int:
+    """單次批次模式：stdin 讀到 EOF 取得整份批次，全部執行完寫出一個 results 框架後結束。"""
+    _prepare_import_path()
+    requests, replies = _open_private_channels()
+    _silence_stderr()
+    raw = requests.read()
+    requests.close()
+    try:
+        req = json.loads(raw.decode("utf-8"))
+        items = req["batch"]
+        if not isinstance(items, list):
+            raise ValueError("batch must be a list")
+    except (UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        _write_frame(replies, {"id": None, "code": 2, "text": "", "stderr": f"bad request: {e}"})
+        replies.close()
+        return 2
+    _write_frame(replies, {"id": None, "results": _dispatch_batch(module, items)})
+    replies.close()
+    return 0
+
+
+# ---------------------------------------------------------
+# 監看模式（事件推送）
+# ---------------------------------------------------------
+
+def _exit_on_eof(requests) -> None:
+    """[背景執行緒] 監看模式不收請求；stdin 一關閉就代表訂閱端不在了，直接結束行程。"""
+    for _ in requests:
+        pass
+    os._exit(0)
+
+
+def _log_signature(log_path: str, uuid: str):
+    """日誌檔的 (大小, 修改時間)；沒有樣板或 stat 失敗時回傳 None（呼叫端只能每次都讀）。"""
+    if not log_path or log_path == "off":
+        return None
+    try:
+        st = os.stat(log_path.replace("{uuid}", uuid))
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _watch_log(module: str, uuid: str, cursors: dict, signatures: dict, log_path: str, channel) -> None:
+    """
+    讀一次專案日誌的新行；有新行才送 log 事件。第一次看到的專案只記下目前位置，不回放舊日誌。
+    先 stat 日誌檔：大小與修改時間都和上次讀取時相同就直接略過，不執行 get_log。
+    """
+    # 讀取前先取簽章：讀取途中寫入的新行，下一輪簽章不同還會再讀到
+    signature = _log_signature(log_path, uuid)
+    position = cursors.get(uuid)
+    if position is not None and signature is not None and signatures.get(uuid) == signature:
+        return
+
+    if position is None:
+        body = _tail_log(module, [uuid, "0", "", "1"])
+        tail = body.get("value")
+        if body["code"] == 0 and isinstance(tail, dict):
+            cursors[uuid] = (int(tail["total"]), str(tail["anchor"]))
+            signatures[uuid] = signature
+        return
+
+    after, anchor = position
+    body = _tail_log(module, [uuid, str(after), anchor, str(WATCH_LOG_LIMIT)])
+    tail = body.get("value")
+    if body["code"] != 0 or not isinstance(tail, dict):
+        return
+    cursors[uuid] = (int(tail["total"]), str(tail["anchor"]))
+    signatures[uuid] = signature
+    if tail["lines"]:
+        _write_frame(channel, {
+            "event": "log",
+            "uuid": uuid,
+            "lines": tail["lines"],
+            "cursor": f"{tail['total']}:{tail['anchor']}",
+            "reset": bool(tail["reset"]),
+        })
+
+
+def watch(module: str, interval: float = WATCH_INTERVAL, log_path: str = WATCH_LOG_PATH) -> int:
+    """監看模式主迴圈：定期比對專案列表與執行中專案的日誌，把變化推成事件框架。"""
+    _prepare_import_path()
+    requests, replies = _open_private_channels()
+    _silence_stderr()
+    threading.Thread(target=_exit_on_eof, args=(requests,), name="watch-stdin", daemon=True).start()
+
+    _write_frame(replies, {"event": "hello"})
+
+    # uuid -> 上一次看到的原始專案資料；uuid -> (日誌行數, 最後一行指紋)；uuid -> 上次讀取時的日誌檔簽章
+    known: dict = {}
+    cursors: dict = {}
+    signatures: dict = {}
+
+    while True:
+        body = _dispatch(module, "list_projects", [])
+        projects = body.get("value") if body["code"] == 0 else None
+        if isinstance(projects, list):
+            seen = set()
+            for raw in projects:
+                if not isinstance(raw, dict) or not raw.get("uuid"):
+                    continue
+                uuid = str(raw["uuid"])
+                seen.add(uuid)
+                old = known.get(uuid)
+                if old != raw:
+                    known[uuid] = raw
+                    _write_frame(replies, {"event": "status", "project": raw})
+                # 執行中的專案才讀日誌；剛停下來的也再讀一次，才收得到「已暫停」那一行
+                was_active = old is not None and old.get("status") in _ACTIVE_STATUSES
+                if raw.get("status") in _ACTIVE_STATUSES or was_active:
+                    _watch_log(module, uuid, cursors, signatures, log_path, replies)
+
+            for uuid in [u for u in known if u not in seen]:
+                known.pop(uuid)
+                cursors.pop(uuid, None)
+                signatures.pop(uuid, None)
+                _write_frame(replies, {"event": "removed", "uuid": uuid})
+
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 4 and sys.argv[1] == "--once":
+        sys.exit(serve_once(sys.argv[2], sys.argv[3], sys.argv[4:]))
+    if len(sys.argv) == 3 and sys.argv[1] == "--once-batch":
+        sys.exit(serve_batch_once(sys.argv[2]))
+    if len(sys.argv) >= 3 and sys.argv[1] == "--watch":
+        sys.exit(watch(
+            sys.argv[2],
+            float(sys.argv[3]) if len(sys.argv) >= 4 else WATCH_INTERVAL,
+            sys.argv[4] if len(sys.argv) >= 5 else WATCH_LOG_PATH,
+        ))
+    if len(sys.argv) < 2 or sys.argv[1].startswith("--"):
+        print(
+            "usage: wsl_bridge.py <daemon-module>\n"
+            "       wsl_bridge.py --once <daemon-module> <cmd> [args...]\n"
+            "       wsl_bridge.py --once-batch <daemon-module>  (batch JSON on stdin)\n"
+            "       wsl_bridge.py --watch <daemon-module> [interval] [log-path-template]",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    sys.exit(serve(sys.argv[1]))
@@ -0,0 +1,443 @@
+# src/bench/run.py
+"""
+效能量測（headless，不需要 WSL）
+
+    python -m src.bench.run                        # 全部量測，結果寫到 bench_results.json
+    python -m src.bench.run --quick                # 較小的資料量與次數（快速檢查用）
+    python -m src.bench.run --only adapter,list    # 只跑部分項目
+    python -m src.bench.run --out new.json --compare old.json   # 和上一次的結果比較
+
+量測項目（suite）：
+- adapter：BackendAdapter 單一指令往返延遲，依 transport 分開
+    - fake：行程內的 FakeDaemon（只有框架編碼 / 解碼的成本）
+    - session / direct：在本機直接啟動 wsl_bridge（不經過 wsl），daemon 換成
+      `src.backend.fake_daemon` 的命令列模式；量到的是 bridge + 行程 + 管線的成本，
+      不含 WSL 本身的啟動時間
+- list：list_projects（後端 / 快取）與 match_project_by_path，10 ~ 10,000 個專案
+- log：humanize_log_html（原 _humanize_log_line）與兩種日誌區的 set_logs，1k ~ 1M 行
+- table：DashboardWidget._reload_projects_from_backend 從發出到表格填好的時間
+- eye：SentryEyeWidget 畫一幀的時間（一般 / 飢渴 / 吞噬 / 眨眼，兩種視窗大小）
+
+每一項都回報 p50 / p95 / p99 / 平均 / 最小 / 最大（毫秒）；
+結果是 JSON，用 --compare 可以和之前的檔案逐項比較。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# 沒有螢幕也能建立 Qt 元件
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from src.backend import adapter as adapter_module
+from src.backend.adapter import TRANSPORT_DIRECT, TRANSPORT_FAKE, TRANSPORT_SESSION, BackendAdapter
+from src.backend.fake_daemon import FAKE_BACKEND_ENV, FakeDaemon
+from src.backend.wsl_bridge import PING_COMMAND
+
+# 結果檔格式版本（欄位有不相容的變動時 +1）
+RESULTS_VERSION = 1
+
+SUITES = ("adapter", "list", "log", "table", "eye")
+
+# 本機啟動 bridge 時使用的 daemon 模組（假後端的命令列模式）
+FAKE_DAEMON_MODULE = "src.backend.fake_daemon"
+BRIDGE_PATH = str(Path(__file__).resolve().parents[1] / "backend" / "wsl_bridge.py")
+
+# --compare 時，p50 變慢超過這個比例就標記出來
+REGRESSION_THRESHOLD = 0.10
+
+
+# ==========================================
+#   統計
+# ==========================================
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """已排序樣本的第 q 百分位（線性內插）。"""
+    if not sorted_samples:
+        return 0.0
+    pos = (len(sorted_samples) - 1) * q / 100.0
+    low = int(pos)
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (pos - low)
+
+
+def summarize(suite: str, name: str, params: Dict[str, Any], samples_ms: List[float], **extra: Any) -> Dict[str, Any]:
+    """一組樣本 → 結果項目。"""
+    ordered = sorted(samples_ms)
+    result = {
+        "suite": suite,
+        "name": name,
+        "params": params,
+        "unit": "ms",
+        "samples": len(ordered),
+        "p50": round(percentile(ordered, 50), 4),
+        "p95": round(percentile(ordered, 95), 4),
+        "p99": round(percentile(ordered, 99), 4),
+        "mean": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+        "min": round(ordered[0], 4) if ordered else 0.0,
+        "max": round(ordered[-1], 4) if ordered else 0.0,
+    }
+    result.update(extra)
+    return result
+
+
+def measure(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> List[float]:
+    """呼叫 fn repeat 次（先暖身 warmup 次），回傳每次的毫秒數。"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return samples
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """比較用的鍵：suite / name / 排序過的參數。"""
+    params = ",".join(f"{k}={v}" for k, v in sorted(result.get("params", {}).items()))
+    return f"{result['suite']}/{result['name']}[{params}]"
+
+
+def _report(result: Dict[str, Any]) -> None:
+    print(
+        f"  {result_key(result):<58} p50={result['p50']:>10.3f}  p95={result['p95']:>10.3f}  "
+        f"p99={result['p99']:>10.3f} ms  (n={result['samples']})",
+        flush=True,
+    )
+
+
+# ==========================================
+#   共用：假後端與本機 bridge
+# ==========================================
+
+class LocalBridgeAdapter(BackendAdapter):
+    """在本機直接啟動 wsl_bridge（不經過 wsl），daemon 換成假後端的命令列模式。"""
+
+    def _build_session_command(self) -> List[str]:
+        return [sys.executable, "-u", BRIDGE_PATH, FAKE_DAEMON_MODULE]
+
+    def _build_direct_command(self, cmd: str, clean_args: List[str]) -> List[str]:
+        return [sys.executable, "-u", BRIDGE_PATH, "--once", FAKE_DAEMON_MODULE, cmd, *clean_args]
+
+    def _build_direct_batch_command(self) -> List[str]:
+        return [sys.executable, "-u", BRIDGE_PATH, "--once-batch", FAKE_DAEMON_MODULE]
+
+
+def fake_adapter(fake: FakeDaemon) -> BackendAdapter:
+    """transport=fake 的 adapter，後端換成指定的 FakeDaemon。"""
+    adp = BackendAdapter(transport=TRANSPORT_FAKE)
+    adp._session = fake
+    return adp
+
+
+@contextmanager
+def use_adapter(adp: BackendAdapter) -> Iterator[BackendAdapter]:
+    """暫時把模組層的單例換成 adp（module 函式與 UI 都會用到它）。"""
+    saved = adapter_module._adapter_singleton
+    adapter_module._adapter_singleton = adp
+    try:
+        yield adp
+    finally:
+        adapter_module._adapter_singleton = saved
+        adp.close()
+
+
+@contextmanager
+def fake_backend_env(spec: str) -> Iterator[None]:
+    """暫時設定 SENTRY_FAKE_BACKEND（本機 bridge 啟動的 daemon 會繼承）。"""
+    saved = os.environ.get(FAKE_BACKEND_ENV)
+    os.environ[FAKE_BACKEND_ENV] = spec
+    try:
+        yield
+    finally:
+        if saved is None:
+            os.environ.pop(FAKE_BACKEND_ENV, None)
+        else:
+            os.environ[FAKE_BACKEND_ENV] = saved
+
+
+# ==========================================
+#   量測項目
+# ==========================================
+
+def bench_adapter(quick: bool) -> List[Dict[str, Any]]:
+    """單一指令往返延遲（依 transport）。"""
+    results = []
+    projects = 100
+    log_lines = 2000
+    commands = [
+        (PING_COMMAND, []),
+        ("list_projects", []),
+        ("get_log", ["fake-00001"]),
+    ]
+    repeats = {
+        TRANSPORT_FAKE: 50 if quick else 500,
+        TRANSPORT_SESSION: 20 if quick else 200,
+        TRANSPORT_DIRECT: 5 if quick else 30,
+    }
+
+    with fake_backend_env(f"projects={projects},log_lines={log_lines},seed=1"):
+        for transport in (TRANSPORT_FAKE, TRANSPORT_SESSION, TRANSPORT_DIRECT):
+            if transport == TRANSPORT_FAKE:
+                adp = fake_adapter(FakeDaemon(projects=projects, log_lines=log_lines, seed=1))
+            else:
+                adp = LocalBridgeAdapter(transport=transport)
+            try:
+                for cmd, args in commands:
+                    samples = measure(lambda: adp._run_wsl_command(cmd, *args), repeats[transport])
+                    result = summarize(
+                        "adapter", cmd,
+                        {"transport": transport, "projects": projects, "log_lines": log_lines},
+                        samples,
+                    )
+                    results.append(result)
+                    _report(result)
+            finally:
+                adp.close()
+    return results
+
+
+def bench_list(quick: bool) -> List[Dict[str, Any]]:
+    """list_projects 與 match_project_by_path 隨專案數的變化。"""
+    results = []
+    sizes = [10, 100, 1000] if quick else [10, 100, 1000, 10000]
+    for size in sizes:
+        with use_adapter(fake_adapter(FakeDaemon(projects=size, seed=1))) as adp:
+            repeat = max(5, min(200, 20000 // size)) if not quick else 5
+            params = {"projects": size}
+
+            samples = measure(lambda: adp.list_projects(force_refresh=True), repeat)
+            results.append(summarize("list", "list_projects_backend", params, samples))
+
+            adp.list_projects(force_refresh=True)
+            samples = measure(adp.list_projects, repeat * 10)
+            results.append(summarize("list", "list_projects_cached", params, samples))
+
+            # 拖曳比對：存在的專案（中間那一個）與不存在的路徑
+            hit = f"\\\\wsl$\\Ubuntu\\home\\fake\\projects\\project_{size // 2 + 1:05d}"
+            miss = "D:\\Work\\not_a_project"
+            samples = measure(lambda: adapter_module.match_project_by_path(hit), repeat * 10)
+            results.append(summarize("list", "match_project_by_path_hit", params, samples))
+            samples = measure(lambda: adapter_module.match_project_by_path(miss), repeat * 10)
+            results.append(summarize("list", "match_project_by_path_miss", params, samples))
+
+            for result in results[-4:]:
+                _report(result)
+    return results
+
+
+def _qt_app():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def bench_log(quick: bool) -> List[Dict[str, Any]]:
+    """日誌翻譯與兩種日誌區 set_logs 的吞吐量。"""
+    _qt_app()
+    from src.tray.log_model import VirtualLogViewerWidget, classify_log_line, humanize_log_html
+    from src.tray.tray_app import LogViewerWidget
+
+    results = []
+    sizes = [1000, 10000] if quick else [1000, 10000, 100000, 1000000]
+    for size in sizes:
+        fake = FakeDaemon(projects=1, log_lines=size, seed=1)
+        lines = fake.invoke("get_log", ["fake-00001"])["value"]
+        params = {"lines": size}
+        repeat = 3 if quick else max(3, min(20, 200000 // size))
+
+        def _humanize_cold() -> None:
+            # 分類結果有 lru_cache：每次先清掉，量的是「第一次看到這些行」的成本
+            classify_log_line.cache_clear()
+            for line in lines:
+                humanize_log_html(line)
+
+        samples = measure(_humanize_cold, repeat)
+        p50 = percentile(sorted(samples), 50)
+        result = summarize(
+            "log", "humanize_log_html", params, samples,
+            lines_per_second=round(size / (p50 / 1000.0)) if p50 else 0,
+        )
+        results.append(result)
+        _report(result)
+
+        # rich 日誌區只會畫最後 max_lines 行（預設 5000）；量的是完整的 set_logs 呼叫
+        rich = LogViewerWidget()
+        samples = measure(lambda: rich.set_logs(lines), repeat)
+        result = summarize("log", "LogViewerWidget.set_logs", dict(params, max_lines=rich.max_lines), samples)
+        results.append(result)
+        _report(result)
+        rich.deleteLater()
+
+        virtual = VirtualLogViewerWidget()
+        samples = measure(lambda: virtual.set_logs(lines), repeat)
+        result = summarize("log", "VirtualLogViewerWidget.set_logs", params, samples)
+        results.append(result)
+        _report(result)
+        virtual.deleteLater()
+    return results
+
+
+def bench_table(quick: bool) -> List[Dict[str, Any]]:
+    """_reload_projects_from_backend：從發出到表格填好（含背景執行緒與訊號往返）。"""
+    app = _qt_app()
+    from PySide6.QtCore import QEventLoop, QTimer
+    from src.tray.tray_app import DashboardWidget
+
+    results = []
+    sizes = [10, 100, 1000] if quick else [10, 100, 1000, 10000]
+    for size in sizes:
+        with use_adapter(fake_adapter(FakeDaemon(projects=size, seed=1))):
+            dashboard = DashboardWidget(switch_callback=lambda: None)
+            # 建構時的第一次載入先等它完成
+            app.processEvents()
+            repeat = 3 if quick else max(5, min(50, 20000 // size))
+
+            def _reload(clear: bool) -> None:
+                if clear:
+                    dashboard.project_model.set_projects([])
+                loop = QEventLoop()
+                dashboard._reload_projects_from_backend(then=loop.quit, force=True)
+                QTimer.singleShot(60000, loop.quit)
+                loop.exec()
+
+            params = {"projects": size}
+            samples = measure(lambda: _reload(True), repeat)
+            results.append(summarize("table", "reload_fill_empty", params, samples))
+            samples = measure(lambda: _reload(False), repeat)
+            results.append(summarize("table", "reload_unchanged", params, samples))
+            for result in results[-2:]:
+                _report(result)
+
+            dashboard.log_timer.stop()
+            dashboard.deleteLater()
+            app.processEvents()
+    return results
+
+
+def bench_eye(quick: bool) -> List[Dict[str, Any]]:
+    """SentryEyeWidget 畫一幀（paintEvent）的時間；眼睛不顯示（動畫時鐘不會啟動），只量繪製本身。"""
+    _qt_app()
+    from PySide6.QtGui import QImage
+    from src.tray.tray_app import SentryEyeWidget
+
+    # 狀態名稱 → 每幀之前要設定的屬性
+    states: Dict[str, Dict[str, Any]] = {
+        "idle": {},
+        "hungry": {"pending_folder": "bench"},
+        "eating": {"eating_frame": 20},
+        "blink": {"is_blinking": True, "blink_progress": 0.3, "blink_repeats": 0},
+    }
+    results = []
+    repeat = 30 if quick else 200
+    for size in (300, 600):
+        eye = SentryEyeWidget(lambda: None)
+        eye.resize(size, size)
+        # 只量眼睛本身：藏起氣泡與按鈕
+        eye.bubble.hide()
+        eye.btn_dashboard.hide()
+        image = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+
+        for state, attrs in states.items():
+            def _frame() -> None:
+                eye.pending_folder = None
+                for name, value in attrs.items():
+                    setattr(eye, name, value)
+                eye.render(image)
+
+            samples = measure(_frame, repeat, warmup=3)
+            result = summarize("eye", "paint_frame", {"size": size, "state": state}, samples)
+            results.append(result)
+            _report(result)
+        eye.deleteLater()
+    return results
+
+
+_SUITE_RUNNERS: Dict[str, Callable[[bool], List[Dict[str, Any]]]] = {
+    "adapter": bench_adapter,
+    "list": bench_list,
+    "log": bench_log,
+    "table": bench_table,
+    "eye": bench_eye,
+}
+
+
+# ==========================================
+#   比較
+# ==========================================
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """逐項比較 p50 / p95，回傳可以直接印出的文字行（變慢超過門檻的標上 ▲）。"""
+    old = {result_key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        key = result_key(result)
+        before = old.get(key)
+        if before is None:
+            rows.append(f"  {key:<58} (新項目)")
+            continue
+        marks = []
+        for field in ("p50", "p95"):
+            if before[field]:
+                ratio = result[field] / before[field] - 1.0
+                marks.append(f"{field} {before[field]:.3f} → {result[field]:.3f} ({ratio:+.1%})")
+        slower = before["p50"] and result["p50"] / before["p50"] - 1.0 > REGRESSION_THRESHOLD
+        rows.append(f"{'▲' if slower else ' '} {key:<58} " + "  ".join(marks))
+    return rows
+
+
+# ==========================================
+#   進入點
+# ==========================================
+
+def run(suites: List[str], quick: bool) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    for suite in suites:
+        print(f"[bench] {suite}", flush=True)
+        results.extend(_SUITE_RUNNERS[suite](quick))
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "suites": suites,
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.bench.run", description="Sentry UI 效能量測（headless）")
+    parser.add_argument("--out", default="bench_results.json", help="結果 JSON 的輸出路徑")
+    parser.add_argument("--only", default=",".join(SUITES), help=f"要跑的項目，以逗號分隔（{', '.join(SUITES)}）")
+    parser.add_argument("--quick", action="store_true", help="較小的資料量與次數")
+    parser.add_argument("--compare", metavar="BASELINE", help="和之前的結果 JSON 比較")
+    args = parser.parse_args(argv)
+
+    suites = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = [s for s in suites if s not in _SUITE_RUNNERS]
+    if unknown:
+        parser.error(f"未知的項目: {', '.join(unknown)}")
+
+    report = run(suites, args.quick)
+    Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[bench] 結果已寫入 {args.out}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print(f"[bench] 與 {args.compare} 比較（p50 變慢超過 {REGRESSION_THRESHOLD:.0%} 標記 ▲）")
+        for row in compare(report, baseline):
+            print(row)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+# src/tray/bulk_dialog.py
+"""
+批次操作的進度視窗（BulkOperationDialog）。
+
+控制台多選專案後，右鍵選單的「批量啟動 / 停止 / 手動更新 / 刪除」都開這個視窗：
+
+- 上方：目前進度（已完成 / 總數）與進度條
+- 中間：每個專案一列，完成一個就填上結果（成功綠字、失敗紅字、取消 / 略過灰字）
+- 下方按鈕：執行中是「取消」（還沒開始的項目不再送出），結束後變成「關閉」
+
+實際工作由 src/backend/bulk.py 的 BulkOperation 在背景執行緒完成；
+整批結束時發出 completed(BulkOutcome)，控制台用 outcome.projects 一次對齊表格。
+"""
+from __future__ import annotations
+
+from PySide6.QtCore import Signal
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QProgressBar,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from src.backend.bulk import BULK_START, BULK_STOP, BulkOperation, BulkOutcome, BulkResult
+from src.tray.workers import run_in_background
+
+# 結果文字的顏色（與控制台底部訊息列一致）
+_COLOR_OK = QColor("#2e7d32")
+_COLOR_ERROR = QColor("#c62828")
+_COLOR_MUTED = QColor("#888888")
+
+
+class BulkOperationDialog(QDialog):
+    """顯示一個 BulkOperation 的進度與逐項結果。"""
+
+    # 整批結束（含取消）；參數是 BulkOutcome
+    completed = Signal(object)
+
+    def __init__(self, operation: BulkOperation, parent=None) -> None:
+        super().__init__(parent)
+        self.operation = operation
+        self._rows = {uuid: row for row, (uuid, _name) in enumerate(operation.targets)}
+        self._done = 0
+        self._running = False
+
+        total = len(operation.targets)
+        self.setWindowTitle(f"批量{operation.label}（{total} 個專案）")
+        self.setModal(True)
+        self.resize(520, 420)
+
+        layout = QVBoxLayout(self)
+
+        self.status_label = QLabel(f"正在{operation.label}... 0 / {total}")
+        layout.addWidget(self.status_label)
+
+        self.progress = QProgressBar(self)
+        self.progress.setRange(0, total)
+        self.progress.setValue(0)
+        layout.addWidget(self.progress)
+
+        self.table = QTableWidget(total, 2, self)
+        self.table.setHorizontalHeaderLabels(["專案", "結果"])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        for row, (_uuid, name) in enumerate(operation.targets):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            pending = QTableWidgetItem("等待中")
+            pending.setForeground(_COLOR_MUTED)
+            self.table.setItem(row, 1, pending)
+        self.table.resizeColumnToContents(0)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch(1)
+        self.button = QPushButton("取消")
+        self.button.clicked.connect(self._on_button)
+        buttons.addWidget(self.button)
+        layout.addLayout(buttons)
+
+    # ---------------------------------------------------------
+    # 執行
+    # ---------------------------------------------------------
+
+    def start(self) -> None:
+        """顯示視窗並在背景開始執行。"""
+        self._running = True
+        self.show()
+        run_in_background(
+            self.operation.run,
+            on_chunk=self._on_item,
+            on_done=self._on_finished,
+            on_error=self._on_failed,
+        )
+
+    def _on_item(self, result: BulkResult) -> None:
+        """[GUI 執行緒] 一個項目完成。"""
+        self._done += 1
+        self.progress.setValue(self._done)
+        self._show_result(result)
+        total = len(self.operation.targets)
+        if self._done < total:
+            self.status_label.setText(f"正在{self.operation.label}... {self._done} / {total}")
+        elif self.operation.action in (BULK_START, BULK_STOP) and not self.operation.cancelled:
+            self.status_label.setText("指令已全部送出，等待後端狀態更新...")
+
+    def _on_finished(self, outcome: BulkOutcome) -> None:
+        """[GUI 執行緒] 整批結束：用最終結果重畫每一列（啟動 / 停止會補上收斂後的狀態）。"""
+        self._running = False
+        for result in outcome.results:
+            self._show_result(result)
+        self.progress.setValue(len(self.operation.targets))
+
+        failed = len(outcome.failed)
+        cancelled = sum(1 for r in outcome.results if r.cancelled)
+        summary = f"完成：成功 {outcome.succeeded}"
+        if failed:
+            summary += f"，失敗 {failed}"
+        if cancelled:
+            summary += f"，取消 {cancelled}"
+        summary += f"（{outcome.elapsed:.1f} 秒）"
+        self.status_label.setText(summary)
+        self.button.setText("關閉")
+        self.button.setEnabled(True)
+        self.completed.emit(outcome)
+
+    def _on_failed(self, e: Exception) -> None:
+        """[GUI 執行緒] 批次本身出錯（不是單一項目失敗）。"""
+        self._running = False
+        self.status_label.setText(f"批次{self.operation.label}失敗：{e}")
+        self.button.setText("關閉")
+        self.button.setEnabled(True)
+        self.completed.emit(BulkOutcome(action=self.operation.action, cancelled=self.operation.cancelled))
+
+    def _show_result(self, result: BulkResult) -> None:
+        row = self._rows.get(result.uuid)
+        if row is None:
+            return
+        item = self.table.item(row, 1)
+        item.setText(result.message or ("成功" if result.ok else "失敗"))
+        if result.cancelled or result.skipped:
+            item.setForeground(_COLOR_MUTED)
+        else:
+            item.setForeground(_COLOR_OK if result.ok else _COLOR_ERROR)
+        item.setToolTip(result.message)
+
+    # ---------------------------------------------------------
+    # 取消 / 關閉
+    # ---------------------------------------------------------
+
+    def _on_button(self) -> None:
+        if self._running:
+            self._request_cancel()
+        else:
+            self.accept()
+
+    def _request_cancel(self) -> None:
+        self.operation.cancel()
+        self.button.setEnabled(False)
+        self.status_label.setText("正在取消（已送出的指令會等它完成）...")
+
+    def reject(self) -> None:
+        """Esc / 關閉鈕：執行中視為取消，結束後才真的關閉。"""
+        if self._running:
+            self._request_cancel()
+            return
+        super().reject()
+
+    def closeEvent(self, event) -> None:
+        if self._running:
+            self._request_cancel()
+            event.ignore()
+            return
+        super().closeEvent(event)
@@ -0,0 +1,261 @@
+# src/tray/diagnostics.py
+"""
+控制台的隱藏「診斷」分頁（DiagnosticsPanel）。
+
+在控制台按 Ctrl+Shift+D 開關。內容來自 src/backend/metrics.py：
+
+- 頂部：統計起點，以及啟動各階段的時間（托盤圖示、第一次畫出眼睛、後端暖機、建立控制台）；
+  多後端時再加上每個後端的狀態與最近一次讀取列表的延遲（通訊模式欄會標成 session@<後端>）
+- 上方表格：每個（指令, 通訊模式）的次數、失敗數、總延遲 p50 / p95 / p99，
+  冷啟動（啟動了新的 bridge 行程）/ 熱連線各自的 p50，
+  以及啟動 / 後端執行 / 解碼的平均時間（毫秒）
+- 下方文字：選取列的失敗類別、最後一次錯誤、總延遲直方圖
+- 按鈕：重新整理、匯出 JSON、清除統計
+- 面板顯示中才每秒自動更新，切走或關閉就停止計時器
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QFileDialog,
+    QHBoxLayout,
+    QLabel,
+    QPlainTextEdit,
+    QPushButton,
+    QSplitter,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from src.backend import adapter, metrics
+
+# 自動更新間隔（毫秒）
+DIAGNOSTICS_REFRESH_MS = 1000
+
+HEADERS = ["指令", "模式", "次數", "失敗", "p50", "p95", "p99", "冷 p50", "熱 p50", "啟動", "後端", "解碼"]
+
+# 啟動階段的顯示名稱（見 SentryTrayAppV2._record_startup）
+STARTUP_LABELS = {
+    "tray_icon": "托盤圖示",
+    "eye_first_paint": "第一次畫出眼睛",
+    "backend_warmup": "後端暖機完成",
+    "dashboard_build": "建立控制台",
+}
+
+# 直方圖文字長條的最大寬度（字元）
+_BAR_WIDTH = 40
+
+
+def _ms(value: float) -> str:
+    return f"{value:.1f}"
+
+
+def format_histogram(hist: Dict[str, Any]) -> List[str]:
+    """把 metrics 的直方圖 dict 排成文字長條（略過空的桶子）。"""
+    buckets = [b for b in hist.get("buckets", []) if b["count"]]
+    if not buckets:
+        return ["（尚無樣本）"]
+    peak = max(b["count"] for b in buckets)
+    lines = []
+    for b in buckets:
+        label = f"≤ {b['le']:g} ms" if b["le"] is not None else f"> {metrics.BUCKETS_MS[-1]:g} ms"
+        bar = "█" * max(1, round(b["count"] * _BAR_WIDTH / peak))
+        lines.append(f"{label:>12}  {bar} {b['count']}")
+    return lines
+
+
+class DiagnosticsPanel(QWidget):
+    """adapter 延遲與失敗統計的檢視面板。"""
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._commands: List[Dict[str, Any]] = []
+
+        layout = QVBoxLayout(self)
+
+        # --- 頂部：說明 + 按鈕 ---
+        bar = QHBoxLayout()
+        self.since_label = QLabel("")
+        # 匯出結果（自動更新不會蓋掉）
+        self.message_label = QLabel("")
+        btn_refresh = QPushButton("🔄 重新整理")
+        btn_refresh.clicked.connect(self.refresh)
+        btn_export = QPushButton("💾 匯出 JSON")
+        btn_export.clicked.connect(self._export)
+        btn_clear = QPushButton("🧹 清除統計")
+        btn_clear.clicked.connect(self._clear)
+        bar.addWidget(self.since_label)
+        bar.addWidget(self.message_label)
+        bar.addStretch(1)
+        bar.addWidget(btn_refresh)
+        bar.addWidget(btn_export)
+        bar.addWidget(btn_clear)
+        layout.addLayout(bar)
+
+        # --- 中間：統計表 + 選取列的細節 ---
+        splitter = QSplitter(Qt.Orientation.Vertical, self)
+        self.table = QTableWidget(0, len(HEADERS), self)
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setToolTip("延遲單位為毫秒；冷 = 這次啟動了新的 bridge 行程；啟動 = 總時間 - 後端執行 - 解碼")
+        self.table.currentCellChanged.connect(lambda *_: self._show_detail())
+        splitter.addWidget(self.table)
+
+        self.detail = QPlainTextEdit(self)
+        self.detail.setReadOnly(True)
+        self.detail.setPlaceholderText("選取上方一列，顯示失敗類別與延遲分佈。")
+        splitter.addWidget(self.detail)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter)
+
+        # 只在面板顯示時才跑
+        self._timer = QTimer(self)
+        self._timer.setInterval(DIAGNOSTICS_REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+
+    # ---------------------------------------------------------
+    # 顯示 / 隱藏：控制自動更新
+    # ---------------------------------------------------------
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event) -> None:
+        self._timer.stop()
+        super().hideEvent(event)
+
+    # ---------------------------------------------------------
+    # 更新內容
+    # ---------------------------------------------------------
+
+    def refresh(self) -> None:
+        """重新讀取 metrics 快照並更新表格（保留目前選取的指令）。"""
+        snap = metrics.snapshot()
+        selected = self._selected_key()
+        self._commands = snap["commands"]
+        text = f"統計起點：{snap['since']}"
+        if snap["startup"]:
+            text += "　啟動：" + "，".join(f"{STARTUP_LABELS.get(k, k)} {v:.0f} ms" for k, v in snap["startup"].items())
+        backends = adapter.backend_health()
+        if backends:
+            text += "　後端：" + "，".join(self._health_text(h) for h in backends)
+        self.since_label.setText(text)
+
+        self.table.setRowCount(len(self._commands))
+        select_row = -1
+        for row, entry in enumerate(self._commands):
+            total = entry["total"]
+            values = [
+                entry["command"],
+                entry["transport"],
+                str(total["count"]),
+                str(sum(entry["failures"].values())),
+                _ms(total["p50"]),
+                _ms(total["p95"]),
+                _ms(total["p99"]),
+                _ms(entry["cold"]["p50"]) if entry["cold"]["count"] else "-",
+                _ms(entry["warm"]["p50"]) if entry["warm"]["count"] else "-",
+                _ms(entry["spawn"]["mean"]),
+                _ms(entry["backend"]["mean"]),
+                _ms(entry["parse"]["mean"]),
+            ]
+            for col, text in enumerate(values):
+                item = self.table.item(row, col)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if col >= 2:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    self.table.setItem(row, col, item)
+                item.setText(text)
+            if (entry["command"], entry["transport"]) == selected:
+                select_row = row
+
+        if select_row >= 0 and select_row != self.table.currentRow():
+            self.table.selectRow(select_row)
+        self._show_detail()
+
+    @staticmethod
+    def _health_text(health: adapter.BackendHealth) -> str:
+        """一個後端的狀態摘要：名稱 + 正常（最近一次讀取延遲）/ 緩慢 / 失敗。"""
+        if not health.ok:
+            return f"{health.name} 失敗"
+        if health.pending:
+            return f"{health.name} 緩慢"
+        return f"{health.name} {health.latency * 1000:.0f} ms"
+
+    def _selected_key(self) -> tuple | None:
+        row = self.table.currentRow()
+        if 0 <= row < len(self._commands):
+            entry = self._commands[row]
+            return entry["command"], entry["transport"]
+        return None
+
+    def _show_detail(self) -> None:
+        row = self.table.currentRow()
+        if not (0 <= row < len(self._commands)):
+            self.detail.clear()
+            return
+        entry = self._commands[row]
+        total = entry["total"]
+        lines = [
+            f"{entry['command']}（{entry['transport']}）",
+            f"次數 {total['count']}，平均 {_ms(total['mean'])} ms，最大 {_ms(total['max'])} ms",
+        ]
+        for label, key in (("冷啟動", "cold"), ("熱連線", "warm")):
+            part = entry[key]
+            if part["count"]:
+                lines.append(
+                    f"{label} {part['count']} 次，平均 {_ms(part['mean'])} ms，"
+                    f"p95 {_ms(part['p95'])} ms，最大 {_ms(part['max'])} ms"
+                )
+        lines += [
+            "",
+            "失敗類別：",
+        ]
+        failures = entry["failures"]
+        if failures:
+            lines += [f"  {kind}: {count}" for kind, count in sorted(failures.items())]
+        else:
+            lines.append("  （無）")
+        if entry["last_error"]:
+            lines += ["", f"最後一次錯誤：{entry['last_error']}"]
+        lines += ["", "總延遲分佈："]
+        lines += format_histogram(total)
+
+        text = "\n".join(lines)
+        if text != self.detail.toPlainText():
+            self.detail.setPlainText(text)
+
+    # ---------------------------------------------------------
+    # 按鈕
+    # ---------------------------------------------------------
+
+    def _export(self) -> None:
+        path, _ = QFileDialog.getSaveFileName(
+            self, "匯出延遲統計", "sentry_metrics.json", "JSON (*.json)"
+        )
+        if not path:
+            return
+        try:
+            written = metrics.dump(path)
+        except OSError as e:
+            self.message_label.setText(f"匯出失敗：{e}")
+            return
+        self.message_label.setText(f"已匯出：{written}")
+
+    def _clear(self) -> None:
+        metrics.reset()
+        self.table.clearSelection()
+        self.refresh()
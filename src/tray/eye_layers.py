@@ -0,0 +1,239 @@
+# src/tray/eye_layers.py
+"""
+哨兵之眼（SentryEyeWidget）的預先繪製圖層。
+
+以前 paintEvent 每 50 ms 都重新建立光暈漸層、眼眶曲線、畫筆與筆刷，再全部抗鋸齒重畫一次，
+但真正每一幀會變的只有：呼吸（光暈大小）、瞳孔位置、眨眼時眼皮蓋下來的高度。
+
+現在把不會變的部分依「顏色狀態 × 視窗大小 × 螢幕縮放」先畫成 QPixmap：
+
+- halo：光暈（以最大呼吸半徑畫一次，每幀縮放貼上）
+- outline：眼眶外框（整個視窗大小，每幀原樣貼上）
+- pupil：虹膜環 + 黑色內圈（每幀貼在瞳孔位置）
+- lid：填滿眼眶形狀的眼皮（眨眼時只貼上半部 lid_h 高的部分，等同原本的「剪裁 + 畫矩形」）
+
+顏色狀態只有三種：idle（青）、hungry（橘，等待寫入檔）、eating（綠，吞噬動畫）。
+視窗大小改變時由 widget 呼叫 EyeLayerCache.clear()。
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from PySide6.QtCore import QPoint, QPointF, QRect, QRectF, Qt
+from PySide6.QtGui import QBrush, QColor, QPainter, QPainterPath, QPen, QPixmap, QRadialGradient
+
+EYE_IDLE = "idle"
+EYE_HUNGRY = "hungry"
+EYE_EATING = "eating"
+
+# 顏色狀態 → (主色, 光暈色)
+EYE_PALETTE: Dict[str, Tuple[QColor, QColor]] = {
+    EYE_IDLE: (QColor(0, 255, 255), QColor(0, 150, 255)),       # 正常：青色
+    EYE_HUNGRY: (QColor(255, 140, 0), QColor(255, 69, 0)),      # 飢渴中：橘紅色
+    EYE_EATING: (QColor(50, 255, 50), QColor(0, 200, 0)),       # 吞噬中：綠色
+}
+
+# 瞳孔大小（相對眼眶高度）
+PUPIL_SCALE = {EYE_IDLE: 0.45, EYE_HUNGRY: 0.55, EYE_EATING: 0.2}
+
+# 呼吸係數的最大值：平常 0.85 ~ 1.0，吞噬時固定 1.2
+MAX_BREATH = {EYE_IDLE: 1.0, EYE_HUNGRY: 1.0, EYE_EATING: 1.2}
+
+
+@dataclass(frozen=True)
+class EyeGeometry:
+    """由視窗大小推出的眼睛幾何（與原本 paintEvent 的相對比例相同）。"""
+    width: int
+    height: int
+
+    @property
+    def center(self) -> QPoint:
+        return QRect(0, 0, self.width, self.height).center()
+
+    @property
+    def eye_width(self) -> float:
+        return self.width * 0.8
+
+    @property
+    def eye_height(self) -> float:
+        return self.height * 0.5
+
+    def halo_radius(self, breath_factor: float) -> float:
+        return (self.eye_width / 2) * breath_factor * 1.2
+
+    def outline_path(self) -> QPainterPath:
+        """眼眶（上下兩條二次貝茲曲線）。"""
+        center = self.center
+        path = QPainterPath()
+        left_pt = QPoint(int(center.x() - self.eye_width / 2), int(center.y()))
+        right_pt = QPoint(int(center.x() + self.eye_width / 2), int(center.y()))
+        top_ctrl = QPoint(int(center.x()), int(center.y() - self.eye_height))
+        bottom_ctrl = QPoint(int(center.x()), int(center.y() + self.eye_height))
+        path.moveTo(left_pt)
+        path.quadTo(top_ctrl, right_pt)
+        path.quadTo(bottom_ctrl, left_pt)
+        return path
+
+    def lid_rect(self, lid_factor: float) -> QRectF:
+        """眨眼時眼皮蓋住的範圍：從眼眶最高點往下，高度是眼眶的 2 倍 × 閉合程度。"""
+        center = self.center
+        return QRectF(
+            int(center.x() - self.eye_width / 2),
+            int(center.y() - self.eye_height),
+            int(self.eye_width),
+            int(self.eye_height * 2 * lid_factor),
+        )
+
+
+@dataclass
+class EyeLayers:
+    """一組（狀態 × 大小）的預先繪製圖層。"""
+    halo: QPixmap
+    halo_radius: float      # halo 圖層畫的是這個半徑（貼上時依呼吸縮放）
+    outline: QPixmap
+    pupil: QPixmap
+    pupil_anchor: QPoint    # 瞳孔中心在 pupil 圖層裡的位置（邏輯座標）
+    lid: QPixmap
+
+
+def _new_pixmap(width: int, height: int, dpr: float) -> QPixmap:
+    """建立透明、依螢幕縮放的 QPixmap（width / height 為邏輯像素）。"""
+    pixmap = QPixmap(max(1, math.ceil(width * dpr)), max(1, math.ceil(height * dpr)))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    return pixmap
+
+
+def render_layers(state: str, geometry: EyeGeometry, dpr: float) -> EyeLayers:
+    """畫出一組圖層（顏色、線寬、透明度都和原本 paintEvent 一致）。"""
+    main_color, glow_color = EYE_PALETTE[state]
+    is_eating = state == EYE_EATING
+
+    # --- 1. 光暈：以最大呼吸半徑畫一次 ---
+    radius = geometry.halo_radius(MAX_BREATH[state])
+    side = math.ceil(radius * 2)
+    halo = _new_pixmap(side, side, dpr)
+    halo_center = QPointF(side / 2, side / 2)
+    gradient = QRadialGradient(halo_center, radius)
+    c1 = QColor(main_color)
+    c1.setAlpha(100 if not is_eating else 180)
+    c2 = QColor(glow_color)
+    c2.setAlpha(40 if not is_eating else 50)
+    gradient.setColorAt(0.0, c1)
+    gradient.setColorAt(0.5, c2)
+    gradient.setColorAt(1.0, QColor(0, 0, 0, 0))
+    painter = QPainter(halo)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setBrush(QBrush(gradient))
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.drawEllipse(halo_center, radius, radius)
+    painter.end()
+
+    # --- 2. 眼眶外框 ---
+    path = geometry.outline_path()
+    outline = _new_pixmap(geometry.width, geometry.height, dpr)
+    painter = QPainter(outline)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    pen_glow = QPen(QColor(main_color))
+    # [視覺微調] 使用浮點數寬度，讓線條更細緻 (1.5px / 2.5px)
+    pen_glow.setWidthF(2.5 if is_eating else 1.5)
+    painter.setPen(pen_glow)
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    painter.drawPath(path)
+    painter.end()
+
+    # --- 3. 瞳孔：虹膜環（透明 + 邊框）+ 內圈（黑色實心） ---
+    pupil_r = geometry.eye_height * PUPIL_SCALE[state]
+    pupil_side = math.ceil(pupil_r * 2) + 4
+    anchor = QPoint(pupil_side // 2, pupil_side // 2)
+    pupil = _new_pixmap(pupil_side, pupil_side, dpr)
+    painter = QPainter(pupil)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    ring_pen = QPen(main_color)
+    ring_pen.setWidthF(1.5)
+    painter.setPen(ring_pen)
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    # 以整數中心點呼叫（與原本 paintEvent 相同的 drawEllipse 多載，半徑會取整數）
+    painter.drawEllipse(anchor, pupil_r, pupil_r)
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QBrush(QColor(0, 0, 0, 220)))
+    painter.drawEllipse(anchor, pupil_r * 0.6, pupil_r * 0.6)
+    painter.end()
+
+    # --- 4. 眼皮：整個眼眶填滿眼皮色，眨眼時只貼上半部 ---
+    lid = _new_pixmap(geometry.width, geometry.height, dpr)
+    lid_color = QColor(main_color)
+    lid_color.setAlpha(200)
+    painter = QPainter(lid)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setClipPath(path)
+    painter.fillRect(geometry.lid_rect(1.0), lid_color)
+    painter.end()
+
+    return EyeLayers(
+        halo=halo,
+        halo_radius=radius,
+        outline=outline,
+        pupil=pupil,
+        pupil_anchor=anchor,
+        lid=lid,
+    )
+
+
+class EyeLayerCache:
+    """
+    依（狀態, 寬, 高, 螢幕縮放）快取 EyeLayers。
+
+    - get()：第一次用到某個組合時才畫（三種狀態各畫一次）
+    - clear()：視窗大小改變時呼叫，舊大小的圖層全部丟掉
+    """
+
+    def __init__(self) -> None:
+        self._layers: Dict[Tuple[str, int, int, float], EyeLayers] = {}
+
+    def get(self, state: str, geometry: EyeGeometry, dpr: float) -> EyeLayers:
+        key = (state, geometry.width, geometry.height, dpr)
+        layers = self._layers.get(key)
+        if layers is None:
+            layers = self._layers[key] = render_layers(state, geometry, dpr)
+        return layers
+
+    def clear(self) -> None:
+        self._layers.clear()
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+
+def draw_eye(
+    painter: QPainter,
+    layers: EyeLayers,
+    geometry: EyeGeometry,
+    breath_factor: float,
+    pupil_offset: QPoint,
+    lid_factor: float = 0.0,
+) -> None:
+    """用預先畫好的圖層組出一幀：光暈（縮放）→ 眼眶 → 瞳孔 → 眼皮（眨眼中才有）。"""
+    center = geometry.center
+
+    # 光暈依呼吸縮放：漸層本身很平滑，不開 SmoothPixmapTransform 也看不出差異（而且快得多）
+    # 圖層邊長略大於直徑（取整），依半徑比例縮放整張圖層，光暈中心仍對準眼睛中心
+    scale = geometry.halo_radius(breath_factor) / layers.halo_radius
+    half = layers.halo.width() / layers.halo.devicePixelRatio() * scale / 2
+    painter.drawPixmap(
+        QRectF(center.x() - half, center.y() - half, half * 2, half * 2),
+        layers.halo,
+        QRectF(layers.halo.rect()),
+    )
+
+    painter.drawPixmap(0, 0, layers.outline)
+    painter.drawPixmap(center + pupil_offset - layers.pupil_anchor, layers.pupil)
+
+    if lid_factor > 0:
+        target = geometry.lid_rect(lid_factor)
+        if target.height() > 0:
+            dpr = layers.lid.devicePixelRatio()
+            source = QRectF(target.x() * dpr, target.y() * dpr, target.width() * dpr, target.height() * dpr)
+            painter.drawPixmap(target, layers.lid, source)
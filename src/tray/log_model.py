@@ -0,0 +1,380 @@
+# src/tray/log_model.py
+"""
+日誌的「翻譯機」與虛擬化日誌瀏覽器。
+
+- classify_log_line()：把一行原始日誌解析成結構化的 LogRecord
+  （時間、圖示文字、顏色、檔名…），LogViewerWidget 的 HTML 與這裡的繪製共用同一套規則。
+- LogListModel：只保存原始字串，要顯示哪一行才解析哪一行（解析結果有 LRU 快取）。
+- LogLineDelegate：依 LogRecord 直接用 QPainter 畫出顏色與圖示，不產生 HTML、不排版整份文件。
+- VirtualLogViewerWidget：清單式（單欄 QTableView）的日誌區，介面與 LogViewerWidget 相同
+  （set_logs / append_logs / set_max_lines / setPlaceholderText），
+  記憶體只跟行數成正比，捲動成本與總行數無關，適合上百萬行的日誌。
+"""
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, List, Optional
+
+from PySide6.QtCore import QAbstractListModel, QEvent, QModelIndex, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter
+from PySide6.QtWidgets import QAbstractItemView, QStyle, QStyledItemDelegate, QStyleOptionViewItem, QTableView, QHeaderView
+
+# 日誌解析用的正規表示式（預先編譯，每行都要用）
+# 時間戳記：[YYYY-MM-DD HH:MM:SS]
+LOG_TIMESTAMP_RE = re.compile(r"\[(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}:\d{2})\]")
+# 檔案事件：[偵測] created|modified|deleted: <路徑>
+LOG_FILE_EVENT_RE = re.compile(r"\[偵測\] (created|modified|deleted): (.+)")
+
+# 時間前綴與日期標題的顏色
+TIME_COLOR = "#666666"
+DATE_COLOR = "#44AAFF"
+
+# 虛擬化日誌區預設最多保留幾行
+DEFAULT_VIRTUAL_LOG_MAX_LINES = 1_000_000
+
+# 往回找「上一個日期」時最多看幾行（沒有時間戳記的行連續出現時的上限，避免 O(n)）
+_DATE_LOOKBACK = 64
+
+
+# ==========================================
+#   翻譯機：原始日誌 → LogRecord
+# ==========================================
+
+@dataclass(frozen=True)
+class LogRecord:
+    """
+    一行日誌的顯示資訊。
+
+    - date / time：時間戳記（沒有時為 None）
+    - text：主要文字（含圖示），依 color / bold 顯示
+    - detail：接在 " : " 後面的補充（例如檔名，用預設字色）
+    - show_time：是否在前面顯示時間（黑名單等系統訊息不顯示）
+    """
+    date: Optional[str]
+    time: Optional[str]
+    text: str
+    color: str
+    bold: bool = False
+    detail: str = ""
+    show_time: bool = True
+
+    def to_html(self) -> str:
+        """轉成 LogViewerWidget 使用的彩色 HTML（原 _humanize_log_line 的輸出格式）。"""
+        t_prefix = (
+            f'<font color="{TIME_COLOR}">{self.time}</font> '
+            if self.time and self.show_time else ""
+        )
+        # 預設規則會把原始日誌原樣放進 text，一律跳脫才不會被當成 HTML
+        text = html.escape(self.text)
+        body = f"<b>{text}</b>" if self.bold else text
+        if self.detail:
+            return f'{t_prefix}<font color="{self.color}">{body}</font> : {html.escape(self.detail)}'
+        return f'{t_prefix}<font color="{self.color}">{body}</font>'
+
+    def to_plain(self) -> str:
+        """純文字版（複製、提示文字用）。"""
+        prefix = f"{self.time} " if self.time and self.show_time else ""
+        suffix = f" : {self.detail}" if self.detail else ""
+        return f"{prefix}{self.text}{suffix}"
+
+
+@lru_cache(maxsize=8192)
+def classify_log_line(raw_line: str) -> LogRecord:
+    """[核心] 將原始日誌解析為 LogRecord（純函式，結果可快取）。"""
+    match = LOG_TIMESTAMP_RE.search(raw_line)
+    date_str = match.group(1) if match else None
+    time_str = match.group(2) if match else None
+
+    def rec(text: str, color: str, bold: bool = False, detail: str = "", show_time: bool = True) -> LogRecord:
+        return LogRecord(date_str, time_str, text, color, bold, detail, show_time)
+
+    # 1. 哨兵啟動/停止
+    if "哨兵啟動" in raw_line:
+        return rec("👁️ 哨兵已就位，開始監控", "#00FFFF", bold=True)
+    if "Stopping sentry" in raw_line or "已成功發送終止信號" in raw_line:
+        return rec("💤 哨兵已暫停值勤", "#888888")
+
+    # 2. 檔案事件 (Created / Modified / Deleted)
+    event = LOG_FILE_EVENT_RE.search(raw_line)
+    if event:
+        event_type = event.group(1)
+        filename = event.group(2)
+        # 去掉完整路徑，只留檔名
+        if "/" in filename or "\\" in filename:
+            filename = Path(filename).name
+        if event_type == "created":
+            return rec("✨ 發現新檔案", "#00FF00", detail=filename)
+        if event_type == "modified":
+            return rec("📝 偵測到變更", "#FFFFFF", detail=filename)
+        return rec("🗑️ 檔案已移除", "#FF5555", detail=filename)
+
+    # 3. 過熱/靜默 (補回 Muting triggered)
+    if "智能靜默" in raw_line or "Muting triggered" in raw_line:
+        return rec("🛡️ 觸發過熱保護 (進入靜默模式)", "#FFFF00", bold=True)
+
+    # 4. 更新指令
+    if "成功觸發更新指令" in raw_line:
+        return rec("✅ 正在執行目錄樹更新...", "#44AAFF")
+
+    # 5. 黑名單/系統訊息 (淡化處理，不顯示時間)
+    if "OUTPUT-FILE-BLACKLIST" in raw_line:
+        return rec("🔒 安全機制：已自動排除輸出檔監控", "#555555", show_time=False)
+    if "[Step]" in raw_line:
+        return rec(raw_line, "#555555", show_time=False)
+
+    # 預設：原樣顯示
+    return rec(raw_line, "#AAAAAA", show_time=False)
+
+
+def humanize_log_html(raw_line: str) -> str:
+    """一行原始日誌 → 彩色 HTML。"""
+    return classify_log_line(raw_line).to_html()
+
+
+# ==========================================
+#   Model：只存原始字串，顯示時才解析
+# ==========================================
+
+class LogListModel(QAbstractListModel):
+    """
+    日誌列表的資料模型。
+
+    - 每一列是一行原始日誌（str），不預先解析、不產生 HTML。
+    - record_at(row) 才呼叫 classify_log_line（有 LRU 快取），
+      只有畫面上看得到的列會被解析（delegate 直接呼叫，不經 QVariant）。
+    - ShowDateRole / date_changed_at：這一列的日期和上一個日期不同時為 True（delegate 會畫日期標籤）。
+    """
+    ShowDateRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None, max_lines: int = DEFAULT_VIRTUAL_LOG_MAX_LINES) -> None:
+        super().__init__(parent)
+        self._lines: List[str] = []
+        self.max_lines = max(0, int(max_lines))
+
+    # --- Qt 介面 ---
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row = index.row()
+        if row < 0 or row >= len(self._lines):
+            return None
+
+        if role == self.ShowDateRole:
+            return self.date_changed_at(row)
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self._lines[row]
+        return None
+
+    # --- 資料操作 ---
+
+    def set_lines(self, lines: List[str]) -> None:
+        """整份替換（超過上限只保留最後 max_lines 行）。"""
+        self.beginResetModel()
+        self._lines = list(lines[-self.max_lines:] if self.max_lines else lines)
+        self.endResetModel()
+
+    def append_lines(self, lines: List[str]) -> None:
+        """接上新行；超過上限時從最前面丟掉最舊的行。"""
+        if not lines:
+            return
+        if self.max_lines and len(lines) >= self.max_lines:
+            self.set_lines(lines)
+            return
+
+        first = len(self._lines)
+        self.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+        self._lines.extend(lines)
+        self.endInsertRows()
+        self._trim()
+
+    def set_max_lines(self, max_lines: int) -> None:
+        self.max_lines = max(0, int(max_lines))
+        self._trim()
+
+    def _trim(self) -> None:
+        excess = len(self._lines) - self.max_lines if self.max_lines else 0
+        if excess <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, excess - 1)
+        del self._lines[:excess]
+        self.endRemoveRows()
+
+    def record_at(self, row: int) -> Optional[LogRecord]:
+        """第 row 列解析後的 LogRecord（超出範圍回傳 None）。"""
+        if row < 0 or row >= len(self._lines):
+            return None
+        return classify_log_line(self._lines[row])
+
+    def date_changed_at(self, row: int) -> bool:
+        """這一列是否要顯示日期（和往上最近一個有日期的列不同）。"""
+        date = classify_log_line(self._lines[row]).date
+        if date is None:
+            return False
+        for prev in range(row - 1, max(-1, row - 1 - _DATE_LOOKBACK), -1):
+            prev_date = classify_log_line(self._lines[prev]).date
+            if prev_date is not None:
+                return prev_date != date
+        return True
+
+
+# ==========================================
+#   Delegate：直接畫出顏色與圖示
+# ==========================================
+
+class LogLineDelegate(QStyledItemDelegate):
+    """依 LogRecord 逐段繪製：[📅 日期] 時間 主要文字 : 補充。"""
+
+    PADDING = 4
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        # 固定行高（配合 setUniformItemSizes，捲動成本與行數無關）
+        metrics = QFontMetrics(option.font)
+        return QSize(option.rect.width(), metrics.height() + 4)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        # 直接向 Python 端的 model 取 LogRecord（不經 QVariant 包裝自訂物件）
+        model = index.model()
+        if not isinstance(model, LogListModel):
+            return super().paint(painter, option, index)
+        record = model.record_at(index.row())
+        if record is None:
+            return
+
+        painter.save()
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, QColor("#264F78"))
+
+        rect = option.rect
+        base_font = QFont(option.font)
+        base_metrics = QFontMetrics(base_font)
+        # 垂直置中的基線
+        baseline = rect.top() + (rect.height() + base_metrics.ascent() - base_metrics.descent()) // 2
+        x = rect.left() + self.PADDING
+
+        def draw(text: str, color: str, bold: bool = False) -> None:
+            nonlocal x
+            font = QFont(base_font)
+            font.setBold(bold)
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(x, baseline, text)
+            x += QFontMetrics(font).horizontalAdvance(text)
+
+        if record.date and model.date_changed_at(index.row()):
+            draw(f"📅 {record.date}  ", DATE_COLOR, bold=True)
+        if record.time and record.show_time:
+            draw(f"{record.time} ", TIME_COLOR)
+        draw(record.text, record.color, bold=record.bold)
+        if record.detail:
+            draw(f" : {record.detail}", "#d4d4d4")
+
+        painter.restore()
+
+
+# ==========================================
+#   View：虛擬化日誌區
+# ==========================================
+
+class VirtualLogViewerWidget(QTableView):
+    """
+    清單式的日誌區（介面與 LogViewerWidget 相同，可直接替換）。
+
+    - 用單欄、隱藏表頭、固定行高的 QTableView：
+      QListView / QTreeView 即使設定固定行高，仍會逐列計算排版（百萬行要數秒），
+      QTableView 的固定行高可以直接由捲動位置換算出可見列。
+    - 只有可見的列會被解析與繪製；行高固定，百萬行也能順暢捲動。
+    - 使用者往上捲動看舊日誌時，新行進來不會把畫面拉回底部。
+    """
+
+    def __init__(self, parent=None, max_lines: int = DEFAULT_VIRTUAL_LOG_MAX_LINES) -> None:
+        super().__init__(parent)
+        self._model = LogListModel(self, max_lines=max_lines)
+        self.setModel(self._model)
+        self.setItemDelegate(LogLineDelegate(self))
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.horizontalHeader().hide()
+        self.horizontalHeader().setStretchLastSection(True)
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self._update_row_height()
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setStyleSheet("""
+            QTableView {
+                background-color: #1e1e1e;
+                color: #d4d4d4;
+                font-family: 'Microsoft JhengHei', 'Segoe UI Emoji', monospace;
+                font-size: 10pt;
+                border: 1px solid #333333;
+                border-radius: 4px;
+                padding: 5px;
+            }
+        """)
+        self._placeholder = "請選擇左側專案以查看日誌..."
+
+    def _update_row_height(self) -> None:
+        """固定行高＝字高 + 4（字型由樣式表套用後會再呼叫一次）。"""
+        self.verticalHeader().setDefaultSectionSize(QFontMetrics(self.font()).height() + 4)
+
+    def changeEvent(self, event) -> None:
+        super().changeEvent(event)
+        if event.type() in (QEvent.Type.FontChange, QEvent.Type.StyleChange):
+            self._update_row_height()
+
+    @property
+    def max_lines(self) -> int:
+        return self._model.max_lines
+
+    def set_max_lines(self, max_lines: int) -> None:
+        """設定最多保留的行數（<= 0 代表不限制）。"""
+        self._model.set_max_lines(max_lines)
+
+    def setPlaceholderText(self, text: str) -> None:
+        self._placeholder = text
+        self.viewport().update()
+
+    def set_logs(self, logs: List[str]) -> None:
+        """整份替換並捲到最底。"""
+        if not logs:
+            self.setPlaceholderText("此專案目前沒有日誌紀錄。")
+        self._model.set_lines(logs)
+        self.scrollToBottom()
+
+    def append_logs(self, logs: List[str]) -> None:
+        """只接上新行；原本貼在最底下才自動跟著捲動。"""
+        if not logs:
+            return
+        scroll_bar = self.verticalScrollBar()
+        pinned = scroll_bar.value() >= scroll_bar.maximum() - 4
+        self._model.append_lines(logs)
+        if pinned:
+            self.scrollToBottom()
+
+    def toPlainText(self) -> str:
+        """所有行的純文字（與 QTextEdit 介面對齊，主要給除錯 / 複製用）。"""
+        return "\n".join(
+            classify_log_line(self._model.index(row).data()).to_plain()
+            for row in range(self._model.rowCount())
+        )
+
+    def paintEvent(self, event) -> None:
+        super().paintEvent(event)
+        if self._model.rowCount() == 0 and self._placeholder:
+            painter = QPainter(self.viewport())
+            painter.setPen(QColor("#777777"))
+            painter.drawText(
+                self.viewport().rect().adjusted(6, 6, -6, -6),
+                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                self._placeholder,
+            )
@@ -0,0 +1,183 @@
+# src/tray/multi_drop.py
+"""
+一次拖入多個資料夾到 The Eye 的註冊流程。
+
+單一資料夾照舊（SentryEyeWidget.dropEvent 的 Layer 1 ~ 3）；兩個以上時改走這條管線：
+
+1. resolve_drop_folders()（背景執行緒）
+   - 每個資料夾的預設寫入檔（_find_default_output_file）在執行緒池裡同時找
+   - 同時把所有資料夾一次交給 adapter.match_projects_by_paths 比對（專案列表最多讀一次）
+2. MultiDropReviewDialog：一個視窗列出全部資料夾，可以勾選、修改別名；
+   已註冊、位於其他專案底下、或找不到預設寫入檔的資料夾只列出原因，不能勾選
+3. register_projects()（背景執行緒）：勾選的專案用一個批次（adapter.batch）一次送出，逐筆回報結果
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QDialogButtonBox,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from src.backend import adapter
+
+# 同時找預設寫入檔的執行緒數（網路磁碟 / \\wsl$ 上的 is_file 可能很慢）
+DROP_RESOLVE_WORKERS = 8
+
+# 審查表格的欄位
+_COL_NAME, _COL_FOLDER, _COL_OUTPUT, _COL_NOTE = range(4)
+
+
+@dataclass
+class DropCandidate:
+    """一個拖入的資料夾與它的比對結果。"""
+    folder: str
+    output_file: Optional[str] = None
+    existing: Optional[adapter.ProjectInfo] = None
+    parent: Optional[adapter.ProjectInfo] = None
+    nested: List[adapter.ProjectInfo] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        """預設別名：資料夾名稱。"""
+        return Path(self.folder).name
+
+    @property
+    def registrable(self) -> bool:
+        return self.existing is None and self.parent is None and self.output_file is not None
+
+    @property
+    def note(self) -> str:
+        """給使用者看的說明（不能註冊的原因，或需要留意的地方）。"""
+        if self.existing is not None:
+            return f"已註冊：{self.existing.name}"
+        if self.parent is not None:
+            return f"位於專案「{self.parent.name}」底下"
+        if self.output_file is None:
+            return "找不到預設寫入檔"
+        if self.nested:
+            names = "、".join(p.name for p in self.nested[:3])
+            more = f" 等 {len(self.nested)} 個" if len(self.nested) > 3 else ""
+            return f"⚠️ 底下已有專案：{names}{more}"
+        return ""
+
+
+def resolve_drop_folders(
+    folders: List[str],
+    find_output_file: Callable[[Path], Optional[str]],
+) -> List[DropCandidate]:
+    """[背景執行緒] 同時找每個資料夾的預設寫入檔，並一次比對已註冊專案；回傳順序與 folders 相同。"""
+    if not folders:
+        return []
+    workers = max(1, min(DROP_RESOLVE_WORKERS, len(folders)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="drop") as pool:
+        # 比對走後端（或快取），和檔案掃描同時進行
+        matches = pool.submit(adapter.match_projects_by_paths, folders)
+        outputs = list(pool.map(lambda folder: find_output_file(Path(folder)), folders))
+        matched = matches.result()
+
+    return [
+        DropCandidate(folder=folder, output_file=output, existing=existing, parent=parent, nested=list(nested))
+        for folder, output, (existing, parent, nested) in zip(folders, outputs, matched)
+    ]
+
+
+def register_projects(entries: List[Tuple[str, str, str]]) -> List[adapter.BatchResult]:
+    """[背景執行緒] 用一個批次註冊 [(別名, 資料夾, 寫入檔), ...]，回傳每筆的結果。"""
+    with adapter.batch() as b:
+        for name, folder, output_file in entries:
+            b.add_project(name, folder, output_file)
+    return b.results
+
+
+class MultiDropReviewDialog(QDialog):
+    """多資料夾註冊前的審查視窗：勾選要註冊的資料夾、修改別名。"""
+
+    def __init__(self, candidates: List[DropCandidate], parent=None) -> None:
+        super().__init__(parent)
+        self.candidates = candidates
+        registrable = sum(1 for c in candidates if c.registrable)
+
+        self.setWindowTitle(f"新哨兵設定（{len(candidates)} 個資料夾）")
+        self.resize(760, 480)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(
+            f"可以註冊 {registrable} 個資料夾。勾選要加入的專案，雙擊別名可以修改；"
+            "灰色的資料夾不會註冊（原因見說明欄）。"
+        ))
+
+        self.table = QTableWidget(len(candidates), 4, self)
+        self.table.setHorizontalHeaderLabels(["別名", "資料夾", "寫入檔", "說明"])
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(_COL_FOLDER, QHeaderView.ResizeMode.Stretch)
+        header.setStretchLastSection(True)
+
+        for row, cand in enumerate(candidates):
+            name_item = QTableWidgetItem(cand.name)
+            folder_item = QTableWidgetItem(cand.folder)
+            folder_item.setToolTip(cand.folder)
+            output_item = QTableWidgetItem(Path(cand.output_file).name if cand.output_file else "—")
+            output_item.setToolTip(cand.output_file or "")
+            note_item = QTableWidgetItem(cand.note)
+            note_item.setToolTip(cand.note)
+
+            read_only = Qt.ItemFlag.ItemIsEnabled
+            if cand.registrable:
+                name_item.setFlags(read_only | Qt.ItemFlag.ItemIsEditable | Qt.ItemFlag.ItemIsUserCheckable)
+                name_item.setCheckState(Qt.CheckState.Checked)
+            else:
+                read_only = Qt.ItemFlag.NoItemFlags
+                name_item.setFlags(read_only)
+            for item in (folder_item, output_item, note_item):
+                item.setFlags(read_only)
+
+            self.table.setItem(row, _COL_NAME, name_item)
+            self.table.setItem(row, _COL_FOLDER, folder_item)
+            self.table.setItem(row, _COL_OUTPUT, output_item)
+            self.table.setItem(row, _COL_NOTE, note_item)
+        self.table.resizeColumnToContents(_COL_NAME)
+        self.table.resizeColumnToContents(_COL_OUTPUT)
+        layout.addWidget(self.table)
+
+        self.button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        self.button_box.button(QDialogButtonBox.StandardButton.Ok).setText("註冊")
+        self.button_box.accepted.connect(self._on_accept)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+    def accepted_entries(self) -> List[Tuple[str, str, str]]:
+        """勾選的 [(別名, 資料夾, 寫入檔), ...]（別名已去掉前後空白）。"""
+        entries = []
+        for row, cand in enumerate(self.candidates):
+            item = self.table.item(row, _COL_NAME)
+            if cand.registrable and item.checkState() == Qt.CheckState.Checked:
+                entries.append((item.text().strip(), cand.folder, cand.output_file or ""))
+        return entries
+
+    def _on_accept(self) -> None:
+        """送出前檢查：別名不得為空、也不得彼此重複。"""
+        names = [name for name, _folder, _output in self.accepted_entries()]
+        if any(not name for name in names):
+            QMessageBox.warning(self, "別名不得為空", "請為每個勾選的資料夾輸入別名。")
+            return
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            QMessageBox.warning(self, "別名重複", "以下別名重複，請修改後再註冊：\n" + "\n".join(duplicates))
+            return
+        self.accept()
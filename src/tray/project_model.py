@@ -0,0 +1,250 @@
+# src/tray/project_model.py
+"""
+控制台左側的專案表格模型（ProjectTableModel）。
+
+以前表格是 QTableWidget：每次重載都 setRowCount、每列重新 new 四個 QTableWidgetItem，
+選取也一律跳回第 0 列。現在改成 model/view：
+
+- 資料以 uuid 為 key（列表保序 + uuid → 列號的字典）
+- set_projects(新列表)：只對「差異」發出訊號
+    - 消失的 uuid → beginRemoveRows
+    - 新出現的 uuid → beginInsertRows
+    - 順序變了 → beginMoveRows
+    - 內容變了 → 只對變動的格子發 dataChanged
+- 因為沒有 reset，QTableView 的選取（持久索引）與捲動位置都會自動保留
+
+欄位：0 = UUID（隱藏）、1 = 專案名稱、2 = 監控狀態、3 = 模式
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Literal, Optional, Set
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+from src.backend.adapter import ProjectInfo
+
+COL_UUID = 0
+COL_NAME = 1
+COL_STATUS = 2
+COL_MODE = 3
+
+HEADERS = ["UUID", "專案名稱", "監控狀態", "模式"]
+
+# 表格顯示用的狀態：後端的 ProjectStatus 再加上只存在於 UI 的 "transitioning"
+# （已送出啟停指令、正在等後端狀態翻轉）
+DisplayStatus = Literal["monitoring", "stopped", "transitioning"]
+
+
+def status_to_label(status: str) -> str:
+    """狀態代碼 → 中文標籤。"""
+    # 切換中（已送出啟停指令、等待後端回報）
+    if status == "transitioning":
+        return "切換中…"
+    return "監控中" if status == "monitoring" else "已停止"
+
+
+def mode_to_label(mode: str) -> str:
+    """模式代碼 → 中文標籤。"""
+    return "靜默" if mode == "silent" else "互動"
+
+
+class ProjectTableModel(QAbstractTableModel):
+    """
+    專案表格的資料模型（唯讀）。
+
+    - project_at(row) / row_of(uuid)：列號與專案互查
+    - set_transitioning(uuid, on)：切換中的專案在狀態欄顯示「切換中…」
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._projects: List[ProjectInfo] = []
+        self._rows: Dict[str, int] = {}
+        self._transitioning: Set[str] = set()
+
+    # ---------------------------------------------------------
+    # Qt model 介面
+    # ---------------------------------------------------------
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._projects)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        if row < 0 or row >= len(self._projects):
+            return None
+        proj = self._projects[row]
+        col = index.column()
+        if col == COL_UUID:
+            return proj.uuid
+        if col == COL_NAME:
+            # 多後端時在名稱後面標出來源後端
+            return f"{proj.name} [{proj.backend}]" if proj.backend else proj.name
+        if col == COL_STATUS:
+            return status_to_label(self.display_status(proj))
+        if col == COL_MODE:
+            return mode_to_label(proj.mode)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+            and 0 <= section < len(HEADERS)
+        ):
+            return HEADERS[section]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        # 只能選取，不能編輯
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    # ---------------------------------------------------------
+    # 查詢
+    # ---------------------------------------------------------
+
+    def projects(self) -> List[ProjectInfo]:
+        """目前的專案列表（依表格順序的副本）。"""
+        return list(self._projects)
+
+    def project_at(self, row: int) -> Optional[ProjectInfo]:
+        if 0 <= row < len(self._projects):
+            return self._projects[row]
+        return None
+
+    def row_of(self, uuid: str) -> int:
+        """uuid 所在的列號；不存在時回傳 -1。"""
+        return self._rows.get(uuid, -1)
+
+    def display_status(self, proj: ProjectInfo) -> DisplayStatus:
+        """表格要顯示的狀態：切換中的專案一律顯示 transitioning。"""
+        return "transitioning" if proj.uuid in self._transitioning else proj.status
+
+    # ---------------------------------------------------------
+    # 更新（只對差異發訊號）
+    # ---------------------------------------------------------
+
+    def set_projects(self, projects: Iterable[ProjectInfo]) -> None:
+        """以新的專案列表為準，套用新增 / 移除 / 移動 / 內容變更。"""
+        incoming: List[ProjectInfo] = []
+        seen: Set[str] = set()
+        for proj in projects:
+            # 後端理論上不會有重複 uuid；真的重複時只保留第一筆，維持 key 唯一
+            if proj.uuid in seen:
+                continue
+            seen.add(proj.uuid)
+            incoming.append(proj)
+
+        # 空表第一次載入：直接整批放進去，不必逐列插入
+        if not self._projects:
+            if incoming:
+                self.beginInsertRows(QModelIndex(), 0, len(incoming) - 1)
+                self._projects = incoming
+                self._reindex()
+                self.endInsertRows()
+            return
+
+        # 1. 移除消失的 uuid（由下往上，連續的列合併成一次 remove）
+        gone = [row for row, p in enumerate(self._projects) if p.uuid not in seen]
+        while gone:
+            last = gone.pop()
+            first = last
+            while gone and gone[-1] == first - 1:
+                first = gone.pop()
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._projects[first:last + 1]
+            self.endRemoveRows()
+        self._reindex()
+
+        # 2. 依新順序逐列對齊：前 row 列已經和 incoming 一致
+        for row, proj in enumerate(incoming):
+            current = self._projects[row] if row < len(self._projects) else None
+            if current is not None and current.uuid == proj.uuid:
+                self._replace_row(row, proj)
+                continue
+
+            old_row = self._rows.get(proj.uuid, -1)
+            if old_row < 0:
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._projects.insert(row, proj)
+                self.endInsertRows()
+            else:
+                # old_row 一定在 row 之後（前面的列都已對齊）
+                self.beginMoveRows(QModelIndex(), old_row, old_row, QModelIndex(), row)
+                self._projects.insert(row, self._projects.pop(old_row))
+                self.endMoveRows()
+                self._replace_row(row, proj)
+            self._reindex(row)
+
+    def update_project(self, proj: ProjectInfo) -> bool:
+        """替換單一專案的內容（例如切換監控狀態後）；不在表格中時回傳 False。"""
+        row = self._rows.get(proj.uuid, -1)
+        if row < 0:
+            return False
+        self._replace_row(row, proj)
+        return True
+
+    def upsert_project(self, proj: ProjectInfo) -> None:
+        """更新單一專案；不在表格中時接到最後一列（例如後端推來的新專案）。"""
+        if self.update_project(proj):
+            return
+        row = len(self._projects)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._projects.append(proj)
+        self._rows[proj.uuid] = row
+        self.endInsertRows()
+
+    def remove_uuids(self, uuids: Iterable[str]) -> None:
+        """移除指定的專案（例如刪除成功後）。"""
+        drop = set(uuids)
+        self.set_projects(p for p in self._projects if p.uuid not in drop)
+
+    def set_transitioning(self, uuid: str, on: bool) -> None:
+        """標記 / 取消「切換中」，只重畫那一格狀態欄。"""
+        if on:
+            self._transitioning.add(uuid)
+        else:
+            self._transitioning.discard(uuid)
+        row = self._rows.get(uuid, -1)
+        if row >= 0:
+            cell = self.index(row, COL_STATUS)
+            self.dataChanged.emit(cell, cell, [Qt.ItemDataRole.DisplayRole])
+
+    # ---------------------------------------------------------
+    # 內部工具
+    # ---------------------------------------------------------
+
+    def _replace_row(self, row: int, proj: ProjectInfo) -> None:
+        """換掉某列的 ProjectInfo，只對顯示內容真的改變的欄位發 dataChanged。"""
+        old = self._projects[row]
+        self._projects[row] = proj
+        if old == proj:
+            return
+
+        changed = [
+            col for col, differs in (
+                (COL_NAME, old.name != proj.name or old.backend != proj.backend),
+                (COL_STATUS, old.status != proj.status),
+                (COL_MODE, old.mode != proj.mode),
+            ) if differs
+        ]
+        if changed:
+            self.dataChanged.emit(
+                self.index(row, min(changed)),
+                self.index(row, max(changed)),
+                [Qt.ItemDataRole.DisplayRole],
+            )
+
+    def _reindex(self, start: int = 0) -> None:
+        """重建 uuid → 列號（只從 start 開始，前面的列號沒變）。"""
+        if start == 0:
+            self._rows = {}
+        for row in range(start, len(self._projects)):
+            self._rows[self._projects[row].uuid] = row
@@ -4,10 +4,14 @@
 
 # --- 1. 系統與基礎工具 ---
 import sys
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Callable
 import math
 from pathlib import Path
 
+# 啟動時間的起點（在載入 PySide6 之前記下，見 SentryTrayAppV2 的啟動量測）
+STARTUP_T0 = time.perf_counter()
+
 # --- 2. PySide6 核心與介面元件 ---
 from PySide6.QtCore import (
     Qt, 
@@ -24,13 +28,13 @@ from PySide6.QtGui import (
     QIcon, 
     QAction, 
     QPainter,          # (畫筆)
-    QPen, 
     QColor, 
     QBrush, 
-    QRadialGradient,   # (漸層)
     QCursor,
     QPalette,
-    QPainterPath        # (貝茲曲線工具
+    QTextCursor,        # (日誌區逐行插入)
+    QKeySequence,
+    QShortcut,          # (隱藏的診斷分頁快捷鍵)
 )
 
 from PySide6.QtWidgets import (
@@ -48,8 +52,7 @@ from PySide6.QtWidgets import (
     QInputDialog,
     QSpacerItem,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QSplitter,
     QFrame,
     QAbstractItemView,
@@ -60,10 +63,30 @@ from PySide6.QtWidgets import (
     QDialogButtonBox,
     QDialog,
     QCheckBox,
+    QTabWidget,
 )
 
 # --- 3. 專案內部模組 ---
-from src.backend import adapter
+from src.backend import adapter, events, metrics, paths
+from src.backend.async_adapter import get_async_adapter
+from src.backend.bulk import (
+    BULK_ACTION_LABELS, BULK_DELETE, BULK_START, BULK_STOP, BULK_UPDATE, BulkOperation, BulkOutcome,
+)
+from src.tray.bulk_dialog import BulkOperationDialog
+from src.tray.log_model import (
+    DEFAULT_VIRTUAL_LOG_MAX_LINES,
+    VirtualLogViewerWidget,
+    classify_log_line,
+)
+from src.tray.diagnostics import DiagnosticsPanel
+from src.tray.eye_layers import EYE_EATING, EYE_HUNGRY, EYE_IDLE, EyeGeometry, EyeLayerCache, draw_eye
+from src.tray.multi_drop import MultiDropReviewDialog, register_projects, resolve_drop_folders
+from src.tray.project_model import ProjectTableModel, mode_to_label, status_to_label
+from src.tray.workers import EventRelay, run_in_background, run_coroutine, shutdown_asyncio_bridge
+
+# 日誌輪詢間隔（毫秒）：平常 5 秒；事件串流連線中時改成 30 秒的保險輪詢（新行由事件推送）
+LOG_POLL_INTERVAL_MS = 5000
+LOG_POLL_INTERVAL_LIVE_MS = 30000
 
 # ==========================================
 #   [New] 直覺引導氣泡 (Status Bubble)
@@ -136,7 +159,18 @@ class StatusBubble(QWidget):
 # ==========================================
 #   View A: 哨兵之眼 (Sentry Eye) - 正式實作
 # ==========================================
+
+# 動畫步長（毫秒）：有動作時的更新間隔，也是動畫推進的時間單位（原本的 50 ms 心跳）
+EYE_FRAME_MS = 50
+# 靜止時（只剩呼吸）的更新間隔
+EYE_IDLE_FRAME_MS = 125
+# 時鐘延遲太久（系統忙碌）時最多補幾步，避免動畫瞬間跳很遠
+EYE_MAX_CATCHUP_STEPS = 10
+
 class SentryEyeWidget(QWidget):
+
+    # 第一次畫出眼睛時發出一次（啟動時間量測用）
+    first_painted = Signal()
     
     # 這是我們的靜態常數
     DEFAULT_OUTPUT_FILENAMES = ["README.md", "README.MD", "readme.md", "INDEX.md", "index.md"]
@@ -169,16 +203,24 @@ class SentryEyeWidget(QWidget):
         self.pending_folder = None
 
         # --- 動畫核心 ---
-        # 我們建立（create）一個計時器，讓眼睛動起來。
-        self.timer = QTimer(self)
-        # 每 50 毫秒（ms）觸發一次更新，讓畫面重畫。
-        self.timer.timeout.connect(self.update)
-        # 啟動（start）計時器。
-        self.timer.start(50)
+        # 單一動畫時鐘（取代原本的心跳 / 掃視 / 眨眼三個計時器）：
+        # - 眼睛看不見時（收到托盤、切到控制台）完全停止，顯示時才啟動（showEvent / hideEvent）
+        # - 有動作（瞳孔移動、眨眼、吞噬）時每 EYE_FRAME_MS 更新一次，
+        #   靜止時（只剩呼吸）放慢成每 EYE_IDLE_FRAME_MS 一次
+        # - 動畫以經過的時間推進（每 EYE_FRAME_MS 算一步），更新間隔變長時呼吸速度不變
+        self._clock = QTimer(self)
+        self._clock.timeout.connect(self._on_clock_tick)
+        # 上一次推進動畫的時間，以及還沒推進的「步數零頭」
+        self._last_tick = time.monotonic()
+        self._step_debt = 0.0
         # 這是一個變數，用來記錄動畫目前的「呼吸進度」。
         self.phase = 0
-        # [新增] 吞噬動畫計數器 (0 = 無動畫, >0 = 播放中)
+        # [新增] 吞噬動畫計數器 (0 = 無動畫, >0 = 播放中；以動畫步數計)
         self.eating_frame = 0
+        # 預先繪製的圖層（依顏色狀態 × 大小快取，見 eye_layers.py）
+        self._eye_layers = EyeLayerCache()
+        # 是否已經畫過第一幀（first_painted 只發一次）
+        self._painted = False
 
         # [新增] 初始化引導氣泡
         # 我們把 self (眼睛) 傳進去當作 parent，這樣氣泡就會成為眼睛的子視窗
@@ -191,18 +233,10 @@ class SentryEyeWidget(QWidget):
         self.pupil_offset = QPoint(0, 0)       # 目前位置
         self.target_offset = QPoint(0, 0)      # 目標位置
 
-        # [新增] 掃視計時器 (Saccade Timer)
-        self.saccade_timer = QTimer(self)
-        self.saccade_timer.timeout.connect(self._trigger_saccade)
-        self.saccade_timer.start(3000) # 初始每 3 秒動一次
-
-        # [新增] 眨眼計時器 (Blink Timer)
-        # 我們建立（create）一個計時器，專門控制眨眼。
-        self.blink_timer = QTimer(self)
-        # 時間到時，連結（connect）到觸發眨眼的方法。
-        self.blink_timer.timeout.connect(self._trigger_blink)
-        # 啟動（start）計時器，初始設定 4000 毫秒（4秒）。
-        self.blink_timer.start(4000)
+        # [新增] 掃視與眨眼的下一次時間（time.monotonic 秒；由動畫時鐘檢查）
+        # 初始 3 秒後第一次掃視、4 秒後第一次眨眼
+        self._next_saccade_at = self._last_tick + 3.0
+        self._next_blink_at = self._last_tick + 4.0
 
         # [新增] 眨眼狀態變數
         # 這是一個旗標，標記目前是否正在（is）眨眼。
@@ -248,7 +282,7 @@ class SentryEyeWidget(QWidget):
         """隨機產生眼球移動目標""" 
         import random 
         # 隨機決定下一次動的時間 (2~5秒) 
-        self.saccade_timer.setInterval(random.randint(2000, 5000))
+        self._next_saccade_at = time.monotonic() + random.randint(2000, 5000) / 1000
         # 隨機決定看的方向 (範圍限制在 +/- 15px 以內，避免脫窗)
         # 這裡使用整數簡化計算
         rx = random.randint(-15, 15)
@@ -258,14 +292,15 @@ class SentryEyeWidget(QWidget):
     def _trigger_blink(self):
         """觸發眨眼動畫 (設定雙連眨)"""
         import random
-        if self.eating_frame > 0:
-            return
-
         # --- [教學] 修改這裡的數字來控制頻率 ---
         # 4000 = 4秒, 8000 = 8秒
         # 這表示：每隔 4~8 秒之間，會觸發一次眨眼
         next_interval = random.randint(4000, 8000) 
-        self.blink_timer.setInterval(next_interval)
+        self._next_blink_at = time.monotonic() + next_interval / 1000
+
+        # 吞噬中不眨眼（等下一次）
+        if self.eating_frame > 0:
+            return
         
         # 開始眨眼
         self.is_blinking = True
@@ -285,8 +320,9 @@ class SentryEyeWidget(QWidget):
             self.bubble.hide()
 
     def resizeEvent(self, event):
-        """當視窗大小改變時，調整氣泡位置"""
+        """當視窗大小改變時，調整氣泡位置，並丟掉舊大小的預先繪製圖層"""
         super().resizeEvent(event)
+        self._eye_layers.clear()
         # 讓氣泡水平置中
         if hasattr(self, 'bubble'):
             bx = (self.width() - self.bubble.width()) // 2
@@ -294,171 +330,134 @@ class SentryEyeWidget(QWidget):
             by = int(self.height() * 0.85) 
             self.bubble.move(bx, by)
         
-    def paintEvent(self, event):
-        """繪製精細版哨兵之眼 (v2.1: 中空機械眼 + 雷射邊框)"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
+    # --- 動畫時鐘 ---
+    def showEvent(self, event):
+        """眼睛出現時啟動動畫時鐘（隱藏期間的時間不算，動畫從停下的地方接著走）"""
+        super().showEvent(event)
+        self._last_tick = time.monotonic()
+        self._step_debt = 0.0
+        self._schedule_clock()
+
+    def hideEvent(self, event):
+        """眼睛看不見時（收到托盤、切到控制台）完全停止動畫時鐘"""
+        self._clock.stop()
+        super().hideEvent(event)
+
+    def wake_animation(self):
+        """外部改變了動畫狀態（例如開始吞噬）：馬上切回全速更新並重畫"""
+        if self.isVisible():
+            self._schedule_clock()
+        self.update()
+
+    def _is_animating(self) -> bool:
+        """是否有「動作」正在進行（瞳孔移動、眨眼、吞噬）；否則只剩呼吸，可以放慢更新"""
+        return self.eating_frame > 0 or self.is_blinking or self._pupil_step() != (0, 0)
+
+    def _schedule_clock(self):
+        """依目前是否有動作，決定動畫時鐘的間隔（只在間隔改變或尚未啟動時重設）"""
+        interval = EYE_FRAME_MS if self._is_animating() else EYE_IDLE_FRAME_MS
+        if not self._clock.isActive() or self._clock.interval() != interval:
+            self._clock.start(interval)
+
+    def _on_clock_tick(self):
+        """動畫時鐘：依經過的時間推進動畫、觸發掃視 / 眨眼，再決定下一次多久後醒來"""
+        now = time.monotonic()
+        self._step_debt += (now - self._last_tick) * 1000 / EYE_FRAME_MS
+        self._last_tick = now
+        steps = int(self._step_debt)
+        self._step_debt -= steps
+
+        if now >= self._next_saccade_at:
+            self._trigger_saccade()
+        if now >= self._next_blink_at:
+            self._trigger_blink()
+
+        # 系統忙碌造成的長時間延遲不追趕（最多補 EYE_MAX_CATCHUP_STEPS 步）
+        for _ in range(min(steps, EYE_MAX_CATCHUP_STEPS)):
+            self._advance_frame()
+        if steps:
+            self.update()
+        self._schedule_clock()
+
+    def _pupil_step(self) -> tuple[int, int]:
+        """瞳孔這一步要移動多少 (Ease-out 插值，係數 0.1 代表速度；取整數，太近就停下)"""
+        dx = self.target_offset.x() - self.pupil_offset.x()
+        dy = self.target_offset.y() - self.pupil_offset.y()
+        return int(dx * 0.1), int(dy * 0.1)
+
+    def _advance_frame(self):
+        """推進一步（EYE_FRAME_MS）動畫：呼吸、瞳孔、吞噬倒數、眨眼進度"""
         # --- 0. 動畫核心計算 ---
         self.phase += 0.1
-        breath_factor = 0.85 + 0.15 * abs(math.sin(self.phase))
         # --- [新增] 瞳孔物理運動 (Ease-out 插值) ---
-        # 讓目前位置追趕目標位置，係數 0.1 代表速度
-        dx = self.target_offset.x() - self.pupil_offset.x()
-        dy = self.target_offset.y() - self.pupil_offset.y()
+        # 讓目前位置追趕目標位置 (轉成整數以利繪圖)
+        step_x, step_y = self._pupil_step()
+        self.pupil_offset = QPoint(self.pupil_offset.x() + step_x, self.pupil_offset.y() + step_y)
+        # 吞噬動畫倒數
+        if self.eating_frame > 0:
+            self.eating_frame -= 1
+
+        # --- 眨眼動畫 (v2.2: 單向 + 雙連眨) ---
+        if self.is_blinking:
+            # 增加進度 (0.35 = 眨得更快一點，因為要眨兩下)
+            self.blink_progress += 0.35
+
+            # 動畫結束檢查
+            if self.blink_progress >= 2.0:
+                # [關鍵] 檢查是否需要連眨
+                if self.blink_repeats > 0:
+                    self.blink_repeats -= 1
+                    self.blink_progress = 0.0 # 重置進度，馬上再眨一次
+                else:
+                    # 真的結束了
+                    self.is_blinking = False
+                    self.blink_progress = 0.0
+
+    def paintEvent(self, event):
+        """
+        繪製精細版哨兵之眼 (v2.1: 中空機械眼 + 雷射邊框)
 
-        # 更新目前位置 (轉成整數以利繪圖)
-        new_x = self.pupil_offset.x() + int(dx * 0.1)
-        new_y = self.pupil_offset.y() + int(dy * 0.1)
-        self.pupil_offset = QPoint(new_x, new_y)
+        這裡只負責「畫」目前的動畫狀態（推進動畫在 _advance_frame）。
+        光暈、眼眶、瞳孔與眼皮都是預先畫好的圖層（見 src/tray/eye_layers.py），
+        每幀只貼上幾張 pixmap；圖層只在大小或顏色狀態改變時重畫。
+        """
+        breath_factor = 0.85 + 0.15 * abs(math.sin(self.phase))
         # 狀態判斷
         is_eating = self.eating_frame > 0
         if is_eating:
-            self.eating_frame -= 1
             breath_factor = 1.2 
             
         # 判斷是否處於「飢渴狀態 (Hunting Mode)」
         is_hungry = self.pending_folder is not None
 
-        rect = self.rect()
-        center = rect.center()
-        w = rect.width()
-        h = rect.height()
-        
-        # [動態適配] 使用相對比例，而非固定數值
-        eye_width = w * 0.8
-        eye_height = h * 0.5
-
-        # --- 定義色票 (Color Palette) ---
+        # --- 定義色票 (Color Palette)：吞噬中綠色、飢渴中橘紅色、正常青色 ---
         if is_eating:
-            # 吞噬中：綠色
-            main_color = QColor(50, 255, 50)
-            glow_color = QColor(0, 200, 0)
+            state = EYE_EATING
         elif is_hungry:
-            # 飢渴中：橘紅色
-            main_color = QColor(255, 140, 0) 
-            glow_color = QColor(255, 69, 0)  
+            state = EYE_HUNGRY
         else:
-            # 正常：青色
-            main_color = QColor(0, 255, 255)
-            glow_color = QColor(0, 150, 255)
+            state = EYE_IDLE
 
-        # --- 1. 背景光暈 ---
-        halo_radius = (eye_width / 2) * breath_factor * 1.2
-        halo = QRadialGradient(center, halo_radius)
-        
-        # 設定透明度
-        c1 = QColor(main_color)
-        c1.setAlpha(100 if not is_eating else 180)
-        c2 = QColor(glow_color)
-        c2.setAlpha(40 if not is_eating else 50)
-        
-        halo.setColorAt(0.0, c1)
-        halo.setColorAt(0.5, c2)
-        halo.setColorAt(1.0, QColor(0, 0, 0, 0))
-        
-        painter.setBrush(QBrush(halo))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawEllipse(center, halo_radius, halo_radius)
-        
-        # --- 2. 眼眶 (上下眼瞼) ---
-        path = QPainterPath()
-        left_pt = QPoint(int(center.x() - eye_width/2), int(center.y()))
-        right_pt = QPoint(int(center.x() + eye_width/2), int(center.y()))
-        top_ctrl = QPoint(int(center.x()), int(center.y() - eye_height))
-        bottom_ctrl = QPoint(int(center.x()), int(center.y() + eye_height))
-        
-        path.moveTo(left_pt)
-        path.quadTo(top_ctrl, right_pt)
-        path.quadTo(bottom_ctrl, left_pt)
-        
-        # 外框顏色
-        pen_color = QColor(main_color)
-        pen_color.setAlpha(255)
-        pen_glow = QPen(pen_color)
-        # [視覺微調] 使用浮點數寬度，讓線條更細緻 (1.5px / 2.5px)
-        pen_glow.setWidthF(2.5 if is_eating else 1.5)
-        painter.setPen(pen_glow)
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawPath(path)
-
-# --- 3. 瞳孔 (v2.1: 中空雷射環 + 物理運動) ---
-        # [關鍵 1] 計算瞳孔的新中心點 (原本的中心 + 偏移量)
-        pupil_center = center + self.pupil_offset
-
-        # [關鍵 2] 根據狀態決定瞳孔大小 (維持 Task 9.2.1 的邏輯)
-        if is_eating:
-            pupil_scale = 0.2
-        elif is_hungry:
-            pupil_scale = 0.55 
-        else:
-            pupil_scale = 0.45 
-
-        pupil_r = eye_height * pupil_scale
-        
-        # [關鍵 3] 繪製 (注意：這裡全部改成用 pupil_center！)
-        
-        # A. 虹膜 (透明 + 邊框)
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        ring_pen = QPen(main_color)
-        ring_pen.setWidthF(1.5) 
-        painter.setPen(ring_pen)
-        # 使用新的中心點繪製
-        painter.drawEllipse(pupil_center, pupil_r, pupil_r)
-        
-        # B. 內圈瞳孔 (黑色實心)
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.setBrush(QBrush(QColor(0, 0, 0, 220)))
-        # 使用新的中心點繪製
-        painter.drawEllipse(pupil_center, pupil_r * 0.6, pupil_r * 0.6)
-
-        # --- 4. 眨眼動畫 (v2.2: 單向 + 雙連眨) ---
+        # 眼皮閉合程度：前半段蓋下來、後半段掀回去
+        lid_factor = 0.0
         if self.is_blinking:
-            # 增加進度 (0.35 = 眨得更快一點，因為要眨兩下)
-            self.blink_progress += 0.35
-
-            # 計算閉合程度
             if self.blink_progress <= 1.0:
                 lid_factor = self.blink_progress
             else:
                 lid_factor = 2.0 - self.blink_progress
 
-            # 動畫結束檢查
-            if self.blink_progress >= 2.0:
-                # [關鍵] 檢查是否需要連眨
-                if self.blink_repeats > 0:
-                    self.blink_repeats -= 1
-                    self.blink_progress = 0.0 # 重置進度，馬上再眨一次
-                    lid_factor = 0.0
-                else:
-                    # 真的結束了
-                    self.is_blinking = False
-                    self.blink_progress = 0.0
-                    lid_factor = 0.0
+        # [動態適配] 幾何使用相對比例，而非固定數值
+        geometry = EyeGeometry(self.width(), self.height())
+        layers = self._eye_layers.get(state, geometry, self.devicePixelRatioF())
 
-            # 設定剪裁
-            painter.save()
-            painter.setClipPath(path)
+        # 光暈 → 眼眶 → 瞳孔 (中空雷射環 + 物理運動) → 眼皮 (只從上面蓋下來)
+        painter = QPainter(self)
+        draw_eye(painter, layers, geometry, breath_factor, self.pupil_offset, lid_factor)
+        painter.end()
 
-            # 計算眼皮高度
-            # 因為只從上面蓋下來，高度需要是原本的 2 倍才能蓋滿全眼
-            lid_h = int(eye_height * 2 * lid_factor)
-            
-            lid_color = QColor(main_color)
-            lid_color.setAlpha(200) 
-            painter.setBrush(QBrush(lid_color))
-            painter.setPen(Qt.PenStyle.NoPen)
-
-            # 只畫上眼瞼 (從上往下蓋)
-            # 起點 Y 是眼眶最高點 (center.y - eye_height)
-            painter.drawRect(
-                int(center.x() - eye_width/2), 
-                int(center.y() - eye_height), 
-                int(eye_width), 
-                lid_h
-            )
-            
-            painter.restore()
+        if not self._painted:
+            self._painted = True
+            self.first_painted.emit()
 
     # --- 實作無邊框視窗的拖曳功能 ---
     def mousePressEvent(self, event):
@@ -510,43 +509,36 @@ class SentryEyeWidget(QWidget):
                 event.ignore()
             return
 
+        # --- [多資料夾] 一次拖入兩個以上的資料夾：批次註冊管線（見 src/tray/multi_drop.py）---
+        folders = [str(p) for p in (Path(u.toLocalFile()) for u in urls) if p.is_dir()]
+        if len(folders) > 1:
+            self._start_multi_drop(list(dict.fromkeys(folders)))
+            event.accept()
+            return
+
         # --- [Layer 1] 舊雨判定 ---
         if path_obj.is_dir():
-            match_proj = adapter.match_project_by_path(path_str)
-
-            if match_proj:
-                if match_proj.status == "monitoring":
-                    adapter.trigger_manual_update(match_proj.uuid)
-                    # [氣泡] 單次更新回饋
-                    self.bubble.show_message(f"✨ 專案「{match_proj.name}」\n已觸發單次更新！", 3000)
-                else:
-                    adapter.toggle_project_status(match_proj.uuid)
-                    # [氣泡] 啟動回饋
-                    self.bubble.show_message(f"👁️ 歡迎回來，{match_proj.name}。\n哨兵已啟動！", 4000)
-                
-                event.accept()
-                return
+            # 比對走 adapter 的路徑索引（快取過期時才需要問後端），仍放在背景以免卡住眼睛動畫
+            def _resolve():
+                match_proj = adapter.match_project_by_path(path_str)
+                if match_proj is not None:
+                    return match_proj, None, []
+                # 不是專案本身：再看看它是不是某專案的子資料夾、或底下已有專案
+                return (
+                    None,
+                    adapter.find_project_containing(path_str),
+                    adapter.find_projects_within(path_str),
+                )
 
-        # --- [Layer 2 & 3] 新專案處理 ---
-        if path_obj.is_dir():
-            # Layer 2: 智慧預設
-            default_file = self._find_default_output_file(path_obj)
-            # 我們用「if」同時檢查：是否開啟了智慧配對（enable_smart_match）以及是否找到了預設檔。
-            if self.enable_smart_match and default_file:
-                # [氣泡] 預設檔命中提示 (在彈出輸入框前先給個提示)
-                self.bubble.show_message("✨ 已鎖定預設檔，準備啟動...", 2000)
-                # 這裡稍微延遲一下再彈出輸入框，讓氣泡能被看到
-                QTimer.singleShot(500, lambda: self._execute_add_project(str(path_obj), default_file))
-            else:
-                # Layer 3: 飢餓模式
-                self.pending_folder = str(path_obj)
-                self.update() 
-                # 用「if」判斷：只有在開啟引導（enable_guidance）時，才顯示氣泡8秒。
-                if self.enable_guidance:
-                    self.bubble.show_message("🟠 收到資料夾！\n請再拖入「寫入檔」給我...", 8000)
+            run_in_background(
+                _resolve,
+                on_done=lambda r: self._on_folder_matched(path_obj, *r),
+                on_error=lambda e: self.bubble.show_message(f"❌ 查詢專案失敗：{e}", 3000),
+            )
             event.accept()
-            
-        elif path_obj.is_file():
+            return
+
+        if path_obj.is_file():
             menu = QMenu(self)
             menu.setStyleSheet("QMenu { background-color: rgba(20, 20, 30, 240); color: white; border: 1px solid #00FFFF; }")
             action = QAction(f"⚡ 單次更新: {path_obj.name}", menu)
@@ -557,6 +549,110 @@ class SentryEyeWidget(QWidget):
                 event.accept()
 
 
+    def _on_folder_matched(
+        self,
+        path_obj: Path,
+        match_proj: adapter.ProjectInfo | None,
+        parent_proj: adapter.ProjectInfo | None = None,
+        nested_projs: List[adapter.ProjectInfo] | None = None,
+    ) -> None:
+        """
+        [背景回呼] 拖入的資料夾比對完成：舊專案走 Layer 1，新專案走 Layer 2 & 3。
+        - parent_proj：資料夾位於這個已註冊專案底下 → 視同拖入該專案（Layer 1）
+        - nested_projs：資料夾底下已有的專案 → 仍可註冊，但先提醒
+        """
+        # --- [Layer 1'] 子資料夾：歸給所屬的專案 ---
+        if not match_proj and parent_proj:
+            self.bubble.show_message(f"📂 這是專案「{parent_proj.name}」底下的資料夾。", 2000)
+            match_proj = parent_proj
+
+        # --- [Layer 1] 舊雨 ---
+        if match_proj:
+            if match_proj.status == "monitoring":
+                run_in_background(
+                    adapter.trigger_manual_update, match_proj.uuid,
+                    # [氣泡] 單次更新回饋
+                    on_done=lambda _r: self.bubble.show_message(f"✨ 專案「{match_proj.name}」\n已觸發單次更新！", 3000),
+                    on_error=lambda e: self.bubble.show_message(f"❌ 更新失敗：{e}", 3000),
+                )
+            else:
+                run_in_background(
+                    adapter.toggle_project_status, match_proj.uuid,
+                    # [氣泡] 啟動回饋
+                    on_done=lambda _r: self.bubble.show_message(f"👁️ 歡迎回來，{match_proj.name}。\n哨兵已啟動！", 4000),
+                    on_error=lambda e: self.bubble.show_message(f"❌ 啟動失敗：{e}", 3000),
+                )
+            return
+
+        # --- [Layer 2 & 3] 新專案處理 ---
+        if nested_projs:
+            names = "、".join(p.name for p in nested_projs[:3])
+            more = f" 等 {len(nested_projs)} 個" if len(nested_projs) > 3 else ""
+            self.bubble.show_message(f"⚠️ 此資料夾底下已有專案：{names}{more}", 3000)
+
+        # Layer 2: 智慧預設
+        default_file = self._find_default_output_file(path_obj)
+        # 我們用「if」同時檢查：是否開啟了智慧配對（enable_smart_match）以及是否找到了預設檔。
+        if self.enable_smart_match and default_file:
+            # [氣泡] 預設檔命中提示 (在彈出輸入框前先給個提示)
+            self.bubble.show_message("✨ 已鎖定預設檔，準備啟動...", 2000)
+            # 這裡稍微延遲一下再彈出輸入框，讓氣泡能被看到
+            QTimer.singleShot(500, lambda: self._execute_add_project(str(path_obj), default_file))
+        else:
+            # Layer 3: 飢餓模式
+            self.pending_folder = str(path_obj)
+            self.update() 
+            # 用「if」判斷：只有在開啟引導（enable_guidance）時，才顯示氣泡8秒。
+            if self.enable_guidance:
+                self.bubble.show_message("🟠 收到資料夾！\n請再拖入「寫入檔」給我...", 8000)
+
+    def _start_multi_drop(self, folders: List[str]) -> None:
+        """多資料夾：背景同時找預設寫入檔並一次比對已註冊專案，完成後開審查視窗。"""
+        self.bubble.show_message(f"📦 收到 {len(folders)} 個資料夾，比對中...", 3000)
+        run_in_background(
+            resolve_drop_folders, folders, self._find_default_output_file,
+            on_done=self._on_multi_drop_resolved,
+            on_error=lambda e: self.bubble.show_message(f"❌ 查詢專案失敗：{e}", 3000),
+        )
+
+    def _on_multi_drop_resolved(self, candidates) -> None:
+        """[背景回呼] 比對完成：列出全部資料夾給使用者確認，勾選的專案一次註冊。"""
+        if not any(c.registrable for c in candidates):
+            self.bubble.show_message(
+                f"🤔 {len(candidates)} 個資料夾都不能註冊\n（已註冊，或找不到預設寫入檔）", 4000
+            )
+            return
+
+        dialog = MultiDropReviewDialog(candidates, self)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        entries = dialog.accepted_entries()
+        if not entries:
+            return
+
+        self.bubble.show_message(f"⏳ 正在註冊 {len(entries)} 個專案...", 3000)
+        run_in_background(
+            register_projects, entries,
+            on_done=self._on_multi_registered,
+            on_error=lambda e: QMessageBox.critical(self, "新增失敗", str(e)),
+        )
+
+    def _on_multi_registered(self, results: List[adapter.BatchResult]) -> None:
+        """[背景回呼] 批次註冊完成：成功的吞下去，失敗的一次列出。"""
+        added = [r for r in results if r.ok]
+        failed = [r for r in results if not r.ok]
+        if added:
+            # 吞噬動畫 (持續約 20 幀)
+            self.eating_frame = 20
+            self.wake_animation()
+        if failed:
+            details = "\n".join(f"- {r.args[0] if r.args else '?'}：{r.error}" for r in failed)
+            QTimer.singleShot(600, lambda: QMessageBox.warning(
+                self, "部分新增失敗", f"成功：{len(added)}\n失敗：{len(failed)}\n\n{details}"
+            ))
+        else:
+            self.bubble.show_message(f"✨ 已加入 {len(added)} 個哨兵！", 4000)
+
     def _execute_add_project(self, folder, output_file):
         """[內部工具] 執行最終的新增動作"""
         path_obj = Path(folder)
@@ -569,17 +665,23 @@ class SentryEyeWidget(QWidget):
             self.pending_folder = None
             return
 
-        try:
-            adapter.add_project(name=name, path=folder, output_file=output_file)
+        def _on_added(_result) -> None:
             # [新增] 觸發吞噬動畫 (持續約 20 幀)
             self.eating_frame = 20
+            self.wake_animation()
             # [修正] 延遲 600 毫秒再彈出視窗，讓使用者先欣賞「吞噬動畫」
-            actual_filename = Path(output_file).name
             QTimer.singleShot(600, lambda: QMessageBox.information(self, "新增成功", f"已加入哨兵：{name}\n目標：{Path(output_file).name}"))
-        except Exception as e:
+
+        def _on_failed(e: Exception) -> None:
             QMessageBox.critical(self, "新增失敗", str(e))
             self.pending_folder = None # 失敗也要重置
 
+        # 在背景呼叫後端新增，等待期間眼睛照常呼吸
+        run_in_background(
+            adapter.add_project, name=name, path=folder, output_file=output_file,
+            on_done=_on_added, on_error=_on_failed,
+        )
+
     def _real_add_project(self, path_obj):
         """[真實邏輯] 呼叫 Adapter 新增專案 (含智慧引導)"""
         folder_path = str(path_obj)
@@ -607,38 +709,44 @@ class SentryEyeWidget(QWidget):
             # 用「return」結束新增流程。
             return
 
-        # 3. 呼叫後端 (使用找到的 output_file)
-        try:
-            # 嘗試快速新增
-            adapter.add_project(name=name, path=folder_path, output_file=output_file)
+        # 3. 呼叫後端 (使用找到的 output_file)；在背景執行，等待期間眼睛照常呼吸，也不再收新的拖曳
+        def _on_added(_result) -> None:
+            self.setAcceptDrops(True)
             # R2 修正: 確保成功訊息顯示的是實際找到的檔名，而不是硬編碼的 README.md。
-            actual_filename = Path(output_file).name 
+            actual_filename = Path(output_file).name
             QMessageBox.information(self, "新增成功", f"已加入哨兵：{name}\n目標：{actual_filename}")
-            
-        except Exception as e:
+
+        def _on_failed(e: Exception) -> None:
+            self.setAcceptDrops(True)
             # --- 失敗後的智慧引導 ---
             error_msg = str(e)
-            
+
             # 【關鍵優化】如果找不到預設檔案（R2 暫時解法）
             # 或者是後端報錯，我們直接引導使用者去控制台。
             if "不存在" in error_msg or "No such file" in error_msg or "已被佔用" in error_msg:
                 QMessageBox.warning(
-                    self, 
-                    "新增失敗 - 需要手動修正", 
+                    self,
+                    "新增失敗 - 需要手動修正",
                     f"快速新增失敗：找不到預設寫入檔，或專案已被佔用。\n\n已為您切換至【控制台】，請在下方手動輸入路徑。",
                     QMessageBox.StandardButton.Ok
                 )
-                
+
                 # 執行切換到 View B (控制台) 的動作
                 self.btn_dashboard.click()
-                
+
                 # 這裡未來可以新增邏輯：自動填入 View B 的輸入框
                 # 但目前 View B 的輸入框邏輯還沒完全移植，先只做到切換。
-                
+
             else:
                 # 其他錯誤（例如後端崩潰、Adapter 通訊失敗）直接報錯
                 QMessageBox.critical(self, "新增失敗", error_msg)
 
+        self.setAcceptDrops(False)
+        run_in_background(
+            adapter.add_project, name=name, path=folder_path, output_file=output_file,
+            on_done=_on_added, on_error=_on_failed,
+        )
+
     def contextMenuEvent(self, event):
         """[Task 9.4-UX] 右鍵選單：提供飢餓狀態的逃生門"""
         # 只有在「飢餓模式 (有暫存資料夾)」時，才顯示這個選單
@@ -769,17 +877,23 @@ class IgnoreSettingsDialog(QDialog):
         self.list_widget.scrollToBottom()
         self.new_pattern_edit.clear()
 
+# 寫入檔列表項目存放「後端原始路徑」的 role（顯示文字是轉換後的 Windows 路徑）
+TARGET_PATH_ROLE = Qt.ItemDataRole.UserRole + 1
+
 class TargetListWidget(QListWidget):
     """
     專門用於處理寫入檔列表的 QListWidget 子類別。
     它接收專案 UUID 和重載回調函式，直接執行拖曳新增邏輯。
+    busy_callback(True / False)：後端呼叫開始 / 失敗結束時通知對話框鎖住 / 解鎖按鈕
+    （成功時接著 reload_callback，由它在重新讀取完成後解鎖）。
     """
-    def __init__(self, uuid, reload_callback, log_callback, parent=None):
+    def __init__(self, uuid, reload_callback, log_callback, busy_callback=None, parent=None):
         super().__init__(parent)
         # 儲存參數
         self.uuid = uuid 
         self.reload_data = reload_callback 
         self.log_callback = log_callback
+        self.busy_callback = busy_callback or (lambda _busy: None)
         self.VALID_EXTENSIONS = {'.md', '.markdown', '.txt', '.log'}
 
         # --- 拖曳核心設定 ---
@@ -829,43 +943,56 @@ class TargetListWidget(QListWidget):
             event.ignore()
 
     def dropEvent(self, event):
-        """處理放下事件：批次呼叫後端追加目標"""
-        from pathlib import Path
-        from PySide6.QtWidgets import QMessageBox
-
+        """處理放下事件：批次呼叫後端追加目標（在背景執行，完成前列表與按鈕保持鎖住）"""
         urls = event.mimeData().urls()
         if not urls:
             return
-            
-        added_count = 0
-        error_count = 0
-        
+
+        # 只處理存在的檔案，且在白名單內
+        files = []
         for url in urls:
             path_str = url.toLocalFile()
             path_obj = Path(path_str)
-            
-            # 只處理存在的檔案，且在白名單內
             if path_obj.is_file() and path_obj.suffix.lower() in self.VALID_EXTENSIONS:
-                try:
-                    # 呼叫後端追加 (複用既有的 adapter 接口)
-                    adapter.add_target(self.uuid, path_str)
+                files.append(path_str)
+
+        if not files:
+            QMessageBox.warning(self, "警告", "拖曳無效：沒有可識別的 Markdown 檔案。")
+            event.ignore()
+            return
+        event.accept()
+
+        def _send() -> List[adapter.BatchResult]:
+            # 收集所有可用檔案，整批送出 (只需一次後端往返)
+            with adapter.batch() as b:
+                for path_str in files:
+                    b.add_target(self.uuid, path_str)
+            return b.results
+
+        def _on_done(results: List[adapter.BatchResult]) -> None:
+            added_count = 0
+            error_count = 0
+            for result in results:
+                if result.ok:
                     added_count += 1
-                    self.log_callback(f"+ 拖曳新增: {Path(path_str).name}")
-                except Exception:
+                    self.log_callback(f"+ 拖曳新增: {Path(result.args[1]).name}")
+                else:
                     # 如果後端拒絕 (例如：重複路徑、路徑無效)，我們計數但繼續處理下一個
                     error_count += 1
-            
-        # 根據結果更新介面與回饋
-        if added_count > 0 or error_count > 0:
-            self.reload_data() # 刷新列表
+
+            # 根據結果更新介面與回饋
+            self.reload_data() # 刷新列表（背景重新讀取，完成後解鎖）
             msg = f"✓ 成功追加 {added_count} 個目標。"
             if error_count > 0:
                 msg += f" (忽略 {error_count} 個重複/無效路徑)"
             QMessageBox.information(self, "批次追加結果", msg)
-            event.accept()
-        else:
-            QMessageBox.warning(self, "警告", "拖曳無效：沒有可識別的 Markdown 檔案。")
-            event.ignore()
+
+        def _on_failed(e: Exception) -> None:
+            self.busy_callback(False)
+            QMessageBox.critical(self, "追加失敗", str(e))
+
+        self.busy_callback(True)
+        run_in_background(_send, on_done=_on_done, on_error=_on_failed)
 
 # 我們用「class」來定義（define）編輯專案設定視窗類別。
 class EditProjectDialog(QDialog):
@@ -881,6 +1008,8 @@ class EditProjectDialog(QDialog):
         self.uuid = project_data.uuid if project_data else ""
         # [新增] 記錄即時操作的次數 (如增刪寫入檔)
         self.change_log = []
+        # 寫入檔的後端呼叫進行中（見 _set_busy）
+        self._busy = False
         self.setWindowTitle(f"修改專案設定 - {project_data.name if project_data else ''}")
         self.resize(600, 500) # 加高一點以容納列表
         
@@ -902,7 +1031,10 @@ class EditProjectDialog(QDialog):
         layout_basic.addWidget(self.name_edit)
 
         # 2. 專案路徑
-        self.path_edit = QLineEdit(data.path if data else "")
+        # 以 Windows 形式顯示（C:\... 或 \\wsl$\...）；比對變更時兩邊都轉成 WSL 路徑
+        # 多後端時用專案所屬後端的 distro 組 \\wsl$ 路徑
+        self._distro = adapter.backend_distro(data.backend) if data else None
+        self.path_edit = QLineEdit(paths.to_windows(data.path, self._distro) if data else "")
         layout_basic.addWidget(QLabel("專案資料夾路徑 (Path)："))
         layout_basic.addWidget(self.path_edit)
         layout_basic.addWidget(QLabel("提示：修改路徑可能導致哨兵重啟！"))
@@ -924,7 +1056,8 @@ class EditProjectDialog(QDialog):
         self.target_list = TargetListWidget(
             uuid=self.uuid, 
             reload_callback=self._reload_data,
-            log_callback=self._append_log
+            log_callback=self._append_log,
+            busy_callback=self._set_busy,
         )
         # [新增] 啟用寫入檔列表的拖曳功能
         self.target_list.setAcceptDrops(True)
@@ -933,14 +1066,14 @@ class EditProjectDialog(QDialog):
         
         # 按鈕區
         btn_layout = QHBoxLayout()
-        btn_add = QPushButton("➕ 追加寫入檔...")
-        btn_remove = QPushButton("➖ 移除選中檔")
+        self.btn_add_target = QPushButton("➕ 追加寫入檔...")
+        self.btn_remove_target = QPushButton("➖ 移除選中檔")
         
-        btn_add.clicked.connect(self._on_add_target)
-        btn_remove.clicked.connect(self._on_remove_target)
+        self.btn_add_target.clicked.connect(self._on_add_target)
+        self.btn_remove_target.clicked.connect(self._on_remove_target)
         
-        btn_layout.addWidget(btn_add)
-        btn_layout.addWidget(btn_remove)
+        btn_layout.addWidget(self.btn_add_target)
+        btn_layout.addWidget(self.btn_remove_target)
         layout_targets.addLayout(btn_layout)
         
         main_layout.addWidget(group_targets)
@@ -954,19 +1087,47 @@ class EditProjectDialog(QDialog):
         main_layout.addWidget(self.button_box)
 
     def _refresh_target_list(self, targets: List[str]):
-        """刷新列表顯示"""
+        """刷新列表顯示（顯示 Windows 形式，原始路徑存在 TARGET_PATH_ROLE，送回後端時用它）"""
         self.target_list.clear()
-        for t in targets:
-            self.target_list.addItem(t)
+        for t, shown in zip(targets, paths.to_windows_many(targets, self._distro)):
+            item = QListWidgetItem(shown)
+            item.setData(TARGET_PATH_ROLE, t)
+            item.setToolTip(t)
+            self.target_list.addItem(item)
+
+    def _set_busy(self, busy: bool) -> None:
+        """
+        寫入檔的後端呼叫進行中：鎖住列表、增刪按鈕與 Save / Cancel
+        （避免重複送出，也避免在列表還沒重新讀取完時按下 Save 比對到舊資料）。
+        """
+        self._busy = busy
+        self.target_list.setEnabled(not busy)
+        self.btn_add_target.setEnabled(not busy)
+        self.btn_remove_target.setEnabled(not busy)
+        self.button_box.setEnabled(not busy)
+
+    def reject(self) -> None:
+        # 後端呼叫進行中不關閉（Esc / 視窗的 X），結果回來時對話框必須還在
+        if self._busy:
+            return
+        super().reject()
 
     def _reload_data(self):
-        """從後端重新讀取此專案的最新資料 (用於更新列表)"""
+        """在背景從後端重新讀取此專案的最新資料 (用於更新列表)；讀取期間鎖住列表與按鈕"""
+        self._set_busy(True)
+
+        def _on_loaded(all_projects: List[adapter.ProjectInfo]) -> None:
+            self._set_busy(False)
+            current = next((p for p in all_projects if p.uuid == self.uuid), None)
+            if current:
+                self.project_data = current
+                self._refresh_target_list(current.output_file)
 
-        all_projects = adapter.list_projects()
-        current = next((p for p in all_projects if p.uuid == self.uuid), None)
-        if current:
-            self.project_data = current
-            self._refresh_target_list(current.output_file)
+        def _on_failed(e: Exception) -> None:
+            self._set_busy(False)
+            QMessageBox.warning(self, "重新讀取失敗", str(e))
+
+        run_in_background(adapter.list_projects, on_done=_on_loaded, on_error=_on_failed)
 
     def _append_log(self, msg: str):
         self.change_log.append(msg)
@@ -983,16 +1144,20 @@ class EditProjectDialog(QDialog):
         if not file_path:
             return
 
-        try:
-            # 呼叫後端追加
-            adapter.add_target(self.uuid, file_path)
-            self._append_log(f"+ 新增: {Path(file_path).name}") 
-            # 刷新介面
+        def _on_added(_result) -> None:
+            self._append_log(f"+ 新增: {Path(file_path).name}")
+            # 刷新介面（背景重新讀取，完成後解鎖）
             self._reload_data()
             QMessageBox.information(self, "成功", "已成功追加寫入目標。")
-        except Exception as e:
+
+        def _on_failed(e: Exception) -> None:
+            self._set_busy(False)
             QMessageBox.critical(self, "追加失敗", str(e))
 
+        # 呼叫後端追加（背景執行，完成前鎖住列表與按鈕）
+        self._set_busy(True)
+        run_in_background(adapter.add_target, self.uuid, file_path, on_done=_on_added, on_error=_on_failed)
+
     def _on_remove_target(self):
         """處理移除寫入檔 (支援批次移除)"""
         selected_items = self.target_list.selectedItems()
@@ -1015,23 +1180,39 @@ class EditProjectDialog(QDialog):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
-        if reply == QMessageBox.StandardButton.Yes:
-            # 3. 執行批次移除
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        # 3. 執行批次移除 (整批一次往返；背景執行，完成前鎖住列表與按鈕)
+        targets = [item.data(TARGET_PATH_ROLE) for item in selected_items]
+
+        def _send() -> List[adapter.BatchResult]:
+            with adapter.batch() as b:
+                for target in targets:
+                    b.remove_target(self.uuid, target)
+            return b.results
+
+        def _on_done(results: List[adapter.BatchResult]) -> None:
             error_count = 0
-            for item in selected_items:
-                path_to_remove = item.text()
-                try:
-                    adapter.remove_target(self.uuid, path_to_remove)
-                    self._append_log(f"- 移除: {Path(path_to_remove).name}")
-                except Exception:
+            for result in results:
+                if result.ok:
+                    self._append_log(f"- 移除: {Path(result.args[1]).name}")
+                else:
                     error_count += 1
-            
-            # 4. 刷新介面
+
+            # 4. 刷新介面（背景重新讀取，完成後解鎖）
             self._reload_data()
-            
+
             if error_count > 0:
                 QMessageBox.warning(self, "部分失敗", f"有 {error_count} 個檔案移除失敗。")
 
+        def _on_failed(e: Exception) -> None:
+            self._set_busy(False)
+            QMessageBox.critical(self, "移除失敗", str(e))
+
+        self._set_busy(True)
+        run_in_background(_send, on_done=_on_done, on_error=_on_failed)
+
     def get_changes(self) -> Dict[str, Any]:
         """回傳基本資料的變更 (Name/Path) 以及寫入檔變更"""
         changes = {}
@@ -1044,7 +1225,7 @@ class EditProjectDialog(QDialog):
 
         # 2. 檢查路徑變更
         new_path = self.path_edit.text().strip()
-        if self.project_data and new_path != self.project_data.path:
+        if self.project_data and paths.to_wsl(new_path) != paths.to_wsl(self.project_data.path):
             if new_path:
                 changes['path'] = new_path
         
@@ -1053,7 +1234,7 @@ class EditProjectDialog(QDialog):
         current_targets = []
         for i in range(self.target_list.count()):
             item = self.target_list.item(i)
-            current_targets.append(item.text())
+            current_targets.append(item.data(TARGET_PATH_ROLE))
             
         # 與原始資料比對 (轉換成 set 比較內容，忽略順序)
         original_targets = self.project_data.output_file if self.project_data else []
@@ -1074,13 +1255,25 @@ from PySide6.QtWidgets import QTextEdit
 # ==========================================
 from PySide6.QtWidgets import QTextEdit
 
+# 日誌區預設最多保留幾行（超過時最舊的行會被丟掉）；可用 sentry_config.ini 的 log_viewer_max_lines 覆寫
+DEFAULT_LOG_VIEWER_MAX_LINES = 5000
+
+
 class LogViewerWidget(QTextEdit):
     """
     黑底白字的日誌顯示器 (內建翻譯機 + 時間軸)。
+
+    - 每一行（含日期標題）是文件中的一個 block，append_logs 只插入新行，
+      花費與新行數成正比，不會整份重新排版。
+    - document().maximumBlockCount 限制保留的行數，超過時最舊的行自動丟棄。
+    - 使用者往上捲動看舊日誌時，新行進來不會把畫面拉回底部；
+      只有原本就貼在最底下時才自動跟著捲動。
     """
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, max_lines: int = DEFAULT_LOG_VIEWER_MAX_LINES):
         super().__init__(parent)
         self.setReadOnly(True)
+        # 唯讀的日誌不需要復原紀錄（否則每次 append 都會累積記憶體）
+        self.setUndoRedoEnabled(False)
         # 設定樣式：黑底、灰字、等寬字體
         self.setStyleSheet("""
             QTextEdit {
@@ -1094,92 +1287,90 @@ class LogViewerWidget(QTextEdit):
             }
         """)
         self.setPlaceholderText("請選擇左側專案以查看日誌...")
+        # 目前顯示內容的最後一個日期（append_logs 用來判斷要不要插入新的日期標題）
+        self._last_date: str | None = None
+        self.max_lines = 0
+        self.set_max_lines(max_lines)
+
+    def set_max_lines(self, max_lines: int) -> None:
+        """設定最多保留的行數（<= 0 代表不限制）。"""
+        self.max_lines = max(0, int(max_lines))
+        self.document().setMaximumBlockCount(self.max_lines)
 
     def set_logs(self, logs: list[str]):
-        """更新日誌內容 (自動翻譯 + 時間軸分組)"""
+        """更新日誌內容 (自動翻譯 + 時間軸分組)：清空後整份重畫，並捲到最底。"""
+        # 整份重畫：日期分組從頭算起
+        self._last_date = None
+        self.clear()
         if not logs:
             self.setPlaceholderText("此專案目前沒有日誌紀錄。")
-            self.clear()
             return
-            
-        html_content = ""
-        last_date = None
-        import re
+
+        # 超過上限的舊行反正會被丟掉，乾脆不畫
+        if self.max_lines and len(logs) > self.max_lines:
+            logs = logs[-self.max_lines:]
+        self._insert_lines(logs)
+        self._scroll_to_bottom()
+
+    def append_logs(self, logs: list[str]):
+        """只把新增的日誌行接在最後面（搭配 adapter.get_log_tail 使用）。"""
+        if not logs:
+            return
+        if self.document().isEmpty():
+            self.set_logs(logs)
+            return
+
+        scroll_bar = self.verticalScrollBar()
+        # 「貼在底部」允許幾個像素的誤差
+        pinned = scroll_bar.value() >= scroll_bar.maximum() - 4
+        saved_value = scroll_bar.value()
+
+        self._insert_lines(logs[-self.max_lines:] if self.max_lines else logs)
+
+        if pinned:
+            self._scroll_to_bottom()
+        else:
+            scroll_bar.setValue(saved_value)
+
+    def _insert_lines(self, logs: list[str]) -> None:
+        """把一批日誌行逐行插入文件尾端（一次編輯區塊，只排版新增的部分）。"""
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        # 空文件的第一個 block 直接拿來用，之後每行都開新 block
+        first = self.document().isEmpty()
+
+        cursor.beginEditBlock()
+        try:
+            for html_line in self._render_lines(logs):
+                if not first:
+                    cursor.insertBlock()
+                first = False
+                cursor.insertHtml(html_line)
+        finally:
+            cursor.endEditBlock()
+
+    def _scroll_to_bottom(self) -> None:
+        scroll_bar = self.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
+
+    def _render_lines(self, logs: list[str]) -> list[str]:
+        """把一批日誌行轉成 HTML 行；日期與上一行不同時才插入日期標題（沿用上一批的最後日期）。"""
+        html_lines: list[str] = []
 
         for line in logs:
-            # 1. 嘗試提取日期 (格式: [YYYY-MM-DD HH:MM:SS])
-            match = re.search(r"\[(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}:\d{2})\]", line)
-            
-            if match:
-                date_str = match.group(1) # YYYY-MM-DD
-                time_str = match.group(2) # HH:MM:SS
-                
-                # 如果日期變了，插入一個日期標題
-                if date_str != last_date:
-                    html_content += f'<br><b><font color="#44AAFF">📅 {date_str}</font></b><br>'
-                    last_date = date_str
-                
-                # 呼叫翻譯機 (傳入 time_str 讓它只顯示時間)
-                html_content += self._humanize_log_line(line, time_str) + "<br>"
-            else:
-                # 沒時間戳記的行 (例如舊日誌或系統訊息)，直接翻譯
-                html_content += self._humanize_log_line(line, None) + "<br>"
-            
-        self.setHtml(html_content)
-        
-        # 自動捲動到底部
-        cursor = self.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.setTextCursor(cursor)
-
-    def _humanize_log_line(self, raw_line: str, time_str: str | None) -> str:
-        """[核心] 將原始日誌翻譯為彩色 HTML"""
-        import re
-        
-        # 定義時間前綴 (如果有傳入 time_str 就用它，否則不顯示)
-        t_prefix = f'<font color="#666666">{time_str}</font> ' if time_str else ""
-
-        # 1. 哨兵啟動/停止
-        if "哨兵啟動" in raw_line:
-            return f'{t_prefix}<font color="#00FFFF">👁️ <b>哨兵已就位，開始監控</b></font>'
-        if "Stopping sentry" in raw_line or "已成功發送終止信號" in raw_line:
-            return f'{t_prefix}<font color="#888888">💤 哨兵已暫停值勤</font>'
-
-        # 2. 檔案事件 (Created / Modified / Deleted)
-        # 注意：這裡的 regex 只需要抓 event 和 filename，時間已經在外面抓過了
-        match = re.search(r"\[偵測\] (created|modified|deleted): (.+)", raw_line)
-        if match:
-            event_type = match.group(1)
-            filename = match.group(2)
-            
-            # 去掉完整路徑，只留檔名
-            if "/" in filename or "\\" in filename:
-                from pathlib import Path
-                filename = Path(filename).name
-
-            if event_type == "created":
-                return f'{t_prefix}<font color="#00FF00">✨ 發現新檔案</font> : {filename}'
-            if event_type == "modified":
-                return f'{t_prefix}<font color="#FFFFFF">📝 偵測到變更</font> : {filename}'
-            if event_type == "deleted":
-                return f'{t_prefix}<font color="#FF5555">🗑️ 檔案已移除</font> : {filename}'
-
-        # 3. 過熱/靜默 (補回 Muting triggered)
-        if "智能靜默" in raw_line or "Muting triggered" in raw_line:
-            return f'{t_prefix}<font color="#FFFF00">🛡️ <b>觸發過熱保護 (進入靜默模式)</b></font>'
-        
-        # 4. 更新指令
-        if "成功觸發更新指令" in raw_line:
-            return f'{t_prefix}<font color="#44AAFF">✅ 正在執行目錄樹更新...</font>'
-
-        # 5. 黑名單/系統訊息 (淡化處理)
-        if "OUTPUT-FILE-BLACKLIST" in raw_line:
-            return f'<font color="#555555">🔒 安全機制：已自動排除輸出檔監控</font>'
-        if "[Step]" in raw_line:
-            return f'<font color="#555555">{raw_line}</font>'
-
-        # 預設：原樣顯示
-        return f'<font color="#AAAAAA">{raw_line}</font>'
+            # 翻譯機（classify_log_line）會順便解析出時間戳記 [YYYY-MM-DD HH:MM:SS]
+            record = classify_log_line(line)
+
+            # 如果日期變了，插入一個日期標題
+            if record.date and record.date != self._last_date:
+                html_lines.append(f'<b><font color="#44AAFF">📅 {record.date}</font></b>')
+                self._last_date = record.date
+
+            html_lines.append(record.to_html())
+
+        return html_lines
+
+
 class DashboardWidget(QWidget):
     """
     Sentry 控制台主視窗
@@ -1202,13 +1393,29 @@ class DashboardWidget(QWidget):
         # 我們將回調函式 儲存（store）起來，供稍後使用。
         self.on_stats_change = on_stats_change
 
+        # [Task 9.4-Memory] 初始化設定檔 (sentry_config.ini)
+        # 整個控制台共用這一個 QSettings（建構介面時也要讀 log_viewer_mode），只開一次
+        self.settings = QSettings("sentry_config.ini", QSettings.Format.IniFormat)
 
         # # TODO: 這裡的註解將使用通俗比喻來解釋資料結構。
-        # 準備一個叫「current_projects」的空籃子（[]），
-        # 專門用來存放從後端讀取的專案資訊（adapter.ProjectInfo）。
-        self.current_projects: list[adapter.ProjectInfo] = []
+        # 準備一個叫「project_model」的表格模型，
+        # 專門用來存放從後端讀取的專案資訊（adapter.ProjectInfo），以 uuid 為 key。
+        # （current_projects 屬性會依表格順序回傳它的副本）
+        self.project_model = ProjectTableModel(self)
         self.new_input_fields: list[QLineEdit] = [] 
         self.new_browse_buttons: list[QPushButton] = []
+        # 背景請求的狀態：專案列表重載的世代編號、日誌請求是否進行中
+        self._reload_generation = 0
+        self._log_request_in_flight = False
+        # 日誌請求進行中時收到新行事件：等它回來後再補讀一次
+        self._log_refresh_pending = False
+        # 日誌增量讀取：目前日誌區顯示的是哪個專案、以及它的游標（換專案時整份重讀）
+        self._log_view_uuid: str | None = None
+        self._log_cursor: str | None = None
+        # 切換中的專案：uuid -> 切換後應該變成的狀態（等待期間顯示「切換中…」，也擋掉重複雙擊）
+        self._pending_toggles: Dict[str, str] = {}
+        # 執行中的批次操作視窗（同一時間只允許一批）
+        self._bulk_dialog: BulkOperationDialog | None = None
         # 呼叫各類函式來 建立介面 和 載入初始資料。        
         self._build_ui()
                 
@@ -1216,27 +1423,27 @@ class DashboardWidget(QWidget):
         self._load_ignore_settings()
 
         # [New] 日誌自動刷新計時器
-        # 改為每 5 秒刷新一次，減輕 CPU 負擔
+        # 改為每 5 秒刷新一次，減輕 CPU 負擔（事件串流連線中時放慢，見 handle_backend_event）
+        # 只在控制台顯示時才跑（showEvent / hideEvent），建構時不啟動
         self.log_timer = QTimer(self)
+        self.log_timer.setInterval(LOG_POLL_INTERVAL_MS)
         self.log_timer.timeout.connect(self._refresh_current_log)
-        self.log_timer.start(5000)
 
-        # [Task 9.4-Memory] 初始化設定檔 (sentry_config.ini)
-        self.settings = QSettings("sentry_config.ini", QSettings.Format.IniFormat)
-        
-        # 讀取記憶 (預設為 True)
-        mem_guidance = self.settings.value("enable_guidance", True, type=bool)
-        mem_smart = self.settings.value("enable_smart_match", True, type=bool)
-        
-        # [Task 9.4-Memory] 初始化設定檔
-        self.settings = QSettings("sentry_config.ini", QSettings.Format.IniFormat)
-        
-        # 讀取記憶 (並強制轉型為 bool 以滿足 Pylance)
+        # 讀取記憶 (預設為 True，並強制轉型為 bool 以滿足 Pylance)
         val_g = self.settings.value("enable_guidance", True, type=bool)
         val_s = self.settings.value("enable_smart_match", True, type=bool)
         
         mem_guidance = bool(val_g)
         mem_smart = bool(val_s)
+
+        # 日誌區保留行數上限（0 = 不限制；虛擬化日誌區的預設上限大得多）
+        default_max = (
+            DEFAULT_VIRTUAL_LOG_MAX_LINES
+            if isinstance(self.log_viewer, VirtualLogViewerWidget)
+            else DEFAULT_LOG_VIEWER_MAX_LINES
+        )
+        max_lines = self.settings.value("log_viewer_max_lines", default_max, type=int)
+        self.log_viewer.set_max_lines(int(max_lines))
         
         # 套用設定 (使用 blockSignals 暫時靜音，避免初始化時觸發寫入邏輯)
         self.check_guidance.blockSignals(True)
@@ -1248,6 +1455,22 @@ class DashboardWidget(QWidget):
         self.check_guidance.blockSignals(False)
         self.check_smart.blockSignals(False)
 
+    def showEvent(self, event) -> None:
+        """控制台出現時才開始定時刷新日誌。"""
+        super().showEvent(event)
+        if not self.log_timer.isActive():
+            self.log_timer.start()
+
+    def hideEvent(self, event) -> None:
+        """控制台看不見時（切回眼睛、收到托盤）停掉日誌計時器。"""
+        self.log_timer.stop()
+        super().hideEvent(event)
+
+    @property
+    def current_projects(self) -> list[adapter.ProjectInfo]:
+        """目前表格中的專案（依顯示順序的副本；要修改請透過 project_model）。"""
+        return self.project_model.projects()
+
     # --- [新增] 獨立的統計通知函式 ---
     # 我們用「def」來 定義（define）重新計算並通知上層的函式。
     def _notify_stats_update(self) -> None:
@@ -1290,9 +1513,16 @@ class DashboardWidget(QWidget):
         title_label = QLabel("Sentry 控制台")
         title_label.setStyleSheet("font-weight: bold;")
 
+        # 重新整理：略過 adapter 的專案列表快取，強制向後端重新讀取
+        btn_refresh = QPushButton("🔄 重新整理")
+        btn_refresh.setToolTip("強制從後端重新讀取專案列表（F5）")
+        btn_refresh.setShortcut("F5")
+        btn_refresh.clicked.connect(lambda: self._reload_projects_from_backend(force=True))
+
         nav_layout.addWidget(btn_back)
         nav_layout.addWidget(title_label)
         nav_layout.addStretch(1) # 推到底
+        nav_layout.addWidget(btn_refresh)
         main_layout.addLayout(nav_layout)
         # --- 導航區塊結束 ---
 
@@ -1329,37 +1559,64 @@ class DashboardWidget(QWidget):
         self.status_label.setWordWrap(True)
 
         # --- 5. 組合所有佈局 ---
-        # 把分割器（splitter）加入到主佈局（main_layout）的上半部分。
-        main_layout.addWidget(splitter)
-        # 把底部面板（bottom_panel）加入到主佈局的中間部分。
-        main_layout.addWidget(bottom_panel)
+        # 分割器與底部面板放在「專案」分頁裡；分頁列只有一頁時自動隱藏（setTabBarAutoHide），
+        # 平常看起來和沒有分頁一樣，按 Ctrl+Shift+D 才會多出「診斷」分頁。
+        projects_page = QWidget(self)
+        projects_layout = QVBoxLayout(projects_page)
+        projects_layout.setContentsMargins(0, 0, 0, 0)
+        # 把分割器（splitter）加入到分頁的上半部分。
+        projects_layout.addWidget(splitter)
+        # 把底部面板（bottom_panel）加入到分頁的下半部分。
+        projects_layout.addWidget(bottom_panel)
+
+        self.tabs = QTabWidget(self)
+        self.tabs.setTabBarAutoHide(True)
+        self.tabs.addTab(projects_page, "📋 專案")
+        main_layout.addWidget(self.tabs)
         # 把狀態標籤（status_label）加入到主佈局的最下方。
         main_layout.addWidget(self.status_label)
 
+        # 隱藏的診斷分頁（adapter 指令延遲統計，見 src/tray/diagnostics.py）：第一次打開時才建立
+        self.diagnostics_panel: DiagnosticsPanel | None = None
+        diag_shortcut = QShortcut(QKeySequence("Ctrl+Shift+D"), self)
+        diag_shortcut.activated.connect(self.toggle_diagnostics)
+
         # --- 6. 事件連結 (Signal/Slot) ---
-        # 當表格的選擇改變時（itemSelectionChanged），連結（connect）到處理函式。
-        self.project_table.itemSelectionChanged.connect(
+        # 當表格的目前列改變時（currentRowChanged），連結（connect）到處理函式。
+        # 重載時選中的專案還在，目前列跟著它移動，這個訊號就不會觸發（詳情與日誌不會被重設）。
+        self.project_table.selectionModel().currentRowChanged.connect(
             self._on_project_selection_changed
         )
-        # 當表格的項目被雙擊時（itemDoubleClicked），連結（connect）到處理函式。
-        self.project_table.itemDoubleClicked.connect(
+        # 當表格的項目被雙擊時（doubleClicked），連結（connect）到處理函式。
+        self.project_table.doubleClicked.connect(
             self._on_project_double_clicked
         )
             
+    def toggle_diagnostics(self) -> None:
+        """開 / 關隱藏的「診斷」分頁（Ctrl+Shift+D）。"""
+        if self.diagnostics_panel is None:
+            self.diagnostics_panel = DiagnosticsPanel(self)
+        index = self.tabs.indexOf(self.diagnostics_panel)
+        if index >= 0:
+            # 移除分頁會把面板藏起來，它的自動更新也跟著停止
+            self.tabs.removeTab(index)
+            self.diagnostics_panel.hide()
+            return
+        index = self.tabs.addTab(self.diagnostics_panel, "🩺 診斷")
+        self.tabs.setCurrentIndex(index)
+
 # 這裡，我們用「def」來定義（define）建立專案表格的函式。
-    def _build_project_table(self) -> QTableWidget:
-        # 建立一個表格元件（QTableWidget）。
-        table = QTableWidget(self)
+    def _build_project_table(self) -> QTableView:
+        # 建立一個表格元件（QTableView），資料來自 project_model。
+        table = QTableView(self)
+        table.setModel(self.project_model)
 
         # 設定（set）選單策略為 CustomContextMenu，這樣才能自訂選單。
         table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         # 綁定（connect）請求選單訊號到我們的處理函式。
         table.customContextMenuRequested.connect(self._on_table_context_menu)
                 
-        # 設定表格的欄位數量（setColumnCount）為 4 個。
-        table.setColumnCount(4)
-        # 設定水平表頭的標籤（setHorizontalHeaderLabels），依序是欄位名稱。
-        table.setHorizontalHeaderLabels(["UUID","專案名稱", "監控狀態", "模式"])
+        # 欄位數量與表頭文字（UUID、專案名稱、監控狀態、模式）由 project_model 提供。
 
         # 設定選取行為（setSelectionBehavior）：點擊任何一個格子時，會選取（SelectRows）整行。
         table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
@@ -1426,7 +1683,13 @@ class DashboardWidget(QWidget):
         layout.addWidget(log_title)
 
         # 植入我們剛剛寫好的元件
-        self.log_viewer = LogViewerWidget()
+        # sentry_config.ini 的 log_viewer_mode：rich（預設，QTextEdit 彩色文件）
+        # 或 virtual（QListView 虛擬化清單，適合數十萬行以上的大日誌）
+        mode = self.settings.value("log_viewer_mode", "rich")
+        if str(mode).strip().lower() == "virtual":
+            self.log_viewer = VirtualLogViewerWidget()
+        else:
+            self.log_viewer = LogViewerWidget()
         layout.addWidget(self.log_viewer)
 
         # 回傳（return）設定好的框架元件。
@@ -1535,54 +1798,60 @@ class DashboardWidget(QWidget):
     # 從 backend_adapter 載入資料
     # ---------------------------
 
-    def _reload_projects_from_backend(self) -> None:
-        """呼叫 adapter.list_projects()，並刷新表格內容 (訊號屏蔽版)。"""
-        # 1. 獲取資料
-        self.current_projects = adapter.list_projects()
-        
-        # 2. 更新統計與 Tooltip
+    def _reload_projects_from_backend(
+        self, then: Callable[[], None] | None = None, force: bool = False
+    ) -> None:
+        """
+        在背景呼叫 adapter.list_projects()，完成後刷新表格內容。
+        then：表格刷新後接著要做的事（例如打開編輯視窗）。
+        force：略過 adapter 的列表快取（「重新整理」按鈕用）；平常讀快取即可，
+               寫入指令都會讓快取失效，不會讀到自己改過之前的舊資料。
+        """
+        # 每次重載都有一個世代編號；較早發出、較晚回來的結果直接丟棄
+        self._reload_generation += 1
+        generation = self._reload_generation
+
+        def _on_loaded(projects: list[adapter.ProjectInfo]) -> None:
+            if generation == self._reload_generation:
+                # 只套用差異（新增 / 移除 / 變動的格子），選取與捲動位置保持不動
+                self._apply_projects(projects)
+                self._report_backend_health()
+            if then is not None:
+                then()
+
+        def _on_failed(e: Exception) -> None:
+            if generation == self._reload_generation:
+                self._set_status_message(f"讀取專案列表失敗：{e}", level="error")
+
+        run_in_background(adapter.list_projects, force_refresh=force, on_done=_on_loaded, on_error=_on_failed)
+
+    def _report_backend_health(self) -> None:
+        """多後端時：有後端讀取失敗或逾時（沿用舊列表）就在訊息列提醒。"""
+        problems = []
+        for health in adapter.backend_health():
+            if not health.ok:
+                problems.append(f"{health.name} 讀取失敗（{health.error}）")
+            elif health.pending:
+                problems.append(f"{health.name} 回應緩慢（沿用上次的列表）")
+        if problems:
+            self._set_status_message("⚠️ 後端：" + "；".join(problems), level="error")
+
+    def _apply_projects(self, projects: list[adapter.ProjectInfo]) -> None:
+        """把新的專案列表套用到表格（不呼叫後端）：只更新差異，保留原本的選取。"""
+        self.project_model.set_projects(projects)
+
+        # 更新統計與 Tooltip
         self._notify_stats_update()
 
-        # [關鍵修正] 暫時切斷表格的訊號，避免更新過程觸發不必要的 selectionChanged
-        self.project_table.blockSignals(True)
-        
-        try:
-            self.project_table.setRowCount(len(self.current_projects))
-            
-            for row, proj in enumerate(self.current_projects):
-                # 1. UUID (隱藏)
-                uuid_item = QTableWidgetItem(proj.uuid)
-                uuid_item.setFlags(uuid_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.project_table.setItem(row, 0, uuid_item)
-
-                # 2. 名稱
-                name_item = QTableWidgetItem(proj.name)
-                name_item.setFlags(name_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.project_table.setItem(row, 1, name_item)
-
-                # 3. 狀態
-                status_item = QTableWidgetItem(self._status_to_label(proj.status))
-                status_item.setFlags(status_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.project_table.setItem(row, 2, status_item)
-
-                # 4. 模式
-                mode_item = QTableWidgetItem(self._mode_to_label(proj.mode))
-                mode_item.setFlags(mode_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.project_table.setItem(row, 3, mode_item)
-
-            # [關鍵修正] 資料填完後，手動處理選取狀態
-            if self.current_projects:
-                # 預設選取第一行 (或者您可以改成保持之前的選取，但選第一行最穩)
-                self.project_table.selectRow(0)
-                
-                # 手動更新詳情面板 (因為訊號被切斷了，必須手動呼叫)
-                self._update_detail_panel(self.current_projects[0])
-            else:
-                self._update_detail_panel(None)
-                
-        finally:
-            # [關鍵修正] 無論如何，最後一定要把訊號接回去，不然使用者就不能點擊了
-            self.project_table.blockSignals(False)
+        proj = self._selected_project()
+        if proj is not None:
+            # 選中的專案還在：內容可能變了，刷新詳情即可（日誌照原本的游標繼續）
+            self._update_detail_panel(proj)
+        elif self.project_model.rowCount() > 0:
+            # 第一次載入、或原本選中的專案被刪了：選第一列（會觸發 currentRowChanged 載入詳情與日誌）
+            self.project_table.selectRow(0)
+        else:
+            self._update_detail_panel(None)
 
     def _refresh_current_log(self):
         """[自動呼叫] 刷新當前選中專案的日誌"""
@@ -1590,38 +1859,157 @@ class DashboardWidget(QWidget):
         if not self.isVisible():
             return
 
-        # 獲取當前選中的行
-        row = self.project_table.currentRow()
-        if row < 0 or row >= len(self.current_projects):
+        # 上一次的日誌請求還沒回來，就不要再疊一個
+        if self._log_request_in_flight:
             return
 
-        # 獲取 UUID
-        proj = self.current_projects[row]
-        
-        # 呼叫 Adapter 獲取最新日誌
-        logs = adapter.get_log_content(proj.uuid)
-        
-        # 更新顯示 (LogViewerWidget 會自動處理捲動)
-        if hasattr(self, 'log_viewer'):
-            self.log_viewer.set_logs(logs)
+        # 獲取當前選中的專案
+        proj = self._selected_project()
+        if proj is None:
+            return
+
+        # 獲取 UUID，並在背景呼叫 Adapter 獲取最新日誌
+        self._load_log_for(proj.uuid)
+
+    def _load_log_for(self, uuid: str) -> None:
+        """
+        在背景增量讀取指定專案的日誌，回來時若仍是選中的專案才更新顯示。
+        同一個專案只取游標之後的新行；換了專案就從頭讀（cursor=None）。
+        """
+        self._log_request_in_flight = True
+        cursor = self._log_cursor if uuid == self._log_view_uuid else None
+        # 從頭讀（cursor=None）一定是整份換掉，所以大型日誌可以邊收邊顯示：
+        # 第一段 set_logs、之後每段 append_logs，最後回來時就不用再畫一次
+        streamed = False
+
+        def _on_chunk(lines: list[str]) -> None:
+            nonlocal streamed
+            if self._selected_uuid() != uuid or not hasattr(self, 'log_viewer'):
+                return
+            if streamed:
+                self.log_viewer.append_logs([str(x) for x in lines])
+            else:
+                self.log_viewer.set_logs([str(x) for x in lines])
+                streamed = True
+
+        def _on_loaded(tail: adapter.LogTail) -> None:
+            self._log_request_in_flight = False
+            self._run_pending_log_refresh()
+            # 使用者可能已經換選其他專案，舊的結果不要蓋上去
+            if self._selected_uuid() != uuid:
+                return
+            if not hasattr(self, 'log_viewer'):
+                return
+            # 已經邊收邊顯示完了，只要記下游標
+            if streamed:
+                pass
+            # 第一次讀、換專案、或日誌被輪替/截斷 → 整份重畫；否則只接上新行
+            elif tail.reset or uuid != self._log_view_uuid:
+                self.log_viewer.set_logs(tail.lines)
+            else:
+                self.log_viewer.append_logs(tail.lines)
+            self._log_view_uuid = uuid
+            self._log_cursor = tail.cursor
+
+        def _on_failed(e: Exception) -> None:
+            self._log_request_in_flight = False
+            self._run_pending_log_refresh()
+            print(f"[Dashboard] 讀取日誌失敗: {e}")
+
+        # 第一次讀 / 重置時最多帶回日誌區放得下的行數（0 = 不限制）
+        limit = self.log_viewer.max_lines
+        run_in_background(
+            adapter.get_log_tail, uuid, cursor, limit,
+            on_done=_on_loaded, on_error=_on_failed,
+            on_chunk=_on_chunk if cursor is None else None,
+        )
+
+    def _run_pending_log_refresh(self) -> None:
+        """請求期間有新行事件進來 → 回到事件迴圈後再補讀一次（用新的游標）。"""
+        if self._log_refresh_pending:
+            self._log_refresh_pending = False
+            QTimer.singleShot(0, self._refresh_current_log)
+
+    # ---------------------------
+    # 後端事件（push）
+    # ---------------------------
+
+    def handle_backend_event(self, event: events.BackendEvent) -> None:
+        """[GUI 執行緒] 套用後端推來的事件：表格、Tooltip 統計、日誌區。"""
+        if event.kind == "connected":
+            # 新行會被推過來，輪詢只當保險
+            self.log_timer.setInterval(LOG_POLL_INTERVAL_LIVE_MS)
+        elif event.kind == "disconnected":
+            self.log_timer.setInterval(LOG_POLL_INTERVAL_MS)
+        elif event.kind == "status" and event.project is not None:
+            self._on_project_event(event.project)
+        elif event.kind == "removed":
+            self.project_model.remove_uuids([event.uuid])
+            self._notify_stats_update()
+            if self._selected_project() is None:
+                self._update_detail_panel(None)
+        elif event.kind == "log":
+            self._on_log_event(event)
+        elif event.kind == "muting":
+            proj = self.project_model.project_at(self.project_model.row_of(event.uuid))
+            name = proj.name if proj is not None else event.uuid
+            self._set_status_message(f"🛡️ 專案 '{name}' 觸發過熱保護，已進入靜默模式。", level="info")
+
+    def _on_project_event(self, proj: adapter.ProjectInfo) -> None:
+        """單一專案有變化：只更新那一列（沒看過的專案接到最後），再重算 Tooltip。"""
+        self.project_model.upsert_project(proj)
+        self._notify_stats_update()
+        selected = self._selected_project()
+        if selected is not None and selected.uuid == proj.uuid:
+            self._update_detail_panel(selected)
+        elif selected is None and self.project_model.rowCount() > 0 and self.isVisible():
+            self.project_table.selectRow(0)
+
+    def _on_log_event(self, event: events.BackendEvent) -> None:
+        """新日誌行：正在顯示這個專案時直接接上，並採用事件帶來的游標。"""
+        if event.uuid != self._log_view_uuid or self._selected_uuid() != event.uuid:
+            return
+        if self._log_request_in_flight:
+            # 進行中的請求用的是舊游標，等它回來再補讀，避免同一批行接兩次
+            self._log_refresh_pending = True
+            return
+        if event.reset:
+            # 日誌被輪替 / 截斷：整份重讀
+            self._log_view_uuid = None
+            self._load_log_for(event.uuid)
+            return
+        self.log_viewer.append_logs(list(event.lines))
+        if event.cursor:
+            self._log_cursor = event.cursor
+
+    def _selected_project(self) -> adapter.ProjectInfo | None:
+        """目前選中列（currentIndex）的專案（沒有選取時回傳 None）。"""
+        return self.project_model.project_at(self.project_table.currentIndex().row())
+
+    def _selected_uuid(self) -> str | None:
+        """目前選中列的專案 UUID（沒有選取時回傳 None）。"""
+        proj = self._selected_project()
+        return proj.uuid if proj is not None else None
 
     def _open_audit_dialog(self) -> None:
         """[Task 9.4] 審查靜默項目 (Audit)"""
         # 1. 防呆：確認有選到專案
-        row = self.project_table.currentRow()
-        if row < 0 or row >= len(self.current_projects):
+        proj = self._selected_project()
+        if proj is None:
             return
         
-        proj = self.current_projects[row]
-        
         self._set_status_message(f"正在查詢專案 '{proj.name}' 的靜默狀態...", level="info")
-        # 讓介面轉圈圈，避免卡頓感
-        QApplication.processEvents()
+        # 查詢期間鎖住按鈕，避免重複點擊
+        self.btn_audit_muted.setEnabled(False)
+
+        def _on_failed(e: Exception) -> None:
+            self.btn_audit_muted.setEnabled(True)
+            self._set_status_message(f"審查失敗：{e}", level="error")
+            QMessageBox.critical(self, "錯誤", f"無法執行審查：\n{e}")
+
+        def _on_muted_paths(muted_paths: list[str]) -> None:
+            self.btn_audit_muted.setEnabled(True)
 
-        try:
-            # 2. 呼叫 Adapter 查詢 (注意：這個方法我們等一下才要在 adapter.py 補上！)
-            muted_paths = adapter.get_muted_paths(proj.uuid)
-            
             if not muted_paths:
                 QMessageBox.information(self, "審查結果", "目前沒有被靜默的路徑，一切正常。")
                 self._set_status_message("審查完成：無異常。", level="success")
@@ -1638,40 +2026,52 @@ class DashboardWidget(QWidget):
             # 4. 彈出對話框
             reply = QMessageBox.question(self, "發現靜默項目", msg, QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             
-            if reply == QMessageBox.StandardButton.Yes:
-                # 5. 確認後呼叫 Adapter 執行固化 (這個方法我們等一下也要補！)
-                adapter.solidify_ignore_patterns(proj.uuid)
-                
-                self._set_status_message(f"✓ 已固化忽略規則。", level="success")
-                QMessageBox.information(self, "成功", "已更新忽略規則，哨兵將自動重啟。")
-                
-                # 6. 刷新介面
-                self._reload_projects_from_backend()
-            else:
+            if reply != QMessageBox.StandardButton.Yes:
                 self._set_status_message("已取消審查操作。", level="info")
+                return
 
-        except Exception as e:
-            self._set_status_message(f"審查失敗：{e}", level="error")
-            QMessageBox.critical(self, "錯誤", f"無法執行審查：\n{e}")
+            # 5. 確認後在背景執行固化
+            self._set_status_message(f"正在固化專案 '{proj.name}' 的忽略規則...", level="info")
+            run_in_background(
+                adapter.solidify_ignore_patterns, proj.uuid,
+                on_done=_on_solidified, on_error=_on_failed,
+            )
+
+        def _on_solidified(_result) -> None:
+            self._set_status_message(f"✓ 已固化忽略規則。", level="success")
+            QMessageBox.information(self, "成功", "已更新忽略規則，哨兵將自動重啟。")
+            # 6. 刷新介面
+            self._reload_projects_from_backend()
+
+        # 2. 在背景呼叫 Adapter 查詢
+        run_in_background(adapter.get_muted_paths, proj.uuid, on_done=_on_muted_paths, on_error=_on_failed)
 
     def _open_ignore_settings_dialog(self) -> None:
         """打開忽略規則設定視窗"""
         # 1. 獲取當前選中的專案
-        row = self.project_table.currentRow()
-        if row < 0 or row >= len(self.current_projects):
+        proj = self._selected_project()
+        if proj is None:
             return
         
-        proj = self.current_projects[row]
-        
         self._set_status_message(f"正在讀取專案 '{proj.name}' 的忽略設定...", level="info")
-        # 強制刷新 UI，避免卡頓感
-        QApplication.processEvents()
+        self.btn_tree_ignore.setEnabled(False)
 
-        try:
+        async def _fetch() -> tuple[list[str], set[str]]:
             # 2. 從後端讀取兩份資料：候選名單 & 當前設定
-            candidates = adapter.get_ignore_candidates(proj.uuid)
-            current_patterns = set(adapter.get_current_ignore_patterns(proj.uuid))
-            
+            #    （session 模式兩個指令合成一批，只走一次往返；direct 模式各開一個行程並行）
+            aadp = get_async_adapter()
+            candidates, current_patterns = await aadp.get_ignore_lists(proj.uuid)
+            return candidates, set(current_patterns)
+
+        def _on_failed(e: Exception) -> None:
+            self.btn_tree_ignore.setEnabled(True)
+            self._set_status_message(f"讀取/儲存設定失敗：{e}", level="error")
+            QMessageBox.critical(self, "錯誤", str(e))
+
+        def _on_fetched(data: tuple[list[str], set[str]]) -> None:
+            self.btn_tree_ignore.setEnabled(True)
+            candidates, current_patterns = data
+
             # 3. 建立並顯示對話框
             dialog = IgnoreSettingsDialog(self, proj.name)
             
@@ -1679,25 +2079,26 @@ class DashboardWidget(QWidget):
             dialog.load_patterns(candidates, current=current_patterns)
             
             # 4. 等待使用者操作
-            if dialog.exec() == QDialog.DialogCode.Accepted:
-                # 使用者按了儲存，獲取最新的勾選結果
-                new_patterns = dialog.get_result()
-                
-                self._set_status_message(f"正在儲存設定並重啟哨兵...", level="info")
-                QApplication.processEvents()
-                
-                # 5. 呼叫後端寫入
-                adapter.update_ignore_patterns(proj.uuid, new_patterns)
-                
-                self._set_status_message(f"✓ 專案 '{proj.name}' 忽略規則已更新。", level="success")
-                QMessageBox.information(self, "更新成功", "忽略規則已更新，哨兵已自動重啟以套用新設定。")
-            else:
+            if dialog.exec() != QDialog.DialogCode.Accepted:
                 # 使用者按取消
                 self._set_status_message("已取消編輯忽略規則。", level="info")
+                return
 
-        except Exception as e:
-            self._set_status_message(f"讀取/儲存設定失敗：{e}", level="error")
-            QMessageBox.critical(self, "錯誤", str(e))
+            # 使用者按了儲存，獲取最新的勾選結果
+            new_patterns = dialog.get_result()
+            self._set_status_message(f"正在儲存設定並重啟哨兵...", level="info")
+
+            # 5. 在背景呼叫後端寫入
+            run_in_background(
+                adapter.update_ignore_patterns, proj.uuid, new_patterns,
+                on_done=_on_saved, on_error=_on_failed,
+            )
+
+        def _on_saved(_result) -> None:
+            self._set_status_message(f"✓ 專案 '{proj.name}' 忽略規則已更新。", level="success")
+            QMessageBox.information(self, "更新成功", "忽略規則已更新，哨兵已自動重啟以套用新設定。")
+
+        run_coroutine(_fetch(), on_done=_on_fetched, on_error=_on_failed)
 
 # 這裡，我們用「def」來定義（define）載入忽略設定的函式。
     def _load_ignore_settings(self) -> None:
@@ -1759,20 +2160,20 @@ class DashboardWidget(QWidget):
 
 # 這裡，我們用「def」來定義（define）當專案列表的選取項目改變時（selection_changed）執行的函式。
     def _on_project_selection_changed(self) -> None:
-        # 獲取（get）目前選取的行號（currentRow）。
-        row = self.project_table.currentRow()
+        # 獲取（get）目前選取列（currentIndex）的專案。
+        proj = self._selected_project()
         
-        # 用「if」來判斷：如果（if）行號小於 0（沒選取）...
-        if row < 0 or row >= len(self.current_projects):
+        # 用「if」來判斷：如果（if）沒有選到專案...
+        if proj is None:
             self._update_detail_panel(None)
             self.btn_tree_ignore.setEnabled(False)
             # [New] 清空日誌
             if hasattr(self, 'log_viewer'):
                 self.log_viewer.set_logs([])
+            self._log_view_uuid = None
+            self._log_cursor = None
             return
 
-        # 從「專案籃子」（self.current_projects）中，根據行號（row）取出選取的專案（proj）。
-        proj = self.current_projects[row]
         # 呼叫（call）_update_detail_panel 函式，顯示這個專案的詳細資訊。
         self._update_detail_panel(proj)
 
@@ -1782,71 +2183,95 @@ class DashboardWidget(QWidget):
         self.btn_audit_muted.setEnabled(True)
 
         # [New] 讀取並顯示日誌
-        # 呼叫 Adapter 獲取該專案的日誌內容
-        logs = adapter.get_log_content(proj.uuid)
-        # 餵給顯示器
-        self.log_viewer.set_logs(logs)
+        # 在背景呼叫 Adapter 獲取該專案的日誌內容，回來後再餵給顯示器
+        self._load_log_for(proj.uuid)
     
     # 這裡，我們用「def」來定義（define）當專案列表被雙擊時（double_clicked）執行的函式。
     def _on_project_double_clicked(self) -> None:
         """雙擊列 → 切換監控狀態。"""
 
         # 1. 先確認有選到有效列
-        # 獲取（get）目前選取的行號（currentRow）。
-        row = self.project_table.currentRow()
-        # 用「if」來判斷：如果（if）行號無效，就直接用「return」結束。
-        if row < 0 or row >= len(self.current_projects):
-            return
-
-        # 2. 取得 UUID 欄位（第 0 欄是隱藏 uuid）
-        # 獲取（get）表格中指定行（row）、第 0 欄的項目（item）。
-        uuid_item = self.project_table.item(row, 0)
-        # 用「if」來判斷：如果（if）這個項目是空的（None），就直接結束。
-        if uuid_item is None:
-            # 理論上不該發生，代表列表初始化有問題
+        # 獲取（get）目前選取列的專案（_selected_project）。
+        proj = self._selected_project()
+        # 用「if」來判斷：如果（if）沒有選到，就直接用「return」結束。
+        if proj is None:
             return
 
-        # 獲取（get）表格項目的文字（text），並去除空格（strip）。
-        project_key = uuid_item.text().strip()
+        # 2. 取得 UUID（模型以 uuid 為 key）
+        project_key = proj.uuid.strip()
         # 用「if」來判斷：如果（if）UUID 是空的，就直接結束。
         if not project_key:
             return
 
-        # 3. 呼叫 backend_adapter 切換狀態
-        # 呼叫（call）後端（adapter）的 toggle_project_status 函式，嘗試切換專案狀態。
-        updated = adapter.toggle_project_status(project_key)
+        # 同一個專案還在切換中，就不要再送一次（否則會 start 完又 stop）
+        if project_key in self._pending_toggles:
+            self._set_status_message("該專案正在切換中，請稍候...", level="info")
+            return
+
+        # 3. 標記為「切換中」並在背景呼叫 backend_adapter（adapter 會等到狀態真的翻轉才回來）
+        self._pending_toggles[project_key] = "stopped" if proj.status == "monitoring" else "monitoring"
+        self._refresh_row_status(project_key)
+        self._set_status_message("正在切換監控狀態...", level="info")
+
+        def _on_failed(e: Exception) -> None:
+            self._pending_toggles.pop(project_key, None)
+            self._refresh_row_status(project_key)
+            self._set_status_message(f"切換監控狀態失敗：{e}", level="error")
+
+        run_in_background(
+            adapter.toggle_project_status, project_key,
+            on_done=lambda updated: self._on_toggle_finished(project_key, updated),
+            on_error=_on_failed,
+        )
+
+    def _display_status(self, proj: adapter.ProjectInfo) -> str:
+        """表格/詳情要顯示的狀態：切換中的專案一律顯示 transitioning。"""
+        return self.project_model.display_status(proj)
+
+    def _refresh_row_status(self, uuid: str) -> None:
+        """只重畫某個專案那一列的狀態欄（與詳情面板），不整張表重繪。"""
+        self.project_model.set_transitioning(uuid, uuid in self._pending_toggles)
+        proj = self._selected_project()
+        if proj is not None and proj.uuid == uuid:
+            self._update_detail_panel(proj)
+
+    def _on_toggle_finished(self, project_key: str, updated: adapter.ProjectInfo | None) -> None:
+        """[背景回呼] 切換監控狀態完成後，更新本地快取與表格。"""
+        expected = self._pending_toggles.pop(project_key, None)
+
         # 用「if」來判斷：如果（if）回傳的結果是 None（代表切換失敗，找不到專案）...
         if updated is None:
+            # 恢復原本的狀態顯示
+            self._refresh_row_status(project_key)
             # D-2：失敗 → 用底部訊息列顯示錯誤（紅字）
             # 呼叫（call）_set_status_message，顯示錯誤訊息，並設定 level 為 "error"。
             self._set_status_message("切換監控狀態失敗：找不到指定專案。", level="error")
             # 用「return」結束。
             return
 
-        # 4. 更新本地快取
-        # 用新的更新後的專案物件（updated）替換掉「專案籃子」（self.current_projects）中原本位置的舊物件。
-        self.current_projects[row] = updated
+        # 4. 更新表格模型（取消「切換中」標記，並換上新的專案物件）
+        # 等待期間列表可能已重載，模型以 UUID 為 key，不受列號變動影響；
+        # 只有狀態 / 模式真的改變的格子會重畫。
+        self.project_model.set_transitioning(updated.uuid, False)
+        if not self.project_model.update_project(updated):
+            return
 
         # 【關鍵修復】狀態改變了，這裡一定要重新算一次人頭！
         self._notify_stats_update()
 
-        # 5. 更新表格顯示（狀態 & 模式）
-        # 獲取（get）表格中指定行（row）的狀態（第 2 欄）和模式（第 3 欄）項目。
-        status_item = self.project_table.item(row, 2)
-        mode_item = self.project_table.item(row, 3)
-
-        # 用「if」來判斷：如果（if）狀態項目不是空的...
-        if status_item is not None:
-            # 就設定（setText）新的狀態文字（這裡呼叫 _status_to_label 轉換中文）。
-            status_item.setText(self._status_to_label(updated.status))
-        # 用「if」來判斷：如果（if）模式項目不是空的...
-        if mode_item is not None:
-            # 就設定（setText）新的模式文字（這裡呼叫 _mode_to_label 轉換中文）。
-            mode_item.setText(self._mode_to_label(updated.mode))
-
-            # 呼叫（call）_update_detail_panel 函式，用更新後的專案物件（updated）刷新右側詳情面板。
+        # 只有它仍是選中的專案時，才刷新右側詳情面板。
+        if self._selected_uuid() == updated.uuid:
             self._update_detail_panel(updated)
 
+        # 等待逾時：後端還沒回報新狀態，表格先顯示目前觀察到的狀態
+        if expected is not None and updated.status != expected:
+            self._set_status_message(
+                f"已送出切換指令，但 {updated.name} 目前仍為 {self._status_to_label(updated.status)}，"
+                "請稍後按「重新整理」確認。",
+                level="error",
+            )
+            return
+
         # 6. D-2：成功 → 同樣用底部訊息列顯示成功（綠字）
         # 呼叫（call）_set_status_message，顯示成功的提示訊息，並設定 level 為 "success"。
         self._set_status_message(
@@ -1868,14 +2293,11 @@ class DashboardWidget(QWidget):
         
         if count == 1:
             # 單選邏輯 (保持原有功能：更新、修改、刪除)
-            row = selection[0].row()
-            uuid_item = self.project_table.item(row, 0)
-            name_item = self.project_table.item(row, 1)
-            
-            if not uuid_item or not name_item: return
+            proj = self.project_model.project_at(selection[0].row())
+            if proj is None: return
             
-            p_uuid = uuid_item.text()
-            p_name = name_item.text()
+            p_uuid = proj.uuid
+            p_name = proj.name
 
             action_update = QAction("🔄 立即手動更新", menu)
             action_update.triggered.connect(lambda: self._perform_manual_update(p_uuid, p_name))
@@ -1894,19 +2316,26 @@ class DashboardWidget(QWidget):
             menu.addAction(action_delete)
             
         else:
-            # 多選邏輯 (只允許批量刪除，避免邏輯複雜化)
+            # 多選邏輯：批量啟動 / 停止 / 手動更新 / 刪除（進度視窗，見 _perform_bulk）
             # 收集所有選取的 (uuid, name)
             targets = []
             for index in selection:
-                row = index.row()
-                # [修正] 防禦性寫法：先取出 item，檢查是否存在
-                item_u = self.project_table.item(row, 0)
-                item_n = self.project_table.item(row, 1)
-                
-                # 只有當兩個格子都有東西時，才取文字
-                if item_u and item_n:
-                    targets.append((item_u.text(), item_n.text()))
-            
+                # [修正] 防禦性寫法：先從模型取出專案，檢查是否存在
+                proj = self.project_model.project_at(index.row())
+                if proj is not None:
+                    targets.append((proj.uuid, proj.name))
+
+            for text, action in (
+                (f"▶️ 批量啟動 ({count} 個專案)", BULK_START),
+                (f"⏹️ 批量停止 ({count} 個專案)", BULK_STOP),
+                (f"🔄 批量手動更新 ({count} 個專案)", BULK_UPDATE),
+            ):
+                bulk_action = QAction(text, menu)
+                bulk_action.triggered.connect(lambda _checked=False, a=action: self._perform_bulk(a, targets))
+                menu.addAction(bulk_action)
+
+            menu.addSeparator()
+
             label_text = f"🗑️ 批量刪除 ({count} 個專案)..."
             action_batch_delete = QAction(label_text, menu)
             # 傳遞列表給刪除函式
@@ -1919,23 +2348,22 @@ class DashboardWidget(QWidget):
     def _perform_manual_update(self, uuid: str, name: str) -> None:
         # 先顯示一個「請稍候」的狀態訊息。
         self._set_status_message(f"正在更新專案 '{name}'，請稍候...", level="info")
-        
-        # 強制刷新（processEvents）UI，避免看起來卡死。
-        QApplication.processEvents()
 
-        try:
-            # 呼叫（call）後端執行更新。
-            adapter.trigger_manual_update(uuid)
+        def _on_done(_result) -> None:
             # 成功後顯示綠字訊息。
             self._set_status_message(f"✓ 專案 '{name}' 手動更新成功！", level="success")
             # 彈出成功對話框。
             QMessageBox.information(self, "更新成功", f"專案 '{name}' 的目錄結構已更新至 Markdown。")
-        except Exception as e:
+
+        def _on_failed(e: Exception) -> None:
             # 失敗顯示紅字訊息。
             self._set_status_message(f"更新失敗：{e}", level="error")
             # 彈出錯誤警告框。
             QMessageBox.critical(self, "更新失敗", str(e))
 
+        # 在背景呼叫（call）後端執行更新，介面不會卡住。
+        run_in_background(adapter.trigger_manual_update, uuid, on_done=_on_done, on_error=_on_failed)
+
     def _perform_delete_project(self, targets: list[tuple[str, str]]) -> None:
         """執行刪除專案 (支援單刪與批刪)"""
         count = len(targets)
@@ -1964,23 +2392,46 @@ class DashboardWidget(QWidget):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        # 3. 執行刪除循環
+        # 多個專案：進度視窗 + 有限併發（可取消）
+        if count > 1:
+            self._perform_bulk(BULK_DELETE, targets)
+            return
+
+        # 3. 單一專案：在背景執行刪除
+        self._set_status_message(f"正在刪除 {count} 個專案...", level="info")
+
+        names = dict(targets)
+
+        def _run_batch() -> list[adapter.BatchResult]:
+            with adapter.batch() as b:
+                for uuid, _name in targets:
+                    b.delete_project(uuid)
+            return b.results
+
+        run_in_background(
+            _run_batch,
+            on_done=lambda results: self._on_delete_finished(results, names),
+            on_error=lambda e: self._set_status_message(f"刪除失敗：{e}", level="error"),
+        )
+
+    def _on_delete_finished(self, results: list[adapter.BatchResult], names: dict[str, str]) -> None:
+        """[背景回呼] 批次刪除完成，逐筆回報並更新表格。"""
         success_count = 0
         errors = []
-        
-        self._set_status_message(f"正在刪除 {count} 個專案...", level="info")
-        QApplication.processEvents()
+        deleted_uuids = set()
 
-        for uuid, name in targets:
-            try:
-                adapter.delete_project(uuid)
+        for result in results:
+            uuid = result.args[0] if result.args else ""
+            if result.ok:
                 success_count += 1
-            except Exception as e:
-                errors.append(f"{name}: {str(e)}")
+                deleted_uuids.add(uuid)
+            else:
+                errors.append(f"{names.get(uuid, uuid)}: {result.error}")
 
         # 4. 結果回饋與刷新
-        self._reload_projects_from_backend()
-        self._update_detail_panel(None) # 清空詳情避免殘留
+        # 刪除結果已逐筆回報，直接從本地列表移除即可，不必再整個 list_projects 一次
+        # （模型只移除這幾列；選中的專案若被刪，_apply_projects 會改選第一列）
+        self._apply_projects([p for p in self.current_projects if p.uuid not in deleted_uuids])
 
         if len(errors) == 0:
             self._set_status_message(f"✓ 成功刪除 {success_count} 個專案。", level="success")
@@ -1989,13 +2440,64 @@ class DashboardWidget(QWidget):
             QMessageBox.critical(self, "部分刪除失敗", f"成功: {success_count}\n失敗: {len(errors)}\n\n錯誤詳情:\n{err_msg}")
             self._set_status_message(f"刪除完成，但有 {len(errors)} 個失敗。", level="error")
 
+    def _perform_bulk(self, action: str, targets: list[tuple[str, str]]) -> None:
+        """多選專案的批次操作：開進度視窗，在背景以有限併發執行，結束後一次對齊表格。"""
+        if not targets:
+            return
+        if self._bulk_dialog is not None:
+            self._set_status_message("已有批次操作在執行中，請稍候...", level="info")
+            self._bulk_dialog.raise_()
+            return
+
+        operation = BulkOperation(action, targets)
+
+        # 啟動 / 停止：送出期間這些列顯示「切換中」（單獨切換中的專案維持原標記）
+        marked: list[str] = []
+        if action in (BULK_START, BULK_STOP):
+            expected = "monitoring" if action == BULK_START else "stopped"
+            for uuid, _name in targets:
+                if uuid not in self._pending_toggles:
+                    self._pending_toggles[uuid] = expected
+                    self._refresh_row_status(uuid)
+                    marked.append(uuid)
+
+        dialog = BulkOperationDialog(operation, self)
+        dialog.completed.connect(lambda outcome: self._on_bulk_finished(outcome, marked))
+        dialog.finished.connect(dialog.deleteLater)
+        self._bulk_dialog = dialog
+        self._set_status_message(f"正在批量{operation.label} {len(targets)} 個專案...", level="info")
+        dialog.start()
+
+    def _on_bulk_finished(self, outcome: BulkOutcome, marked: list[str]) -> None:
+        """[背景回呼] 批次結束：取消「切換中」標記，用最後讀到的列表一次對齊表格。"""
+        self._bulk_dialog = None
+        for uuid in marked:
+            self._pending_toggles.pop(uuid, None)
+            self.project_model.set_transitioning(uuid, False)
+
+        if outcome.projects is not None:
+            self._apply_projects(outcome.projects)
+        else:
+            self._reload_projects_from_backend(force=True)
+
+        label = BULK_ACTION_LABELS[outcome.action]
+        failed = len(outcome.failed)
+        if failed:
+            self._set_status_message(f"批量{label}完成，但有 {failed} 個失敗（詳見進度視窗）。", level="error")
+        elif outcome.cancelled:
+            self._set_status_message(f"批量{label}已取消：完成 {outcome.succeeded} 個。", level="info")
+        else:
+            self._set_status_message(f"✓ 批量{label} {outcome.succeeded} 個專案完成。", level="success")
+
 # 我們用「def」來定義（define）執行編輯專案函式。
     def _perform_edit_project(self, uuid: str, name: str) -> None:
         """打開編輯視窗，並呼叫後端修改專案。"""
 
-        # 在打開編輯視窗前，強制從後端讀取最新狀態，防止「殘影」
-        self._reload_projects_from_backend()
+        # 在打開編輯視窗前，先在背景從後端讀取最新狀態，防止「殘影」；讀完再開視窗
+        self._set_status_message(f"正在讀取專案 '{name}' 的最新資料...", level="info")
+        self._reload_projects_from_backend(then=lambda: self._open_edit_dialog(uuid, name))
 
+    def _open_edit_dialog(self, uuid: str, name: str) -> None:
         # 1. 找到專案的完整資料
         target_proj = next((p for p in self.current_projects if p.uuid == uuid), None)
         if not target_proj:
@@ -2029,32 +2531,37 @@ class DashboardWidget(QWidget):
                 self._reload_projects_from_backend()
                 return
             
-            # 4. 逐一呼叫後端 API 進行修改
-            all_success = True
-            error_details = []
-            
-            for field, new_value in changes.items():
-                try:
-                    if field in ['name', 'path', 'output_file']:
-                        self._set_status_message(f"正在修改 '{name}' 的 {field}...", level="info")
-                        QApplication.processEvents()
-                        
-                        # 【修正】這裡改為呼叫 adapter.edit_project(uuid, field, new_value)
-                        # 這符合我們剛剛在 adapter.py 定義的接口 (3 個參數)
-                        adapter.edit_project(uuid, field, new_value) 
-                        
-                except Exception as e:
-                    all_success = False
-                    error_details.append(f"欄位 {field} 失敗：{e}")
-                    
-            # 5. 根據結果更新 UI
-            if all_success:
-                self._set_status_message(f"✓ 專案 '{name}' 已成功更新！", level="success")
-                self._reload_projects_from_backend() # 重繪列表
-            else:
-                final_error = "\n".join(error_details)
-                self._set_status_message(f"更新失敗！詳情請見彈出視窗。", level="error")
-                QMessageBox.critical(self, "部分更新失敗", f"專案 '{name}' 的部分欄位未能更新。\n\n錯誤詳情:\n{final_error}")
+            # 4. 將所有欄位修改合併成一個批次 (一次後端往返)，在背景執行
+            self._set_status_message(f"正在修改 '{name}' 的 {', '.join(changes)}...", level="info")
+
+            def _run_batch() -> list[adapter.BatchResult]:
+                with adapter.batch() as b:
+                    for field, new_value in changes.items():
+                        if field in ['name', 'path', 'output_file']:
+                            b.edit_project(uuid, field, new_value)
+                return b.results
+
+            run_in_background(
+                _run_batch,
+                on_done=lambda results: self._on_edit_finished(results, name),
+                on_error=lambda e: self._set_status_message(f"更新失敗：{e}", level="error"),
+            )
+
+    def _on_edit_finished(self, results: list[adapter.BatchResult], name: str) -> None:
+        """[背景回呼] 欄位修改批次完成。"""
+        error_details = [
+            f"欄位 {result.args[1]} 失敗：{result.error}"
+            for result in results if not result.ok
+        ]
+
+        # 5. 根據結果更新 UI
+        if not error_details:
+            self._set_status_message(f"✓ 專案 '{name}' 已成功更新！", level="success")
+            self._reload_projects_from_backend() # 重繪列表
+        else:
+            final_error = "\n".join(error_details)
+            self._set_status_message(f"更新失敗！詳情請見彈出視窗。", level="error")
+            QMessageBox.critical(self, "部分更新失敗", f"專案 '{name}' 的部分欄位未能更新。\n\n錯誤詳情:\n{final_error}")
 
     # ---------------------------
     # 詳情區更新
@@ -2074,21 +2581,26 @@ class DashboardWidget(QWidget):
             return
 
         # 呼叫（call）_status_to_label 函式，把狀態代碼（proj.status）轉成中文標籤。
-        status_label = self._status_to_label(proj.status)
+        status_label = self._status_to_label(self._display_status(proj))
         # 呼叫（call）_mode_to_label 函式，把模式代碼（proj.mode）轉成中文標籤。
         mode_label = self._mode_to_label(proj.mode)
 
+        # 多後端時：路徑用專案所屬後端的 distro 顯示
+        distro = adapter.backend_distro(proj.backend)
+
         # 建立（[]）一個叫 text_lines 的「文字籃子」，用於顯示專案詳情。
         text_lines = [
             f"專案名稱：{proj.name}",
             f"監控狀態：{status_label}",
             f"模式：{mode_label}",
             "",
-            f"專案路徑：{proj.path}",
-            f"主寫入檔：{proj.output_file[0] if proj.output_file else '(未設定)'}",
+            f"專案路徑：{paths.to_windows(proj.path, distro)}",
+            f"主寫入檔：{paths.to_windows(proj.output_file[0], distro) if proj.output_file else '(未設定)'}",
             "",
             "提示：雙擊左側列表可【啟動／停止】監控。",
         ]
+        if proj.backend:
+            text_lines.insert(3, f"後端：{proj.backend}" + (f"（{distro}）" if distro else ""))
         # 用換行符號（\n）連接（join）文字籃子，並設定（setText）到詳情標籤上。
         self.detail_label.setText("\n".join(text_lines))
 
@@ -2100,15 +2612,15 @@ class DashboardWidget(QWidget):
     # 它負責把狀態代碼轉成中文標籤。
     @staticmethod
     def _status_to_label(status: str) -> str:
-        # 用「return ... if ... else ...」來判斷並回傳（return）中文標籤。
-        return "監控中" if status == "monitoring" else "已停止"
+        # 規則與表格模型共用（project_model.status_to_label）。
+        return status_to_label(status)
 
     # 這裡，我們用「@staticmethod」來標記（mark）這是一個不需要物件（self）就可以呼叫的函式。
     # 它負責把模式代碼轉成中文標籤。
     @staticmethod
     def _mode_to_label(mode: str) -> str:
-        # 用「return ... if ... else ...」來判斷並回傳（return）中文標籤。
-        return "靜默" if mode == "silent" else "互動"
+        # 規則與表格模型共用（project_model.mode_to_label）。
+        return mode_to_label(mode)
     
     # --- 實作無邊框視窗的拖曳功能 ---
     def mousePressEvent(self, event):
@@ -2193,6 +2705,7 @@ class SentryTrayAppV2:
         self.tray_icon.activated.connect(self._on_tray_activated)
         
         self.tray_icon.show()
+        self._record_startup("tray_icon")
 
         # --- 2. 建立雙視圖容器 ---
         # 我們建立（create）一個堆疊容器，它可以像紙牌一樣切換頁面。
@@ -2200,45 +2713,170 @@ class SentryTrayAppV2:
         self.container.setWindowTitle("Sentry v2.0 Sandbox")
         self.container.resize(900, 600)
 
-        # 建立兩個視圖，並傳入「切換頁面」的函式作為參數。
+        # 建立眼睛視圖，並傳入「切換頁面」的函式作為參數。
         self.view_a = SentryEyeWidget(switch_callback=self.go_to_dashboard)        
-        # 替換為我們剛剛貼入並改名的 DashboardWidget
-        # 這裡我們傳入了 self.go_to_eye 函式作為返回按鈕的回調
-        # type: ignore # 【技術鎮壓】忽略 Pylance 對 update_tooltip 的循環依賴警告
-        self.view_b = DashboardWidget(on_stats_change=lambda r, m: self.update_tooltip(r, m), switch_callback=self.go_to_eye)
-        # 把視圖加入（addWidget）容器中。
+        self.view_a.first_painted.connect(lambda: self._record_startup("eye_first_paint", report=True))
         # 索引 0 = View A
         self.container.addWidget(self.view_a)
-        # 索引 1 = View B
-        self.container.addWidget(self.view_b)
-        # [Task 9.4] 連接 Dashboard 的偏好設定訊號到 Eye
-        self.view_b.preferences_changed.connect(self.view_a.set_preferences)
+
+        # [Task 9.4] 偏好設定（引導氣泡 / 智慧配對）：啟動時讀一次交給 Eye，
+        # 之後由 Dashboard 的 preferences_changed 訊號同步
+        settings = QSettings("sentry_config.ini", QSettings.Format.IniFormat)
+        self.view_a.set_preferences(
+            bool(settings.value("enable_guidance", True, type=bool)),
+            bool(settings.value("enable_smart_match", True, type=bool)),
+        )
+
+        # View B（控制台）延後到第一次 go_to_dashboard 才建立（見 _ensure_dashboard）：
+        # 啟動時不建表格 / 日誌區、不碰 adapter、不開日誌計時器
+        self.view_b: DashboardWidget | None = None
+        # 事件串流目前是否連線中（控制台建立時要讓它知道，日誌輪詢才會用慢速）
+        self._events_connected = False
+        # uuid -> (狀態, 模式)：控制台還沒建立時 Tooltip 的資料來源
+        # （暖機讀到的列表打底，之後由 status / removed 事件維持）
+        self._tooltip_states: Dict[str, tuple[str, str]] = {}
+
+        # --- 後端暖機 / 保活（[backend] warmup / keepalive_interval）---
+        # 托盤與眼睛出現之後才在背景付掉 WSL 冷啟動，第一次打開控制台或拖曳時就不必等
+        self._keepalive_timer = QTimer(self.app)
+        self._keepalive_timer.timeout.connect(self._keep_backend_alive)
+        self._keepalive_busy = False
+        QTimer.singleShot(0, self._start_backend_warmup)
+
+        # --- 後端事件訂閱 ---
+        # 事件在背景執行緒到達，經 EventRelay 轉回 GUI 執行緒再更新表格 / Tooltip / 日誌
+        # 等事件迴圈開始（托盤與眼睛都出現之後）才啟動
+        self._event_relay = EventRelay()
+        self._event_relay.received.connect(self._on_backend_event)
+        QTimer.singleShot(0, lambda: events.subscribe(self._event_relay.received.emit))
 
         # --- 改成呼叫 go_to_eye() 來初始化 ---
         # 這會同時設定頁面並將視窗縮小為 130x130
         self.go_to_eye()
 
-        # 啟動時直接顯示視窗
-        self.container.show()
-
-        # 設定容器視窗屬性以支援透明背景
+        # 設定容器視窗屬性以支援透明背景（必須在 show 之前：setWindowFlags 會把已顯示的視窗藏起來）
         self.container.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         # [修改] 移除 WindowStaysOnTopHint，不再強制置頂
         self.container.setWindowFlags(Qt.WindowType.FramelessWindowHint)
 
+        # 啟動時直接顯示視窗
+        self.container.show()
+
+    def _record_startup(self, stage: str, report: bool = False) -> None:
+        """記錄啟動到某個階段花的時間（從載入 tray_app 開始算；診斷分頁可以看到）。"""
+        elapsed = time.perf_counter() - STARTUP_T0
+        metrics.record_startup(stage, elapsed)
+        if report:
+            marks = metrics.snapshot()["startup"]
+            print("[Startup] " + "，".join(f"{name} {ms:.0f} ms" for name, ms in marks.items()))
+
+    def _start_backend_warmup(self) -> None:
+        """依設定在背景暖機，並啟動保活計時器。"""
+        settings = adapter.get_warmup_settings()
+        if settings.keepalive_interval > 0:
+            # 每半個間隔檢查一次；adapter 只在真的閒置超過 keepalive_interval 時才 ping
+            self._keepalive_timer.start(max(1000, int(settings.keepalive_interval * 500)))
+        if settings.warmup:
+            def _warm_up() -> list[adapter.ProjectInfo]:
+                # 暖機已經填好列表快取，這裡再讀一次只是取回快取（給 Tooltip 打底）
+                adapter.warm_up()
+                return adapter.list_projects()
+
+            def _warmed(projects: list[adapter.ProjectInfo]) -> None:
+                self._record_startup("backend_warmup", report=True)
+                for p in projects:
+                    self._tooltip_states.setdefault(p.uuid, (p.status, p.mode))
+                self._refresh_tooltip()
+
+            run_in_background(
+                _warm_up,
+                on_done=_warmed,
+                on_error=lambda e: print(f"[Warning] 後端暖機失敗（第一次操作時會再啟動）: {e}"),
+            )
+
+    def _refresh_tooltip(self) -> None:
+        """
+        控制台還沒建立時，用 _tooltip_states 算出監控 / 靜默數量並更新 Tooltip
+        （計算規則同 DashboardWidget._notify_stats_update；控制台建立後由它負責）。
+        """
+        if self.view_b is not None:
+            return
+        running = muting = 0
+        for status, mode in self._tooltip_states.values():
+            if status == "monitoring":
+                if mode == "silent":
+                    muting += 1
+                else:
+                    running += 1
+        self.update_tooltip(running, muting)
+
+    def _keep_backend_alive(self) -> None:
+        """[保活計時器] 上一個 ping 還沒回來就不再送。"""
+        if self._keepalive_busy:
+            return
+        self._keepalive_busy = True
+
+        def _done(_sent) -> None:
+            self._keepalive_busy = False
+
+        def _failed(e: Exception) -> None:
+            self._keepalive_busy = False
+            print(f"[Warning] 保活 ping 失敗: {e}")
+
+        run_in_background(adapter.keep_alive, on_done=_done, on_error=_failed)
+
+    def _ensure_dashboard(self) -> DashboardWidget:
+        """第一次需要控制台時才建立它（之後都用同一個）。"""
+        if self.view_b is None:
+            started = time.perf_counter()
+            # 這裡我們傳入了 self.go_to_eye 函式作為返回按鈕的回調
+            # type: ignore # 【技術鎮壓】忽略 Pylance 對 update_tooltip 的循環依賴警告
+            self.view_b = DashboardWidget(on_stats_change=lambda r, m: self.update_tooltip(r, m), switch_callback=self.go_to_eye)
+            # 索引 1 = View B
+            self.container.addWidget(self.view_b)
+            # [Task 9.4] 連接 Dashboard 的偏好設定訊號到 Eye
+            self.view_b.preferences_changed.connect(self.view_a.set_preferences)
+            if self._events_connected:
+                self.view_b.handle_backend_event(events.BackendEvent("connected"))
+            metrics.record_startup("dashboard_build", time.perf_counter() - started)
+        return self.view_b
+
+    def _on_backend_event(self, event: events.BackendEvent) -> None:
+        """
+        [GUI 執行緒] 後端事件：交給控制台套用（還沒建立時只更新 Tooltip）；
+        過熱保護另外用托盤通知提醒。
+        """
+        if event.kind in ("connected", "disconnected"):
+            self._events_connected = event.kind == "connected"
+        if event.kind == "status" and event.project is not None:
+            self._tooltip_states[event.project.uuid] = (event.project.status, event.project.mode)
+            self._refresh_tooltip()
+        elif event.kind == "removed":
+            self._tooltip_states.pop(event.uuid, None)
+            self._refresh_tooltip()
+        if self.view_b is not None:
+            self.view_b.handle_backend_event(event)
+        if event.kind == "muting" and self.tray_icon is not None:
+            proj = None
+            if self.view_b is not None:
+                proj = self.view_b.project_model.project_at(self.view_b.project_model.row_of(event.uuid))
+            name = proj.name if proj is not None else event.uuid
+            self.tray_icon.showMessage("Sentry", f"{name} 觸發過熱保護，已進入靜默模式", QSystemTrayIcon.MessageIcon.Warning, 3000)
+
     def go_to_dashboard(self):
-        """切換到 View B (展開)"""
+        """切換到 View B (展開)；第一次呼叫時才建立控制台"""
+        dashboard = self._ensure_dashboard()
         # 1. 命令 View B 重新去後端拉取最新資料
-        self.view_b._reload_projects_from_backend()
+        dashboard._reload_projects_from_backend()
         # 2. 切換頁面
-        self.container.setCurrentIndex(1)
+        self.container.setCurrentWidget(dashboard)
         # 3. [新增] 展開視窗為後台尺寸
         self.container.resize(900, 600)
     
     def go_to_eye(self):
         """切換到 View A (縮微)"""
         # 1. 切換頁面
-        self.container.setCurrentIndex(0)
+        self.container.setCurrentWidget(self.view_a)
         # 2. [新增] 縮小視窗為眼球尺寸
         self.container.resize(130, 130)
 
@@ -2272,6 +2910,10 @@ def main():
     app = QApplication(sys.argv)
     # 這是為了確保關閉視窗時不會直接殺死程式 (因為有 Tray)。
     app.setQuitOnLastWindowClosed(False)
+    # 結束時關閉常駐的 WSL 連線，避免留下孤兒行程
+    app.aboutToQuit.connect(events.shutdown)
+    app.aboutToQuit.connect(adapter.shutdown)
+    app.aboutToQuit.connect(shutdown_asyncio_bridge)
     
     # 啟動 v2 沙盒
     sandbox = SentryTrayAppV2(app)
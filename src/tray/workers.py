@@ -0,0 +1,218 @@
+# src/tray/workers.py
+"""
+背景執行層：讓 adapter 呼叫離開 GUI 執行緒。
+
+WSL 指令動輒數百毫秒到數秒，如果直接在 GUI 執行緒上跑，
+托盤、The Eye 動畫與控制台都會一起凍結。
+這裡用 QThreadPool + QRunnable 把呼叫丟到背景，
+結果再透過 Qt 訊號（跨執行緒自動排入 GUI 事件佇列）送回來。
+
+用法：
+    run_in_background(adapter.list_projects, on_done=self._on_loaded, on_error=self._on_failed)
+
+支援串流的 adapter 呼叫（接受 on_chunk 參數）可以再給 on_chunk，
+每段資料一解碼完就在 GUI 執行緒回呼（一定早於 on_done）：
+    run_in_background(adapter.get_log_tail, uuid, on_chunk=self._on_lines, on_done=...)
+
+asyncio 版（AsyncBackendAdapter）則透過 run_coroutine：
+一條背景執行緒專門跑 asyncio 事件迴圈，coroutine 完成後同樣用 Qt 訊號送回 GUI 執行緒。
+    run_coroutine(self._fetch_both(uuid), on_done=..., on_error=...)
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Callable, Coroutine, Optional, Set
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+# adapter 呼叫專用的執行緒池（與 Qt 全域池分開，避免和其他工作互搶）
+_ADAPTER_POOL: Optional[QThreadPool] = None
+# 同時在背景執行的 adapter 呼叫上限
+ADAPTER_POOL_SIZE = 4
+
+# 執行中的任務訊號物件；保留參照直到結果送回，避免被 Python GC 提早回收
+_live_signals: Set["TaskSignals"] = set()
+
+
+def adapter_pool() -> QThreadPool:
+    """取得（必要時建立）adapter 專用的執行緒池。"""
+    global _ADAPTER_POOL
+    if _ADAPTER_POOL is None:
+        _ADAPTER_POOL = QThreadPool()
+        _ADAPTER_POOL.setMaxThreadCount(ADAPTER_POOL_SIZE)
+    return _ADAPTER_POOL
+
+
+class TaskSignals(QObject):
+    """
+    背景任務的訊號集合。
+
+    這個物件在 GUI 執行緒建立，所以從背景執行緒 emit 時，
+    Qt 會自動改用 QueuedConnection，回呼一定在 GUI 執行緒執行。
+    """
+    # 成功：回傳值
+    finished = Signal(object)
+    # 失敗：例外物件
+    failed = Signal(object)
+    # 串流片段（on_chunk）：同一條背景執行緒發出，所以一定排在 finished 之前
+    progress = Signal(object)
+
+
+class AdapterTask(QRunnable):
+    """在執行緒池中執行一個函式（通常是 adapter 呼叫）。"""
+
+    def __init__(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        # 由 run_in_background 在 GUI 執行緒建立並接好回呼
+        self.signals: TaskSignals
+
+    def run(self) -> None:
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(
+    fn: Callable[..., Any],
+    *args: Any,
+    on_done: Optional[Callable[[Any], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+    on_chunk: Optional[Callable[[Any], None]] = None,
+    **kwargs: Any,
+) -> AdapterTask:
+    """
+    把 fn(*args, **kwargs) 丟到背景執行。
+
+    - on_done(result)：成功時在 GUI 執行緒呼叫
+    - on_error(exc) ：失敗時在 GUI 執行緒呼叫（未提供時只印出錯誤）
+    - on_chunk(part)：fn 的 on_chunk 參數每收到一段資料，就在 GUI 執行緒呼叫一次
+    """
+    task = AdapterTask(fn, *args, **kwargs)
+    task.signals = _connect_signals(on_done, on_error)
+    if on_chunk is not None:
+        task.signals.progress.connect(on_chunk)
+        task.kwargs["on_chunk"] = task.signals.progress.emit
+    adapter_pool().start(task)
+    return task
+
+
+def _connect_signals(
+    on_done: Optional[Callable[[Any], None]],
+    on_error: Optional[Callable[[Exception], None]],
+) -> TaskSignals:
+    """在 GUI 執行緒建立一組 TaskSignals 並接上回呼；送出結果後自動釋放參照。"""
+    signals = TaskSignals()
+    _live_signals.add(signals)
+
+    def _release(*_):
+        _live_signals.discard(signals)
+
+    if on_done is not None:
+        signals.finished.connect(on_done)
+    if on_error is not None:
+        signals.failed.connect(on_error)
+    else:
+        signals.failed.connect(lambda e: print(f"[Worker] 背景任務失敗: {e}"))
+    signals.finished.connect(_release)
+    signals.failed.connect(_release)
+    return signals
+
+
+class EventRelay(QObject):
+    """
+    把背景執行緒上的回呼轉到 GUI 執行緒（例如後端事件訂閱）。
+
+        relay = EventRelay()
+        relay.received.connect(self._on_backend_event)
+        events.subscribe(relay.received.emit)
+
+    EventRelay 要由 GUI 端保留參照（通常存成屬性），否則會被回收。
+    """
+    received = Signal(object)
+
+
+# ==========================================
+#   asyncio ↔ Qt 橋接
+# ==========================================
+
+class AsyncioBridge:
+    """
+    在背景執行緒上常駐一個 asyncio 事件迴圈。
+
+    Qt 的事件迴圈佔住 GUI 執行緒，asyncio 迴圈就放在另一條執行緒；
+    coroutine 用 run_coroutine_threadsafe 丟進去，完成後由 TaskSignals 送回 GUI 執行緒。
+    """
+
+    def __init__(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="asyncio-bridge", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> "asyncio.Future[Any]":
+        signals = _connect_signals(on_done, on_error)
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+        def _on_future_done(fut) -> None:
+            # 這裡在 asyncio 執行緒上；emit 會自動排入 GUI 執行緒
+            try:
+                result = fut.result()
+            except Exception as e:
+                signals.failed.emit(e)
+            else:
+                signals.finished.emit(result)
+
+        future.add_done_callback(_on_future_done)
+        return future
+
+    def stop(self) -> None:
+        """停止事件迴圈（程式結束時呼叫）。"""
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2)
+
+
+_ASYNCIO_BRIDGE: Optional[AsyncioBridge] = None
+
+
+def asyncio_bridge() -> AsyncioBridge:
+    """取得（必要時建立）共用的 asyncio 橋接器。"""
+    global _ASYNCIO_BRIDGE
+    if _ASYNCIO_BRIDGE is None:
+        _ASYNCIO_BRIDGE = AsyncioBridge()
+    return _ASYNCIO_BRIDGE
+
+
+def run_coroutine(
+    coro: Coroutine[Any, Any, Any],
+    on_done: Optional[Callable[[Any], None]] = None,
+    on_error: Optional[Callable[[Exception], None]] = None,
+) -> "asyncio.Future[Any]":
+    """
+    在背景 asyncio 迴圈執行 coroutine，結果透過 Qt 訊號在 GUI 執行緒回呼。
+    （回呼規則與 run_in_background 相同）
+    """
+    return asyncio_bridge().submit(coro, on_done=on_done, on_error=on_error)
+
+
+def shutdown_asyncio_bridge() -> None:
+    """停止共用的 asyncio 橋接器（如果曾經建立過）。"""
+    global _ASYNCIO_BRIDGE
+    if _ASYNCIO_BRIDGE is not None:
+        _ASYNCIO_BRIDGE.stop()
+        _ASYNCIO_BRIDGE = None